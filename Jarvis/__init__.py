@@ -1,18 +1,29 @@
 import time
 
-from Jarvis.speech_engine import SpeechEngine
-
 
 def _log_error(context, error):
     print(f"{context}: {error}")
 
 class JarvisAssistant:
-    def __init__(self):
-        self._mic_disabled_reason = None
-        self._mic_warned = False
+    def __init__(self, speech=True):
+        """
+        ``speech=False`` builds a headless assistant (server use): no audio
+        devices are opened, ``tts`` is a no-op and ``mic_input`` returns "".
+        """
+        self._mic_disabled_reason = None if speech else "Speech is disabled (headless assistant)."
+        self._mic_warned = not speech
         self._app_shutdown_cb = None
         self._app_shutdown_requested = False
-        self._speech = SpeechEngine()
+        self._speech = None
+        if speech:
+            # Imported here so headless use does not pull in the audio stack.
+            from Jarvis.speech_engine import SpeechEngine
+
+            self._speech = SpeechEngine()
+
+    @property
+    def headless(self):
+        return self._speech is None
 
     def set_app_shutdown_callback(self, cb):
         """
@@ -36,6 +47,8 @@ class JarvisAssistant:
             return False
 
     def mic_available(self) -> bool:
+        if self._speech is None:
+            return False
         return self._speech.mic_available()
 
     def last_input_language(self):
@@ -132,12 +145,18 @@ class JarvisAssistant:
         :param text: text(String)
         :return: True/False (Play sound if True otherwise write exception to log and return  False)
         """
+        if self._speech is None:
+            return False
         return self._speech.speak(text, wait=True)
 
     def tts_async(self, text):
+        if self._speech is None:
+            return False
         return self._speech.speak(text, wait=False)
 
     def wait_until_silent(self, timeout_s=10):
+        if self._speech is None:
+            return True
         return self._speech.wait_until_silent(timeout_s=timeout_s)
 
     def tell_me_date(self):
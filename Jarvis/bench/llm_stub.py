@@ -0,0 +1,222 @@
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_CONTENT = '{"action":"reply","reply":"Stub reply."}'
+
+
+def load_script(path):
+    """
+    Read a stub script: ``{"models": [...], "default": "...", "latency": {...}, "rules": [...]}``.
+
+    A ``.jsonl`` file is read as replayed rules instead, one
+    ``{"user": "...", "content": "..."}`` object per line.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        if str(path).endswith(".jsonl"):
+            return {"rules": [json.loads(line) for line in f if line.strip()]}
+        return json.load(f)
+
+
+class LatencyModel:
+    """
+    Seeded latency sampler: ``{"dist": "fixed"|"uniform"|"normal"|"lognormal", ...}``.
+
+    ``ms`` is the fixed value or mean, ``sigma`` the spread (``min_ms``..``max_ms``
+    for uniform); ``chunk_ms`` is the gap between streamed chunks. ``models``
+    maps a model name to its own spec.
+    """
+
+    def __init__(self, spec=None, seed=0):
+        self.spec = dict(spec or {})
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _for(self, model):
+        spec = dict(self.spec)
+        spec.update((self.spec.get("models") or {}).get(model) or {})
+        return spec
+
+    def sample_ms(self, model=""):
+        spec = self._for(model)
+        dist = str(spec.get("dist") or "fixed").lower()
+        ms = float(spec.get("ms", 0))
+        sigma = float(spec.get("sigma", 0))
+        with self._lock:
+            if dist == "uniform":
+                value = self._rng.uniform(float(spec.get("min_ms", 0)), float(spec.get("max_ms", ms)))
+            elif dist == "normal":
+                value = self._rng.gauss(ms, sigma)
+            elif dist == "lognormal":
+                # ``ms`` is the median; ``sigma`` is the spread of the underlying normal.
+                value = ms * self._rng.lognormvariate(0.0, sigma)
+            else:
+                value = ms
+        return max(0.0, value)
+
+    def chunk_ms(self, model=""):
+        return max(0.0, float(self._for(model).get("chunk_ms", 0)))
+
+
+class StubLLM:
+    """
+    Scripted stand-in for an OpenAI-compatible provider.
+
+    Rules are tried in order against the last user message: ``user`` must
+    match it exactly (replayed turns), ``match`` is a regex search, and an
+    optional ``model`` narrows the rule to one model. The first hit's
+    ``content`` is returned; ``default`` answers everything else.
+    """
+
+    def __init__(self, script=None, *, seed=0):
+        script = dict(script or {})
+        self.models = list(script.get("models") or ["stub-model"])
+        self.default = str(script.get("default") or DEFAULT_CONTENT)
+        self.latency = LatencyModel(script.get("latency"), seed=seed)
+        self.rules = []
+        for rule in script.get("rules") or []:
+            rule = dict(rule)
+            if rule.get("match"):
+                rule["_re"] = re.compile(str(rule["match"]), re.IGNORECASE)
+            self.rules.append(rule)
+        self._lock = threading.Lock()
+        self._stats = {"requests": 0, "streamed": 0, "rule_hits": 0, "default_hits": 0}
+
+    def _count(self, name):
+        with self._lock:
+            self._stats[name] += 1
+
+    def reply_for(self, messages, model=""):
+        last_user = ""
+        for msg in reversed(messages or []):
+            if isinstance(msg, dict) and msg.get("role") == "user":
+                last_user = str(msg.get("content") or "")
+                break
+        for rule in self.rules:
+            if rule.get("model") and rule["model"] != model:
+                continue
+            if "user" in rule and str(rule["user"]).strip() != last_user.strip():
+                continue
+            if "_re" in rule and not rule["_re"].search(last_user):
+                continue
+            self._count("rule_hits")
+            return str(rule.get("content", ""))
+        self._count("default_hits")
+        return self.default
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats)
+
+
+def _usage(messages, content):
+    prompt_chars = sum(len(str(m.get("content") or "")) for m in messages or [] if isinstance(m, dict))
+    return {"prompt_tokens": prompt_chars // 4, "completion_tokens": len(content) // 4}
+
+
+def _pieces(content, size=12):
+    return [content[i:i + size] for i in range(0, len(content), size)] or [""]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        return
+
+    def _json(self, status, body):
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _sse(self, obj):
+        data = obj if isinstance(obj, bytes) else json.dumps(obj, ensure_ascii=False).encode("utf-8")
+        self.wfile.write(b"data: " + data + b"\n\n")
+        self.wfile.flush()
+
+    def do_GET(self):
+        stub = self.server.stub
+        if self.path.rstrip("/").endswith("/models"):
+            return self._json(200, {"object": "list", "data": [{"id": m, "object": "model"} for m in stub.models]})
+        self._json(404, {"error": {"message": "not found"}})
+
+    def do_POST(self):
+        stub = self.server.stub
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            return self._json(400, {"error": {"message": "invalid json"}})
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            return self._json(404, {"error": {"message": "not found"}})
+        stub._count("requests")
+        model = str(body.get("model") or "")
+        messages = body.get("messages") or []
+        content = stub.reply_for(messages, model)
+        time.sleep(stub.latency.sample_ms(model) / 1000.0)
+        usage = _usage(messages, content)
+        if not body.get("stream"):
+            return self._json(
+                200,
+                {
+                    "object": "chat.completion",
+                    "model": model,
+                    "choices": [{"index": 0, "message": {"role": "assistant", "content": content}}],
+                    "usage": usage,
+                },
+            )
+
+        stub._count("streamed")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        gap = stub.latency.chunk_ms(model) / 1000.0
+        for i, piece in enumerate(_pieces(content)):
+            if i and gap:
+                time.sleep(gap)
+            self._sse({"object": "chat.completion.chunk", "model": model, "choices": [{"delta": {"content": piece}}]})
+        if (body.get("stream_options") or {}).get("include_usage"):
+            self._sse({"object": "chat.completion.chunk", "choices": [], "usage": usage})
+        self._sse(b"[DONE]")
+
+
+class StubLLMServer:
+    """Serve a ``StubLLM`` on ``host:port`` from a background thread (port 0 picks a free one)."""
+
+    def __init__(self, stub=None, host="127.0.0.1", port=0):
+        self.stub = stub or StubLLM()
+        self._httpd = ThreadingHTTPServer((host, int(port)), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.stub = self.stub
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="jivan-llm-stub", daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        self._httpd.serve_forever()
+
+    def close(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,170 @@
+import hashlib
+import json
+import math
+import threading
+import time
+
+# Report stage -> latency metric the brain records for it.
+STAGES = (
+    ("routing", "context_plan_ms"),
+    ("memory", "context_memory_ms"),
+    ("history", "context_history_ms"),
+    ("llm_plan", "llm_plan_ms"),
+    ("tool", "tool_exec_ms"),
+    ("llm_format", "llm_format_ms"),
+)
+QUANTILES = (("p50", 0.50), ("p95", 0.95), ("p99", 0.99))
+
+
+def load_corpus(path):
+    """Utterances from a ``.json`` list or a text file (one per line, ``#`` comments skipped)."""
+    with open(path, "r", encoding="utf-8") as f:
+        if str(path).endswith(".json"):
+            return [str(x) for x in json.load(f) if str(x).strip()]
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith("#")]
+
+
+def corpus_digest(corpus):
+    return hashlib.sha1("\n".join(corpus).encode("utf-8")).hexdigest()[:12]
+
+
+def percentile(values, q):
+    """Nearest-rank percentile, so reports do not depend on interpolation choices."""
+    rows = sorted(values)
+    if not rows:
+        return None
+    idx = min(len(rows) - 1, max(0, int(math.ceil(q * len(rows))) - 1))
+    return rows[idx]
+
+
+def summarize(values):
+    values = [float(v) for v in values]
+    out = {"n": len(values)}
+    for name, q in QUANTILES:
+        value = percentile(values, q)
+        out[name] = round(value, 2) if value is not None else None
+    out["mean"] = round(sum(values) / len(values), 2) if values else None
+    return out
+
+
+class StageRecorder:
+    """
+    Metrics observer that sums stage latencies between ``begin()`` and ``end()``.
+
+    Turns run one at a time during a benchmark, so every sample seen in that
+    window (including ones from worker threads) belongs to the current turn.
+    """
+
+    def __init__(self, stages=STAGES):
+        self._by_metric = {metric: stage for stage, metric in stages}
+        self._row = None
+        self._lock = threading.Lock()
+
+    def __call__(self, name, value_ms):
+        stage = self._by_metric.get(name)
+        if stage is None:
+            return
+        with self._lock:
+            if self._row is not None:
+                self._row[stage] = self._row.get(stage, 0.0) + float(value_ms)
+
+    def begin(self):
+        with self._lock:
+            self._row = {}
+
+    def end(self):
+        with self._lock:
+            row, self._row = self._row or {}, None
+        return row
+
+
+def run_pass(brain, corpus, recorder, *, session_prefix="bench"):
+    """One turn per utterance, each in its own session; returns per-turn stage timings."""
+    turns = []
+    for i, text in enumerate(corpus):
+        recorder.begin()
+        started = time.perf_counter()
+        try:
+            reply = brain.respond(text, session_id=f"{session_prefix}-{i}")
+        except Exception as e:
+            reply = None
+            print(f"Benchmark turn failed: {e}")
+        total_ms = (time.perf_counter() - started) * 1000.0
+        stages = recorder.end()
+        stages["total"] = total_ms
+        turns.append({"text": text, "ok": bool(reply), "stages": stages})
+    return turns
+
+
+def summarize_pass(turns):
+    names = [stage for stage, _metric in STAGES] + ["total"]
+    stages = {}
+    for name in names:
+        values = [t["stages"][name] for t in turns if name in t["stages"]]
+        if values:
+            stages[name] = summarize(values)
+    return {"turns": len(turns), "failed": sum(1 for t in turns if not t["ok"]), "stages": stages}
+
+
+def run_benchmark(brain, corpus, *, warm_runs=1, session_prefix="bench"):
+    """
+    Drive ``brain.respond`` over ``corpus``: one cold pass, then ``warm_runs`` passes.
+
+    Warm passes reuse the cold pass's session ids, so the per-session semantic
+    cache and the shared tool cache are hot. ``brain`` should be freshly built
+    for the cold numbers to mean anything.
+    """
+    from Jarvis.runtime.metrics import metrics_add_observer, metrics_remove_observer
+
+    recorder = StageRecorder()
+    metrics_add_observer(recorder)
+    try:
+        cold = run_pass(brain, corpus, recorder, session_prefix=session_prefix)
+        warm = []
+        for _ in range(max(0, int(warm_runs))):
+            warm.extend(run_pass(brain, corpus, recorder, session_prefix=session_prefix))
+    finally:
+        metrics_remove_observer(recorder)
+    report = {"cold": summarize_pass(cold)}
+    if warm:
+        report["warm"] = summarize_pass(warm)
+    return report
+
+
+def compare(baseline, current, *, tolerance=0.15, min_delta_ms=5.0):
+    """
+    Stage percentiles of ``current`` that regressed against ``baseline``.
+
+    A regression is slower by more than ``tolerance`` (relative) and
+    ``min_delta_ms`` (absolute), so timer noise on tiny stages is ignored.
+    """
+    rows = []
+    for phase in ("cold", "warm"):
+        base_stages = (baseline.get(phase) or {}).get("stages") or {}
+        cur_stages = (current.get(phase) or {}).get("stages") or {}
+        for stage, cur in cur_stages.items():
+            base = base_stages.get(stage)
+            if not base:
+                continue
+            for name, _q in QUANTILES:
+                before, after = base.get(name), cur.get(name)
+                if before is None or after is None:
+                    continue
+                if after - before >= min_delta_ms and after > before * (1.0 + tolerance):
+                    rows.append(
+                        {"phase": phase, "stage": stage, "quantile": name, "baseline_ms": before, "current_ms": after}
+                    )
+    return rows
+
+
+def format_report(report):
+    lines = []
+    for phase in ("cold", "warm"):
+        data = report.get(phase)
+        if not data:
+            continue
+        lines.append(f"{phase}: {data['turns']} turns, {data['failed']} failed")
+        lines.append(f"  {'stage':<11}{'n':>5}{'p50':>10}{'p95':>10}{'p99':>10}")
+        for stage, row in data["stages"].items():
+            lines.append(f"  {stage:<11}{row['n']:>5}{row['p50']:>10.1f}{row['p95']:>10.1f}{row['p99']:>10.1f}")
+    return "\n".join(lines)
@@ -1,26 +1,52 @@
 import json
 import os
 import re
+import threading
 import time
 import hashlib
+from concurrent.futures import ThreadPoolExecutor
 
 from Jarvis.config import config
 from Jarvis.protocols import list_protocols
 
-from .llm import LLMError, chat_completions
-from .intent_routing import required_noauth_mcp_plan, required_telegram_mcp_plan
-from .cache import RedisConversationBuffer
+from .llm import LLMError, cached_prompt_tokens, chat_completions, chat_completions_stream
+from .llm_hedge import HedgedLLM
+from .intent_routing import TOOL_ROUTER
+from .cache import RedisConversationBuffer, SemanticReplyCache, TTLCache, make_cache_backend, parse_ttl_overrides
 from .mcp import ComposioMCPClient
 from .memory import MemoryManager
+from .memory.token_index import TokenIndex, token_set
+from .chain import plan_chain_waves, run_chain_waves, split_chain
+from .context_assembly import ContextAssembly
 from .persona import persona_block
+from .prompt import StaticPromptPrefix, join_system_prompt
+from .session import DEFAULT_SESSION_ID, BrainSession, SessionStore
+from .slots import fill_slots
+from .speculation import SPECULATIVE_TOOLS, args_match, predict_tool
+from .streaming import ReplyTextStream, SentenceChunker
+from .summary import RollingSummary
+from .tokens import fit_messages, history_budget, make_token_counter, message_tokens
+from .tool_retrieval import CatalogRetriever
+from .turn_context import TurnContext, normalize_history
 from Jarvis.security import validate_source_access
-from .tools import get_tool_spec, run_tool, tools_for_prompt_compact
+from .tools import (
+    CRITICAL_TOOLS,
+    EXECUTOR,
+    REGISTRY,
+    TOOL_SPECS,
+    check_tool_args,
+    format_tool_reply,
+    get_tool_spec,
+    run_tool,
+    tools_for_prompt_compact,
+)
 from Jarvis.runtime.errors import humanize
+from Jarvis.runtime.flags import config_flag
+from Jarvis.runtime.metrics import metrics_inc, metrics_observe_ms
 from Jarvis.runtime.replay import replay_event
-
-
-def _tokenize(text):
-    return [t for t in re.split(r"[^a-zA-Z0-9_]+", str(text or "").lower()) if len(t) > 1]
+from Jarvis.runtime.singleflight import SingleFlight
+from Jarvis.runtime import tracing, transport
+from Jarvis.runtime.structured_log import get_turn_id, set_turn_id
 
 
 def _extract_json_object(text):
@@ -46,56 +72,6 @@ def _as_fallback_reply(text):
     return t[:1200]
 
 
-def _extract_topic_from_text(user_text):
-    text = (user_text or "").strip()
-    lowered = text.lower()
-    for prefix in ("tell me about ", "who is ", "what is "):
-        if lowered.startswith(prefix):
-            return text[len(prefix) :].strip()
-    return ""
-
-
-def _extract_weather_city(user_text):
-    lowered = (user_text or "").strip().lower()
-    m = re.search(r"\bweather(?:\s+in)?\s+(.+)$", lowered)
-    if not m:
-        return ""
-    return m.group(1).strip()
-
-
-def _detect_lang_for_joke(user_text):
-    s = user_text or ""
-    for ch in s:
-        code = ord(ch)
-        if 0x0530 <= code <= 0x058F:
-            return "hy"
-        if 0x0400 <= code <= 0x04FF:
-            return "ru"
-    return "en"
-
-
-def _extract_after_keyword(text, keyword):
-    src = str(text or "")
-    lower_src = src.lower()
-    idx = lower_src.find(keyword.lower())
-    if idx == -1:
-        return ""
-    return src[idx + len(keyword) :].strip(" :,-")
-
-
-def _extract_meme_text(user_text):
-    text = (user_text or "").strip()
-    lowered = text.lower()
-    for prefix in ("meme ", "make meme ", "generate meme "):
-        if lowered.startswith(prefix):
-            body = text[len(prefix) :].strip()
-            if "|" in body:
-                top, bottom = body.split("|", 1)
-                return top.strip(), bottom.strip()
-            return body, ""
-    return "", ""
-
-
 def _detect_user_language(user_text, command_context=None):
     ctx = command_context if isinstance(command_context, dict) else {}
     hinted = str(ctx.get("language", "") or "").strip().lower()
@@ -141,8 +117,35 @@ def _telegram_owner_hint():
     return ""
 
 
-def _latency_trace_enabled():
-    return str(getattr(config, "latency_trace", "1")).lower() in ("1", "true", "yes", "on")
+class Reply(str):
+    """
+    A turn's reply text, plus ``unspoken``: the part not already handed to ``on_sentence``.
+
+    That is all of it when nothing was streamed, or when the turn failed after
+    streaming began and replied with something else (an error message).
+    """
+
+    unspoken = ""
+
+
+def _streamed_reply(reply, sentences):
+    if not isinstance(reply, str):
+        return reply
+    out = Reply(reply)
+    out.unspoken = reply
+    # Chunks are trimmed and may split a long word, so compare the text without whitespace.
+    spoken = "".join("".join(sentences).split())
+    if spoken and "".join(reply.split()).startswith(spoken):
+        seen = 0
+        for i, ch in enumerate(reply):
+            if seen == len(spoken):
+                out.unspoken = reply[i:].strip()
+                break
+            if not ch.isspace():
+                seen += 1
+        else:
+            out.unspoken = ""
+    return out
 
 
 def _localized_text(lang, *, en, ru=None, de=None):
@@ -187,82 +190,221 @@ def _fast_tool_reply(tool_name, tool_result, user_lang):
     return ""
 
 
-def _required_noauth_mcp_plan(user_text):
-    return required_noauth_mcp_plan(user_text)
+_NEEDS_LLM_PHRASING = re.compile(
+    r"\b(why|explain|compare|should|recommend|summari[sz]e|analy[sz]e|"
+    r"почему|объясни\w*|сравни\w*|стоит\s+ли|посоветуй\w*|"
+    r"warum|erkl[äa]r\w*|vergleich\w*|sollte\w*|empfiehl\w*)\b",
+    re.IGNORECASE,
+)
 
 
-def _required_tool_plan(user_text, recent_messages=None):
-    text = (user_text or "").strip()
-    lowered = text.lower()
-    if not lowered:
-        return None
-
-    telegram_plan = required_telegram_mcp_plan(text, recent_messages=recent_messages)
-    if telegram_plan:
-        return telegram_plan
-
-    mcp_noauth = _required_noauth_mcp_plan(text)
-    if mcp_noauth:
-        return mcp_noauth
-
-    if "protocol" in lowered or lowered in ("monday", "monday morning"):
-        if "monday morning" in lowered:
-            return ("run_protocol", {"name": "monday_morning", "confirm": True})
-        if "monday" in lowered:
-            return ("run_protocol", {"name": "monday", "confirm": True})
+def _template_reply_allowed(user_text, reply):
+    """A tool template is good enough unless the user asked for reasoning or it is too long to speak."""
+    if not config_flag("brain_template_replies", "1"):
+        return False
+    if not reply or len(reply) > int(getattr(config, "brain_template_reply_max_chars", 480)):
+        return False
+    return not _NEEDS_LLM_PHRASING.search(str(user_text or ""))
 
-    # Explicit deterministic routing to prevent LLM-memory answers where tools exist.
-    if "joke" in lowered or "make me laugh" in lowered or "funny" in lowered:
-        return ("joke", {"language": _detect_lang_for_joke(text)})
 
-    if lowered.startswith("meme ") or lowered.startswith("make meme ") or lowered.startswith("generate meme "):
-        top_text, bottom_text = _extract_meme_text(text)
-        return ("imgflip_meme", {"top_text": top_text, "bottom_text": bottom_text})
+def _missing_tool_args(spec, tool_args):
+    """Required args that are empty or whose value the tool's validator rejects."""
+    if not spec:
+        return []
+    return check_tool_args(spec.get("name"), tool_args or {})[0]
 
-    if "calculate" in lowered:
-        return ("wolframalpha", {"query": text})
 
-    if re.search(r"\d+\s*[\+\-\*/^%]\s*\d+", lowered):
-        return ("wolframalpha", {"query": text})
-
-    if lowered.startswith("who is ") or lowered.startswith("tell me about "):
-        topic = _extract_topic_from_text(text)
-        if topic:
-            return ("wikipedia", {"topic": topic})
-
-    if lowered.startswith("what is "):
-        topic = _extract_topic_from_text(text)
-        if topic:
-            # Prefer Wolfram for formula-like questions, otherwise Wikipedia.
-            if re.search(r"\d", topic) or any(op in topic for op in ("+", "-", "*", "/", "^", "%")):
-                return ("wolframalpha", {"query": text})
-            return ("wikipedia", {"topic": topic})
-
-    if "weather" in lowered:
-        city = _extract_weather_city(text)
-        if city:
-            return ("weather", {"city": city})
+def _required_tool_plan(user_text, recent_messages=None):
+    rule, plan = TOOL_ROUTER.match(user_text, recent_messages=recent_messages)
+    if rule:
+        metrics_inc(f"route_{rule}", 1)
+    return plan
 
-    if "news" in lowered or "headlines" in lowered:
-        return ("news", {})
 
-    if "ip address" in lowered:
-        return ("ip_address", {})
+def _turn_tool_plan(user_text, recent_messages=None):
+    """The forced plan for a whole turn; chained text has none, so it reaches the chain planner."""
+    if split_chain(user_text):
+        return None
+    return _required_tool_plan(user_text, recent_messages=recent_messages)
+
+
+def _build_static_prefix(soul, base_instructions, tools_json, protocols_json, telegram_hint):
+    return (
+        "You are JIVAN (Just Intelligent Versatile, Autonomous Nexus), a desktop voice assistant.\n"
+        "\n"
+        "Personality & operating principles:\n"
+        + "BEGIN SOUL.md\n"
+        + soul
+        + "\nEND SOUL.md\n"
+        + "\n\n"
+        + base_instructions
+        + "\nAvailable tools JSON:\n"
+        + tools_json
+        + ("\n\nAvailable protocols JSON:\n" + protocols_json if protocols_json else "")
+        + ("\n\n" + telegram_hint if telegram_hint else "")
+    )
+
+
+class _SpeculativeTool:
+    """
+    Run the predicted tool while the planner LLM call is in flight.
+
+    ``take`` hands the result over when the final plan asks for the same tool
+    and args; anything else counts as wasted work.
+    """
+
+    def __init__(self, brain, *, user_text, source_context):
+        self._brain = brain
+        self._future = None
+        self._settled = False
+        self.tool_name = ""
+        self.tool_args = {}
+        allowed = {
+            str(x).strip()
+            for x in str(getattr(config, "brain_speculative_tool_names", ",".join(SPECULATIVE_TOOLS))).split(",")
+            if str(x).strip()
+        }
+        prediction = predict_tool(user_text)
+        if not prediction or prediction[0] not in allowed or prediction[0] not in SPECULATIVE_TOOLS:
+            return
+        self.tool_name, self.tool_args = prediction
+        self._future = brain._submit(
+            brain._execute_tool,
+            tool_name=self.tool_name,
+            tool_args=self.tool_args,
+            user_text=user_text,
+            source_context=source_context,
+        )
+        brain._count("speculative_started")
 
-    if "time" in lowered and "timer" not in lowered:
-        return ("get_time", {})
+    def covers(self, tool_name, tool_args):
+        return self._future is not None and tool_name == self.tool_name and args_match(self.tool_args, tool_args)
 
-    if re.search(r"\bdate\b", lowered):
-        return ("get_date", {})
+    def discard(self):
+        if self._future is None or self._settled:
+            return
+        self._settled = True
+        self._future.cancel()
+        self._brain._count("speculative_wasted")
 
-    return None
+    def take(self, tool_name, tool_args):
+        if self._future is None or self._settled:
+            return None
+        if not self.covers(tool_name, tool_args):
+            self.discard()
+            return None
+        self._settled = True
+        try:
+            result = self._future.result()
+        except Exception:
+            result = None
+        if not isinstance(result, dict):
+            self._brain._count("speculative_wasted")
+            return None
+        self._brain._count("speculative_hits")
+        return result
+
+
+class _EarlyToolDispatch:
+    """
+    Start a side-effect-free tool while the planner is still streaming its JSON plan.
+
+    The call is dispatched once ``tool_name`` and every required arg are parsed; later
+    tokens that change the tool or any of its args discard the prefetched result.
+    """
+
+    def __init__(self, brain, *, user_text, source_context, covered=None, turn=None):
+        self._brain = brain
+        self._user_text = user_text
+        self._source_context = source_context
+        self._covered = covered
+        self._turn = turn
+        self._future = None
+        self._tool_name = ""
+        self._tool_args = {}
+        self._arg_names = ()
+        self._discarded = False
+
+    def on_events(self, parser, events):
+        if self._discarded:
+            return
+        if self._future is not None:
+            if self._contradicted(parser):
+                self.discard()
+            return
+        if parser.get("action") != "tool":
+            return
+        tool_name = parser.get("tool_name")
+        spec = get_tool_spec(tool_name) if isinstance(tool_name, str) else None
+        if not spec or spec.get("side_effects") or tool_name in CRITICAL_TOOLS:
+            return
+        raw_args = {
+            path[1]: value
+            for path, value in parser.values.items()
+            if len(path) == 2 and path[0] == "tool_args"
+        }
+        args = self._brain._deterministic_fill_tool_args(
+            tool_name=tool_name,
+            user_text=self._user_text,
+            tool_args=raw_args,
+            turn=self._turn,
+        )
+        if any(args.get(k) in ("", None) for k in spec.get("required") or []):
+            return
+        if self._covered and self._covered(tool_name, args):
+            return
+        self._tool_name = tool_name
+        self._arg_names = tuple((spec.get("args") or {}).keys())
+        self._tool_args = self._project(args)
+        self._future = self._brain._submit(
+            self._brain._execute_tool,
+            tool_name=tool_name,
+            tool_args=args,
+            user_text=self._user_text,
+            source_context=self._source_context,
+        )
+        metrics_inc("early_dispatch_started", 1)
+
+    def _project(self, args):
+        return {k: args.get(k) for k in self._arg_names if args.get(k) not in ("", None)}
+
+    def _contradicted(self, parser):
+        if parser.get("action", default="tool") != "tool":
+            return True
+        if parser.get("tool_name", default=self._tool_name) != self._tool_name:
+            return True
+        for path, value in parser.values.items():
+            if len(path) == 2 and path[0] == "tool_args" and path[1] in self._arg_names:
+                if value not in ("", None) and self._tool_args.get(path[1]) != value:
+                    return True
+        return False
+
+    def discard(self):
+        if self._future is None or self._discarded:
+            return
+        self._discarded = True
+        self._future.cancel()
+        metrics_inc("early_dispatch_discarded", 1)
+
+    def take(self, tool_name, tool_args):
+        """Return the prefetched result when the final plan matches the dispatched call."""
+        if self._future is None or self._discarded:
+            return None
+        if tool_name != self._tool_name or self._project(tool_args or {}) != self._tool_args:
+            self.discard()
+            return None
+        try:
+            result = self._future.result()
+        except Exception:
+            return None
+        metrics_inc("early_dispatch_used", 1)
+        return result
 
 
 class JarvisBrain:
     def __init__(self, *, assistant, wolfram_fn):
         self._assistant = assistant
         self._wolfram_fn = wolfram_fn
-        self._history = []
         self._soul_text = None
         self._soul_mtime = None
         self._soul_path = os.path.abspath(
@@ -271,11 +413,67 @@ class JarvisBrain:
         self._memory = MemoryManager()
         self._mcp = ComposioMCPClient()
         self._redis_buffer = RedisConversationBuffer()
-        self._semantic_cache = {}
-        self._tool_cache = {}
-        self._stats = {"llm_calls": 0, "tool_calls": 0, "cache_hits": 0}
+        cache_backend = make_cache_backend()
+        cache_max_items = int(getattr(config, "brain_cache_max_items", 256))
+        cache_max_bytes = int(getattr(config, "brain_cache_max_bytes", 2_000_000))
+        self._semantic_cache = SemanticReplyCache(
+            ttl_s=int(getattr(config, "brain_semantic_cache_ttl_s", 45)),
+            max_items=cache_max_items,
+            max_bytes=cache_max_bytes,
+            backend=cache_backend,
+            on_metric=metrics_inc,
+        )
+        self._tool_cache = TTLCache(
+            "tool",
+            ttl_s=int(getattr(config, "brain_tool_cache_ttl_s", 60)),
+            max_items=cache_max_items,
+            max_bytes=cache_max_bytes,
+            backend=cache_backend,
+            on_metric=metrics_inc,
+        )
+        self._tool_cache_ttls = parse_ttl_overrides(getattr(config, "brain_tool_cache_ttls", ""))
+        # Identical calls already in flight (another turn or session) are joined instead of repeated.
+        self._tool_flight = SingleFlight("tool", on_metric=metrics_inc)
+        self._llm_flight = SingleFlight("llm", on_metric=metrics_inc)
+        self._llm = HedgedLLM(
+            hedge_quantile=float(getattr(config, "llm_hedge_quantile", 0.9)),
+            min_samples=int(getattr(config, "llm_hedge_min_samples", 20)),
+            default_hedge_ms=int(getattr(config, "llm_hedge_default_ms", 2500)),
+            max_hedge_ratio=float(getattr(config, "llm_hedge_max_ratio", 0.15)),
+            breaker_failures=int(getattr(config, "llm_breaker_failures", 5)),
+            breaker_reset_s=int(getattr(config, "llm_breaker_reset_s", 30)),
+            on_metric=metrics_inc,
+        )
+        # Moving average of the tool-arg fill LLM call, reported as latency saved when slots resolve locally.
+        self._arg_fill_llm_ms = None
+        self._count_tokens = make_token_counter(getattr(config, "llm_tokenizer", "heuristic"))
+        self._stats = {
+            "llm_calls": 0,
+            "tool_calls": 0,
+            "cache_hits": 0,
+            "speculative_started": 0,
+            "speculative_hits": 0,
+            "speculative_wasted": 0,
+        }
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(2, int(getattr(config, "brain_worker_threads", 6))),
+            thread_name_prefix="jivan-brain",
+        )
+        # Per-conversation state; the desktop loop uses the default session, the server one per client.
+        self._local = threading.local()
+        self._default_session = self._new_session(DEFAULT_SESSION_ID)
+        self._sessions = SessionStore(
+            self._new_session,
+            max_sessions=int(getattr(config, "brain_max_sessions", 256)),
+            idle_ttl_s=int(getattr(config, "brain_session_idle_ttl_s", 3600)),
+            pinned=(DEFAULT_SESSION_ID,),
+        )
         self._tools_prompt_cache = tools_for_prompt_compact()
         self._protocols_prompt_cache = json.dumps(list_protocols(), indent=2)
+        self._catalog_checked_ts = time.time()
+        self._prompt_prefix = StaticPromptPrefix(_build_static_prefix)
+        self._catalog_retriever = self._build_catalog_retriever()
+        self._always_on_tools_prompt = tools_for_prompt_compact(self._catalog_retriever.always_on)
         self._base_instructions = (
             "Strict output contract (IMPORTANT):\n"
             "- Respond with EXACTLY ONE JSON object and nothing else.\n"
@@ -298,6 +496,32 @@ class JarvisBrain:
             "- If the user says \"search\" / \"look up\", use `web_search` or `google_search`.\n"
         )
 
+    def _new_session(self, session_id):
+        if session_id == DEFAULT_SESSION_ID and getattr(self, "_default_session", None) is not None:
+            return self._default_session
+        buffer = self._redis_buffer if session_id == DEFAULT_SESSION_ID else self._redis_buffer.for_session(session_id)
+        summary = RollingSummary(
+            self._summarize_turns,
+            submit=self._submit,
+            load=buffer.read_summary if buffer.enabled else None,
+            save=buffer.write_summary if buffer.enabled else None,
+            max_chars=int(getattr(config, "brain_summary_max_chars", 1200)),
+        )
+        return BrainSession(session_id, buffer=buffer, summary=summary, history_index=TokenIndex())
+
+    @property
+    def _session(self):
+        """The session of the turn running on this thread (the default one outside ``respond``)."""
+        return getattr(self._local, "session", None) or self._default_session
+
+    def session(self, session_id=None):
+        return self._sessions.get(session_id or DEFAULT_SESSION_ID)
+
+    def session_stats(self):
+        out = self._sessions.stats()
+        out["sessions"] = [s.info() for s in self._sessions.sessions()]
+        return out
+
     def _settings(self):
         api_key = getattr(config, "llm_api_key", "") or ""
         base_url = getattr(config, "llm_base_url", "") or ""
@@ -319,56 +543,85 @@ class JarvisBrain:
         return self._redis_buffer.health_check(force=force)
 
     def runtime_stats(self):
-        return dict(self._stats)
-
-    def _normalize_query(self, text):
-        return " ".join(_tokenize(text))
-
-    def _semantic_cache_get(self, key):
-        ttl = int(getattr(config, "brain_semantic_cache_ttl_s", 45))
-        row = self._semantic_cache.get(key)
-        if not row:
-            return None
-        if (time.time() - float(row.get("ts", 0))) > max(1, ttl):
-            self._semantic_cache.pop(key, None)
+        out = dict(self._stats)
+        started = out.get("speculative_started", 0)
+        out["speculative_hit_rate"] = (out.get("speculative_hits", 0) / float(started)) if started else 0.0
+        fills = out.get("arg_fill_local", 0) + out.get("arg_fill_llm", 0)
+        out["arg_fill_llm_rate"] = (out.get("arg_fill_llm", 0) / float(fills)) if fills else 0.0
+        out["route_hits"] = {k: v for k, v in TOOL_ROUTER.hit_counts().items() if v}
+        out["singleflight"] = {"tool": self._tool_flight.stats(), "llm": self._llm_flight.stats()}
+        out["llm_routes"] = self._llm.stats()
+        out["http"] = transport.host_stats()
+        out["tool_registry"] = REGISTRY.stats()
+        out["tool_executor"] = EXECUTOR.stats()
+        return out
+
+    def _count(self, name, value=1):
+        self._stats[name] = int(self._stats.get(name, 0)) + int(value)
+        metrics_inc(name, value)
+
+    def _semantic_cache_get(self, user_text, user_lang):
+        reply = self._semantic_cache.get(user_text, self._semantic_cache_scope(user_lang))
+        if reply is None:
             return None
         self._stats["cache_hits"] += 1
-        return row.get("reply")
+        return reply
+
+    def _semantic_cache_set(self, user_text, user_lang, reply, *, tool_name=None):
+        """
+        Remember a reply for similar future queries.
+
+        Plain LLM replies use the semantic TTL; tool replies are only cached for
+        side-effect-free tools listed in ``brain_semantic_cache_intents`` and
+        never outlive that tool's own cache TTL.
+        """
+        intent = str(tool_name or "reply")
+        allowed = {
+            x.strip() for x in str(getattr(config, "brain_semantic_cache_intents", "reply")).split(",") if x.strip()
+        }
+        if intent not in allowed:
+            return False
+        ttl_s = None
+        if tool_name:
+            spec = get_tool_spec(tool_name) or {}
+            if not spec or spec.get("side_effects") or tool_name in CRITICAL_TOOLS:
+                return False
+            ttl_s = self._tool_cache_ttl(tool_name)
+        return self._semantic_cache.set(
+            user_text, self._semantic_cache_scope(user_lang), str(reply or ""), ttl_s=ttl_s, intent=intent
+        )
 
-    def _semantic_cache_set(self, key, reply):
-        self._semantic_cache[key] = {"ts": time.time(), "reply": str(reply or "")}
-        if len(self._semantic_cache) > 200:
-            # bounded cache
-            oldest = sorted(self._semantic_cache.items(), key=lambda x: x[1].get("ts", 0))[:40]
-            for k, _ in oldest:
-                self._semantic_cache.pop(k, None)
+    def _semantic_cache_scope(self, user_lang):
+        # Replies may draw on a session's history, so sessions never answer from each other's cache.
+        session = self._session
+        return user_lang if session is self._default_session else f"{session.id}:{user_lang}"
 
     def _tool_cache_key(self, tool_name, tool_args):
         raw = json.dumps({"tool": tool_name, "args": tool_args or {}}, sort_keys=True, ensure_ascii=False)
         return hashlib.sha1(raw.encode("utf-8")).hexdigest()
 
+    def _tool_cache_ttl(self, tool_name):
+        return self._tool_cache_ttls.get(str(tool_name or ""), self._tool_cache.ttl_s)
+
     def _tool_cache_get(self, tool_name, tool_args):
-        ttl = int(getattr(config, "brain_tool_cache_ttl_s", 60))
-        key = self._tool_cache_key(tool_name, tool_args)
-        row = self._tool_cache.get(key)
-        if not row:
-            return None
-        if (time.time() - float(row.get("ts", 0))) > max(1, ttl):
-            self._tool_cache.pop(key, None)
+        result = self._tool_cache.get(self._tool_cache_key(tool_name, tool_args))
+        if result is None:
             return None
         self._stats["cache_hits"] += 1
-        return row.get("result")
+        return result
 
     def _tool_cache_set(self, tool_name, tool_args, result):
         key = self._tool_cache_key(tool_name, tool_args)
-        self._tool_cache[key] = {"ts": time.time(), "result": result}
-        if len(self._tool_cache) > 200:
-            oldest = sorted(self._tool_cache.items(), key=lambda x: x[1].get("ts", 0))[:40]
-            for k, _ in oldest:
-                self._tool_cache.pop(k, None)
+        self._tool_cache.set(key, result, ttl_s=self._tool_cache_ttl(tool_name))
 
     def _cacheable_tool(self, tool_name):
-        return str(tool_name or "") in {"weather", "news", "ip_address", "get_time", "get_date", "wikipedia"}
+        name = str(tool_name or "")
+        return name in {"weather", "news", "ip_address", "get_time", "get_date", "wikipedia"} and (
+            self._tool_cache_ttl(name) > 0
+        )
+
+    def cache_stats(self):
+        return {"semantic": self._semantic_cache.stats(), "tool": self._tool_cache.stats()}
 
     def _smalltalk_reply(self, text, lang):
         lowered = str(text or "").strip().lower()
@@ -391,39 +644,303 @@ class JarvisBrain:
             return getattr(config, "llm_model", "") or default_model
         return getattr(config, "llm_fast_model", "") or default_model
 
+    def _submit(self, fn, *args, **kwargs):
+        turn_id = get_turn_id()
+        session = self._session
+        parent = tracing.current_span()
+
+        def _run():
+            if turn_id:
+                set_turn_id(turn_id)
+            self._local.session = session
+            with tracing.attach(parent):
+                return fn(*args, **kwargs)
+
+        return self._executor.submit(_run)
+
+    def _refresh_catalog_prompts(self):
+        refresh_s = int(getattr(config, "brain_prompt_catalog_refresh_s", 30))
+        now = time.time()
+        if refresh_s <= 0 or (now - self._catalog_checked_ts) < refresh_s:
+            return
+        self._catalog_checked_ts = now
+        try:
+            protocols = json.dumps(list_protocols(), indent=2)
+        except Exception:
+            return
+        # Keep the old string object when nothing changed so the prefix is not rebuilt.
+        if protocols != self._protocols_prompt_cache:
+            self._protocols_prompt_cache = protocols
+            self._catalog_retriever = self._build_catalog_retriever()
+
+    def _build_catalog_retriever(self):
+        try:
+            protocols = json.loads(self._protocols_prompt_cache)
+        except ValueError:
+            protocols = []
+        always_on = [
+            x.strip() for x in str(getattr(config, "brain_tool_retrieval_always_on", "")).split(",") if x.strip()
+        ]
+        return CatalogRetriever(
+            TOOL_SPECS,
+            protocols if isinstance(protocols, list) else [],
+            always_on=always_on,
+            top_k=int(getattr(config, "brain_tool_retrieval_top_k", 8)),
+            protocol_top_k=int(getattr(config, "brain_protocol_retrieval_top_k", 4)),
+            min_score=float(getattr(config, "brain_tool_retrieval_min_score", 1.5)),
+        )
+
+    def _catalog_for_query(self, user_text):
+        """Tool/protocol catalog text for the per-turn suffix, or "" when the full catalog is in the prefix."""
+        if not config_flag("brain_tool_retrieval", "1"):
+            return ""
+        picked = self._catalog_retriever.select(user_text)
+        always_on = set(self._catalog_retriever.always_on)
+        tools_json = tools_for_prompt_compact([n for n in picked["tools"] if n not in always_on])
+        protocols_json = self._protocols_prompt_cache
+        if not picked["fallback"]:
+            wanted = set(picked["protocols"])
+            try:
+                protocols_json = json.dumps(
+                    [p for p in json.loads(self._protocols_prompt_cache) if p.get("name") in wanted], indent=2
+                )
+            except ValueError:
+                pass
+        text = (
+            "More tools for this request (JSON):\n"
+            + tools_json
+            + "\n\nAvailable protocols JSON:\n"
+            + protocols_json
+        )
+        metrics_inc("tool_retrieval_fallbacks" if picked["fallback"] else "tool_retrieval_hits", 1)
+        metrics_observe_ms("planner_catalog_chars", len(text))
+        replay_event(
+            "planner_catalog",
+            {
+                "tools": picked["tools"],
+                "protocols": picked["protocols"],
+                "fallback": picked["fallback"],
+                "top_score": round(picked["top_score"], 3),
+                "chars": len(text),
+            },
+        )
+        return text
+
+    def _static_prompt_prefix(self, soul):
+        self._refresh_catalog_prompts()
+        rebuilds = self._prompt_prefix.rebuilds
+        if config_flag("brain_tool_retrieval", "1"):
+            tools_json, protocols_json = self._always_on_tools_prompt, ""
+        else:
+            tools_json, protocols_json = self._tools_prompt_cache, self._protocols_prompt_cache
+        text, digest = self._prompt_prefix.get(
+            soul,
+            self._base_instructions,
+            tools_json,
+            protocols_json,
+            _telegram_owner_hint(),
+        )
+        if self._prompt_prefix.rebuilds != rebuilds:
+            metrics_inc("prompt_prefix_rebuilds", 1)
+            replay_event("prompt_prefix", {"digest": digest, "chars": len(text)})
+        return text
+
+    def _prompt_cache_extra(self):
+        if not config_flag("llm_prompt_cache_key", "0") or not self._prompt_prefix.digest:
+            return None
+        return {"prompt_cache_key": f"jivan-{self._prompt_prefix.digest}"}
+
+    def _record_usage(self, usage):
+        prompt_tokens = int(usage.get("prompt_tokens") or usage.get("input_tokens") or 0)
+        cached = cached_prompt_tokens(usage)
+        metrics_inc("llm_prompt_tokens", prompt_tokens)
+        metrics_inc("llm_cached_prompt_tokens", cached)
+        if prompt_tokens:
+            tracing.annotate(prompt_tokens=prompt_tokens, cached_prompt_tokens=cached)
+
+    def _complete(self, *, api_key, base_url, model, messages, timeout_s, on_sentence=None, on_plan=None):
+        # A model behind an open breaker is not streamed from; the plain path fails over to the next route.
+        streamable = config_flag("llm_streaming", "1") and self._llm.available((api_key, base_url, model))
+        if not (on_sentence or on_plan) or not streamable:
+            return self._chat(
+                api_key=api_key,
+                base_url=base_url,
+                model=model,
+                messages=messages,
+                timeout_s=timeout_s,
+                extra=self._prompt_cache_extra(),
+                on_usage=self._record_usage,
+            )
+        started = time.perf_counter()
+        first = {"ms": None}
+
+        def _emit(sentence):
+            if first["ms"] is None:
+                first["ms"] = int((time.perf_counter() - started) * 1000)
+                metrics_observe_ms("llm_first_sentence_ms", first["ms"])
+                tracing.event("llm_first_sentence", ms=first["ms"])
+            if on_sentence:
+                on_sentence(sentence)
+
+        chunker = SentenceChunker(
+            _emit,
+            min_chars=int(getattr(config, "speech_tts_chunk_min_chars", 16)),
+            max_chars=int(getattr(config, "speech_tts_chunk_max_chars", 220)),
+        )
+        stream = ReplyTextStream(chunker)
+        try:
+            for delta in chat_completions_stream(
+                api_key=api_key,
+                base_url=base_url,
+                model=model,
+                messages=messages,
+                timeout_s=timeout_s,
+                extra=self._prompt_cache_extra(),
+                # Asking for the usage chunk adds stream_options, which some providers reject.
+                on_usage=self._record_usage if config_flag("llm_stream_include_usage", "1") else None,
+            ):
+                events = stream.feed(delta)
+                if on_plan and events:
+                    on_plan(stream.parser, events)
+        except LLMError as e:
+            if chunker.emitted:
+                raise
+            # Nothing was spoken yet, so a plain request is still a clean fallback.
+            print(f"LLM stream failed, retrying without streaming: {e}")
+            metrics_inc("llm_stream_fallbacks", 1)
+            return self._chat(
+                api_key=api_key,
+                base_url=base_url,
+                model=model,
+                messages=messages,
+                timeout_s=timeout_s,
+                extra=self._prompt_cache_extra(),
+                on_usage=self._record_usage,
+            )
+        return stream.finish()
+
+    def _chat(self, *, api_key, base_url, model, messages, timeout_s, extra=None, on_usage=None):
+        """``chat_completions`` that joins an identical request (same model and messages) already in flight."""
+        kwargs = dict(
+            api_key=api_key,
+            base_url=base_url,
+            model=model,
+            messages=messages,
+            timeout_s=timeout_s,
+            extra=extra,
+            on_usage=on_usage,
+        )
+        if not config_flag("brain_singleflight", "1"):
+            return self._chat_resilient(**kwargs)
+        raw = json.dumps([base_url, model, messages, extra], sort_keys=True, ensure_ascii=False, default=str)
+        key = hashlib.sha1(raw.encode("utf-8")).hexdigest()
+        content, _shared = self._llm_flight.do(key, self._chat_resilient, **kwargs)
+        return content
+
+    def _llm_routes(self, api_key, base_url, model):
+        """Primary model first, then the fast model and the optional fallback endpoint to hedge or fail over to."""
+        routes = [(api_key, base_url, model)]
+        fast_model = getattr(config, "llm_fast_model", "") or ""
+        if fast_model:
+            routes.append((api_key, base_url, fast_model))
+        fallback_url = getattr(config, "llm_fallback_base_url", "") or ""
+        if fallback_url:
+            routes.append(
+                (
+                    getattr(config, "llm_fallback_api_key", "") or api_key,
+                    fallback_url,
+                    getattr(config, "llm_fallback_model", "") or model,
+                )
+            )
+        return routes
+
+    def _chat_resilient(self, *, api_key, base_url, model, messages, timeout_s, extra=None, on_usage=None):
+        if not config_flag("llm_hedging", "1"):
+            return chat_completions(
+                api_key=api_key,
+                base_url=base_url,
+                model=model,
+                messages=messages,
+                timeout_s=timeout_s,
+                extra=extra,
+                on_usage=on_usage,
+            )
+        # Every caller expects a JSON object; an answer without one only wins when nothing better arrives.
+        return self._llm.complete(
+            self._llm_routes(api_key, base_url, model),
+            messages,
+            timeout_s=timeout_s,
+            extra=extra,
+            on_usage=on_usage,
+            validate=lambda content: _extract_json_object(content) is not None,
+        )
+
     def _apply_prompt_budget(self, messages):
-        budget = int(getattr(config, "llm_prompt_char_budget", 12000))
+        budget = int(getattr(config, "llm_history_token_budget", 2500))
         if budget <= 0:
             return messages
-        total = 0
-        out = []
-        for row in reversed(messages):
-            txt = str(row.get("content", ""))
-            piece = len(txt)
-            if total + piece > budget and out:
-                continue
-            out.append(row)
-            total += piece
-            if total >= budget:
-                break
-        return list(reversed(out))
+        # The system prompt (SOUL, catalog, memory) is sent whole; only history competes for the budget.
+        system_tokens = sum(message_tokens(m, self._count_tokens) for m in messages if m.get("role") == "system")
+        budget = history_budget(
+            system_tokens,
+            budget,
+            context_tokens=int(getattr(config, "llm_context_tokens", 0)),
+            reply_tokens=int(getattr(config, "llm_reply_reserve_tokens", 1024)),
+        )
+        kept, dropped = fit_messages(messages, system_tokens + budget, self._count_tokens)
+        tokens = sum(self._count_tokens(str(m.get("content", ""))) for m in kept)
+        metrics_observe_ms("llm_prompt_estimated_tokens", tokens)
+        if dropped:
+            metrics_inc("prompt_rows_dropped", len(dropped))
+            self._compact_history(dropped)
+        return kept
+
+    def _compact_history(self, rows):
+        if config_flag("brain_summary_enabled", "1"):
+            self._session.summary.compact([r for r in rows if r.get("role") in ("user", "assistant")])
+
+    def _summarize_turns(self, previous, rows):
+        """Fold ``rows`` into the running conversation summary (runs on the brain worker pool)."""
+        api_key, base_url, model = self._settings()
+        if not (api_key and base_url and model):
+            return ""
+        if config_flag("brain_no_llm_mode", "0") or config_flag("runtime_offline_mode", "0"):
+            return ""
+        max_chars = int(getattr(config, "brain_summary_max_chars", 1200))
+        instructions = (
+            "You maintain a running summary of a conversation between a user and the JIVAN assistant. "
+            "Merge the new turns into the previous summary. Keep names, preferences, decisions, facts "
+            "the user shared and open tasks; drop greetings and small talk. "
+            f"Write plain text, at most {max_chars} characters. Return only the summary."
+        )
+        metrics_inc("summary_llm_calls", 1)
+        return chat_completions(
+            api_key=api_key,
+            base_url=base_url,
+            model=getattr(config, "llm_fast_model", "") or model,
+            messages=[
+                {"role": "system", "content": instructions},
+                {
+                    "role": "user",
+                    "content": json.dumps({"previous_summary": previous, "new_turns": rows}, ensure_ascii=False),
+                },
+            ],
+            timeout_s=int(getattr(config, "llm_tool_fill_timeout_s", 10)),
+        )
 
-    def _deterministic_fill_tool_args(self, *, tool_name, user_text, tool_args):
-        args = dict(tool_args or {})
+    def _deterministic_fill_tool_args(self, *, tool_name, user_text, tool_args, turn=None, lang="en"):
         name = str(tool_name or "")
         text = str(user_text or "")
-        if name == "weather" and not args.get("city"):
-            city = _extract_weather_city(text)
-            if city:
-                args["city"] = city
-        if name == "wikipedia" and not args.get("topic"):
-            topic = _extract_topic_from_text(text)
-            if topic:
-                args["topic"] = topic
-        if name == "wolframalpha" and not args.get("query"):
-            args["query"] = text
+        _missing, arg_errors = check_tool_args(name, tool_args)
+        # Rejected values (a folder that does not exist, an unknown action) count as empty so the
+        # extractors can replace them; any an extractor cannot fill stay, so the tool reports why.
+        seeded = {k: v for k, v in (tool_args or {}).items() if k not in arg_errors}
+        args, _filled, _missing = fill_slots(name, seeded, text, lang=lang)
+        for k in arg_errors:
+            args.setdefault(k, tool_args[k])
         if name == "mcp_execute" and not args.get("tool_name"):
-            plan = _required_tool_plan(text, recent_messages=self._merged_history())
+            recent = turn.history() if turn is not None else self._merged_history()
+            plan = _required_tool_plan(text, recent_messages=recent)
             if plan and plan[0] == "mcp_execute":
                 p_args = plan[1] if isinstance(plan[1], dict) else {}
                 if p_args.get("tool_name"):
@@ -432,90 +949,173 @@ class JarvisBrain:
                         args["tool_input"] = p_args.get("tool_input")
         return args
 
-    def _run_chain_if_possible(self, user_text, source_context, user_lang, api_key, base_url, model, timeout_main):
-        text = str(user_text or "")
-        if " and then " not in text.lower():
-            return None
-        parts = [p.strip() for p in re.split(r"\band then\b", text, flags=re.IGNORECASE) if p.strip()]
-        if len(parts) < 2 or len(parts) > 4:
+    def _run_chain_if_possible(
+        self, user_text, source_context, user_lang, api_key, base_url, model, timeout_main, turn=None, messages=None
+    ):
+        parts = split_chain(user_text)
+        if not parts:
             return None
-        plans = []
+        recent = turn.history() if turn is not None else self._merged_history()
+        steps = []
         for part in parts:
-            p = _required_tool_plan(part, recent_messages=self._merged_history())
+            p = _required_tool_plan(part, recent_messages=recent)
             if not p:
                 return None
-            plans.append((part, p))
-        replies = []
-        for part, plan in plans:
-            tname, targs = plan
-            rep = self._run_tool_and_format_reply(
+            steps.append(p)
+
+        def _is_pure(tool_name):
+            spec = get_tool_spec(tool_name) or {}
+            return bool(spec) and not spec.get("side_effects") and tool_name not in CRITICAL_TOOLS
+
+        def _execute(i, tool_name, tool_args):
+            return self._execute_tool(
+                tool_name=tool_name,
+                tool_args=tool_args,
+                user_text=parts[i],
+                source_context=source_context,
+            )
+
+        waves = plan_chain_waves(steps, _is_pure)
+        with tracing.span("chain", steps=len(steps), waves=len(waves)):
+            results = run_chain_waves(steps, waves, _execute, self._submit)
+
+        direct = []
+        for part, (tool_name, tool_args), result in zip(parts, steps, results):
+            if result is None:
+                result = {"ok": False, "tool_name": tool_name, "error_code": "execution_failed"}
+            reply, _stage = self._direct_tool_reply(
+                tool_name=tool_name, tool_args=tool_args, tool_result=result, user_text=part, user_lang=user_lang
+            )
+            direct.append(reply)
+
+        if all(direct):
+            reply = " ".join(direct)
+        else:
+            reply = self._format_chain_reply(
                 api_key=api_key,
                 base_url=base_url,
                 model=model,
-                system="",
-                messages=self._apply_prompt_budget([{"role": "system", "content": _language_instruction(user_lang)}]),
-                user_text=part,
+                messages=messages,
+                user_text=user_text,
                 user_lang=user_lang,
-                source_context=source_context,
-                tool_name=tname,
-                tool_args=targs,
+                parts=parts,
+                steps=steps,
+                results=results,
                 timeout_main=timeout_main,
             )
-            if rep:
-                replies.append(str(rep))
-        if not replies:
+        if not reply:
             return None
-        return " ".join(replies[:3])
+        self._record_turn("assistant", reply, turn=turn)
+        # One user turn, learned once; a protocol run is the only tool result memory extracts from.
+        protocol_result = next(
+            (r for (t, _a), r in zip(steps, results) if t == "run_protocol" and isinstance(r, dict)), None
+        )
+        self._memory.learn_turn(user_text=user_text, assistant_reply=reply, tool_result=protocol_result)
+        replay_event("chain_reply", {"tools": [t for t, _a in steps], "waves": waves, "reply": reply})
+        return reply
+
+    def _format_chain_reply(
+        self, *, api_key, base_url, model, messages, user_text, user_lang, parts, steps, results, timeout_main
+    ):
+        """
+        One follow-up call phrases every chain step instead of one call per step.
+
+        Like the single-tool follow-up it is sent after the turn's ``messages``
+        (SOUL/system prompt and history), so the reply keeps the same voice.
+        """
+        payload = [
+            {"request": part, "tool_name": tool_name, "tool_args": tool_args, "tool_result": result}
+            for part, (tool_name, tool_args), result in zip(parts, steps, results)
+        ]
+        followup = (
+            "You just called several tools for one chained request. Write ONE final user-facing response "
+            "in JIVAN voice and SOUL.md style that covers every step in order.\n"
+            "Rules:\n"
+            "- Do not dump raw JSON unless the user asked for it.\n"
+            "- If a tool_result.ok is false, say what failed for that step.\n"
+            "- Be concise.\n"
+            + _language_instruction(user_lang)
+            + "\n"
+            "DATA:\n"
+            + json.dumps({"user_text": user_text, "steps": payload}, ensure_ascii=False)
+            + "\nReturn ONLY JSON: "
+            + '{"action":"reply","reply":"..."}'
+        )
+        metrics_inc("tool_llm_format_calls", 1)
+        try:
+            self._stats["llm_calls"] += 1
+            content = self._chat(
+                api_key=api_key,
+                base_url=base_url,
+                model=model,
+                messages=list(messages or [{"role": "system", "content": _language_instruction(user_lang)}])
+                + [{"role": "user", "content": followup}],
+                timeout_s=timeout_main,
+            )
+        except LLMError as e:
+            print(f"LLM chain follow-up failed: {e}")
+            return ""
+        obj = _extract_json_object(content)
+        if obj and obj.get("action") == "reply":
+            return str(obj.get("reply", "") or "")
+        return _as_fallback_reply(content)
 
     def _trim_history(self):
-        self._history = self._history[-12:]
+        session = self._session
+        history = session.history
+        if len(history) > 12:
+            # Turns leaving the window are kept in the rolling summary.
+            self._compact_history(history[:-12])
+            del history[:-12]
+        index = session.history_index
+        if index is None:
+            return
+        kept = {id(row) for row in history}
+        for key in list(index.keys()):
+            row = index.row(key)
+            # Mirror normalize_history: rows out of the window go, and so do leading assistant rows.
+            if id(row) in kept and row.get("role") != "assistant":
+                break
+            index.discard(key)
 
     def _merged_history(self):
-        if not self._redis_buffer.enabled:
-            rows = list(self._history)
+        metrics_inc("history_reads", 1)
+        session = self._session
+        if not session.buffer.enabled:
+            rows = list(session.history)
         else:
-            rows = self._redis_buffer.read(max_items=12)
+            rows = session.buffer.read(max_items=12)
             if rows:
                 rows = rows[-12:]
             else:
-                rows = list(self._history)
-        # Some providers reject history if the first non-system message is assistant.
-        # Normalize to begin with a user turn and keep only valid chat roles.
-        normalized = []
-        for row in rows:
-            if not isinstance(row, dict):
-                continue
-            role = str(row.get("role", "")).strip().lower()
-            content = str(row.get("content", ""))
-            if role not in ("user", "assistant", "system"):
-                continue
-            if not content.strip():
-                continue
-            normalized.append({"role": role, "content": content})
-        while normalized and normalized[0].get("role") == "assistant":
-            normalized.pop(0)
-        return normalized[-12:]
-
-    def _history_for_query(self, user_text):
-        rows = self._merged_history()
-        q = set(_tokenize(user_text))
-        if not q:
+                rows = list(session.history)
+        return normalize_history(rows, 12)
+
+    def _history_for_query(self, user_text, turn=None):
+        rows = turn.history() if turn is not None else self._merged_history()
+        if not token_set(user_text):
             return rows[-8:]
-        scored = []
+        index = self._session.history_index
+        if index is not None and index.rows() == rows:
+            return [dict(row) for row in index.top(user_text, 8)]
+        # The store holds rows this process never recorded (another process, a restart): index them for this turn.
+        metrics_inc("history_index_misses", 1)
+        index = TokenIndex()
         for row in rows:
-            c = str(row.get("content", ""))
-            score = len(q.intersection(set(_tokenize(c))))
-            scored.append((score, row))
-        scored.sort(key=lambda x: x[0], reverse=True)
-        picked = [r for _s, r in scored[:8]]
-        # Preserve conversation order after relevance filtering.
-        ordered = [r for r in rows if r in picked]
-        return ordered[-8:]
-
-    def _record_turn(self, role, content):
-        self._history.append({"role": role, "content": content})
+            index.add(row, row.get("content", ""))
+        return index.top(user_text, 8)
+
+    def _record_turn(self, role, content, turn=None):
+        session = self._session
+        row = {"role": role, "content": content}
+        session.history.append(row)
+        index = session.history_index
+        if index is not None and str(content or "").strip() and (len(index) or role != "assistant"):
+            index.add(row, str(content))
         self._trim_history()
-        self._redis_buffer.append(role=role, content=content)
+        session.buffer.append(role=role, content=content)
+        if turn is not None:
+            turn.record(role, content)
 
     def _load_soul(self):
         try:
@@ -539,7 +1139,64 @@ class JarvisBrain:
         self._soul_mtime = mtime
         return soul, None
 
-    def respond(self, user_text, command_context=None):
+    def _assemble_context(self, user_text, turn):
+        def _deadline(name, default_ms):
+            return int(getattr(config, f"brain_context_{name}_deadline_ms", default_ms))
+
+        cached_soul = self._soul_text
+        assembly = ContextAssembly(self._submit)
+        # Without a cached SOUL.md there is nothing to fall back to, so wait for the read.
+        assembly.add(
+            "soul",
+            tracing.wrap("soul", self._load_soul),
+            deadline_ms=_deadline("soul", 200) if cached_soul else None,
+            default=(cached_soul, None),
+        )
+        assembly.add(
+            "history",
+            tracing.wrap("history", lambda: self._history_for_query(user_text, turn)),
+            deadline_ms=_deadline("history", 300),
+            default=list(self._session.history)[-8:],
+        )
+        assembly.add(
+            "memory",
+            tracing.wrap("memory", lambda: self._memory.context_block(user_text)),
+            deadline_ms=_deadline("memory", 400),
+            default="",
+        )
+        assembly.add(
+            "persona",
+            tracing.wrap("persona", lambda: persona_block(user_text)),
+            deadline_ms=_deadline("persona", 150),
+            default="",
+        )
+        assembly.add(
+            "plan",
+            tracing.wrap("routing", lambda: _turn_tool_plan(user_text, recent_messages=turn.history())),
+            deadline_ms=_deadline("plan", 400),
+            default=None,
+        )
+        return assembly
+
+    def _report_context_timings(self, assembly):
+        timings = assembly.timings()
+        for name, row in timings.items():
+            if row.get("ms") is not None:
+                metrics_observe_ms(f"context_{name}_ms", row["ms"])
+            if row.get("status") in ("timeout", "error"):
+                metrics_inc(f"context_{name}_{row['status']}", 1)
+        replay_event("context_assembly", {"sources": timings})
+        # Sources past their deadline are still running; their spans land later, so flag them on the turn.
+        tracing.annotate(**{f"context_{name}": row["status"] for name, row in timings.items() if row["status"] != "ok"})
+
+    def respond(self, user_text, command_context=None, on_sentence=None, session_id=None):
+        """
+        Answer one user turn in conversation ``session_id`` (the default session when omitted).
+
+        Turns of one session run one at a time; different sessions run concurrently.
+        The reply is a ``Reply``: its ``unspoken`` part still has to be voiced when
+        ``on_sentence`` was given.
+        """
         api_key, base_url, model = self._settings()
         if not (api_key and base_url and model):
             return None
@@ -547,12 +1204,32 @@ class JarvisBrain:
         allowed, reason = validate_source_access(source_context)
         if not allowed:
             return f"Command rejected by access policy: {reason}."
-        low_latency_mode = str(getattr(config, "speech_low_latency_mode", "1")).lower() in (
-            "1",
-            "true",
-            "yes",
-            "on",
-        )
+        session = self._sessions.get(session_id) if session_id else self._default_session
+        previous = getattr(self._local, "session", None)
+        with session.lock:
+            self._local.session = session
+            try:
+                session.source_context = dict(source_context)
+                if session.lang and not source_context.get("language"):
+                    source_context = dict(source_context, language=session.lang)
+                session.turns += 1
+                spoken = []
+
+                def _on_sentence(sentence):
+                    spoken.append(str(sentence))
+                    on_sentence(sentence)
+
+                with tracing.span("respond", session=session.id):
+                    reply = self._respond_turn(
+                        user_text, source_context, _on_sentence if on_sentence else None, api_key, base_url, model
+                    )
+                return _streamed_reply(reply, spoken)
+            finally:
+                session.touch()
+                self._local.session = previous
+
+    def _respond_turn(self, user_text, source_context, on_sentence, api_key, base_url, model):
+        low_latency_mode = config_flag("speech_low_latency_mode", "1")
         if low_latency_mode:
             model = getattr(config, "llm_fast_model", "") or model
         timeout_main = int(getattr(config, "llm_timeout_s", 18))
@@ -561,53 +1238,44 @@ class JarvisBrain:
         if low_latency_mode:
             timeout_main = min(timeout_main, timeout_fast)
         user_lang = _detect_user_language(user_text, source_context)
-        no_llm_mode = str(getattr(config, "brain_no_llm_mode", "0")).lower() in ("1", "true", "yes", "on")
-        offline_mode = str(getattr(config, "runtime_offline_mode", "0")).lower() in ("1", "true", "yes", "on")
+        no_llm_mode = config_flag("brain_no_llm_mode", "0")
+        offline_mode = config_flag("runtime_offline_mode", "0")
 
         smalltalk = self._smalltalk_reply(user_text, user_lang)
         if smalltalk:
             self._record_turn("assistant", smalltalk)
             return smalltalk
 
-        soul, soul_error = self._load_soul()
-        if soul_error:
-            return soul_error
-
-        normalized_query = self._normalize_query(user_text)
-        cached_reply = self._semantic_cache_get(f"{user_lang}:{normalized_query}")
+        # Checked before any context source starts, so a hit never leaves memory/plan work running.
+        cached_reply = self._semantic_cache_get(user_text, user_lang)
         if cached_reply:
             return cached_reply
 
-        history = self._history_for_query(user_text)
-        system = (
-            "You are JIVAN (Just Intelligent Versatile, Autonomous Nexus), a desktop voice assistant.\n"
-            "\n"
-            "Personality & operating principles:\n"
-            + "BEGIN SOUL.md\n"
-            + soul
-            + "\nEND SOUL.md\n"
-            + "\n\n"
-            + self._base_instructions
-            + "\nAvailable tools JSON:\n"
-            + self._tools_prompt_cache
-            + "\n\nAvailable protocols JSON:\n"
-            + self._protocols_prompt_cache
-            + "\n\n"
-            + _language_instruction(user_lang)
-            + "\n\n"
-            + _telegram_owner_hint()
-            + "\n\n"
-            + persona_block(user_text)
+        # History is read from Redis once per turn; later readers share this snapshot.
+        turn = TurnContext(self._merged_history)
+        assembly = self._assemble_context(user_text, turn)
+
+        context = assembly.collect()
+        self._report_context_timings(assembly)
+        soul, soul_error = context["soul"]
+        if soul_error:
+            return soul_error
+
+        history = context["history"]
+        system = join_system_prompt(
+            self._static_prompt_prefix(soul),
+            self._catalog_for_query(user_text),
+            _language_instruction(user_lang),
+            context["persona"],
+            context["memory"],
+            self._session.summary.block(),
         )
-        mem_block = self._memory.context_block(user_text)
-        if mem_block:
-            system = system + "\n\n" + mem_block
 
-        self._record_turn("user", user_text)
+        self._record_turn("user", user_text, turn=turn)
         messages = [{"role": "system", "content": system}] + history
         messages = self._apply_prompt_budget(messages)
 
-        forced_plan = _required_tool_plan(user_text, recent_messages=history)
+        forced_plan = context["plan"]
         if forced_plan:
             if offline_mode and forced_plan[0] == "mcp_execute":
                 return _localized_text(
@@ -629,6 +1297,7 @@ class JarvisBrain:
                 tool_name=forced_tool_name,
                 tool_args=forced_tool_args,
                 timeout_main=timeout_main,
+                on_sentence=on_sentence,
             )
 
         chain_reply = self._run_chain_if_possible(
@@ -639,6 +1308,8 @@ class JarvisBrain:
             base_url=base_url,
             model=model,
             timeout_main=timeout_main,
+            turn=turn,
+            messages=messages,
         )
         if chain_reply:
             return chain_reply
@@ -651,36 +1322,58 @@ class JarvisBrain:
                 de="Für diese Anfrage wurde kein direkter Tool-Pfad gefunden.",
             )
 
+        # A deterministic tool route overrides an LLM "reply", so only stream the
+        # planner answer to TTS when no such override can happen.
+        reply_override_plan = _turn_tool_plan(user_text, recent_messages=turn.history())
+        speculation = None
+        if config_flag("brain_speculative_tools", "1") and not reply_override_plan:
+            speculation = _SpeculativeTool(self, user_text=user_text, source_context=source_context)
+        dispatch = _EarlyToolDispatch(
+            self,
+            user_text=user_text,
+            source_context=source_context,
+            covered=speculation.covers if speculation else None,
+            turn=turn,
+        )
         try:
             model = self._route_model(user_text, model)
-            llm_started = time.perf_counter()
             self._stats["llm_calls"] += 1
-            content = chat_completions(
-                api_key=api_key,
-                base_url=base_url,
-                model=model,
-                messages=messages,
-                timeout_s=timeout_main,
-            )
-            if _latency_trace_enabled():
-                print(f"[latency] llm_plan={int((time.perf_counter()-llm_started)*1000)}ms")
+            with tracing.span("llm_plan", model=model) as plan_span:
+                content = self._complete(
+                    api_key=api_key,
+                    base_url=base_url,
+                    model=model,
+                    messages=messages,
+                    timeout_s=timeout_main,
+                    on_sentence=None if reply_override_plan else on_sentence,
+                    on_plan=dispatch.on_events if config_flag("brain_early_tool_dispatch", "1") else None,
+                )
+            metrics_observe_ms("llm_plan_ms", plan_span.duration_ms)
         except LLMError as e:
             print(f"LLM request failed: {e}")
+            dispatch.discard()
+            if speculation:
+                speculation.discard()
             return "AI brain is unavailable right now."
 
         obj = _extract_json_object(content)
+        if not obj or obj.get("action") != "tool":
+            dispatch.discard()
+            if speculation:
+                speculation.discard()
         if not obj:
             # Fallback: allow normal conversational replies even if the model
             # didn't respect the JSON-only contract. Do not attempt tool calls.
             fallback = _as_fallback_reply(content) or "Sorry, I couldn't process that."
             self._record_turn("assistant", fallback)
             self._memory.learn_turn(user_text=user_text, assistant_reply=fallback, tool_result=None)
-            self._semantic_cache_set(f"{user_lang}:{normalized_query}", fallback)
+            self._semantic_cache_set(user_text, user_lang, fallback)
             return fallback
 
         action = obj.get("action")
+        replay_event("planner_plan", {"action": action, "tool": obj.get("tool_name") if action == "tool" else None})
         if action == "reply":
-            plan = _required_tool_plan(user_text, recent_messages=self._merged_history())
+            plan = reply_override_plan
             if plan:
                 forced_tool_name, forced_tool_args = plan
                 return self._run_tool_and_format_reply(
@@ -695,11 +1388,12 @@ class JarvisBrain:
                     tool_name=forced_tool_name,
                     tool_args=forced_tool_args,
                     timeout_main=timeout_main,
+                    on_sentence=on_sentence,
                 )
             reply = obj.get("reply", "")
             self._record_turn("assistant", reply)
             self._memory.learn_turn(user_text=user_text, assistant_reply=reply, tool_result=None)
-            self._semantic_cache_set(f"{user_lang}:{normalized_query}", reply)
+            self._semantic_cache_set(user_text, user_lang, reply)
             return reply
 
         if action == "tool":
@@ -707,24 +1401,22 @@ class JarvisBrain:
             tool_args = obj.get("tool_args", {}) or {}
             if not isinstance(tool_args, dict):
                 tool_args = {}
+            spec = get_tool_spec(tool_name)
+            planner_missing = _missing_tool_args(spec, tool_args)
             tool_args = self._deterministic_fill_tool_args(
                 tool_name=tool_name,
                 user_text=user_text,
                 tool_args=tool_args,
+                turn=turn,
+                lang=user_lang,
             )
 
-            spec = get_tool_spec(tool_name)
             if spec:
-                expected_args = spec.get("args") or {}
-                required_args = spec.get("required")
-                if isinstance(required_args, list):
-                    arg_keys = required_args
-                else:
-                    arg_keys = list(expected_args.keys())
-                missing = []
-                for k in arg_keys:
-                    if k not in tool_args or tool_args.get(k) in ("", None):
-                        missing.append(k)
+                missing, arg_errors = check_tool_args(tool_name, tool_args)
+                if planner_missing and not missing:
+                    self._count("arg_fill_local")
+                    if self._arg_fill_llm_ms is not None:
+                        metrics_observe_ms("tool_arg_fill_saved_ms", self._arg_fill_llm_ms)
                 if missing:
                     # Ask the LLM to fill tool_args (without changing tool_name).
                     fill_system = (
@@ -732,8 +1424,10 @@ class JarvisBrain:
                         "Do not include any extra keys. "
                         "If an arg is unknown, set it to an empty string."
                     )
+                    self._count("arg_fill_llm")
+                    fill_started = time.perf_counter()
                     try:
-                        filled = chat_completions(
+                        filled = self._chat(
                             api_key=api_key,
                             base_url=base_url,
                             model=model,
@@ -747,6 +1441,8 @@ class JarvisBrain:
                                             "tool_name": tool_name,
                                             "tool_spec": spec,
                                             "current_tool_args": tool_args,
+                                            "missing_args": missing,
+                                            "arg_errors": {k: v for k, v in arg_errors.items() if k in missing},
                                         }
                                     ),
                                 },
@@ -755,10 +1451,15 @@ class JarvisBrain:
                         )
                         filled_obj = _extract_json_object(filled) or {}
                         if isinstance(filled_obj, dict):
-                            tool_args = {**tool_args, **filled_obj}
+                            # Locally resolved slots win over the model's guesses.
+                            tool_args = {**filled_obj, **{k: v for k, v in tool_args.items() if v not in ("", None)}}
                     except LLMError as e:
                         print(f"LLM tool-arg fill failed: {e}")
                         pass
+                    fill_ms = (time.perf_counter() - fill_started) * 1000.0
+                    metrics_observe_ms("tool_arg_fill_llm_ms", fill_ms)
+                    prev = self._arg_fill_llm_ms
+                    self._arg_fill_llm_ms = fill_ms if prev is None else 0.8 * prev + 0.2 * fill_ms
 
             return self._run_tool_and_format_reply(
                 api_key=api_key,
@@ -772,10 +1473,93 @@ class JarvisBrain:
                 tool_name=tool_name,
                 tool_args=tool_args,
                 timeout_main=timeout_main,
+                on_sentence=on_sentence,
+                prefetched_result=(speculation.take(tool_name, tool_args) if speculation else None)
+                or dispatch.take(tool_name, tool_args),
             )
 
         return "AI brain returned an unsupported action."
 
+    def _direct_tool_reply(self, *, tool_name, tool_args, tool_result, user_text, user_lang):
+        """
+        Reply to a tool result without the follow-up LLM call when possible.
+
+        Returns ``(reply, replay_stage)``; ``("", None)`` means the LLM should phrase it.
+        """
+        if isinstance(tool_result, dict) and tool_result.get("pending"):
+            reply = _localized_text(
+                user_lang,
+                en="That is taking a while; it is still running in the background.",
+                ru="Это занимает больше времени; задача продолжает выполняться в фоне.",
+                de="Das dauert etwas länger; es läuft im Hintergrund weiter.",
+            )
+            return reply, "tool_pending"
+        fast_reply = _fast_tool_reply(tool_name=tool_name, tool_result=tool_result, user_lang=user_lang)
+        if fast_reply:
+            return fast_reply, "tool_fast_reply"
+        if isinstance(tool_result, dict) and not tool_result.get("ok"):
+            error_code = tool_result.get("error_code", "execution_failed")
+            details = tool_result.get("details", "")
+            return humanize(error_code, details), "tool_error"
+        template_reply = format_tool_reply(
+            tool_name=tool_name, tool_result=tool_result, tool_args=tool_args, lang=user_lang
+        )
+        if _template_reply_allowed(user_text, template_reply):
+            metrics_inc("tool_template_replies", 1)
+            return template_reply, "tool_template_reply"
+        return "", None
+
+    def _execute_tool(self, *, tool_name, tool_args, user_text, source_context):
+        if self._cacheable_tool(tool_name):
+            cached = self._tool_cache_get(tool_name, tool_args)
+            if isinstance(cached, dict):
+                return cached
+
+        if config_flag("brain_singleflight", "1") and self._coalescable_tool(tool_name):
+            tool_result, _shared = self._tool_flight.do(
+                self._tool_cache_key(tool_name, tool_args),
+                self._run_tool_uncached,
+                tool_name=tool_name,
+                tool_args=tool_args,
+                user_text=user_text,
+                source_context=source_context,
+            )
+            return tool_result
+        return self._run_tool_uncached(
+            tool_name=tool_name, tool_args=tool_args, user_text=user_text, source_context=source_context
+        )
+
+    def _coalescable_tool(self, tool_name):
+        # Only calls without side effects may be shared; two "send message" requests must both run.
+        spec = get_tool_spec(tool_name) or {}
+        return bool(spec) and not spec.get("side_effects") and tool_name not in CRITICAL_TOOLS
+
+    def _run_tool_uncached(self, *, tool_name, tool_args, user_text, source_context):
+        tool_result = {"ok": False}
+        last_exc = None
+        for _attempt in range(2):
+            try:
+                self._stats["tool_calls"] += 1
+                with tracing.span("tool", tool=tool_name) as tool_span:
+                    tool_result = run_tool(
+                        tool_name=tool_name,
+                        tool_args=tool_args,
+                        user_text=user_text,
+                        source_context=source_context,
+                        assistant=self._assistant,
+                        wolfram_fn=self._wolfram_fn,
+                    )
+                metrics_observe_ms("tool_exec_ms", tool_span.duration_ms)
+                break
+            except Exception as e:
+                last_exc = e
+                time.sleep(0.1)
+        if not isinstance(tool_result, dict) or (not tool_result.get("ok") and last_exc is not None):
+            return None
+        if self._cacheable_tool(tool_name) and tool_result.get("ok"):
+            self._tool_cache_set(tool_name, tool_args, tool_result)
+        return tool_result
+
     def _run_tool_and_format_reply(
         self,
         *,
@@ -790,61 +1574,38 @@ class JarvisBrain:
         tool_name,
         tool_args,
         timeout_main,
+        on_sentence=None,
+        prefetched_result=None,
     ):
-        if self._cacheable_tool(tool_name):
-            cached = self._tool_cache_get(tool_name, tool_args)
-            if isinstance(cached, dict):
-                tool_result = cached
-            else:
-                tool_result = None
-        else:
-            tool_result = None
-
+        tool_result = prefetched_result if isinstance(prefetched_result, dict) else None
         if tool_result is None:
-            tool_result = {"ok": False}
-            last_exc = None
-            for _attempt in range(2):
-                try:
-                    tool_started = time.perf_counter()
-                    self._stats["tool_calls"] += 1
-                    tool_result = run_tool(
-                        tool_name=tool_name,
-                        tool_args=tool_args,
-                        user_text=user_text,
-                        source_context=source_context,
-                        assistant=self._assistant,
-                        wolfram_fn=self._wolfram_fn,
-                    )
-                    if _latency_trace_enabled():
-                        print(f"[latency] tool_exec={int((time.perf_counter()-tool_started)*1000)}ms tool={tool_name}")
-                    break
-                except Exception as e:
-                    last_exc = e
-                    time.sleep(0.1)
-            if not isinstance(tool_result, dict) or (not tool_result.get("ok") and last_exc is not None):
-                return "Sorry, I couldn't run that tool."
-            if self._cacheable_tool(tool_name) and isinstance(tool_result, dict) and tool_result.get("ok"):
-                self._tool_cache_set(tool_name, tool_args, tool_result)
+            tool_result = self._execute_tool(
+                tool_name=tool_name,
+                tool_args=tool_args,
+                user_text=user_text,
+                source_context=source_context,
+            )
+        if tool_result is None:
+            return "Sorry, I couldn't run that tool."
 
         followup_payload = {
             "tool_name": tool_name,
             "tool_args": tool_args,
             "tool_result": tool_result,
         }
-        fast_reply = _fast_tool_reply(tool_name=tool_name, tool_result=tool_result, user_lang=user_lang)
-        if fast_reply:
-            self._record_turn("assistant", fast_reply)
-            self._memory.learn_turn(user_text=user_text, assistant_reply=fast_reply, tool_result=tool_result)
-            replay_event("tool_fast_reply", {"tool": tool_name, "reply": fast_reply})
-            return fast_reply
-        if isinstance(tool_result, dict) and not tool_result.get("ok"):
-            error_code = tool_result.get("error_code", "execution_failed")
-            details = tool_result.get("details", "")
-            msg = humanize(error_code, details)
-            self._record_turn("assistant", msg)
-            self._memory.learn_turn(user_text=user_text, assistant_reply=msg, tool_result=tool_result)
-            replay_event("tool_error", {"tool": tool_name, "error_code": error_code})
-            return msg
+        direct_reply, stage = self._direct_tool_reply(
+            tool_name=tool_name, tool_args=tool_args, tool_result=tool_result, user_text=user_text, user_lang=user_lang
+        )
+        if direct_reply:
+            self._record_turn("assistant", direct_reply)
+            self._memory.learn_turn(user_text=user_text, assistant_reply=direct_reply, tool_result=tool_result)
+            if stage == "tool_error":
+                replay_event(stage, {"tool": tool_name, "error_code": tool_result.get("error_code", "execution_failed")})
+            else:
+                replay_event(stage, {"tool": tool_name, "reply": direct_reply})
+                self._semantic_cache_set(user_text, user_lang, direct_reply, tool_name=tool_name)
+            return direct_reply
+        metrics_inc("tool_llm_format_calls", 1)
         followup = (
             "You just called a tool. Write the final user-facing response in JIVAN voice and SOUL.md style.\n"
             "Rules:\n"
@@ -863,16 +1624,16 @@ class JarvisBrain:
         )
 
         try:
-            llm2_started = time.perf_counter()
-            content2 = chat_completions(
-                api_key=api_key,
-                base_url=base_url,
-                model=model,
-                messages=messages + [{"role": "user", "content": followup}],
-                timeout_s=timeout_main,
-            )
-            if _latency_trace_enabled():
-                print(f"[latency] llm_format={int((time.perf_counter()-llm2_started)*1000)}ms")
+            with tracing.span("llm_format", model=model) as format_span:
+                content2 = self._complete(
+                    api_key=api_key,
+                    base_url=base_url,
+                    model=model,
+                    messages=messages + [{"role": "user", "content": followup}],
+                    timeout_s=timeout_main,
+                    on_sentence=on_sentence,
+                )
+            metrics_observe_ms("llm_format_ms", format_span.duration_ms)
         except LLMError as e:
             print(f"LLM follow-up failed: {e}")
             return str(tool_result)
@@ -882,6 +1643,7 @@ class JarvisBrain:
             reply2 = obj2.get("reply", "")
             self._record_turn("assistant", reply2)
             self._memory.learn_turn(user_text=user_text, assistant_reply=reply2, tool_result=tool_result)
+            self._semantic_cache_set(user_text, user_lang, reply2, tool_name=tool_name)
             return reply2
 
         fallback2 = _as_fallback_reply(content2) or str(tool_result)
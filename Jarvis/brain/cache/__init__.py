@@ -1,3 +1,13 @@
 from .redis_buffer import RedisConversationBuffer
+from .semantic import SemanticReplyCache
+from .ttl_lru import RedisCacheBackend, SQLiteCacheBackend, TTLCache, make_cache_backend, parse_ttl_overrides
 
-__all__ = ["RedisConversationBuffer"]
+__all__ = [
+    "RedisConversationBuffer",
+    "RedisCacheBackend",
+    "SemanticReplyCache",
+    "SQLiteCacheBackend",
+    "TTLCache",
+    "make_cache_backend",
+    "parse_ttl_overrides",
+]
@@ -1,3 +1,4 @@
+import copy
 import json
 import time
 
@@ -13,6 +14,7 @@ class RedisConversationBuffer:
         self.enabled = _as_bool(getattr(config, "redis_enabled", "0"))
         self.url = getattr(config, "redis_url", "redis://localhost:6379/0")
         self.key = getattr(config, "redis_session_key", "jivan:session:default")
+        self.summary_key = f"{self.key}:summary"
         self.ttl_s = int(getattr(config, "redis_history_ttl_s", 86400))
         self.max_items = int(getattr(config, "redis_max_items", 24))
         self._client = self._init_client()
@@ -20,6 +22,16 @@ class RedisConversationBuffer:
         self._health_cache = None
         self._health_cache_ts = 0.0
 
+    def for_session(self, session_id):
+        """A buffer for another conversation: same client and settings, its own history key."""
+        other = copy.copy(self)
+        base = self.key.rsplit(":", 1)[0] if ":" in self.key else self.key
+        other.key = f"{base}:{session_id}"
+        other.summary_key = f"{other.key}:summary"
+        other._health_cache = None
+        other._health_cache_ts = 0.0
+        return other
+
     def _init_client(self):
         if not self.enabled:
             return None
@@ -111,3 +123,24 @@ class RedisConversationBuffer:
             if isinstance(obj, dict) and obj.get("role") and obj.get("content") is not None:
                 out.append({"role": str(obj["role"]), "content": str(obj["content"])})
         return out
+
+    def read_summary(self):
+        client = self._ensure_client()
+        if not client:
+            return ""
+        try:
+            return str(client.get(self.summary_key) or "")
+        except Exception:
+            self._client = None
+            return ""
+
+    def write_summary(self, text):
+        client = self._ensure_client()
+        if not client:
+            return False
+        try:
+            client.set(self.summary_key, str(text or ""), ex=self.ttl_s)
+            return True
+        except Exception:
+            self._client = None
+            return False
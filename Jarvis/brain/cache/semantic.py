@@ -0,0 +1,112 @@
+import hashlib
+import json
+import re
+
+from .ttl_lru import TTLCache
+
+# Words that never change what a voice query asks for; they may differ between
+# a query and a cached one. Every other word has to match, in order (see ``content_key``).
+_FILLER = {
+    # en
+    "a", "an", "the", "is", "are", "was", "be", "it", "its", "it's", "what", "what's", "whats", "me", "my",
+    "please", "pls", "tell", "show", "give", "get", "can", "could", "would", "you", "your", "i", "to",
+    "of", "in", "on", "at", "for", "about", "like", "now", "right", "today", "current", "currently",
+    "hey", "jivan", "jarvis", "ok", "okay", "so", "and", "do", "does", "know", "let", "s", "us", "will",
+    "going", "gonna", "there",
+    # ru
+    "а", "и", "в", "во", "на", "о", "об", "про", "мне", "меня", "пожалуйста", "скажи", "покажи",
+    "какая", "какой", "какие", "какое", "сейчас", "сегодня", "ну", "же", "ли", "это",
+    # de
+    "der", "die", "das", "ein", "eine", "ist", "in", "im", "am", "für", "mir", "bitte", "sag", "zeig",
+    "wie", "was", "heute", "jetzt", "mal", "doch",
+}
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+# Inflectional endings (en, ru, de), longest first: "москве"/"москву" and plurals share a key.
+# The rules ignore case, so typed text and lowercase STT output of one query agree.
+_ENDINGS = sorted(
+    {
+        "ings", "ing", "ed", "es", "s",
+        "ами", "ями", "ого", "его", "ому", "ему", "ой", "ей", "ом", "ем", "ах", "ях", "ов", "ев",
+        "ую", "ая", "ое", "ые", "ий", "ый", "а", "я", "у", "ю", "е", "ы", "и", "о",
+        "ern", "en", "er", "e",
+    },
+    key=len,
+    reverse=True,
+)
+_MIN_STEM = 4
+
+
+def _stem(word):
+    if any(ch.isdigit() for ch in word):
+        return word
+    for ending in _ENDINGS:
+        if word.endswith(ending) and len(word) - len(ending) >= _MIN_STEM:
+            return word[: -len(ending)]
+    return word
+
+
+def content_key(text):
+    """
+    The words that carry meaning, lowercased and in order (filler words dropped).
+
+    One inflectional ending is folded off each word; numbers stay whole. Order
+    and repeats count: "5 eur to usd" and "5 usd to eur" get different keys.
+    """
+    out = []
+    for word in _WORD.findall(str(text or "").lower()):
+        if word in _FILLER:
+            continue
+        out.append(_stem(word))
+    return tuple(out)
+
+
+def _row_key(lang, key):
+    raw = json.dumps([lang, list(key)], ensure_ascii=False)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+class SemanticReplyCache:
+    """
+    Reuse a reply for a differently phrased but equivalent recent query.
+
+    Rows live in a ``TTLCache`` (LRU, size bounds and the configured sqlite or
+    redis backend) keyed by language and ``content_key``. A query hits when its
+    meaning-carrying words match a cached one in the same order, whatever the
+    filler, case or inflection around them: "what's the weather in Paris" and
+    "weather in paris please" share a reply, "weather in Berlin" and
+    "3 minus 10" never take one from "weather in Paris" or "10 minus 3". The
+    trade-off is recall: reworded or reordered content ("Paris weather") is a
+    miss, which is cheaper than a wrong answer read aloud.
+    """
+
+    def __init__(self, *, ttl_s=45, max_items=256, max_bytes=0, backend=None, on_metric=None):
+        self._rows = TTLCache(
+            "semantic", ttl_s=ttl_s, max_items=max_items, max_bytes=max_bytes, backend=backend, on_metric=on_metric
+        )
+
+    @property
+    def ttl_s(self):
+        return self._rows.ttl_s
+
+    def get(self, text, lang):
+        """The cached reply for an equivalent query, or ``None``."""
+        key = content_key(text)
+        if not key:
+            return None
+        row = self._rows.get(_row_key(lang, key))
+        return row.get("reply") if isinstance(row, dict) else None
+
+    def set(self, text, lang, reply, *, ttl_s=None, intent="reply"):
+        key = content_key(text)
+        if not key or not reply:
+            return False
+        row = {"text": str(text), "reply": str(reply), "intent": str(intent or "reply")}
+        return self._rows.set(_row_key(lang, key), row, ttl_s=ttl_s)
+
+    def stats(self):
+        return self._rows.stats()
+
+    def __len__(self):
+        return len(self._rows)
@@ -0,0 +1,269 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from Jarvis.config import config
+
+
+def _size_of(value):
+    try:
+        return len(json.dumps(value, ensure_ascii=False, default=str).encode("utf-8"))
+    except Exception:
+        return len(repr(value).encode("utf-8"))
+
+
+def parse_ttl_overrides(raw):
+    """Parse ``"weather=600,news=900"`` into ``{"weather": 600, "news": 900}``."""
+    out = {}
+    for item in str(raw or "").split(","):
+        name, _, value = item.partition("=")
+        name = name.strip()
+        if not name:
+            continue
+        try:
+            out[name] = int(value.strip())
+        except ValueError:
+            continue
+    return out
+
+
+class TTLCache:
+    """
+    Bounded in-memory cache with O(1) LRU eviction and per-entry TTL.
+
+    Entries are evicted least-recently-used first once ``max_items`` or
+    ``max_bytes`` is exceeded; expired entries are dropped when read or when
+    they reach the LRU end. An optional ``backend`` (see ``SQLiteCacheBackend``
+    and ``RedisCacheBackend``) is written through on every set and loaded once
+    at start so a warm cache survives restarts.
+    """
+
+    def __init__(self, namespace, *, ttl_s=60, max_items=256, max_bytes=0, backend=None, on_metric=None):
+        self.namespace = str(namespace or "default")
+        self.ttl_s = int(ttl_s)
+        self.max_items = max(1, int(max_items))
+        self.max_bytes = max(0, int(max_bytes or 0))
+        self._backend = backend
+        self._on_metric = on_metric
+        self._rows = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expired": 0, "sets": 0}
+        self._warm_from_backend()
+
+    def _metric(self, name):
+        self._stats[name] += 1
+        if self._on_metric:
+            self._on_metric(f"cache_{self.namespace}_{name}", 1)
+
+    def _warm_from_backend(self):
+        if not self._backend:
+            return
+        now = time.time()
+        try:
+            rows = list(self._backend.load(self.namespace))
+        except Exception:
+            return
+        with self._lock:
+            for key, value, expires_at in rows:
+                if expires_at and expires_at <= now:
+                    continue
+                self._put_locked(key, value, expires_at)
+
+    def get(self, key, default=None):
+        now = time.time()
+        with self._lock:
+            row = self._rows.get(key)
+            if row is None:
+                self._metric("misses")
+                return default
+            value, expires_at, size = row
+            if expires_at and expires_at <= now:
+                self._drop_locked(key)
+                self._metric("expired")
+                self._metric("misses")
+                return default
+            self._rows.move_to_end(key)
+            self._metric("hits")
+            return value
+
+    def set(self, key, value, ttl_s=None):
+        """Store ``value``; ``ttl_s`` overrides the cache default, ``0`` or less skips caching."""
+        ttl = self.ttl_s if ttl_s is None else float(ttl_s)
+        if ttl <= 0:
+            return False
+        expires_at = time.time() + ttl
+        with self._lock:
+            if not self._put_locked(key, value, expires_at):
+                return False
+            self._metric("sets")
+        if self._backend:
+            try:
+                self._backend.save(self.namespace, key, value, expires_at)
+            except Exception:
+                pass
+        return True
+
+    def pop(self, key):
+        with self._lock:
+            row = self._drop_locked(key)
+        if row is not None and self._backend:
+            try:
+                self._backend.delete(self.namespace, key)
+            except Exception:
+                pass
+        return row[0] if row is not None else None
+
+    def clear(self):
+        with self._lock:
+            keys = list(self._rows)
+            self._rows.clear()
+            self._bytes = 0
+        if self._backend:
+            for key in keys:
+                try:
+                    self._backend.delete(self.namespace, key)
+                except Exception:
+                    pass
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __contains__(self, key):
+        row = self._rows.get(key)
+        return row is not None and (not row[1] or row[1] > time.time())
+
+    def stats(self):
+        out = dict(self._stats)
+        out["items"] = len(self._rows)
+        out["bytes"] = self._bytes
+        lookups = out["hits"] + out["misses"]
+        out["hit_rate"] = (out["hits"] / float(lookups)) if lookups else 0.0
+        return out
+
+    def _put_locked(self, key, value, expires_at):
+        size = _size_of(value)
+        if self.max_bytes and size > self.max_bytes:
+            return False
+        self._drop_locked(key)
+        self._rows[key] = (value, expires_at, size)
+        self._bytes += size
+        while len(self._rows) > self.max_items or (self.max_bytes and self._bytes > self.max_bytes):
+            old_key, (_v, old_expires, _s) = next(iter(self._rows.items()))
+            self._drop_locked(old_key)
+            if old_expires and old_expires <= time.time():
+                self._metric("expired")
+            else:
+                self._metric("evictions")
+        return True
+
+    def _drop_locked(self, key):
+        row = self._rows.pop(key, None)
+        if row is not None:
+            self._bytes -= row[2]
+        return row
+
+
+class SQLiteCacheBackend:
+    """Persist cache rows to a local SQLite file (one table, keyed by namespace + key)."""
+
+    def __init__(self, path):
+        self.path = os.path.abspath(str(path))
+        folder = os.path.dirname(self.path)
+        if folder and not os.path.isdir(folder):
+            os.makedirs(folder, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache_rows ("
+            "namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, expires_at REAL NOT NULL, "
+            "PRIMARY KEY (namespace, key))"
+        )
+        self._conn.commit()
+
+    def load(self, namespace):
+        with self._lock:
+            self._conn.execute("DELETE FROM cache_rows WHERE expires_at <= ?", (time.time(),))
+            self._conn.commit()
+            rows = self._conn.execute(
+                "SELECT key, value, expires_at FROM cache_rows WHERE namespace = ?", (namespace,)
+            ).fetchall()
+        out = []
+        for key, raw, expires_at in rows:
+            try:
+                out.append((key, json.loads(raw), float(expires_at)))
+            except ValueError:
+                continue
+        return out
+
+    def save(self, namespace, key, value, expires_at):
+        raw = json.dumps(value, ensure_ascii=False, default=str)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache_rows (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                (namespace, key, raw, float(expires_at)),
+            )
+            self._conn.commit()
+
+    def delete(self, namespace, key):
+        with self._lock:
+            self._conn.execute("DELETE FROM cache_rows WHERE namespace = ? AND key = ?", (namespace, key))
+            self._conn.commit()
+
+
+class RedisCacheBackend:
+    """Persist cache rows as Redis strings with native expiry under ``<prefix>:<namespace>:<key>``."""
+
+    def __init__(self, url, prefix="jivan:cache"):
+        import redis  # type: ignore
+
+        self._client = redis.Redis.from_url(url, decode_responses=True)
+        self.prefix = str(prefix or "jivan:cache")
+
+    def _key(self, namespace, key):
+        return f"{self.prefix}:{namespace}:{key}"
+
+    def load(self, namespace):
+        out = []
+        head = len(self._key(namespace, ""))
+        now = time.time()
+        for full_key in self._client.scan_iter(match=self._key(namespace, "*"), count=200):
+            raw = self._client.get(full_key)
+            if raw is None:
+                continue
+            try:
+                row = json.loads(raw)
+            except ValueError:
+                continue
+            expires_at = float(row.get("expires_at") or 0)
+            if expires_at and expires_at <= now:
+                continue
+            out.append((full_key[head:], row.get("value"), expires_at))
+        return out
+
+    def save(self, namespace, key, value, expires_at):
+        ttl = max(1, int(expires_at - time.time()))
+        raw = json.dumps({"value": value, "expires_at": expires_at}, ensure_ascii=False, default=str)
+        self._client.set(self._key(namespace, key), raw, ex=ttl)
+
+    def delete(self, namespace, key):
+        self._client.delete(self._key(namespace, key))
+
+
+def make_cache_backend():
+    """Build the backend named by ``brain_cache_backend`` (memory, sqlite or redis)."""
+    kind = str(getattr(config, "brain_cache_backend", "memory") or "memory").strip().lower()
+    try:
+        if kind == "sqlite":
+            return SQLiteCacheBackend(getattr(config, "brain_cache_path", "Jarvis/data/brain_cache.sqlite3"))
+        if kind == "redis":
+            return RedisCacheBackend(
+                getattr(config, "redis_url", "redis://localhost:6379/0"),
+                prefix=getattr(config, "brain_cache_redis_prefix", "jivan:cache"),
+            )
+    except Exception as e:
+        print(f"Brain cache backend '{kind}' unavailable, using memory only: {e}")
+    return None
@@ -0,0 +1,58 @@
+import re
+
+_CHAIN_SPLIT = re.compile(r"\band then\b", re.IGNORECASE)
+
+
+def split_chain(user_text, max_parts=4):
+    """Split "X and then Y" into its parts; ``None`` when the text is not a chain."""
+    text = str(user_text or "")
+    if " and then " not in text.lower():
+        return None
+    parts = [p.strip() for p in _CHAIN_SPLIT.split(text) if p.strip()]
+    if len(parts) < 2 or len(parts) > int(max_parts):
+        return None
+    return parts
+
+
+def plan_chain_waves(steps, is_pure):
+    """
+    Group chain steps into waves that can run concurrently.
+
+    ``steps`` is a list of ``(tool_name, tool_args)``. A step with side effects
+    depends on every earlier step and every later step depends on it, so it
+    always runs alone and in its original position. Consecutive pure steps have
+    no dependencies on each other and share a wave.
+    Returns a list of lists of step indexes, in execution order.
+    """
+    waves = []
+    current = []
+    for i, (tool_name, _tool_args) in enumerate(steps):
+        if is_pure(tool_name):
+            current.append(i)
+            continue
+        if current:
+            waves.append(current)
+            current = []
+        waves.append([i])
+    if current:
+        waves.append(current)
+    return waves
+
+
+def run_chain_waves(steps, waves, execute, submit):
+    """
+    Run ``execute(index, tool_name, tool_args)`` for every step, wave by wave.
+
+    Steps inside a multi-step wave go through ``submit`` (an executor's submit);
+    single-step waves run inline. Results come back in the original step order.
+    """
+    results = [None] * len(steps)
+    for wave in waves:
+        if len(wave) == 1:
+            i = wave[0]
+            results[i] = execute(i, *steps[i])
+            continue
+        futures = [(i, submit(execute, i, *steps[i])) for i in wave]
+        for i, fut in futures:
+            results[i] = fut.result()
+    return results
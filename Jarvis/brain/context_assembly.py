@@ -0,0 +1,75 @@
+import concurrent.futures
+import threading
+import time
+
+_PENDING = object()
+
+
+class ContextAssembly:
+    """
+    Fan out per-turn context sources on a shared executor and merge whatever
+    finished before each source's deadline.
+
+    Deadlines are measured from the moment the assembly is created, so the
+    whole stage costs roughly the slowest source rather than the sum of all.
+    A source that misses its deadline resolves to its ``default``; its worker
+    keeps running in the background and the late value is ignored.
+    """
+
+    def __init__(self, submit):
+        self._submit = submit
+        self._started = time.perf_counter()
+        self._sources = {}
+        self._lock = threading.Lock()
+
+    def add(self, name, fn, *, deadline_ms=None, default=None):
+        """Start ``fn`` in the background; ``deadline_ms=None`` waits for it without a limit."""
+        entry = {"deadline_ms": deadline_ms, "default": default, "value": _PENDING, "ms": None, "status": "pending"}
+
+        def _run():
+            t0 = time.perf_counter()
+            try:
+                return fn()
+            finally:
+                entry["ms"] = int((time.perf_counter() - t0) * 1000)
+
+        with self._lock:
+            self._sources[name] = entry
+        entry["future"] = self._submit(_run)
+        return self
+
+    def get(self, name):
+        """Wait for ``name`` up to its deadline; safe to call from other sources."""
+        entry = self._sources[name]
+        with self._lock:
+            if entry["value"] is not _PENDING:
+                return entry["value"]
+        timeout = None
+        if entry["deadline_ms"] is not None:
+            elapsed = time.perf_counter() - self._started
+            timeout = max(0.0, entry["deadline_ms"] / 1000.0 - elapsed)
+        try:
+            value = entry["future"].result(timeout=timeout)
+            status = "ok"
+        except concurrent.futures.TimeoutError:
+            value = entry["default"]
+            status = "timeout"
+        except Exception:
+            value = entry["default"]
+            status = "error"
+        with self._lock:
+            if entry["value"] is _PENDING:
+                entry["value"] = value
+                entry["status"] = status
+            return entry["value"]
+
+    def collect(self):
+        return {name: self.get(name) for name in list(self._sources)}
+
+    def timings(self):
+        """Per-source ``{"ms": ..., "status": ...}`` plus the stage wall time under ``"total"``."""
+        out = {}
+        for name, entry in self._sources.items():
+            out[name] = {"ms": entry["ms"], "status": entry["status"]}
+        out["total"] = {"ms": int((time.perf_counter() - self._started) * 1000), "status": "ok"}
+        return out
@@ -1,4 +1,130 @@
 import re
+import threading
+from collections import deque
+
+
+class RouteRule:
+    """
+    One deterministic routing rule.
+
+    ``keywords`` are lowercase literals of which at least one must occur in the
+    input for the rule to apply and ``pattern`` is a regex alternative to them;
+    both only preselect candidates. ``build(text, lowered, recent_messages)``
+    does the exact check and returns a ``(tool_name, tool_args)`` plan or None.
+    Lower ``priority`` wins when several rules produce a plan.
+    """
+
+    __slots__ = ("name", "priority", "build", "keywords", "pattern")
+
+    def __init__(self, name, priority, build, *, keywords=(), pattern=None):
+        self.name = str(name)
+        self.priority = int(priority)
+        self.build = build
+        self.keywords = tuple(str(k).lower() for k in keywords)
+        self.pattern = re.compile(pattern) if pattern else None
+
+
+class _KeywordAutomaton:
+    """Aho-Corasick automaton reporting every keyword that occurs in a text, in one pass."""
+
+    def __init__(self, keywords):
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [()]
+        for idx, keyword in enumerate(keywords):
+            node = 0
+            for ch in keyword:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                    self._goto[node][ch] = nxt
+                node = nxt
+            self._out[node] = self._out[node] + (idx,)
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                if node:
+                    fail = self._fail[node]
+                    while fail and ch not in self._goto[fail]:
+                        fail = self._fail[fail]
+                    self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def find(self, text):
+        found = set()
+        node = 0
+        goto, fail, out = self._goto, self._fail, self._out
+        for ch in text:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node]:
+                found.update(out[node])
+        return found
+
+
+class IntentRouter:
+    """
+    A routing table compiled once into a keyword automaton plus one combined regex.
+
+    Each call scans the input once, so its cost does not grow with the number
+    of rules; only the rules whose triggers occur are evaluated, in priority
+    order. ``hit_counts()`` reports how often each rule produced the plan.
+    """
+
+    def __init__(self, rules):
+        self._rules = sorted(rules, key=lambda r: r.priority)
+        keywords = []
+        self._keyword_rules = []
+        seen = {}
+        for i, rule in enumerate(self._rules):
+            for keyword in rule.keywords:
+                if keyword not in seen:
+                    seen[keyword] = len(keywords)
+                    keywords.append(keyword)
+                    self._keyword_rules.append([])
+                self._keyword_rules[seen[keyword]].append(i)
+        self._automaton = _KeywordAutomaton(keywords)
+        self._pattern_rules = [i for i, rule in enumerate(self._rules) if rule.pattern is not None]
+        self._any_pattern = (
+            re.compile("|".join(f"(?:{self._rules[i].pattern.pattern})" for i in self._pattern_rules))
+            if self._pattern_rules
+            else None
+        )
+        self._hits = {rule.name: 0 for rule in self._rules}
+        self._lock = threading.Lock()
+
+    def match(self, user_text, recent_messages=None):
+        """Return ``(rule_name, plan)`` for the highest-priority matching rule, or ``(None, None)``."""
+        text = (user_text or "").strip()
+        lowered = text.lower()
+        if not lowered:
+            return None, None
+        candidates = set()
+        for keyword_idx in self._automaton.find(lowered):
+            candidates.update(self._keyword_rules[keyword_idx])
+        if self._any_pattern is not None and self._any_pattern.search(lowered):
+            candidates.update(i for i in self._pattern_rules if self._rules[i].pattern.search(lowered))
+        for i in sorted(candidates):
+            rule = self._rules[i]
+            plan = rule.build(text, lowered, recent_messages)
+            if plan:
+                with self._lock:
+                    self._hits[rule.name] += 1
+                return rule.name, plan
+        return None, None
+
+    def route(self, user_text, recent_messages=None):
+        return self.match(user_text, recent_messages=recent_messages)[1]
+
+    def hit_counts(self):
+        with self._lock:
+            return dict(self._hits)
 
 
 def _extract_after_keyword(text, keyword):
@@ -18,86 +144,100 @@ def _extract_weather_city(user_text):
     return m.group(1).strip()
 
 
-def required_noauth_mcp_plan(user_text):
+def _extract_topic_from_text(user_text):
     text = (user_text or "").strip()
     lowered = text.lower()
-    if not lowered:
-        return None
+    for prefix in ("tell me about ", "who is ", "what is "):
+        if lowered.startswith(prefix):
+            return text[len(prefix) :].strip()
+    return ""
+
+
+def _detect_lang_for_joke(user_text):
+    s = user_text or ""
+    for ch in s:
+        code = ord(ch)
+        if 0x0530 <= code <= 0x058F:
+            return "hy"
+        if 0x0400 <= code <= 0x04FF:
+            return "ru"
+    return "en"
+
+
+def _extract_meme_text(user_text):
+    text = (user_text or "").strip()
+    lowered = text.lower()
+    for prefix in ("meme ", "make meme ", "generate meme "):
+        if lowered.startswith(prefix):
+            body = text[len(prefix) :].strip()
+            if "|" in body:
+                top, bottom = body.split("|", 1)
+                return top.strip(), bottom.strip()
+            return body, ""
+    return "", ""
 
+
+def _auto_toolkit(name, tool_input):
+    return ("mcp_execute", {"tool_name": f"AUTO_TOOLKIT:{name}", "tool_input": tool_input})
+
+
+# --- Composio no-auth toolkits ---------------------------------------------
+
+
+def _route_codeinterpreter(text, lowered, _recent):
     if "code interpreter" in lowered or "codeinterpreter" in lowered:
         code = (
             _extract_after_keyword(text, "code interpreter")
             or _extract_after_keyword(text, "codeinterpreter")
             or text
         )
-        return (
-            "mcp_execute",
-            {
-                "tool_name": "AUTO_TOOLKIT:codeinterpreter",
-                "tool_input": {"code": code, "_action_hint": "EXECUTE"},
-            },
-        )
+        return _auto_toolkit("codeinterpreter", {"code": code, "_action_hint": "EXECUTE"})
+    return None
+
 
+def _route_composio_search(text, lowered, _recent):
     if "composio search" in lowered:
         query = _extract_after_keyword(text, "composio search") or text
-        return (
-            "mcp_execute",
-            {
-                "tool_name": "AUTO_TOOLKIT:composio_search",
-                "tool_input": {"query": query, "_action_hint": "SEARCH"},
-            },
-        )
+        return _auto_toolkit("composio_search", {"query": query, "_action_hint": "SEARCH"})
+    return None
 
-    if "browser tool" in lowered or "use browser tool" in lowered:
+
+def _route_browser_tool(text, lowered, _recent):
+    if "browser tool" in lowered:
         target = _extract_after_keyword(text, "browser tool") or text
-        return (
-            "mcp_execute",
-            {
-                "tool_name": "AUTO_TOOLKIT:browser_tool",
-                "tool_input": {"query": target, "_action_hint": "BROWSER"},
-            },
-        )
+        return _auto_toolkit("browser_tool", {"query": target, "_action_hint": "BROWSER"})
+    return None
+
 
+def _route_hackernews(text, lowered, _recent):
     if "hacker news" in lowered or re.search(r"\bhn\b", lowered):
         query = _extract_after_keyword(text, "hacker news") or "top stories"
-        return (
-            "mcp_execute",
-            {
-                "tool_name": "AUTO_TOOLKIT:hackernews",
-                "tool_input": {"query": query, "_action_hint": "TOP"},
-            },
-        )
+        return _auto_toolkit("hackernews", {"query": query, "_action_hint": "TOP"})
+    return None
 
-    if "openweathermap" in lowered or "weathermap" in lowered:
+
+def _route_weathermap(text, lowered, _recent):
+    if "weathermap" in lowered:
         city = _extract_weather_city(text) or _extract_after_keyword(text, "openweathermap")
-        return (
-            "mcp_execute",
-            {
-                "tool_name": "AUTO_TOOLKIT:weathermap",
-                "tool_input": {"city": city or text, "_action_hint": "WEATHER"},
-            },
-        )
+        return _auto_toolkit("weathermap", {"city": city or text, "_action_hint": "WEATHER"})
+    return None
+
 
+def _route_text_to_pdf(text, lowered, _recent):
     if "text to pdf" in lowered:
         body = _extract_after_keyword(text, "text to pdf") or text
-        return (
-            "mcp_execute",
-            {
-                "tool_name": "AUTO_TOOLKIT:text_to_pdf",
-                "tool_input": {"text": body, "filename": "jivan_output.pdf", "_action_hint": "PDF"},
-            },
-        )
+        return _auto_toolkit("text_to_pdf", {"text": body, "filename": "jivan_output.pdf", "_action_hint": "PDF"})
+    return None
 
+
+def _route_entelligence(text, lowered, _recent):
     if "entelligence" in lowered:
         prompt = _extract_after_keyword(text, "entelligence") or text
-        return (
-            "mcp_execute",
-            {
-                "tool_name": "AUTO_TOOLKIT:entelligence",
-                "tool_input": {"prompt": prompt, "_action_hint": "ANALYZE"},
-            },
-        )
+        return _auto_toolkit("entelligence", {"prompt": prompt, "_action_hint": "ANALYZE"})
+    return None
+
 
+def _route_gemini(text, lowered, _recent):
     if "use gemini" in lowered or "with gemini" in lowered or lowered.startswith("gemini "):
         prompt = (
             _extract_after_keyword(text, "use gemini")
@@ -105,14 +245,11 @@ def required_noauth_mcp_plan(user_text):
             or _extract_after_keyword(text, "gemini")
             or text
         )
-        return (
-            "mcp_execute",
-            {
-                "tool_name": "AUTO_TOOLKIT:gemini",
-                "tool_input": {"prompt": prompt, "_action_hint": "GENERATE"},
-            },
-        )
+        return _auto_toolkit("gemini", {"prompt": prompt, "_action_hint": "GENERATE"})
+    return None
+
 
+def _route_yelp(text, lowered, _recent):
     if "on yelp" in lowered or "use yelp" in lowered or lowered.startswith("yelp "):
         query = (
             _extract_after_keyword(text, "on yelp")
@@ -120,50 +257,51 @@ def required_noauth_mcp_plan(user_text):
             or _extract_after_keyword(text, "yelp")
             or text
         )
-        return (
-            "mcp_execute",
-            {
-                "tool_name": "AUTO_TOOLKIT:yelp",
-                "tool_input": {"query": query, "_action_hint": "SEARCH"},
-            },
-        )
+        return _auto_toolkit("yelp", {"query": query, "_action_hint": "SEARCH"})
+    return None
 
+
+def _route_seat_geek(text, lowered, _recent):
     if "seat geek" in lowered or "seatgeek" in lowered:
         query = _extract_after_keyword(text, "seat geek") or _extract_after_keyword(text, "seatgeek") or text
-        return (
-            "mcp_execute",
-            {
-                "tool_name": "AUTO_TOOLKIT:seat_geek",
-                "tool_input": {"query": query, "_action_hint": "EVENT"},
-            },
-        )
+        return _auto_toolkit("seat_geek", {"query": query, "_action_hint": "EVENT"})
+    return None
+
 
+def _route_giphy(text, lowered, _recent):
     if "giphy" in lowered or "gif" in lowered:
         query = (
             _extract_after_keyword(text, "giphy")
             or _extract_after_keyword(text, "gif")
             or text
         )
-        return (
-            "mcp_execute",
-            {
-                "tool_name": "AUTO_TOOLKIT:giphy",
-                "tool_input": {"query": query, "_action_hint": "SEARCH"},
-            },
-        )
+        return _auto_toolkit("giphy", {"query": query, "_action_hint": "SEARCH"})
+    return None
 
+
+def _route_composio(text, lowered, _recent):
     if lowered.startswith("composio "):
         prompt = _extract_after_keyword(text, "composio") or text
-        return (
-            "mcp_execute",
-            {
-                "tool_name": "AUTO_TOOLKIT:composio",
-                "tool_input": {"prompt": prompt, "_action_hint": "RUN"},
-            },
-        )
+        return _auto_toolkit("composio", {"prompt": prompt, "_action_hint": "RUN"})
     return None
 
 
+NOAUTH_RULES = [
+    RouteRule("codeinterpreter", 200, _route_codeinterpreter, keywords=("code interpreter", "codeinterpreter")),
+    RouteRule("composio_search", 210, _route_composio_search, keywords=("composio search",)),
+    RouteRule("browser_tool", 220, _route_browser_tool, keywords=("browser tool",)),
+    RouteRule("hackernews", 230, _route_hackernews, keywords=("hacker news", "hn")),
+    RouteRule("weathermap", 240, _route_weathermap, keywords=("weathermap",)),
+    RouteRule("text_to_pdf", 250, _route_text_to_pdf, keywords=("text to pdf",)),
+    RouteRule("entelligence", 260, _route_entelligence, keywords=("entelligence",)),
+    RouteRule("gemini", 270, _route_gemini, keywords=("gemini",)),
+    RouteRule("yelp", 280, _route_yelp, keywords=("yelp",)),
+    RouteRule("seat_geek", 290, _route_seat_geek, keywords=("seat geek", "seatgeek")),
+    RouteRule("giphy", 300, _route_giphy, keywords=("giphy", "gif")),
+    RouteRule("composio", 310, _route_composio, keywords=("composio",)),
+]
+
+
 def _split_first_token(text):
     value = str(text or "").strip()
     if not value:
@@ -193,120 +331,256 @@ def _assistant_requested_telegram_message(recent_messages):
     return False
 
 
-def required_telegram_mcp_plan(user_text, recent_messages=None):
-    text = (user_text or "").strip()
-    lowered = text.lower()
-    if not lowered:
-        return None
+def _telegram(tool_name, tool_input):
+    return ("mcp_execute", {"tool_name": tool_name, "tool_input": tool_input})
 
+
+# --- Telegram --------------------------------------------------------------
+
+
+def _route_tg_send(text, lowered, _recent):
     if lowered.startswith("telegram send "):
         body = _extract_after_keyword(text, "telegram send")
         if body:
-            return ("mcp_execute", {"tool_name": "TELEGRAM_SEND_MESSAGE", "tool_input": {"text": body}})
+            return _telegram("TELEGRAM_SEND_MESSAGE", {"text": body})
+    return None
 
+
+def _route_tg_send_fuzzy(text, lowered, _recent):
     # Fuzzy speech recognition variants for "telegram" (e.g., "telly").
     if "send" in lowered and (" telegram" in f" {lowered}" or " telly" in f" {lowered}"):
         msg = _extract_after_keyword(text, "send")
         msg = re.sub(r"\b(to\s+)?(telegram|telly)\b", "", msg, flags=re.IGNORECASE).strip(" :,-")
         if msg:
-            return ("mcp_execute", {"tool_name": "TELEGRAM_SEND_MESSAGE", "tool_input": {"text": msg}})
+            return _telegram("TELEGRAM_SEND_MESSAGE", {"text": msg})
+    return None
 
+
+def _route_tg_send_to(text, lowered, _recent):
     # Natural-language variants: "send <message> to telegram", "send to telegram <message>".
     m = re.search(r"^\s*send\s+(.+?)\s+to\s+telegram\s*$", lowered, re.IGNORECASE)
     if m:
         body = text[m.start(1) : m.end(1)].strip()
         if body:
-            return ("mcp_execute", {"tool_name": "TELEGRAM_SEND_MESSAGE", "tool_input": {"text": body}})
+            return _telegram("TELEGRAM_SEND_MESSAGE", {"text": body})
     if lowered.startswith("send to telegram "):
         body = _extract_after_keyword(text, "send to telegram")
         if body:
-            return ("mcp_execute", {"tool_name": "TELEGRAM_SEND_MESSAGE", "tool_input": {"text": body}})
+            return _telegram("TELEGRAM_SEND_MESSAGE", {"text": body})
+    return None
 
+
+def _route_tg_reply(text, lowered, _recent):
     if lowered.startswith("telegram reply "):
         body = _extract_after_keyword(text, "telegram reply")
         if body:
-            return (
-                "mcp_execute",
-                {
-                    "tool_name": "TELEGRAM_SEND_MESSAGE",
-                    "tool_input": {"text": body, "_reply_to_last": True},
-                },
-            )
+            return _telegram("TELEGRAM_SEND_MESSAGE", {"text": body, "_reply_to_last": True})
+    return None
 
+
+def _route_tg_poll(text, lowered, _recent):
     if lowered.startswith("telegram poll "):
         body = _extract_after_keyword(text, "telegram poll")
-        if body:
-            segments = [x.strip() for x in body.split("|") if x.strip()]
-            if len(segments) >= 3:
-                question = segments[0]
-                options = segments[1:]
-                return (
-                    "mcp_execute",
-                    {
-                        "tool_name": "TELEGRAM_SEND_POLL",
-                        "tool_input": {"question": question, "options": options},
-                    },
-                )
+        segments = [x.strip() for x in body.split("|") if x.strip()]
+        if len(segments) >= 3:
+            return _telegram("TELEGRAM_SEND_POLL", {"question": segments[0], "options": segments[1:]})
+    return None
+
 
+def _route_tg_photo(text, lowered, _recent):
     if lowered.startswith("telegram photo "):
-        body = _extract_after_keyword(text, "telegram photo")
-        target, caption = _split_first_token(body)
+        target, caption = _split_first_token(_extract_after_keyword(text, "telegram photo"))
         if target:
-            return (
-                "mcp_execute",
-                {
-                    "tool_name": "TELEGRAM_SEND_PHOTO",
-                    "tool_input": {"photo": target, "caption": caption},
-                },
-            )
+            return _telegram("TELEGRAM_SEND_PHOTO", {"photo": target, "caption": caption})
+    return None
 
+
+def _route_tg_document(text, lowered, _recent):
     if lowered.startswith("telegram document "):
-        body = _extract_after_keyword(text, "telegram document")
-        target, caption = _split_first_token(body)
+        target, caption = _split_first_token(_extract_after_keyword(text, "telegram document"))
         if target:
-            return (
-                "mcp_execute",
-                {
-                    "tool_name": "TELEGRAM_SEND_DOCUMENT",
-                    "tool_input": {"document": target, "caption": caption},
-                },
-            )
-
-    if lowered.startswith("telegram edit "):
-        body = _extract_after_keyword(text, "telegram edit")
-        if "::" in body:
-            raw_id, new_text = body.split("::", 1)
-            raw_id = raw_id.strip()
-            new_text = new_text.strip()
-        else:
-            raw_id = ""
-            new_text = body.strip()
-        if new_text:
-            tool_input = {"text": new_text, "_use_last_message_id": True}
-            if raw_id.isdigit():
-                tool_input["message_id"] = int(raw_id)
-            return ("mcp_execute", {"tool_name": "TELEGRAM_EDIT_MESSAGE", "tool_input": tool_input})
-
-    if lowered.startswith("telegram delete"):
-        body = _extract_after_keyword(text, "telegram delete")
-        tool_input = {"_use_last_message_id": True}
-        if body.isdigit():
-            tool_input["message_id"] = int(body)
-        return ("mcp_execute", {"tool_name": "TELEGRAM_DELETE_MESSAGE", "tool_input": tool_input})
+            return _telegram("TELEGRAM_SEND_DOCUMENT", {"document": target, "caption": caption})
+    return None
+
+
+def _route_tg_edit(text, lowered, _recent):
+    if not lowered.startswith("telegram edit "):
+        return None
+    body = _extract_after_keyword(text, "telegram edit")
+    if "::" in body:
+        raw_id, new_text = body.split("::", 1)
+        raw_id = raw_id.strip()
+        new_text = new_text.strip()
+    else:
+        raw_id = ""
+        new_text = body.strip()
+    if not new_text:
+        return None
+    tool_input = {"text": new_text, "_use_last_message_id": True}
+    if raw_id.isdigit():
+        tool_input["message_id"] = int(raw_id)
+    return _telegram("TELEGRAM_EDIT_MESSAGE", tool_input)
 
+
+def _route_tg_delete(text, lowered, _recent):
+    if not lowered.startswith("telegram delete"):
+        return None
+    body = _extract_after_keyword(text, "telegram delete")
+    tool_input = {"_use_last_message_id": True}
+    if body.isdigit():
+        tool_input["message_id"] = int(body)
+    return _telegram("TELEGRAM_DELETE_MESSAGE", tool_input)
+
+
+def _route_tg_updates(_text, lowered, _recent):
     if lowered.startswith("telegram updates"):
-        return ("mcp_execute", {"tool_name": "TELEGRAM_GET_UPDATES", "tool_input": {"limit": 20}})
+        return _telegram("TELEGRAM_GET_UPDATES", {"limit": 20})
+    return None
+
 
+def _route_tg_continuation(text, lowered, recent_messages):
     # Continuation turn: after assistant asked "what should I send to telegram",
     # treat short "say ..." answers as Telegram message content.
-    if _assistant_requested_telegram_message(recent_messages):
-        if lowered.startswith("just say "):
-            body = _extract_after_keyword(text, "just say")
-            if body:
-                return ("mcp_execute", {"tool_name": "TELEGRAM_SEND_MESSAGE", "tool_input": {"text": body}})
-        if lowered.startswith("say "):
-            body = _extract_after_keyword(text, "say")
-            if body:
-                return ("mcp_execute", {"tool_name": "TELEGRAM_SEND_MESSAGE", "tool_input": {"text": body}})
+    if not (lowered.startswith("just say ") or lowered.startswith("say ")):
+        return None
+    if not _assistant_requested_telegram_message(recent_messages):
+        return None
+    if lowered.startswith("just say "):
+        body = _extract_after_keyword(text, "just say")
+        if body:
+            return _telegram("TELEGRAM_SEND_MESSAGE", {"text": body})
+    if lowered.startswith("say "):
+        body = _extract_after_keyword(text, "say")
+        if body:
+            return _telegram("TELEGRAM_SEND_MESSAGE", {"text": body})
+    return None
+
+
+TELEGRAM_RULES = [
+    RouteRule("telegram_send", 100, _route_tg_send, keywords=("telegram send ",)),
+    RouteRule("telegram_send_fuzzy", 110, _route_tg_send_fuzzy, keywords=("telegram", "telly")),
+    RouteRule("telegram_send_to", 120, _route_tg_send_to, keywords=("telegram",)),
+    RouteRule("telegram_reply", 130, _route_tg_reply, keywords=("telegram reply ",)),
+    RouteRule("telegram_poll", 140, _route_tg_poll, keywords=("telegram poll ",)),
+    RouteRule("telegram_photo", 150, _route_tg_photo, keywords=("telegram photo ",)),
+    RouteRule("telegram_document", 160, _route_tg_document, keywords=("telegram document ",)),
+    RouteRule("telegram_edit", 170, _route_tg_edit, keywords=("telegram edit ",)),
+    RouteRule("telegram_delete", 180, _route_tg_delete, keywords=("telegram delete",)),
+    RouteRule("telegram_updates", 190, _route_tg_updates, keywords=("telegram updates",)),
+    RouteRule("telegram_continuation", 195, _route_tg_continuation, keywords=("say ",)),
+]
+
+
+# --- Built-in tools ---------------------------------------------------------
+
+
+def _route_protocol(_text, lowered, _recent):
+    if "protocol" in lowered or lowered in ("monday", "monday morning"):
+        if "monday morning" in lowered:
+            return ("run_protocol", {"name": "monday_morning", "confirm": True})
+        if "monday" in lowered:
+            return ("run_protocol", {"name": "monday", "confirm": True})
+    return None
+
+
+def _route_joke(text, lowered, _recent):
+    # Explicit deterministic routing to prevent LLM-memory answers where tools exist.
+    if "joke" in lowered or "make me laugh" in lowered or "funny" in lowered:
+        return ("joke", {"language": _detect_lang_for_joke(text)})
+    return None
+
+
+def _route_meme(text, lowered, _recent):
+    if lowered.startswith("meme ") or lowered.startswith("make meme ") or lowered.startswith("generate meme "):
+        top_text, bottom_text = _extract_meme_text(text)
+        return ("imgflip_meme", {"top_text": top_text, "bottom_text": bottom_text})
+    return None
 
+
+def _route_calculate(text, lowered, _recent):
+    if "calculate" in lowered:
+        return ("wolframalpha", {"query": text})
+    return None
+
+
+def _route_arithmetic(text, _lowered, _recent):
+    return ("wolframalpha", {"query": text})
+
+
+def _route_who_is(text, lowered, _recent):
+    if lowered.startswith("who is ") or lowered.startswith("tell me about "):
+        topic = _extract_topic_from_text(text)
+        if topic:
+            return ("wikipedia", {"topic": topic})
+    return None
+
+
+def _route_what_is(text, lowered, _recent):
+    if lowered.startswith("what is "):
+        topic = _extract_topic_from_text(text)
+        if topic:
+            # Prefer Wolfram for formula-like questions, otherwise Wikipedia.
+            if re.search(r"\d", topic) or any(op in topic for op in ("+", "-", "*", "/", "^", "%")):
+                return ("wolframalpha", {"query": text})
+            return ("wikipedia", {"topic": topic})
     return None
+
+
+def _route_weather(text, _lowered, _recent):
+    city = _extract_weather_city(text)
+    if city:
+        return ("weather", {"city": city})
+    return None
+
+
+def _route_news(_text, _lowered, _recent):
+    return ("news", {})
+
+
+def _route_ip_address(_text, _lowered, _recent):
+    return ("ip_address", {})
+
+
+def _route_time(_text, lowered, _recent):
+    if "timer" not in lowered:
+        return ("get_time", {})
+    return None
+
+
+def _route_date(_text, lowered, _recent):
+    if re.search(r"\bdate\b", lowered):
+        return ("get_date", {})
+    return None
+
+
+TOOL_RULES = [
+    RouteRule("protocol", 400, _route_protocol, keywords=("monday",)),
+    RouteRule("joke", 410, _route_joke, keywords=("joke", "make me laugh", "funny")),
+    RouteRule("meme", 420, _route_meme, keywords=("meme ",)),
+    RouteRule("calculate", 430, _route_calculate, keywords=("calculate",)),
+    RouteRule("arithmetic", 440, _route_arithmetic, pattern=r"\d+\s*[\+\-\*/^%]\s*\d+"),
+    RouteRule("who_is", 450, _route_who_is, keywords=("who is ", "tell me about ")),
+    RouteRule("what_is", 460, _route_what_is, keywords=("what is ",)),
+    RouteRule("weather", 470, _route_weather, keywords=("weather",)),
+    RouteRule("news", 480, _route_news, keywords=("news", "headlines")),
+    RouteRule("ip_address", 490, _route_ip_address, keywords=("ip address",)),
+    RouteRule("time", 500, _route_time, keywords=("time",)),
+    RouteRule("date", 510, _route_date, keywords=("date",)),
+]
+
+_NOAUTH_ROUTER = IntentRouter(NOAUTH_RULES)
+_TELEGRAM_ROUTER = IntentRouter(TELEGRAM_RULES)
+TOOL_ROUTER = IntentRouter(TELEGRAM_RULES + NOAUTH_RULES + TOOL_RULES)
+
+
+def required_noauth_mcp_plan(user_text):
+    return _NOAUTH_ROUTER.route(user_text)
+
+
+def required_telegram_mcp_plan(user_text, recent_messages=None):
+    return _TELEGRAM_ROUTER.route(user_text, recent_messages=recent_messages)
+
+
+def required_tool_plan(user_text, recent_messages=None):
+    """Deterministic plan for the turn: Telegram, then no-auth toolkits, then built-in tools."""
+    return TOOL_ROUTER.route(user_text, recent_messages=recent_messages)
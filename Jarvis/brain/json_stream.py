@@ -0,0 +1,168 @@
+import json
+
+_LITERALS = {"true": True, "false": False, "null": None}
+_WS = " \t\r\n"
+
+
+class IncrementalJSONObject:
+    """
+    Incrementally parse one JSON object from streamed text.
+
+    ``feed`` returns ``(path, value)`` events for every value that is complete,
+    where ``path`` is a tuple of keys/indices (the outer object itself is ``()``).
+    Text before the first ``{`` (code fences, chatter) is ignored.
+    """
+
+    def __init__(self):
+        self.values = {}
+        self.done = False
+        self.error = False
+        self._started = False
+        self._stack = []
+        self._str = None
+        self._str_is_key = False
+        self._escape = ""
+        self._scalar = ""
+
+    def feed(self, text):
+        events = []
+        for ch in str(text or ""):
+            if self.done or self.error:
+                break
+            self._step(ch, events)
+        return events
+
+    def get(self, *path, default=None):
+        return self.values.get(tuple(path), default)
+
+    def partial_string(self):
+        """Return ``(path, text)`` for a string value that is still being streamed."""
+        if self._str is None or self._str_is_key or not self._stack:
+            return None, ""
+        return self._child_path(), self._str
+
+    def _child_path(self):
+        frame = self._stack[-1]
+        if frame["type"] == "obj":
+            return frame["path"] + (frame["key"],)
+        return frame["path"] + (len(frame["value"]),)
+
+    def _step(self, ch, events):
+        if not self._started:
+            if ch == "{":
+                self._started = True
+                self._stack.append({"type": "obj", "value": {}, "path": (), "key": None, "expect": "key"})
+            return
+        if self._str is not None:
+            self._step_string(ch, events)
+            return
+        if self._scalar:
+            if ch in _WS or ch in ",}]":
+                self._finish_scalar(events)
+            else:
+                self._scalar += ch
+                return
+        frame = self._stack[-1]
+        if ch in _WS:
+            return
+        expect = frame["expect"]
+        if expect == "colon":
+            if ch != ":":
+                self.error = True
+                return
+            frame["expect"] = "value"
+            return
+        if ch == ",":
+            if expect != "comma":
+                self.error = True
+                return
+            frame["expect"] = "key" if frame["type"] == "obj" else "value"
+            return
+        if ch in "}]":
+            closing = "obj" if ch == "}" else "arr"
+            if frame["type"] != closing or expect not in ("comma", "key", "value"):
+                self.error = True
+                return
+            self._stack.pop()
+            self._complete(frame["path"], frame["value"], events)
+            return
+        if expect == "key":
+            if ch != '"':
+                self.error = True
+                return
+            self._str = ""
+            self._str_is_key = True
+            return
+        if expect != "value":
+            self.error = True
+            return
+        if ch == '"':
+            self._str = ""
+            self._str_is_key = False
+        elif ch in "{[":
+            self._stack.append(
+                {
+                    "type": "obj" if ch == "{" else "arr",
+                    "value": {} if ch == "{" else [],
+                    "path": self._child_path(),
+                    "key": None,
+                    "expect": "key" if ch == "{" else "value",
+                }
+            )
+        else:
+            self._scalar = ch
+
+    def _step_string(self, ch, events):
+        if self._escape:
+            self._escape += ch
+            if self._escape[1] == "u" and len(self._escape) < 6:
+                return
+            try:
+                self._str += json.loads('"' + self._escape + '"')
+            except ValueError:
+                self._str += self._escape[1:]
+            self._escape = ""
+            if len(self._str) > 1 and "\udc00" <= self._str[-1] <= "\udfff":
+                # Join a surrogate pair that arrived as two separate escapes.
+                self._str = self._str[:-2] + self._str[-2:].encode("utf-16", "surrogatepass").decode("utf-16", "replace")
+            return
+        if ch == "\\":
+            self._escape = ch
+            return
+        if ch != '"':
+            self._str += ch
+            return
+        value = self._str
+        self._str = None
+        frame = self._stack[-1]
+        if self._str_is_key:
+            frame["key"] = value
+            frame["expect"] = "colon"
+            return
+        self._complete(self._child_path(), value, events)
+
+    def _finish_scalar(self, events):
+        raw = self._scalar
+        self._scalar = ""
+        if raw in _LITERALS:
+            value = _LITERALS[raw]
+        else:
+            try:
+                value = json.loads(raw)
+            except ValueError:
+                self.error = True
+                return
+        self._complete(self._child_path(), value, events)
+
+    def _complete(self, path, value, events):
+        self.values[path] = value
+        events.append((path, value))
+        if not self._stack:
+            self.done = True
+            return
+        frame = self._stack[-1]
+        if frame["type"] == "obj":
+            frame["value"][frame["key"]] = value
+        else:
+            frame["value"].append(value)
+        frame["expect"] = "comma"
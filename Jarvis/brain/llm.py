@@ -1,6 +1,8 @@
-import requests
+import json
+import time
+
+from Jarvis.runtime import transport
 
-_SESSION = requests.Session()
 
 class LLMError(Exception):
     pass
@@ -19,11 +21,11 @@ def list_models(*, api_key, base_url, timeout_s=30):
     }
 
     try:
-        res = _SESSION.get(url, headers=headers, timeout=timeout_s)
+        res = transport.get(url, headers=headers, timeout=timeout_s)
         if not res.ok:
             raise LLMError(f"{res.status_code} {res.text}")
         data = res.json()
-    except requests.RequestException as e:
+    except transport.RequestException as e:
         raise LLMError(str(e))
 
     try:
@@ -32,7 +34,25 @@ def list_models(*, api_key, base_url, timeout_s=30):
         raise LLMError("Unexpected models response format.")
 
 
-def chat_completions(*, api_key, base_url, model, messages, timeout_s=30):
+def cached_prompt_tokens(usage):
+    """Prompt tokens the provider served from its prefix cache (OpenAI, DeepSeek and Anthropic-style usage)."""
+    if not isinstance(usage, dict):
+        return 0
+    details = usage.get("prompt_tokens_details") or {}
+    for value in (
+        details.get("cached_tokens") if isinstance(details, dict) else None,
+        usage.get("prompt_cache_hit_tokens"),
+        usage.get("cache_read_input_tokens"),
+    ):
+        try:
+            if value is not None:
+                return int(value)
+        except (TypeError, ValueError):
+            continue
+    return 0
+
+
+def chat_completions(*, api_key, base_url, model, messages, timeout_s=30, extra=None, on_usage=None):
     if not api_key:
         raise LLMError("Missing LLM API key.")
     if not base_url:
@@ -49,16 +69,107 @@ def chat_completions(*, api_key, base_url, model, messages, timeout_s=30):
         "model": model,
         "messages": messages,
     }
+    if extra:
+        payload.update(extra)
 
     try:
-        res = _SESSION.post(url, headers=headers, json=payload, timeout=timeout_s)
+        res = transport.post(url, headers=headers, json=payload, timeout=timeout_s)
         if not res.ok:
             raise LLMError(f"{res.status_code} {res.text}")
         data = res.json()
-    except requests.RequestException as e:
+    except transport.RequestException as e:
         raise LLMError(str(e))
 
+    if on_usage and isinstance(data, dict) and isinstance(data.get("usage"), dict):
+        on_usage(data["usage"])
     try:
         return data["choices"][0]["message"]["content"]
     except Exception:
         raise LLMError("Unexpected LLM response format.")
+
+
+def _iter_sse_data(res):
+    # SSE bodies are utf-8; decode lines ourselves because requests falls back
+    # to latin-1 for text/* responses without an explicit charset.
+    for raw in res.iter_lines():
+        if not raw:
+            continue
+        line = raw.decode("utf-8", errors="replace").strip()
+        if not line.startswith("data:"):
+            continue
+        data = line[5:].strip()
+        if data == "[DONE]":
+            return
+        yield data
+
+
+def chat_completions_stream(*, api_key, base_url, model, messages, timeout_s=30, extra=None, on_usage=None):
+    """
+    Stream a chat completion (``stream: true``) and yield content deltas as they arrive.
+    Providers that ignore the stream flag and answer with a plain JSON body yield it once.
+    With ``on_usage`` the final usage chunk is requested and passed to it.
+    """
+    if not api_key:
+        raise LLMError("Missing LLM API key.")
+    if not base_url:
+        raise LLMError("Missing LLM base URL.")
+    if not model:
+        raise LLMError("Missing LLM model.")
+
+    url = base_url.rstrip("/") + "/chat/completions"
+    headers = {
+        "Authorization": "Bearer " + api_key,
+        "Content-Type": "application/json",
+        "Accept": "text/event-stream",
+    }
+    payload = {
+        "model": model,
+        "messages": messages,
+        "stream": True,
+    }
+    if on_usage:
+        payload["stream_options"] = {"include_usage": True}
+    if extra:
+        payload.update(extra)
+
+    deadline = time.monotonic() + max(1, float(timeout_s))
+    try:
+        res = transport.post(url, headers=headers, json=payload, timeout=timeout_s, stream=True)
+    except transport.RequestException as e:
+        raise LLMError(str(e))
+
+    try:
+        if not res.ok:
+            raise LLMError(f"{res.status_code} {res.text}")
+        content_type = str(res.headers.get("Content-Type", "")).lower()
+        if "application/json" in content_type:
+            try:
+                data = res.json()
+                content = data["choices"][0]["message"]["content"]
+            except Exception:
+                raise LLMError("Unexpected LLM response format.")
+            if on_usage and isinstance(data.get("usage"), dict):
+                on_usage(data["usage"])
+            if content:
+                yield content
+            return
+        for data in _iter_sse_data(res):
+            if time.monotonic() > deadline:
+                raise LLMError("LLM stream timed out.")
+            try:
+                obj = json.loads(data)
+            except ValueError:
+                continue
+            if on_usage and isinstance(obj, dict) and isinstance(obj.get("usage"), dict):
+                on_usage(obj["usage"])
+            choices = obj.get("choices") if isinstance(obj, dict) else None
+            if not choices:
+                continue
+            delta = choices[0].get("delta") or {}
+            piece = delta.get("content")
+            if piece:
+                yield piece
+    except transport.RequestException as e:
+        raise LLMError(str(e))
+    finally:
+        res.close()
@@ -0,0 +1,282 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from .llm import LLMError, chat_completions
+
+
+def route_key(route):
+    _api_key, base_url, model = route
+    return f"{str(base_url).rstrip('/')}|{model}"
+
+
+class LatencyWindow:
+    """Rolling window of successful call latencies (ms) for one route."""
+
+    def __init__(self, size=200):
+        self._rows = deque(maxlen=max(1, int(size)))
+        self._lock = threading.Lock()
+
+    def add(self, ms):
+        with self._lock:
+            self._rows.append(float(ms))
+
+    def __len__(self):
+        return len(self._rows)
+
+    def quantile(self, q):
+        with self._lock:
+            rows = sorted(self._rows)
+        if not rows:
+            return None
+        idx = min(len(rows) - 1, max(0, int(round(q * (len(rows) - 1)))))
+        return rows[idx]
+
+
+class CircuitBreaker:
+    """
+    Stop sending requests to a route after ``failures`` consecutive errors.
+
+    After ``reset_s`` one probe request is let through (half-open); its
+    success closes the breaker, its failure opens it again.
+    """
+
+    def __init__(self, failures=5, reset_s=30):
+        self.failures = max(1, int(failures))
+        self.reset_s = float(reset_s)
+        self._errors = 0
+        self._opened_at = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def state(self):
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if self._probing or time.monotonic() - self._opened_at >= self.reset_s:
+                return "half_open"
+            return "open"
+
+    def allow(self):
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._probing or time.monotonic() - self._opened_at < self.reset_s:
+                return False
+            self._probing = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self._errors = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self._errors += 1
+            if self._probing or self._errors >= self.failures:
+                self._opened_at = time.monotonic()
+                self._probing = False
+                return True
+            return False
+
+
+class HedgedLLM:
+    """
+    ``chat_completions`` over an ordered list of routes ``(api_key, base_url, model)``.
+
+    The first route whose breaker is closed gets the request. If it has not
+    answered by its own p-``hedge_quantile`` latency (``default_hedge_ms``
+    until ``min_samples`` calls were seen), one hedged duplicate goes to the
+    next route (the same route when there is no other). The first answer that
+    passes ``validate`` wins; the other call is cancelled if it has not
+    started and otherwise abandoned. An error fails over to the next route
+    right away. Hedges are capped at ``max_hedge_ratio`` of recent requests so
+    a slow period cannot double the bill.
+    """
+
+    def __init__(
+        self,
+        call=chat_completions,
+        *,
+        hedge_quantile=0.9,
+        min_samples=20,
+        default_hedge_ms=2500,
+        min_hedge_ms=250,
+        max_hedge_ratio=0.15,
+        breaker_failures=5,
+        breaker_reset_s=30,
+        max_workers=8,
+        on_metric=None,
+    ):
+        self._call = call
+        self.hedge_quantile = float(hedge_quantile)
+        self.min_samples = max(1, int(min_samples))
+        self.default_hedge_ms = float(default_hedge_ms)
+        self.min_hedge_ms = float(min_hedge_ms)
+        self.max_hedge_ratio = float(max_hedge_ratio)
+        self._breaker_args = (breaker_failures, breaker_reset_s)
+        self._on_metric = on_metric
+        self._latency = {}
+        self._breakers = {}
+        self._recent = deque(maxlen=200)
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max(2, int(max_workers)), thread_name_prefix="jivan-llm")
+        self._stats = {"requests": 0, "hedges": 0, "hedge_wins": 0, "failovers": 0, "abandoned": 0, "failures": 0}
+
+    def _metric(self, name, value=1):
+        with self._lock:
+            self._stats[name] += value
+        if self._on_metric:
+            self._on_metric(f"llm_{name}", value)
+
+    def _window(self, route):
+        key = route_key(route)
+        with self._lock:
+            if key not in self._latency:
+                self._latency[key] = LatencyWindow()
+            return self._latency[key]
+
+    def breaker(self, route):
+        key = route_key(route)
+        with self._lock:
+            if key not in self._breakers:
+                self._breakers[key] = CircuitBreaker(*self._breaker_args)
+            return self._breakers[key]
+
+    def available(self, route):
+        return self.breaker(route).state() != "open"
+
+    def hedge_delay_ms(self, route):
+        window = self._window(route)
+        if len(window) < self.min_samples:
+            return self.default_hedge_ms
+        return max(self.min_hedge_ms, window.quantile(self.hedge_quantile))
+
+    def _hedge_allowed(self):
+        with self._lock:
+            if not self._recent:
+                return True
+            return sum(self._recent) / float(len(self._recent)) < self.max_hedge_ratio
+
+    def _run(self, route, messages, timeout_s, extra, on_usage):
+        api_key, base_url, model = route
+        started = time.perf_counter()
+        breaker = self.breaker(route)
+        try:
+            content = self._call(
+                api_key=api_key,
+                base_url=base_url,
+                model=model,
+                messages=messages,
+                timeout_s=timeout_s,
+                extra=extra,
+                on_usage=on_usage,
+            )
+        except Exception:
+            if breaker.record_failure() and self._on_metric:
+                self._on_metric("llm_breaker_opened", 1)
+            raise
+        breaker.record_success()
+        self._window(route).add((time.perf_counter() - started) * 1000.0)
+        return content
+
+    def _take(self, candidates):
+        # allow() claims the half-open probe, so only ask it for the route about to be used.
+        while candidates:
+            route = candidates.pop(0)
+            if self.breaker(route).allow():
+                return route
+        return None
+
+    def complete(self, routes, messages, *, timeout_s, extra=None, on_usage=None, validate=None):
+        ordered = []
+        for route in routes:
+            if route and route[1] and route[2] and route_key(route) not in {route_key(r) for r in ordered}:
+                ordered.append(route)
+        if not ordered:
+            raise LLMError("No LLM route configured.")
+        candidates = list(ordered)
+        primary = self._take(candidates)
+        if primary is None:
+            self._metric("failures")
+            raise LLMError("LLM circuit open for every configured model.")
+        self._metric("requests")
+
+        deadline = time.monotonic() + max(1.0, float(timeout_s))
+        pending = {}
+
+        def _launch(route, kind):
+            remaining = max(1.0, deadline - time.monotonic())
+            future = self._executor.submit(self._run, route, messages, remaining, extra, on_usage)
+            pending[future] = kind
+
+        _launch(primary, "primary")
+        hedge_at = time.monotonic() + self.hedge_delay_ms(primary) / 1000.0
+        hedged = False  # the hedge deadline passed (checked once)
+        launched = False  # a hedge request was actually sent; only these count against max_hedge_ratio
+        fallback, last_error = None, None
+        try:
+            while pending:
+                now = time.monotonic()
+                if now >= deadline:
+                    break
+                wait_s = deadline - now
+                if not hedged:
+                    wait_s = min(wait_s, max(0.0, hedge_at - now))
+                done, _ = wait(list(pending), timeout=wait_s, return_when=FIRST_COMPLETED)
+                for future in done:
+                    kind = pending.pop(future)
+                    try:
+                        content = future.result()
+                    except Exception as e:
+                        last_error = e
+                        if not pending:
+                            route = self._take(candidates)
+                            if route is not None:
+                                self._metric("failovers")
+                                _launch(route, "failover")
+                        continue
+                    if validate is None or validate(content):
+                        if kind == "hedge":
+                            self._metric("hedge_wins")
+                        return content
+                    if fallback is None:
+                        fallback = content
+                if not done and not hedged and time.monotonic() >= hedge_at:
+                    hedged = True
+                    if self._hedge_allowed():
+                        launched = True
+                        self._metric("hedges")
+                        _launch(self._take(candidates) or primary, "hedge")
+        finally:
+            with self._lock:
+                self._recent.append(1 if launched else 0)
+            for future in pending:
+                if not future.cancel():
+                    self._metric("abandoned")
+        if fallback is not None:
+            return fallback
+        self._metric("failures")
+        if isinstance(last_error, LLMError):
+            raise last_error
+        raise LLMError(str(last_error) if last_error else "LLM request timed out.")
+
+    def stats(self):
+        with self._lock:
+            out = dict(self._stats)
+            keys = sorted(set(self._latency) | set(self._breakers))
+        routes = {}
+        for key in keys:
+            window = self._latency.get(key)
+            breaker = self._breakers.get(key)
+            routes[key] = {
+                "samples": len(window) if window else 0,
+                "p50_ms": window.quantile(0.5) if window else None,
+                "p90_ms": window.quantile(0.9) if window else None,
+                "breaker": breaker.state() if breaker else "closed",
+            }
+        out["routes"] = routes
+        return out
@@ -2,7 +2,7 @@ import json
 import re
 import time
 
-import requests
+from Jarvis.runtime import transport
 try:
     from Jarvis.runtime.receipts import record_receipt
 except Exception:
@@ -637,7 +637,7 @@ class ComposioMCPClient:
         if params is not None:
             payload["params"] = params
         try:
-            resp = requests.post(
+            resp = transport.post(
                 self.tool_router_url,
                 headers=self._router_headers(),
                 json=payload,
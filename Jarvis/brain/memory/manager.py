@@ -9,15 +9,13 @@ import threading
 
 from Jarvis.config import config
 
+from .token_index import TokenIndex, token_set
+
 
 def _now_iso():
     return datetime.datetime.now().isoformat(timespec="seconds")
 
 
-def _tokenize(text):
-    return [t for t in re.split(r"[^a-zA-Z0-9_]+", str(text or "").lower()) if len(t) > 1]
-
-
 def _is_sensitive(text):
     t = str(text or "").lower()
     sensitive_markers = (
@@ -62,6 +60,10 @@ class MemoryManager:
                 os.path.join(os.path.dirname(__file__), "..", "..", "..", "memories_local.jsonl")
             )
         self.local_path = local_path
+        # Local store rows are indexed incrementally: each retrieval only parses lines appended since the last one.
+        self._local_index = TokenIndex()
+        self._local_offset = 0
+        self._local_lock = threading.Lock()
         self._sdk_client = self._init_sdk_client()
         self._sdk_retry_ts = 0.0
         self._health_cache = None
@@ -136,8 +138,8 @@ class MemoryManager:
         return rows if isinstance(rows, list) else []
 
     def _score_relevance(self, *, query, text):
-        q_tokens = set(_tokenize(query))
-        t_tokens = set(_tokenize(text))
+        q_tokens = token_set(query)
+        t_tokens = token_set(text)
         if not q_tokens:
             return 0.0
         overlap = len(q_tokens.intersection(t_tokens))
@@ -322,42 +324,56 @@ class MemoryManager:
             return False
         return True
 
-    def _retrieve_local(self, query):
+    def _refresh_local_index(self):
         path = self.local_path
-        if not os.path.exists(path):
-            return []
-        q_tokens = set(_tokenize(query))
-        rows = []
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    try:
-                        row = json.loads(line)
-                    except ValueError:
-                        continue
-                    if not isinstance(row, dict):
-                        continue
-                    if row.get("user_id") != self.user_id:
-                        continue
-                    text = str(row.get("text", ""))
-                    tks = set(_tokenize(text))
-                    overlap = len(q_tokens.intersection(tks)) if q_tokens else 0
-                    score = overlap
-                    # Slight freshness boost.
-                    if row.get("created_at"):
-                        score += 0.2
-                    rows.append((score, row))
+            size = os.path.getsize(path)
         except OSError:
-            return []
+            return
+        if size < self._local_offset:
+            # Store was truncated or replaced; rebuild from scratch.
+            self._local_index = TokenIndex()
+            self._local_offset = 0
+        if size == self._local_offset:
+            return
+        try:
+            with open(path, "rb") as f:
+                f.seek(self._local_offset)
+                chunk = f.read()
+        except OSError:
+            return
+        end = chunk.rfind(b"\n") + 1
+        self._local_offset += end
+        for raw in chunk[:end].splitlines():
+            line = raw.decode("utf-8", errors="replace").strip()
+            if not line:
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                continue
+            if not isinstance(row, dict):
+                continue
+            if row.get("user_id") != self.user_id:
+                continue
+            self._local_index.add(row, str(row.get("text", "")))
 
-        rows.sort(key=lambda x: x[0], reverse=True)
-        # If query has no overlap, still return latest few memories.
-        if rows and rows[0][0] <= 0:
-            return [r for _s, r in rows[-self.max_items :]][::-1]
-        return [r for _s, r in rows[: self.max_items]]
+    def _retrieve_local(self, query):
+        if not os.path.exists(self.local_path):
+            return []
+        with self._local_lock:
+            self._refresh_local_index()
+            index = self._local_index
+            scores = index.overlaps(query)
+            picked = sorted(scores, key=lambda k: (-scores[k], k))[: self.max_items]
+            # If query has no (or little) overlap, still return the latest few memories.
+            if len(picked) < self.max_items:
+                for key in reversed(list(index.keys())):
+                    if key not in scores:
+                        picked.append(key)
+                        if len(picked) >= self.max_items:
+                            break
+            return [index.row(k) for k in picked]
 
     def _save_remote_conversation(self, *, user_text, assistant_reply):
         if not self._sdk_client:
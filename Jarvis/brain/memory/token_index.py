@@ -0,0 +1,86 @@
+import functools
+import re
+
+_SPLIT = re.compile(r"[^a-zA-Z0-9_]+")
+
+
+@functools.lru_cache(maxsize=4096)
+def token_set(text):
+    """Lowercase word tokens (2+ chars) of ``text``; memoized, so repeated rows are tokenized once."""
+    return frozenset(t for t in _SPLIT.split(str(text or "").lower()) if len(t) > 1)
+
+
+class TokenIndex:
+    """
+    Rows with precomputed token sets and an inverted token -> row index.
+
+    Rows keep insertion order. ``overlaps(query)`` only visits the postings of
+    the query's tokens, so scoring costs time proportional to the matches, not
+    to the number of rows. With ``max_rows`` the oldest rows are dropped.
+    """
+
+    def __init__(self, max_rows=0):
+        self.max_rows = max(0, int(max_rows or 0))
+        self._rows = {}
+        self._tokens = {}
+        self._postings = {}
+        self._seq = 0
+
+    def add(self, row, text):
+        self._seq += 1
+        key = self._seq
+        tokens = token_set(text)
+        self._rows[key] = row
+        self._tokens[key] = tokens
+        for token in tokens:
+            self._postings.setdefault(token, set()).add(key)
+        while self.max_rows and len(self._rows) > self.max_rows:
+            self.discard(next(iter(self._rows)))
+        return key
+
+    def discard(self, key):
+        if self._rows.pop(key, None) is None:
+            return
+        for token in self._tokens.pop(key, ()):
+            bucket = self._postings.get(token)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._postings[token]
+
+    def overlaps(self, query):
+        """``{key: number of query tokens in the row}`` for rows sharing at least one token."""
+        out = {}
+        for token in token_set(query):
+            for key in self._postings.get(token, ()):
+                out[key] = out.get(key, 0) + 1
+        return out
+
+    def rows(self):
+        return list(self._rows.values())
+
+    def row(self, key):
+        return self._rows.get(key)
+
+    def keys(self):
+        return iter(self._rows)
+
+    def __len__(self):
+        return len(self._rows)
+
+    def top(self, query, k):
+        """
+        Up to ``k`` rows, best overlap first (earlier rows win ties), returned in insertion order.
+
+        When fewer than ``k`` rows match, the earliest non-matching rows fill the
+        remaining slots, as a stable sort by score would.
+        """
+        scores = self.overlaps(query)
+        picked = sorted(scores, key=lambda key: (-scores[key], key))[:k]
+        if len(picked) < k:
+            for key in self._rows:
+                if key not in scores:
+                    picked.append(key)
+                    if len(picked) >= k:
+                        break
+        return [self._rows[key] for key in sorted(picked)]
@@ -0,0 +1,40 @@
+import hashlib
+import threading
+
+
+class StaticPromptPrefix:
+    """
+    Immutable system-prompt prefix that is rebuilt only when its inputs change.
+
+    ``get(*parts)`` compares the parts with the previous call (identical string
+    objects compare in O(1)), so an unchanged SOUL.md and catalog cost nothing
+    per turn. The prefix always comes first in the system message, which keeps
+    it byte-identical across turns for provider-side prefix caching; ``digest``
+    identifies the current version (e.g. as a ``prompt_cache_key``).
+    """
+
+    def __init__(self, build):
+        self._build = build
+        self._parts = None
+        self._lock = threading.Lock()
+        self.text = ""
+        self.digest = ""
+        self.rebuilds = 0
+
+    def get(self, *parts):
+        with self._lock:
+            if self._parts != parts:
+                text = self._build(*parts)
+                self.text = text
+                self.digest = hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+                self._parts = parts
+                self.rebuilds += 1
+            return self.text, self.digest
+
+
+def join_system_prompt(prefix, *dynamic):
+    """Static prefix first, then the non-empty per-turn blocks."""
+    tail = "\n\n".join(str(x) for x in dynamic if x)
+    if not tail:
+        return prefix
+    return prefix + "\n\n" + tail
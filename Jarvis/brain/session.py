@@ -0,0 +1,125 @@
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_SESSION_ID = "default"
+
+
+class BrainSession:
+    """
+    State of one conversation: its history window (and its token index),
+    Redis buffer (own key), rolling summary, preferred language and last
+    source context.
+
+    ``lock`` serializes turns of the same session so history stays ordered;
+    different sessions run concurrently over the brain's shared clients.
+    """
+
+    def __init__(self, session_id, *, buffer, summary, history_index=None, lang="", source_context=None):
+        self.id = str(session_id)
+        self.buffer = buffer
+        self.summary = summary
+        self.history = []
+        # Token index over the rows of ``history`` the prompt can see (kept in step by the brain).
+        self.history_index = history_index
+        self.lang = str(lang or "")
+        self.source_context = dict(source_context or {})
+        self.lock = threading.RLock()
+        self.created_ts = time.time()
+        self.last_used_ts = self.created_ts
+        self.turns = 0
+
+    def touch(self):
+        self.last_used_ts = time.time()
+
+    def info(self):
+        return {
+            "id": self.id,
+            "lang": self.lang,
+            "source": str(self.source_context.get("source", "") or ""),
+            "turns": self.turns,
+            "history_rows": len(self.history),
+            "idle_s": round(time.time() - self.last_used_ts, 1),
+        }
+
+
+class SessionStore:
+    """
+    Live sessions by id, created on first use with ``factory(session_id)``.
+
+    The least recently used session is dropped once ``max_sessions`` is
+    exceeded and sessions idle for ``idle_ttl_s`` are dropped on access;
+    neither drops a session while one of its turns is running.
+    Dropping only forgets the in-process state; a Redis-backed history is
+    read back when the session returns.
+    """
+
+    def __init__(self, factory, *, max_sessions=256, idle_ttl_s=3600, pinned=()):
+        self._factory = factory
+        self.max_sessions = max(1, int(max_sessions))
+        self.idle_ttl_s = float(idle_ttl_s)
+        self._pinned = set(pinned)
+        self._rows = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"created": 0, "evicted": 0, "expired": 0}
+
+    def get(self, session_id):
+        sid = str(session_id or DEFAULT_SESSION_ID)
+        with self._lock:
+            self._expire_locked()
+            session = self._rows.get(sid)
+            if session is None:
+                session = self._factory(sid)
+                self._rows[sid] = session
+                self._stats["created"] += 1
+                self._evict_locked()
+            self._rows.move_to_end(sid)
+            session.touch()
+            return session
+
+    def peek(self, session_id):
+        with self._lock:
+            return self._rows.get(str(session_id or DEFAULT_SESSION_ID))
+
+    def drop(self, session_id):
+        with self._lock:
+            return self._rows.pop(str(session_id or ""), None) is not None
+
+    def __len__(self):
+        return len(self._rows)
+
+    def sessions(self):
+        with self._lock:
+            return list(self._rows.values())
+
+    def stats(self):
+        out = dict(self._stats)
+        out["active"] = len(self._rows)
+        return out
+
+    def _expire_locked(self):
+        if self.idle_ttl_s <= 0:
+            return
+        cutoff = time.time() - self.idle_ttl_s
+        for sid in [k for k, s in self._rows.items() if s.last_used_ts < cutoff and k not in self._pinned]:
+            session = self._rows[sid]
+            # A session that is mid-turn is still in use however long the turn takes.
+            if not session.lock.acquire(blocking=False):
+                continue
+            session.lock.release()
+            del self._rows[sid]
+            self._stats["expired"] += 1
+
+    def _evict_locked(self):
+        for sid in list(self._rows):
+            if len(self._rows) <= self.max_sessions:
+                return
+            if sid in self._pinned:
+                continue
+            session = self._rows[sid]
+            # As in _expire_locked: a session that is mid-turn stays, even over the limit.
+            if not session.lock.acquire(blocking=False):
+                continue
+            session.lock.release()
+            del self._rows[sid]
+            self._stats["evicted"] += 1
@@ -0,0 +1,349 @@
+import os
+import re
+
+# Command phrases that precede the slot value, per slot kind. All languages are
+# tried (the detected language is only a hint); longer phrases win.
+_PREFIXES = {
+    "search": {
+        "en": ("search the web for", "search google for", "search online for", "search for", "look up", "google",
+               "search", "find"),
+        "ru": ("найди в интернете", "поищи в интернете", "найди", "поищи", "загугли"),
+        "de": ("suche im internet nach", "suche nach", "such nach", "google", "suche"),
+    },
+    "open": {
+        "en": ("please open", "open up", "open", "launch", "start", "run"),
+        "ru": ("открой", "запусти", "включи"),
+        "de": ("öffne", "starte", "mach auf"),
+    },
+    "place": {
+        "en": ("how far is it to", "how far is", "directions to", "distance to", "where is", "show me", "find"),
+        "ru": ("как далеко до", "где находится", "маршрут до", "где"),
+        "de": ("wie weit ist es nach", "wie weit ist", "route nach", "wo ist"),
+    },
+    "note": {
+        "en": ("take a note that", "take a note", "make a note that", "make a note", "note that", "write down",
+               "note"),
+        "ru": ("запиши что", "запиши", "заметка"),
+        "de": ("notiere dass", "notiere", "schreib auf"),
+    },
+    "copy": {
+        "en": ("copy to clipboard", "copy"),
+        "ru": ("скопируй в буфер", "скопируй"),
+        "de": ("kopiere in die zwischenablage", "kopiere"),
+    },
+    "topic": {
+        "en": ("tell me about", "who is", "who was", "what is", "what are", "search wikipedia for", "wikipedia"),
+        "ru": ("расскажи про", "расскажи о", "кто такой", "кто такая", "что такое", "кто такие"),
+        "de": ("erzähl mir von", "erzähl mir über", "wer ist", "wer war", "was ist", "was sind"),
+    },
+    "error": {
+        "en": ("explain this error", "explain the error", "explain error", "what does this error mean"),
+        "ru": ("объясни ошибку", "что значит ошибка"),
+        "de": ("erkläre den fehler", "erkläre fehler", "was bedeutet der fehler"),
+    },
+    "meeting": {
+        "en": ("create meeting notes for", "create meeting note for", "meeting notes for", "meeting note for",
+               "create meeting notes", "create meeting note", "meeting notes", "meeting note"),
+        "ru": ("заметки о встрече", "заметка о встрече", "встреча"),
+        "de": ("besprechungsnotiz für", "besprechungsnotiz"),
+    },
+    "todo_add": {
+        "en": ("add a task", "add task", "add"),
+        "ru": ("добавь задачу", "добавь"),
+        "de": ("füge aufgabe hinzu", "füge hinzu", "neue aufgabe"),
+    },
+}
+_TRAILING = re.compile(
+    r"[\s,]*(?:\bplease|\bfor me|\bpls|\bпожалуйста|\bbitte)?[\s.!?,]*$",
+    re.IGNORECASE,
+)
+_TODO_SUFFIX = re.compile(
+    r"\s+(?:to|on|in)\s+(?:my\s+|the\s+)?(?:todo|to-do|to do|task)s?(?:\s+list)?\s*$"
+    r"|\s+в\s+(?:мой\s+)?(?:список\s+)?(?:задач|дел)\w*\s*$"
+    r"|\s+(?:zu|auf)\s+(?:meiner\s+|die\s+)?(?:aufgaben|todo)\w*(?:\s*liste)?\s*$",
+    re.IGNORECASE,
+)
+
+_NUMBER_WORDS = {
+    "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7, "eight": 8, "nine": 9, "ten": 10,
+    "eleven": 11, "twelve": 12, "fifteen": 15, "twenty": 20,
+    "один": 1, "одна": 1, "два": 2, "две": 2, "три": 3, "четыре": 4, "пять": 5, "шесть": 6, "семь": 7,
+    "восемь": 8, "девять": 9, "десять": 10,
+    "eins": 1, "zwei": 2, "drei": 3, "vier": 4, "fünf": 5, "sechs": 6, "sieben": 7, "acht": 8, "neun": 9,
+    "zehn": 10,
+}
+_NUMBER = re.compile(r"\b(\d{1,6})\b")
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+# Word stems of language names (en/ru/de) -> canonical English name.
+_LANGUAGE_STEMS = (
+    ("engl", "English"), ("англ", "English"),
+    ("germ", "German"), ("deutsch", "German"), ("немец", "German"), ("немецк", "German"),
+    ("russ", "Russian"), ("русск", "Russian"),
+    ("french", "French"), ("franz", "French"), ("франц", "French"),
+    ("span", "Spanish"), ("испан", "Spanish"),
+    ("ital", "Italian"), ("итальян", "Italian"),
+    ("portug", "Portuguese"), ("португ", "Portuguese"),
+    ("chin", "Chinese"), ("китай", "Chinese"),
+    ("japan", "Japanese"), ("япон", "Japanese"),
+    ("armen", "Armenian"), ("армян", "Armenian"),
+    ("ukrain", "Ukrainian"), ("украин", "Ukrainian"),
+    ("turk", "Turkish"), ("türk", "Turkish"), ("турец", "Turkish"),
+)
+_TRANSLATE = re.compile(
+    r"^(?:please\s+)?(?:translate|переведи|übersetze)\s+(?P<text>.+?)\s+"
+    r"(?:to|into|in|на|ins|auf|nach)\s+(?P<lang>\w+)(?:\s+language)?[\s.!?]*$",
+    re.IGNORECASE,
+)
+
+_WEATHER_CITY = re.compile(
+    r"\b(?:weather|forecast|погода|прогноз|wetter)(?:\s+like)?(?:\s+(?:in|for|в|во|für))?\s+(.+)$",
+    re.IGNORECASE,
+)
+_DOMAIN = re.compile(r"\b((?:[a-z0-9-]+\.)+[a-z]{2,})(/[^\s]*)?", re.IGNORECASE)
+_SITES = {
+    "youtube": "youtube.com",
+    "github": "github.com",
+    "google": "google.com",
+    "gmail": "mail.google.com",
+    "wikipedia": "wikipedia.org",
+    "reddit": "reddit.com",
+    "stack overflow": "stackoverflow.com",
+    "stackoverflow": "stackoverflow.com",
+    "linkedin": "linkedin.com",
+    "twitter": "x.com",
+}
+
+_QUOTED = re.compile(r"[\"'«“]([^\"'»”]+)[\"'»”]")
+_WIN_PATH = re.compile(r"\b[a-zA-Z]:\\[^\s\"']*")
+_UNIX_PATH = re.compile(r"(?:^|\s)((?:~|\.{1,2})?/[^\s\"']+)")
+_KNOWN_FOLDERS = (
+    (("downloads", "загрузк", "загрузок", "download"), "~/Downloads"),
+    (("desktop", "рабочий стол", "рабочем столе", "schreibtisch"), "~/Desktop"),
+    (("documents", "документ", "dokumente"), "~/Documents"),
+    (("pictures", "photos", "изображен", "картинк", "bilder"), "~/Pictures"),
+    (("music", "музык", "musik"), "~/Music"),
+    (("videos", "видео"), "~/Videos"),
+)
+_EXTENSION = re.compile(r"\b(?:\*?\.)?(pdf|docx?|xlsx?|pptx?|txt|md|csv|json|py|jpe?g|png|gif|mp3|mp4|wav|zip)\b"
+                        r"(?:\s+(?:files?|файл\w*|dateien?))?", re.IGNORECASE)
+_ERROR_MARKERS = re.compile(r"(?:Error|Exception|Traceback|errno|failed|ошибка|fehler)", re.IGNORECASE)
+
+
+def _clean(value):
+    value = _TRAILING.sub("", str(value or "").strip()).strip(" :,-\"'")
+    return value
+
+
+def strip_prefix(text, kind):
+    """Text after the longest command phrase of ``kind`` at its start, or None when none matches."""
+    src = str(text or "").strip()
+    lowered = src.lower()
+    best = ""
+    for phrases in _PREFIXES.get(kind, {}).values():
+        for phrase in phrases:
+            if len(phrase) <= len(best):
+                continue
+            if lowered == phrase or lowered.startswith(phrase + " ") or lowered.startswith(phrase + ":"):
+                best = phrase
+    if not best:
+        return None
+    return _clean(src[len(best) :]) or None
+
+
+def parse_number(text):
+    """First integer in ``text``, as digits or a number word (en/ru/de), or None."""
+    m = _NUMBER.search(str(text or ""))
+    if m:
+        return int(m.group(1))
+    for word in _WORD.findall(str(text or "").lower()):
+        if word in _NUMBER_WORDS:
+            return _NUMBER_WORDS[word]
+    return None
+
+
+def parse_language(word):
+    token = str(word or "").strip().lower()
+    for stem, name in _LANGUAGE_STEMS:
+        if token.startswith(stem):
+            return name
+    return None
+
+
+def parse_path(text):
+    """A filesystem path from ``text``: quoted, absolute/relative, or a well-known folder name."""
+    src = str(text or "")
+    for m in _QUOTED.finditer(src):
+        candidate = m.group(1).strip()
+        if "/" in candidate or "\\" in candidate:
+            return candidate
+    m = _WIN_PATH.search(src)
+    if m:
+        return m.group(0).rstrip(".,;")
+    m = _UNIX_PATH.search(src)
+    if m:
+        return m.group(1).rstrip(".,;")
+    lowered = src.lower()
+    for names, folder in _KNOWN_FOLDERS:
+        if any(name in lowered for name in names):
+            return os.path.expanduser(folder)
+    return None
+
+
+def _prefixed(kind, *, whole=False):
+    def extract(text, _lang):
+        value = strip_prefix(text, kind)
+        if value is None and whole:
+            value = _clean(text) or None
+        return value
+
+    return extract
+
+
+def _city(text, _lang):
+    m = _WEATHER_CITY.search(str(text or "").strip().lower())
+    if not m:
+        return None
+    city = re.sub(r"\s+(?:today|tomorrow|now|right now|сегодня|завтра|сейчас|heute|morgen|jetzt)$", "", _clean(m.group(1)))
+    return _clean(city) or None
+
+
+def _whole(text, _lang):
+    return _clean(text) or None
+
+
+def _domain(text, _lang):
+    src = str(text or "")
+    m = _DOMAIN.search(src)
+    if m:
+        return m.group(0).rstrip(".,;")
+    lowered = src.lower()
+    for name, domain in _SITES.items():
+        if re.search(rf"\b{re.escape(name)}\b", lowered):
+            return domain
+    return None
+
+
+def _translate_text(text, _lang):
+    m = _TRANSLATE.match(str(text or "").strip())
+    if m and parse_language(m.group("lang")):
+        return _clean(m.group("text")) or None
+    return None
+
+
+def _target_language(text, _lang):
+    m = _TRANSLATE.match(str(text or "").strip())
+    if m:
+        return parse_language(m.group("lang"))
+    words = _WORD.findall(str(text or "").lower())
+    for prev, word in zip(words, words[1:]):
+        if prev in ("to", "into", "на", "ins", "auf", "nach"):
+            name = parse_language(word)
+            if name:
+                return name
+    return None
+
+
+def _error_text(text, _lang):
+    value = strip_prefix(text, "error")
+    if value:
+        return value
+    return _clean(text) if _ERROR_MARKERS.search(str(text or "")) else None
+
+
+def _todo_action(text, _lang):
+    lowered = str(text or "").lower()
+    if re.search(r"\b(?:done|complete|completed|finish|finished|check off|tick)\b|выполн|сделан|erledigt", lowered):
+        return "done"
+    if strip_prefix(text, "todo_add") or re.search(r"\bremind me to\b|напомни", lowered):
+        return "add"
+    if re.search(r"\b(?:list|show|what are|read)\b|покажи|список|zeige|liste", lowered):
+        return "list"
+    return None
+
+
+def _todo_text(text, lang):
+    value = strip_prefix(text, "todo_add")
+    if not value:
+        m = re.search(r"\bremind me to\s+(.+)$", str(text or ""), re.IGNORECASE)
+        value = m.group(1) if m else None
+    if not value:
+        return None
+    return _clean(_TODO_SUFFIX.sub("", value)) or None
+
+
+def _number(text, _lang):
+    return parse_number(text)
+
+
+def _path(text, _lang):
+    return parse_path(text)
+
+
+def _glob(text, _lang):
+    m = _EXTENSION.search(str(text or ""))
+    return f"*.{m.group(1).lower()}" if m else None
+
+
+def _joke_language(text, _lang):
+    for ch in str(text or ""):
+        code = ord(ch)
+        if 0x0530 <= code <= 0x058F:
+            return "hy"
+        if 0x0400 <= code <= 0x04FF:
+            return "ru"
+    return None
+
+
+# tool name -> {arg name: extractor(text, lang) -> value or None}
+SLOT_EXTRACTORS = {
+    "weather": {"city": _city},
+    "wikipedia": {"topic": _prefixed("topic")},
+    "wolframalpha": {"query": _whole},
+    "web_search": {"query": _prefixed("search", whole=True)},
+    "google_search": {"query": _prefixed("search", whole=True)},
+    "launch_app": {"app": _prefixed("open")},
+    "app_launch_fuzzy": {"app": _prefixed("open"), "path": _path},
+    "open_website": {"domain": _domain},
+    "location": {"place": _prefixed("place")},
+    "take_note": {"text": _prefixed("note")},
+    "clipboard_set": {"text": _prefixed("copy")},
+    "translate_text": {"text": _translate_text, "target_language": _target_language},
+    "explain_error": {"error_text": _error_text},
+    "meeting_note_create": {"title": _prefixed("meeting")},
+    "joke": {"language": _joke_language},
+    "todo_manage": {"action": _todo_action, "text": _todo_text, "index": _number},
+    "file_search": {"root": _path, "glob": _glob},
+    "system_health": {"top_n": _number},
+    "clipboard_history": {"limit": _number},
+    "batch_rename": {"directory": _path},
+    "ffmpeg_convert": {"input_path": _path},
+}
+
+
+def _empty(value):
+    return value in ("", None)
+
+
+def fill_slots(tool_name, tool_args, user_text, *, required=(), lang="en"):
+    """
+    Fill empty ``tool_args`` from ``user_text`` with the tool's declared extractors.
+
+    Args the planner already set are never overwritten, and boolean confirmations
+    are never inferred. Returns ``(args, filled, missing)``: the merged args, the
+    names filled locally, and the ``required`` names that are still empty.
+    """
+    args = dict(tool_args or {})
+    filled = []
+    for name, extract in SLOT_EXTRACTORS.get(str(tool_name or ""), {}).items():
+        if not _empty(args.get(name)):
+            continue
+        try:
+            value = extract(str(user_text or ""), lang)
+        except Exception:
+            value = None
+        if not _empty(value):
+            args[name] = value
+            filled.append(name)
+    missing = [k for k in required or () if _empty(args.get(k))]
+    return args, filled, missing
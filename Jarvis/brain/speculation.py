@@ -0,0 +1,89 @@
+import re
+
+# Side-effect-free, cacheable tools that are safe to start before the planner answers.
+SPECULATIVE_TOOLS = ("weather", "news", "wikipedia", "get_time", "ip_address")
+
+_WEATHER_HINT = re.compile(
+    r"\b(forecast|rain(?:ing|y)?|snow(?:ing|y)?|sunny|umbrella|temperature|degrees|"
+    r"how\s+(?:hot|cold|warm)|погод\w*|прогноз\w*|дожд\w*|wetter|regnet|regen|temperatur)\b",
+    re.IGNORECASE,
+)
+_WEATHER_CITY = re.compile(
+    r"\b(?:in|for|at|в|во|для)\s+([^\W\d_][\w\- ]*?)"
+    r"(?:\s+(?:today|tonight|tomorrow|now|this\s+\w+|сегодня|завтра|сейчас|heute|morgen|jetzt))?\s*[?.!]*$",
+    re.IGNORECASE,
+)
+_NEWS_HINT = re.compile(
+    r"(what'?s\s+happening|current\s+events|latest\s+(?:stories|updates)|top\s+stories|"
+    r"новост\w*|что\s+нового\s+в\s+мире|nachrichten|schlagzeilen)",
+    re.IGNORECASE,
+)
+_TIME_HINT = re.compile(
+    r"(what\s+hour|the\s+clock|который\s+час|сколько\s+времени|wie\s+spät|uhrzeit)",
+    re.IGNORECASE,
+)
+_IP_HINT = re.compile(r"\b(?:my|public|external)\s+ip\b|ip[\s-]?(?:адрес|adresse)", re.IGNORECASE)
+_TOPIC_PREFIXES = (
+    "who was ",
+    "who's ",
+    "what was ",
+    "look up ",
+    "search wikipedia for ",
+    "wikipedia ",
+    "кто такой ",
+    "кто такая ",
+    "что такое ",
+    "wer ist ",
+    "wer war ",
+    "was ist ",
+)
+
+
+def _clean(value):
+    return re.sub(r"\s+", " ", str(value or "")).strip(" ?.!,;:")
+
+
+def predict_tool(user_text):
+    """
+    Guess ``(tool_name, tool_args)`` for phrasings the deterministic router misses.
+
+    Only returns tools from ``SPECULATIVE_TOOLS`` and only when every arg the
+    tool needs could be read from the text; otherwise returns ``None``.
+    """
+    text = _clean(user_text)
+    lowered = text.lower()
+    if not lowered:
+        return None
+
+    if _IP_HINT.search(lowered):
+        return ("ip_address", {})
+    if _TIME_HINT.search(lowered):
+        return ("get_time", {})
+    if _NEWS_HINT.search(lowered):
+        return ("news", {})
+    if _WEATHER_HINT.search(lowered):
+        m = _WEATHER_CITY.search(text)
+        city = _clean(m.group(1)) if m else ""
+        if city:
+            return ("weather", {"city": city})
+        return None
+    for prefix in _TOPIC_PREFIXES:
+        if lowered.startswith(prefix):
+            topic = _clean(text[len(prefix) :])
+            if topic and not re.search(r"\d", topic):
+                return ("wikipedia", {"topic": topic})
+            return None
+    return None
+
+
+def _norm_arg(value):
+    if isinstance(value, str):
+        return _clean(value).lower()
+    return value
+
+
+def args_match(predicted, planned):
+    """Compare tool args ignoring case, surrounding punctuation and empty values."""
+    a = {k: _norm_arg(v) for k, v in (predicted or {}).items() if v not in ("", None)}
+    b = {k: _norm_arg(v) for k, v in (planned or {}).items() if v not in ("", None)}
+    return a == b
@@ -0,0 +1,137 @@
+import re
+
+from .json_stream import IncrementalJSONObject
+
+_SENTENCE_END = re.compile(r"[.!?…]+[\"')\]»]*\s")
+_CLAUSE_BREAK = re.compile(r"[,;:—]\s")
+_ABBREVIATIONS = ("mr.", "mrs.", "ms.", "dr.", "st.", "vs.", "etc.", "e.g.", "i.e.", "z.b.", "usw.", "т.е.", "т.д.")
+
+
+class SentenceChunker:
+    """
+    Collect streamed text and emit completed sentences (or long clauses) so TTS
+    can start speaking before generation finishes.
+    """
+
+    def __init__(self, emit, *, min_chars=16, max_chars=220):
+        self._emit = emit
+        self._min_chars = max(1, int(min_chars))
+        self._max_chars = max(self._min_chars + 1, int(max_chars))
+        self._buf = ""
+        self.emitted = 0
+
+    def feed(self, text):
+        if not text:
+            return
+        self._buf += str(text)
+        while True:
+            cut = self._next_cut()
+            if cut <= 0:
+                return
+            self._push(self._buf[:cut])
+            self._buf = self._buf[cut:]
+
+    def flush(self):
+        rest = self._buf
+        self._buf = ""
+        self._push(rest)
+
+    def discard(self):
+        """Drop text not spoken yet."""
+        self._buf = ""
+
+    def _next_cut(self):
+        for m in _SENTENCE_END.finditer(self._buf):
+            end = m.end()
+            head = self._buf[: m.start() + 1].rstrip()
+            if len(head.strip()) < self._min_chars:
+                continue
+            last_word = head.split()[-1].lower() if head.split() else ""
+            if last_word in _ABBREVIATIONS:
+                continue
+            return end
+        if len(self._buf) >= self._max_chars:
+            window = self._buf[: self._max_chars]
+            breaks = [m.end() for m in _CLAUSE_BREAK.finditer(window) if m.end() >= self._min_chars]
+            if breaks:
+                return breaks[-1]
+            space = window.rfind(" ")
+            return space + 1 if space >= self._min_chars else self._max_chars
+        return 0
+
+    def _push(self, piece):
+        sentence = str(piece or "").strip()
+        if not sentence:
+            return
+        self.emitted += 1
+        self._emit(sentence)
+
+
+def _structured_start(text):
+    """Index of the first ``{`` or backtick in ``text``; -1 when it is prose so far."""
+    hits = [i for i in (text.find("{"), text.find("`")) if i >= 0]
+    return min(hits) if hits else -1
+
+
+class ReplyTextStream:
+    """
+    Extract the user-facing reply text from a streamed planner/formatter answer.
+
+    JSON answers only stream the ``reply`` field once ``"action":"reply"`` is seen;
+    answers that do not look like JSON are streamed as plain text. Prose that
+    turns into JSON or a code fence part-way (``Sure! {"action": ...``) stops
+    being spoken there; the rest is only parsed, so a plan is never read aloud.
+    """
+
+    def __init__(self, chunker, *, max_chars=1200):
+        self._chunker = chunker
+        self._max_chars = int(max_chars)
+        self._raw = ""
+        self._mode = ""
+        self._decoded_len = 0
+        self._muted = False
+        self.parser = IncrementalJSONObject()
+
+    @property
+    def action(self):
+        return str(self.parser.get("action", default="") or "")
+
+    def feed(self, delta):
+        if not delta:
+            return []
+        self._raw += str(delta)
+        if not self._mode:
+            head = self._raw.lstrip()
+            if not head:
+                return []
+            self._mode = "json" if head[0] in "{`" else "text"
+            if self._mode == "json":
+                delta = self._raw
+        if self._mode == "text":
+            start = _structured_start(self._raw)
+            if start < 0:
+                self._emit_upto(self._raw.strip())
+                return []
+            self._mode = "json"
+            self._muted = True
+            self._chunker.discard()
+            delta = self._raw[start:]
+        events = self.parser.feed(delta)
+        if self.action == "reply" and not self._muted:
+            reply = self.parser.get("reply")
+            if reply is None:
+                path, partial = self.parser.partial_string()
+                reply = partial if path == ("reply",) else ""
+            self._emit_upto(str(reply))
+        return events
+
+    def finish(self):
+        self._chunker.flush()
+        return self._raw
+
+    def _emit_upto(self, text):
+        text = text[: self._max_chars]
+        if len(text) <= self._decoded_len:
+            return
+        self._chunker.feed(text[self._decoded_len :])
+        self._decoded_len = len(text)
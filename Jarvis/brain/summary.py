@@ -0,0 +1,102 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+def _fingerprint(row):
+    raw = f"{row.get('role', '')}\x00{row.get('content', '')}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+class RollingSummary:
+    """
+    One running summary of the turns that no longer fit in the prompt.
+
+    ``compact(rows)`` queues rows it has not summarized before and folds them
+    into the summary in the background (one job at a time, through ``submit``)
+    with ``summarize(previous_summary, rows) -> str``. The summary is loaded
+    lazily with ``load()`` and written back with ``save(text)``, e.g. next to
+    the Redis conversation buffer.
+    """
+
+    def __init__(self, summarize, *, submit, load=None, save=None, max_chars=1200, remember=512):
+        self._summarize = summarize
+        self._submit = submit
+        self._load = load
+        self._save = save
+        self.max_chars = max(1, int(max_chars))
+        self._remember = max(1, int(remember))
+        self._text = None
+        self._seen = OrderedDict()
+        self._pending = []
+        self._running = False
+        self._lock = threading.Lock()
+        self.compactions = 0
+
+    def text(self):
+        with self._lock:
+            if self._text is not None:
+                return self._text
+        loaded = ""
+        if self._load:
+            try:
+                loaded = str(self._load() or "")
+            except Exception:
+                loaded = ""
+        with self._lock:
+            if self._text is None:
+                self._text = loaded
+            return self._text
+
+    def block(self):
+        text = self.text()
+        return f"Conversation summary (older turns):\n{text}" if text else ""
+
+    def compact(self, rows):
+        """Queue ``rows`` for summarization; returns how many were new."""
+        fresh = []
+        with self._lock:
+            for row in rows or []:
+                if not isinstance(row, dict) or not str(row.get("content", "")).strip():
+                    continue
+                key = _fingerprint(row)
+                if key in self._seen:
+                    continue
+                self._seen[key] = None
+                while len(self._seen) > self._remember:
+                    self._seen.popitem(last=False)
+                fresh.append({"role": str(row.get("role", "")), "content": str(row.get("content", ""))})
+            if not fresh:
+                return 0
+            self._pending.extend(fresh)
+            start = not self._running
+            self._running = True
+        if start:
+            self._submit(self._drain)
+        return len(fresh)
+
+    def _drain(self):
+        while True:
+            with self._lock:
+                batch = self._pending
+                self._pending = []
+                if not batch:
+                    self._running = False
+                    return
+            previous = self.text()
+            try:
+                updated = str(self._summarize(previous, batch) or "").strip()
+            except Exception as e:
+                print(f"Conversation summary failed: {e}")
+                updated = ""
+            if not updated:
+                continue
+            updated = updated[: self.max_chars]
+            with self._lock:
+                self._text = updated
+                self.compactions += 1
+            if self._save:
+                try:
+                    self._save(updated)
+                except Exception:
+                    pass
@@ -0,0 +1,85 @@
+import functools
+import re
+
+# Per-message framing tokens (role, separators) most chat formats add.
+MESSAGE_OVERHEAD_TOKENS = 4
+
+_PIECE = re.compile(r"\w+|[^\w\s]", re.UNICODE)
+
+
+def heuristic_tokens(text):
+    """
+    Fast BPE-like estimate without a tokenizer: ~4 chars per token for ASCII
+    words, ~2 for other scripts, one per punctuation mark.
+    """
+    total = 0
+    for piece in _PIECE.findall(str(text or "")):
+        if piece.isascii():
+            total += max(1, (len(piece) + 3) // 4)
+        else:
+            total += max(1, (len(piece) + 1) // 2)
+    return total
+
+
+def make_token_counter(spec="heuristic", cache_size=512):
+    """
+    Build ``count(text) -> int`` for ``spec``: ``heuristic`` or ``tiktoken[:<encoding>]``.
+
+    tiktoken is optional; when it is missing the heuristic is used. Counts are
+    memoized, so the unchanged system prompt is only counted once.
+    """
+    name, _, arg = str(spec or "heuristic").strip().partition(":")
+    count = heuristic_tokens
+    if name.lower() == "tiktoken":
+        try:
+            import tiktoken  # type: ignore
+
+            encoding = tiktoken.get_encoding(arg.strip() or "o200k_base")
+            count = lambda text: len(encoding.encode(str(text or ""), disallowed_special=()))  # noqa: E731
+        except Exception as e:
+            print(f"Tokenizer '{spec}' unavailable, using heuristic estimate: {e}")
+    return functools.lru_cache(maxsize=max(1, int(cache_size)))(count)
+
+
+def message_tokens(message, count):
+    return count(str(message.get("content", ""))) + MESSAGE_OVERHEAD_TOKENS
+
+
+def history_budget(system_tokens, history_tokens, *, context_tokens=0, reply_tokens=0):
+    """
+    Tokens history rows may use once the system prompt costs ``system_tokens``.
+
+    ``history_tokens`` is the configured history budget. A known
+    ``context_tokens`` window caps it at what the system prompt and the
+    ``reply_tokens`` reserve leave free.
+    """
+    budget = max(0, int(history_tokens))
+    if int(context_tokens) > 0:
+        budget = min(budget, max(0, int(context_tokens) - int(reply_tokens) - int(system_tokens)))
+    return budget
+
+
+def fit_messages(messages, budget, count):
+    """
+    Trim chat ``messages`` to ``budget`` tokens.
+
+    System messages are always kept, as is the newest message. Other rows are
+    kept newest-first while they fit, so the result is a contiguous recent
+    window; it never starts with an assistant row. Returns ``(kept, dropped)``
+    with ``dropped`` in chronological order.
+    """
+    system = [m for m in messages if m.get("role") == "system"]
+    rest = [m for m in messages if m.get("role") != "system"]
+    total = sum(message_tokens(m, count) for m in system)
+    kept = []
+    for i in range(len(rest) - 1, -1, -1):
+        cost = message_tokens(rest[i], count)
+        if kept and total + cost > budget:
+            break
+        kept.append(rest[i])
+        total += cost
+    kept.reverse()
+    dropped = rest[: len(rest) - len(kept)]
+    while len(kept) > 1 and kept[0].get("role") == "assistant":
+        dropped.append(kept.pop(0))
+    return system + kept, dropped
@@ -0,0 +1,161 @@
+import math
+import re
+
+_TOKEN = re.compile(r"[^\W_]+", re.UNICODE)
+
+# Extra phrasing per tool (en/ru/de) so short spec descriptions still match how
+# people actually ask. Only used for retrieval, never sent to the LLM.
+_TOOL_HINTS = {
+    "weather": "forecast rain snow temperature sunny cold hot umbrella погода прогноз дождь wetter regen temperatur",
+    "news": "headlines happening events today новости nachrichten schlagzeilen",
+    "get_time": "time clock hour now который час время uhrzeit spät",
+    "get_date": "date today day month year what day дата число datum",
+    "wikipedia": "who is was tell me about biography history кто такой такая что такое wer ist war",
+    "wolframalpha": "calculate math plus minus times divided compute equation convert units посчитай вычисли rechne",
+    "joke": "funny laugh шутка анекдот witz",
+    "launch_app": "open start run program application excel word chrome открой запусти приложение öffne starte",
+    "app_launch_fuzzy": "open start run program application открой запусти öffne starte",
+    "open_website": "open site url browser go to com org сайт webseite",
+    "web_search": "search look up find online internet поиск найди suche",
+    "google_search": "google search look up",
+    "ip_address": "ip address public external",
+    "my_location": "where am i location city country где я standort",
+    "location": "maps distance directions how far route карта entfernung",
+    "system_info": "cpu ram battery memory usage system status батарея процессор akku",
+    "system_health": "disk space storage cpu processes slow диск festplatte",
+    "take_screenshot": "screenshot screen capture скриншот снимок экрана bildschirmfoto",
+    "screenshot_ocr": "screenshot read text ocr on screen",
+    "take_note": "note write down remember заметка запиши notiz",
+    "todo_manage": "todo to do task tasks list add done задача задачи дела aufgabe aufgaben",
+    "contacts_manage": "contact contacts email address book контакт kontakt",
+    "translate_text": "translate translation переведи перевод übersetze",
+    "clipboard_get": "clipboard copied paste буфер обмена zwischenablage",
+    "clipboard_set": "clipboard copy буфер zwischenablage",
+    "clipboard_save": "clipboard save буфер",
+    "clipboard_history": "clipboard history буфер",
+    "clipboard_clear_history": "clipboard clear буфер",
+    "llm_clipboard_summarize": "summarize clipboard summary",
+    "mcp_execute": "telegram gmail github slack notion send message dm composio отправь сообщение телеграм sende nachricht",
+    "mcp_list_tools": "mcp composio integrations tools available",
+    "run_protocol": "protocol run execute протокол",
+    "list_protocols": "protocols list available протоколы",
+    "file_search": "find file files folder document search where is файл найди datei",
+    "git_summary": "git repo repository status diff changes commit",
+    "imgflip_meme": "meme мем",
+    "switch_window": "switch window alt tab окно fenster",
+    "hide_files": "hide hidden files",
+    "show_files": "show hidden files unhide",
+    "explain_error": "error exception traceback stack trace bug crash ошибка fehler",
+    "meeting_note_create": "meeting note minutes встреча besprechung",
+    "standup_draft": "standup daily update",
+    "focus_mode": "focus distraction concentrate фокус",
+    "clean_downloads": "downloads organize clean tidy",
+    "batch_rename": "rename files",
+    "ffmpeg_convert": "convert video audio mp4 mp3 ffmpeg",
+    "env_check": "environment variables config missing keys setup",
+}
+
+
+def tokenize(text):
+    return [t for t in _TOKEN.findall(str(text or "").lower()) if len(t) > 1]
+
+
+class BM25Index:
+    """Okapi BM25 over a small, static set of documents given as ``(key, text)``."""
+
+    def __init__(self, docs, *, k1=1.2, b=0.75):
+        self.k1 = float(k1)
+        self.b = float(b)
+        self._keys = []
+        self._tf = []
+        self._len = []
+        df = {}
+        for key, text in docs:
+            tokens = tokenize(text)
+            tf = {}
+            for t in tokens:
+                tf[t] = tf.get(t, 0) + 1
+            for t in tf:
+                df[t] = df.get(t, 0) + 1
+            self._keys.append(key)
+            self._tf.append(tf)
+            self._len.append(len(tokens))
+        n = len(self._keys)
+        self._avg_len = (sum(self._len) / float(n)) if n else 0.0
+        self._idf = {t: math.log(1.0 + (n - f + 0.5) / (f + 0.5)) for t, f in df.items()}
+
+    def search(self, query):
+        """Return ``[(score, key), ...]`` with positive scores, best first."""
+        terms = [t for t in set(tokenize(query)) if t in self._idf]
+        if not terms:
+            return []
+        out = []
+        for key, tf, length in zip(self._keys, self._tf, self._len):
+            score = 0.0
+            norm = self.k1 * (1.0 - self.b + self.b * length / (self._avg_len or 1.0))
+            for t in terms:
+                f = tf.get(t)
+                if f:
+                    score += self._idf[t] * f * (self.k1 + 1.0) / (f + norm)
+            if score > 0:
+                out.append((score, key))
+        out.sort(key=lambda x: (-x[0], x[1]))
+        return out
+
+
+def _tool_doc(spec):
+    name = str(spec.get("name", ""))
+    words = name.replace("_", " ")
+    args = " ".join(str(a) for a in (spec.get("args") or {}).keys())
+    # Repeat the name so an exact tool-name mention dominates description noise.
+    return " ".join([words, words, words, str(spec.get("description", "")), args, _TOOL_HINTS.get(name, "")])
+
+
+def _protocol_doc(spec):
+    parts = [str(spec.get("name", "")).replace("_", " ")] * 2
+    parts.extend(str(a) for a in spec.get("aliases") or [])
+    parts.append(str(spec.get("description", "")))
+    parts.extend(str(t) for t in spec.get("triggers") or [])
+    return " ".join(parts)
+
+
+class CatalogRetriever:
+    """
+    Pick the tools and protocols worth showing the planner for one query.
+
+    Returns the ``always_on`` tools plus the top-k BM25 matches. When the best
+    tool score is below ``min_score`` the caller should fall back to the full
+    catalog (``fallback`` is True and ``tools`` lists every tool).
+    """
+
+    def __init__(self, tool_specs, protocol_specs=(), *, always_on=(), top_k=8, protocol_top_k=4, min_score=1.5):
+        self._tool_names = [str(s.get("name", "")) for s in tool_specs if s.get("name")]
+        self._protocol_names = [str(s.get("name", "")) for s in protocol_specs if s.get("name")]
+        self.always_on = [n for n in always_on if n in self._tool_names]
+        self.top_k = max(0, int(top_k))
+        self.protocol_top_k = max(0, int(protocol_top_k))
+        self.min_score = float(min_score)
+        self._tools = BM25Index([(str(s.get("name")), _tool_doc(s)) for s in tool_specs if s.get("name")])
+        self._protocols = BM25Index([(str(s.get("name")), _protocol_doc(s)) for s in protocol_specs if s.get("name")])
+
+    def select(self, user_text):
+        hits = self._tools.search(user_text)
+        top_score = hits[0][0] if hits else 0.0
+        if top_score < self.min_score:
+            return {
+                "tools": list(self._tool_names),
+                "protocols": list(self._protocol_names),
+                "fallback": True,
+                "top_score": top_score,
+            }
+        tools = list(self.always_on)
+        for _score, name in hits:
+            if len(tools) >= len(self.always_on) + self.top_k:
+                break
+            if name not in tools:
+                tools.append(name)
+        if len(self._protocol_names) <= self.protocol_top_k:
+            protocols = list(self._protocol_names)
+        else:
+            protocols = [name for _score, name in self._protocols.search(user_text)[: self.protocol_top_k]]
+        return {"tools": tools, "protocols": protocols, "fallback": False, "top_score": top_score}
@@ -9,7 +9,12 @@ def spec():
     return {
         "name": "batch_rename",
         "description": "Batch rename files in a folder using a simple prefix/suffix pattern (side effect). Requires confirm.",
-        "args": {"directory": "string", "prefix": "string", "suffix": "string", "confirm": "boolean"},
+        "args": {
+            "directory": {"type": "path", "kind": "dir", "must_exist": True},
+            "prefix": "string",
+            "suffix": "string",
+            "confirm": "boolean",
+        },
         "side_effects": True,
     }
 
@@ -5,7 +5,7 @@ def spec():
     return {
         "name": "clipboard_history",
         "description": "List saved clipboard entries for this session.",
-        "args": {"limit": "number"},
+        "args": {"limit": {"type": "integer", "min": 1, "max": 25, "clamp": True}},
     }
 
 
@@ -9,7 +9,11 @@ def spec():
     return {
         "name": "contacts_manage",
         "description": "Manage a simple contacts book stored in contacts.json (side effect for writes).",
-        "args": {"action": "string", "name": "string", "email": "string"},
+        "args": {
+            "action": {"type": "string", "enum": ["list", "get", "add", "remove"]},
+            "name": "string",
+            "email": "string",
+        },
         "side_effects": True,
     }
 
@@ -61,3 +65,56 @@ def run(*, assistant=None, wolfram_fn=None, action="list", name="", email=""):
 
     return {"ok": False, "error": "unknown action"}
 
+
+_TEMPLATES = {
+    "en": {
+        "empty": "Your contacts book is empty.",
+        "list": "Contacts: {items}.",
+        "get": "{name}: {email}.",
+        "missing": "No contact named {name}.",
+        "add": "Saved {name} ({email}).",
+        "remove": "Removed {name} from contacts.",
+    },
+    "ru": {
+        "empty": "Список контактов пуст.",
+        "list": "Контакты: {items}.",
+        "get": "{name}: {email}.",
+        "missing": "Контакт {name} не найден.",
+        "add": "Сохранил {name} ({email}).",
+        "remove": "Удалил {name} из контактов.",
+    },
+    "de": {
+        "empty": "Ihr Adressbuch ist leer.",
+        "list": "Kontakte: {items}.",
+        "get": "{name}: {email}.",
+        "missing": "Kein Kontakt namens {name}.",
+        "add": "{name} ({email}) gespeichert.",
+        "remove": "{name} aus den Kontakten entfernt.",
+    },
+}
+
+
+def format_reply(*, result, tool_args=None, lang="en"):
+    result = result or {}
+    if result.get("sandbox"):
+        return ""
+    t = _TEMPLATES.get(lang, _TEMPLATES["en"])
+    args = tool_args or {}
+    action = str(args.get("action") or "list").strip().lower()
+    name = str(args.get("name") or "").strip()
+    data = result.get("data")
+    if action == "list":
+        if not isinstance(data, list):
+            return ""
+        if not data:
+            return t["empty"]
+        return t["list"].format(items=", ".join(f"{r.get('name')} <{r.get('email')}>" for r in data[:10]))
+    if action == "get":
+        if isinstance(data, str) and data:
+            return t["get"].format(name=name, email=data)
+        return t["missing"].format(name=name)
+    if action == "add":
+        return t["add"].format(name=name, email=str(args.get("email") or "").strip())
+    if action == "remove":
+        return t["remove"].format(name=name)
+    return ""
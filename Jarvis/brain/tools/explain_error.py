@@ -7,6 +7,7 @@ def spec():
         "name": "explain_error",
         "description": "Explain an error/stack trace and suggest fixes using the configured LLM.",
         "args": {"error_text": "string"},
+        "timeout_s": 45,
     }
 
 
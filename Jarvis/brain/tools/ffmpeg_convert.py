@@ -7,8 +7,13 @@ def spec():
     return {
         "name": "ffmpeg_convert",
         "description": "Convert media files using ffmpeg (side effect). Requires ffmpeg installed and confirm.",
-        "args": {"input_path": "string", "output_path": "string", "confirm": "boolean"},
+        "args": {
+            "input_path": {"type": "path", "kind": "file", "must_exist": True},
+            "output_path": {"type": "path"},
+            "confirm": "boolean",
+        },
         "side_effects": True,
+        "timeout_s": 300,
     }
 
 
@@ -17,7 +22,7 @@ def can_run(*, user_text, confirm=False, input_path="", output_path=""):
     return ("convert" in t) or ("ffmpeg" in t) or bool(confirm)
 
 
-def run(*, assistant=None, wolfram_fn=None, input_path="", output_path="", confirm=False):
+def run(*, assistant=None, wolfram_fn=None, input_path="", output_path="", confirm=False, cancel_event=None):
     if not confirm:
         return {"ok": False, "error_code": "confirmation_required"}
 
@@ -32,7 +37,21 @@ def run(*, assistant=None, wolfram_fn=None, input_path="", output_path="", confi
         return {"ok": False, "error_code": "missing_output_path"}
 
     try:
-        subprocess.check_output(["ffmpeg", "-y", "-i", str(inp), str(out)], stderr=subprocess.STDOUT, text=True)
-        return {"ok": True, "output": str(out)}
+        proc = subprocess.Popen(
+            ["ffmpeg", "-y", "-i", str(inp), str(out)], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
     except Exception:
         return {"ok": False, "error_code": "ffmpeg_failed"}
+    while True:
+        try:
+            code = proc.wait(timeout=0.5)
+            break
+        except subprocess.TimeoutExpired:
+            # The executor sets cancel_event when the tool deadline passes; don't leave ffmpeg running.
+            if cancel_event is not None and cancel_event.is_set():
+                proc.kill()
+                proc.wait()
+                return {"ok": False, "error_code": "timeout"}
+    if code != 0:
+        return {"ok": False, "error_code": "ffmpeg_failed"}
+    return {"ok": True, "output": str(out)}
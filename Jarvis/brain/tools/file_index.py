@@ -0,0 +1,309 @@
+import fnmatch
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from Jarvis.config import config
+from Jarvis.runtime.flags import config_flag
+
+_LITERAL_RUN = re.compile(r"[^*?\[\]]+")
+# fnmatch character classes ("[abc]", "[!a-z]", "[]x]"); their letters are alternatives, not a literal.
+_BRACKET = re.compile(r"\[!?\]?[^\]]*\]")
+
+
+def _norm(path):
+    return os.path.normpath(os.path.abspath(os.path.expanduser(str(path or "."))))
+
+
+def _key(path):
+    return os.path.normcase(path)
+
+
+def _under(key, root_key):
+    return key == root_key or key.startswith(root_key.rstrip(os.sep) + os.sep)
+
+
+def _phrase(text):
+    return '"' + text.replace('"', '""') + '"'
+
+
+def _fts_term(name_contains, glob):
+    """Longest literal the trigram index can look up (>= 3 chars), or None for a plain scan."""
+    if len(name_contains) >= 3:
+        return name_contains
+    runs = _LITERAL_RUN.findall(_BRACKET.sub("*", glob or ""))
+    best = max(runs, key=len) if runs else ""
+    return best if len(best) >= 3 else None
+
+
+class FileIndex:
+    """
+    Filename index kept in SQLite for ``file_search``.
+
+    Each configured root is walked once in the background, then rescanned
+    incrementally: a directory whose mtime is unchanged keeps its stored
+    listing and only its subdirectories are re-checked. Names go into an
+    FTS5 trigram table when SQLite has one, so substring and glob lookups
+    avoid a table scan.
+    """
+
+    def __init__(self, path, roots, *, exclude=(), refresh_s=300):
+        self.path = os.path.abspath(str(path))
+        self.roots = [_norm(r) for r in roots if str(r or "").strip()]
+        self.exclude = {str(x).strip() for x in exclude if str(x).strip()}
+        self.refresh_s = float(refresh_s)
+        self._lock = threading.Lock()
+        self._refreshing = None
+        folder = os.path.dirname(self.path)
+        if folder and not os.path.isdir(folder):
+            os.makedirs(folder, exist_ok=True)
+        self._conn = self._connect()
+        self.trigram = self._create_schema(self._conn)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _create_schema(self, conn):
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS roots (key TEXT PRIMARY KEY, path TEXT NOT NULL, "
+            "indexed_at REAL NOT NULL, files INTEGER NOT NULL, scan_ms REAL NOT NULL)"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS dirs (id INTEGER PRIMARY KEY, key TEXT NOT NULL UNIQUE, "
+            "path TEXT NOT NULL, mtime REAL NOT NULL)"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS files (id INTEGER PRIMARY KEY, dir_id INTEGER NOT NULL, name TEXT NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS files_dir ON files (dir_id)")
+        trigram = True
+        try:
+            conn.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS names USING fts5("
+                "name, content='files', content_rowid='id', tokenize='trigram')"
+            )
+        except sqlite3.OperationalError:
+            # SQLite without FTS5 or the trigram tokenizer (< 3.34): LIKE over the files table instead.
+            trigram = False
+        conn.commit()
+        return trigram
+
+    def covering_root(self, root):
+        """The indexed root that contains ``root``, with its row; ``(None, None)`` if there is none."""
+        key = _key(_norm(root))
+        with self._lock:
+            rows = self._conn.execute("SELECT key, path, indexed_at FROM roots").fetchall()
+        for root_key, path, indexed_at in sorted(rows, key=lambda r: -len(r[0])):
+            if not _under(key, root_key):
+                continue
+            rest = key[len(root_key):].strip(os.sep)
+            if rest and any(part in self.exclude for part in rest.split(os.sep)):
+                return None, None
+            return path, indexed_at
+        return None, None
+
+    def search(self, root, name_contains="", glob="*", max_results=25):
+        """
+        Matching paths under ``root`` from the index, or ``None`` when no indexed root covers it.
+
+        Returns ``{"paths", "indexed_at", "stale"}``.
+        """
+        indexed_root, indexed_at = self.covering_root(root)
+        if indexed_root is None:
+            return None
+        needle = str(name_contains or "").lower()
+        glob = glob or "*"
+        root_key = _key(_norm(root))
+        prefix = root_key.rstrip(os.sep) + os.sep
+        term = _fts_term(needle, glob)
+        params = [root_key, len(prefix), prefix]
+        where = "(d.key = ? OR substr(d.key, 1, ?) = ?)"
+        if term and self.trigram:
+            sql = (
+                "SELECT d.path, f.name FROM names JOIN files f ON f.id = names.rowid "
+                f"JOIN dirs d ON d.id = f.dir_id WHERE names MATCH ? AND {where}"
+            )
+            params.insert(0, _phrase(term))
+        elif term and term.isascii():
+            # SQLite's LIKE only folds ASCII case; other needles fall through to the plain scan.
+            sql = (
+                "SELECT d.path, f.name FROM files f JOIN dirs d ON d.id = f.dir_id "
+                f"WHERE f.name LIKE ? ESCAPE '\\' AND {where}"
+            )
+            escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            params.insert(0, f"%{escaped}%")
+        else:
+            sql = f"SELECT d.path, f.name FROM dirs d JOIN files f ON f.dir_id = d.id WHERE {where}"
+        paths = []
+        with self._lock:
+            for dirpath, name in self._conn.execute(sql, params):
+                if needle and needle not in name.lower():
+                    continue
+                if glob and not fnmatch.fnmatch(name, glob):
+                    continue
+                paths.append(os.path.join(dirpath, name))
+                if len(paths) >= max_results:
+                    break
+        stale = self._refreshing is not None or (time.time() - indexed_at) > self.refresh_s
+        return {"paths": paths, "indexed_at": indexed_at, "stale": stale}
+
+    def stats(self):
+        with self._lock:
+            rows = self._conn.execute("SELECT path, indexed_at, files, scan_ms FROM roots").fetchall()
+        return {
+            "trigram": self.trigram,
+            "refreshing": self._refreshing,
+            "roots": [{"path": p, "indexed_at": at, "files": n, "scan_ms": round(ms, 1)} for p, at, n, ms in rows],
+        }
+
+    def refresh_in_background(self, force=False):
+        """Start one background rescan of the roots that are due; returns the thread or None."""
+        now = time.time()
+        with self._lock:
+            if self._refreshing is not None:
+                return None
+            done = dict(self._conn.execute("SELECT key, indexed_at FROM roots").fetchall())
+            due = [r for r in self.roots if force or (now - done.get(_key(r), 0)) > self.refresh_s]
+            if not due:
+                return None
+            self._refreshing = due[0]
+        worker = threading.Thread(target=self._refresh_roots, args=(due,), name="jivan-file-index", daemon=True)
+        worker.start()
+        return worker
+
+    def _refresh_roots(self, roots):
+        try:
+            for root in roots:
+                self._refreshing = root
+                try:
+                    self.refresh(root)
+                except Exception as e:
+                    print(f"File index refresh failed for {root}: {e}")
+        finally:
+            self._refreshing = None
+
+    def refresh(self, root):
+        """Rescan ``root``: directories whose mtime changed are re-listed, vanished ones dropped."""
+        # The scan writes through its own connection; WAL keeps searches on the shared one unblocked.
+        conn = self._connect()
+        try:
+            self._scan(conn, _norm(root))
+        finally:
+            conn.close()
+
+    def _scan(self, conn, root):
+        root_key = _key(root)
+        started = time.perf_counter()
+        known = {}
+        children = {}
+        for dir_id, key, path, mtime in conn.execute("SELECT id, key, path, mtime FROM dirs"):
+            if _under(key, root_key):
+                known[key] = (dir_id, mtime)
+                children.setdefault(_key(os.path.dirname(path)), []).append(path)
+        seen = set()
+        stack = [root]
+        pending = 0
+        while stack:
+            path = stack.pop()
+            key = _key(path)
+            try:
+                mtime = os.stat(path).st_mtime
+            except OSError:
+                continue
+            seen.add(key)
+            row = known.get(key)
+            if row is not None and row[1] == mtime:
+                stack.extend(children.get(key, ()))
+                continue
+            names, subdirs = self._list_dir(path)
+            self._store_dir(conn, row[0] if row else None, key, path, mtime, names)
+            stack.extend(subdirs)
+            pending += 1
+            if pending >= 500:
+                conn.commit()
+                pending = 0
+        for key, (dir_id, _mtime) in known.items():
+            if key not in seen:
+                self._drop_dir(conn, dir_id)
+        count = conn.execute(
+            "SELECT COUNT(*) FROM files f JOIN dirs d ON d.id = f.dir_id WHERE d.key = ? OR substr(d.key, 1, ?) = ?",
+            (root_key, len(root_key.rstrip(os.sep)) + 1, root_key.rstrip(os.sep) + os.sep),
+        ).fetchone()[0]
+        conn.execute(
+            "INSERT OR REPLACE INTO roots (key, path, indexed_at, files, scan_ms) VALUES (?, ?, ?, ?, ?)",
+            (root_key, root, time.time(), int(count), (time.perf_counter() - started) * 1000.0),
+        )
+        conn.commit()
+
+    def _list_dir(self, path):
+        names = []
+        subdirs = []
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        # Symlinked folders are not followed, like os.walk's default.
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in self.exclude:
+                                subdirs.append(entry.path)
+                        elif entry.is_file():
+                            names.append(entry.name)
+                    except OSError:
+                        continue
+        except OSError:
+            pass
+        return names, subdirs
+
+    def _store_dir(self, conn, dir_id, key, path, mtime, names):
+        if dir_id is None:
+            dir_id = conn.execute(
+                "INSERT INTO dirs (key, path, mtime) VALUES (?, ?, ?)", (key, path, mtime)
+            ).lastrowid
+        else:
+            conn.execute("UPDATE dirs SET path = ?, mtime = ? WHERE id = ?", (path, mtime, dir_id))
+            self._drop_files(conn, dir_id)
+        for name in names:
+            file_id = conn.execute("INSERT INTO files (dir_id, name) VALUES (?, ?)", (dir_id, name)).lastrowid
+            if self.trigram:
+                conn.execute("INSERT INTO names (rowid, name) VALUES (?, ?)", (file_id, name))
+
+    def _drop_files(self, conn, dir_id):
+        if self.trigram:
+            rows = conn.execute("SELECT id, name FROM files WHERE dir_id = ?", (dir_id,)).fetchall()
+            conn.executemany("INSERT INTO names (names, rowid, name) VALUES ('delete', ?, ?)", rows)
+        conn.execute("DELETE FROM files WHERE dir_id = ?", (dir_id,))
+
+    def _drop_dir(self, conn, dir_id):
+        self._drop_files(conn, dir_id)
+        conn.execute("DELETE FROM dirs WHERE id = ?", (dir_id,))
+
+
+_INDEX = None
+_INDEX_LOCK = threading.Lock()
+
+
+def get_index():
+    """The shared index built from config, or None when disabled or unavailable."""
+    global _INDEX
+    if not config_flag("file_index_enabled", "1"):
+        return None
+    with _INDEX_LOCK:
+        if _INDEX is None:
+            roots = str(getattr(config, "file_index_roots", "~") or "").split(",")
+            exclude = str(getattr(config, "file_index_exclude", ".git,node_modules,__pycache__") or "").split(",")
+            try:
+                _INDEX = FileIndex(
+                    getattr(config, "file_index_path", "Jarvis/data/file_index.sqlite3"),
+                    roots,
+                    exclude=exclude,
+                    refresh_s=float(getattr(config, "file_index_refresh_s", 300)),
+                )
+            except (OSError, sqlite3.Error) as e:
+                print(f"File index unavailable, searching without it: {e}")
+                _INDEX = False
+        return _INDEX or None
@@ -1,28 +1,27 @@
-import os
+import datetime
 import fnmatch
+import os
 
 
 def spec():
     return {
         "name": "file_search",
         "description": "Search for files by name substring and/or glob pattern under a directory.",
-        "args": {"root": "string", "name_contains": "string", "glob": "string", "max_results": "number"},
+        "args": {
+            "root": {"type": "path", "kind": "dir", "must_exist": True},
+            "name_contains": "string",
+            "glob": "string",
+            "max_results": {"type": "integer", "min": 1, "max": 200, "clamp": True},
+        },
+        "timeout_s": 15,
     }
 
 
-def run(*, assistant=None, wolfram_fn=None, root=".", name_contains="", glob="*", max_results=25):
-    try:
-        max_results = int(max_results)
-    except Exception:
-        max_results = 25
-    max_results = max(1, min(200, max_results))
-
-    root = root or "."
-    name_contains = (name_contains or "").lower()
-    glob = glob or "*"
-
+def _walk(root, name_contains, glob, max_results, cancel_event):
     results = []
     for dirpath, _, filenames in os.walk(root):
+        if cancel_event is not None and cancel_event.is_set():
+            return results
         for filename in filenames:
             if name_contains and name_contains not in filename.lower():
                 continue
@@ -33,3 +32,65 @@ def run(*, assistant=None, wolfram_fn=None, root=".", name_contains="", glob="*"
                 return results
     return results
 
+
+def run(*, assistant=None, wolfram_fn=None, root=".", name_contains="", glob="*", max_results=25, cancel_event=None):
+    try:
+        max_results = int(max_results)
+    except Exception:
+        max_results = 25
+    max_results = max(1, min(200, max_results))
+
+    root = root or "."
+    name_contains = (name_contains or "").lower()
+    glob = glob or "*"
+
+    # Imported here so the reply formatter loads without the index (and its config).
+    from Jarvis.brain.tools import file_index
+
+    index = file_index.get_index()
+    if index is not None:
+        index.refresh_in_background()
+        try:
+            hit = index.search(root, name_contains, glob, max_results)
+        except Exception as e:
+            print(f"File index search failed, walking instead: {e}")
+            hit = None
+        if hit is not None:
+            return {
+                "ok": True,
+                "data": hit["paths"],
+                "source": "index",
+                "stale": hit["stale"],
+                "indexed_at": datetime.datetime.fromtimestamp(hit["indexed_at"]).isoformat(timespec="seconds"),
+            }
+    # The index does not cover root (yet): walk it, as before the index existed.
+    return {"ok": True, "data": _walk(root, name_contains, glob, max_results, cancel_event), "source": "walk"}
+
+
+_TEMPLATES = {
+    "en": {
+        "none": "No matching files found.",
+        "found": "Found {n} files: {files}.",
+    },
+    "ru": {
+        "none": "Подходящих файлов не найдено.",
+        "found": "Найдено файлов: {n}. {files}.",
+    },
+    "de": {
+        "none": "Keine passenden Dateien gefunden.",
+        "found": "{n} Dateien gefunden: {files}.",
+    },
+}
+
+
+def format_reply(*, result, tool_args=None, lang="en"):
+    t = _TEMPLATES.get(lang, _TEMPLATES["en"])
+    data = (result or {}).get("data")
+    if not isinstance(data, list):
+        return ""
+    if not data:
+        return t["none"]
+    files = ", ".join(str(p) for p in data[:5])
+    if len(data) > 5:
+        files += ", …"
+    return t["found"].format(n=len(data), files=files)
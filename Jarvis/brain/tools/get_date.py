@@ -1,3 +1,6 @@
+import datetime
+
+
 def spec():
     return {
         "name": "get_date",
@@ -9,3 +12,63 @@ def spec():
 def run(*, assistant, wolfram_fn=None):
     return assistant.tell_me_date()
 
+
+_MONTHS = {
+    "en": [
+        "January",
+        "February",
+        "March",
+        "April",
+        "May",
+        "June",
+        "July",
+        "August",
+        "September",
+        "October",
+        "November",
+        "December",
+    ],
+    "ru": [
+        "января",
+        "февраля",
+        "марта",
+        "апреля",
+        "мая",
+        "июня",
+        "июля",
+        "августа",
+        "сентября",
+        "октября",
+        "ноября",
+        "декабря",
+    ],
+    "de": [
+        "Januar",
+        "Februar",
+        "März",
+        "April",
+        "Mai",
+        "Juni",
+        "Juli",
+        "August",
+        "September",
+        "Oktober",
+        "November",
+        "Dezember",
+    ],
+}
+_TEMPLATES = {
+    "en": "Today is {month} {day}, {year}.",
+    "ru": "Сегодня {day} {month} {year} года.",
+    "de": "Heute ist der {day}. {month} {year}.",
+}
+
+
+def format_reply(*, result, tool_args=None, lang="en"):
+    value = str((result or {}).get("data") or "").strip()
+    try:
+        parsed = datetime.datetime.strptime(value, "%b %d %Y")
+    except ValueError:
+        return ""
+    lang = lang if lang in _TEMPLATES else "en"
+    return _TEMPLATES[lang].format(month=_MONTHS[lang][parsed.month - 1], day=parsed.day, year=parsed.year)
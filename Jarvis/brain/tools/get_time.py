@@ -9,3 +9,20 @@ def spec():
 def run(*, assistant, wolfram_fn=None):
     return assistant.tell_time()
 
+
+_TEMPLATES = {
+    "en": "It's {time}.",
+    "ru": "Сейчас {time}.",
+    "de": "Es ist {time} Uhr.",
+}
+
+
+def format_reply(*, result, tool_args=None, lang="en"):
+    value = str((result or {}).get("data") or "").strip()
+    if not value:
+        return ""
+    # Speak hours and minutes only; seconds are noise in a voice reply.
+    parts = value.split(":")
+    if len(parts) == 3:
+        value = ":".join(parts[:2])
+    return _TEMPLATES.get(lang, _TEMPLATES["en"]).format(time=value)
@@ -3,7 +3,7 @@ import subprocess
 import tempfile
 from pathlib import Path
 
-import requests
+from Jarvis.runtime import transport
 
 
 def spec():
@@ -28,7 +28,7 @@ def can_run(*, user_text, confirm=False, gif_source="", audio_source="", output_
 def _fetch_if_url(source, suffix):
     src = str(source or "").strip()
     if src.startswith("http://") or src.startswith("https://"):
-        resp = requests.get(src, timeout=25)
+        resp = transport.get(src, timeout=25)
         resp.raise_for_status()
         f = tempfile.NamedTemporaryFile(delete=False, suffix=suffix)
         f.write(resp.content)
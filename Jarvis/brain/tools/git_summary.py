@@ -23,3 +23,40 @@ def run(*, assistant=None, wolfram_fn=None, what="status"):
     except Exception:
         return {"ok": False, "error": "git command failed"}
 
+
+_TEMPLATES = {
+    "en": {
+        "clean": "The working tree is clean.",
+        "status": "{n} changed files: {files}.",
+        "diff": "Diff: {stat}.",
+    },
+    "ru": {
+        "clean": "Рабочее дерево чистое.",
+        "status": "Изменённых файлов: {n}. {files}.",
+        "diff": "Изменения: {stat}.",
+    },
+    "de": {
+        "clean": "Das Arbeitsverzeichnis ist sauber.",
+        "status": "{n} geänderte Dateien: {files}.",
+        "diff": "Diff: {stat}.",
+    },
+}
+
+
+def format_reply(*, result, tool_args=None, lang="en"):
+    t = _TEMPLATES.get(lang, _TEMPLATES["en"])
+    data = (result or {}).get("data")
+    if isinstance(data, dict) and "changed_files" in data:
+        n = int(data.get("changed_files") or 0)
+        if not n:
+            return t["clean"]
+        files = ", ".join(str(l)[3:].strip() for l in (data.get("lines") or [])[:5])
+        if n > 5:
+            files += ", …"
+        return t["status"].format(n=n, files=files)
+    if isinstance(data, str):
+        lines = [l for l in data.splitlines() if l.strip()]
+        if not lines:
+            return t["clean"]
+        return t["diff"].format(stat=lines[-1].strip())
+    return ""
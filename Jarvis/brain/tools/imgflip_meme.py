@@ -1,7 +1,7 @@
 import random
 import os
 
-import requests
+from Jarvis.runtime import transport
 
 
 def spec():
@@ -15,7 +15,7 @@ def spec():
             "template_id": "string",
             "query": "string",
             "meme_type": "string",
-            "boxes": "array",
+            "boxes": {"type": "list", "items": "object"},
             "model": "string",
             "prefix_text": "string",
             "include_nsfw": "boolean",
@@ -27,7 +27,7 @@ def spec():
 
 def _pick_template_id():
     try:
-        resp = requests.get("https://api.imgflip.com/get_memes", timeout=10)
+        resp = transport.get("https://api.imgflip.com/get_memes", timeout=10)
         data = resp.json() if resp.ok else {}
     except Exception:
         return "181913649"  # Drake Hotline Bling
@@ -71,7 +71,7 @@ def _flatten_boxes(boxes):
 
 def _post(endpoint, form):
     try:
-        resp = requests.post(f"https://api.imgflip.com/{endpoint}", data=form, timeout=20)
+        resp = transport.post(f"https://api.imgflip.com/{endpoint}", data=form, timeout=20)
         data = resp.json() if resp.ok else {}
     except Exception as e:
         return {"ok": False, "error_code": "request_failed", "details": str(e)}
@@ -134,7 +134,7 @@ def run(
         if t:
             params["type"] = t
         try:
-            resp = requests.get("https://api.imgflip.com/get_memes", params=params, timeout=20)
+            resp = transport.get("https://api.imgflip.com/get_memes", params=params, timeout=20)
             data = resp.json() if resp.ok else {}
         except Exception as e:
             return {"ok": False, "error_code": "request_failed", "details": str(e)}
@@ -1,4 +1,4 @@
-import requests
+from Jarvis.runtime import transport
 
 
 def spec():
@@ -10,5 +10,18 @@ def spec():
 
 
 def run(*, assistant=None, wolfram_fn=None):
-    return requests.get("https://api.ipify.org", timeout=10).text
+    return transport.get("https://api.ipify.org", timeout=10).text
 
+
+_TEMPLATES = {
+    "en": "Your public IP address is {ip}.",
+    "ru": "Ваш публичный IP-адрес: {ip}.",
+    "de": "Ihre öffentliche IP-Adresse ist {ip}.",
+}
+
+
+def format_reply(*, result, tool_args=None, lang="en"):
+    value = str((result or {}).get("data") or "").strip()
+    if not value or " " in value:
+        return ""
+    return _TEMPLATES.get(lang, _TEMPLATES["en"]).format(ip=value)
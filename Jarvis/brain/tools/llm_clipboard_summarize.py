@@ -9,6 +9,7 @@ def spec():
         "name": "llm_clipboard_summarize",
         "description": "Summarize the current clipboard text using the configured LLM.",
         "args": {"style": "string"},
+        "timeout_s": 45,
     }
 
 
@@ -16,3 +16,13 @@ def run(*, assistant, wolfram_fn=None):
         if isinstance(a, dict) and a.get("title"):
             titles.append(a["title"])
     return {"ok": True, "headlines": titles}
+
+
+def format_reply(*, result, tool_args=None, lang="en"):
+    # Headlines come from an English feed; other languages go through the LLM to translate.
+    if lang != "en":
+        return ""
+    headlines = [str(h).strip() for h in (result or {}).get("headlines") or [] if str(h).strip()]
+    if not headlines:
+        return ""
+    return "Top headlines: " + " ".join(f"{i}. {h.rstrip('.')}." for i, h in enumerate(headlines[:5], 1))
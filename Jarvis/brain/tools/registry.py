@@ -0,0 +1,218 @@
+import ast
+import hashlib
+import importlib
+import inspect
+import json
+import os
+import threading
+import time
+
+MANIFEST_VERSION = 1
+# Arguments the runtime injects; they are never asked from the user.
+_INJECTED_ARGS = ("assistant", "wolfram_fn", "user_text", "cancel_event")
+
+
+def _required_from_run(params):
+    return [name for name, has_default in params if name not in _INJECTED_ARGS and not has_default]
+
+
+def _run_params_from_ast(fn):
+    args = fn.args
+    positional = list(args.posonlyargs) + list(args.args)
+    first_default = len(positional) - len(args.defaults)
+    params = [(a.arg, i >= first_default) for i, a in enumerate(positional)]
+    params += [(a.arg, d is not None) for a, d in zip(args.kwonlyargs, args.kw_defaults)]
+    return params
+
+
+def _enrich(raw, run_params, required_overrides):
+    spec = dict(raw or {})
+    spec.setdefault("args", {})
+    spec.setdefault("description", "")
+    explicit = spec.get("required")
+    if isinstance(explicit, list):
+        required = [str(x) for x in explicit if str(x).strip()]
+    elif spec.get("name", "") in required_overrides:
+        required = list(required_overrides[spec.get("name", "")])
+    else:
+        required = _required_from_run(run_params or [])
+    spec["required"] = required
+    return spec
+
+
+def static_entry(path, module_name, required_overrides):
+    """
+    Manifest row for one tool module, read from its source without importing it.
+
+    Returns None when ``spec()`` is not a plain literal; the caller then imports
+    the module instead.
+    """
+    with open(path, "rb") as f:
+        source = f.read()
+    try:
+        tree = ast.parse(source)
+    except SyntaxError:
+        return None
+    fns = {node.name: node for node in tree.body if isinstance(node, ast.FunctionDef)}
+    spec_fn = fns.get("spec")
+    if spec_fn is None or len(spec_fn.body) != 1 or not isinstance(spec_fn.body[0], ast.Return):
+        return None
+    try:
+        raw = ast.literal_eval(spec_fn.body[0].value)
+    except (ValueError, TypeError, SyntaxError):
+        return None
+    run_params = _run_params_from_ast(fns["run"]) if "run" in fns else []
+    return {
+        "module": module_name,
+        "sha1": hashlib.sha1(source).hexdigest(),
+        "spec": _enrich(raw, run_params, required_overrides),
+        "format_reply": "format_reply" in fns,
+        "can_run": "can_run" in fns,
+    }
+
+
+def imported_entry(module, module_name, sha1, required_overrides):
+    try:
+        sig = inspect.signature(module.run)
+        run_params = [
+            (name, p.default is not inspect.Parameter.empty)
+            for name, p in sig.parameters.items()
+            if p.kind not in (p.VAR_POSITIONAL, p.VAR_KEYWORD)
+        ]
+    except Exception:
+        run_params = []
+    return {
+        "module": module_name,
+        "sha1": sha1,
+        "spec": _enrich(module.spec(), run_params, required_overrides),
+        "format_reply": callable(getattr(module, "format_reply", None)),
+        "can_run": callable(getattr(module, "can_run", None)),
+    }
+
+
+def _sha1_file(path):
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+class ToolRegistry:
+    """
+    Tool name -> spec -> lazily imported module.
+
+    Specs come from a manifest cached at ``manifest_path``. A row is reused
+    while its module's source hash matches, and is otherwise re-read from the
+    source with ``ast`` (no import). Modules, and the heavy packages they
+    pull in, are imported on first use.
+    """
+
+    def __init__(self, package, module_names, *, tool_dir, manifest_path="", required_overrides=None):
+        self.package = package
+        self.tool_dir = tool_dir
+        self.manifest_path = manifest_path
+        self._overrides = dict(required_overrides or {})
+        self._modules = {}
+        self._lock = threading.Lock()
+        started = time.perf_counter()
+        entries, self.manifest_status = self._load_entries(list(module_names))
+        self.build_ms = (time.perf_counter() - started) * 1000.0
+        self._entries = {e["spec"].get("name"): e for e in entries}
+        self.specs = [e["spec"] for e in entries]
+
+    def _overrides_digest(self):
+        return hashlib.sha1(json.dumps(self._overrides, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def _read_cache(self):
+        if not self.manifest_path or not os.path.exists(self.manifest_path):
+            return {}
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if data.get("version") != MANIFEST_VERSION or data.get("overrides") != self._overrides_digest():
+            return {}
+        return {row.get("module"): row for row in data.get("tools") or [] if isinstance(row, dict)}
+
+    def _write_cache(self, entries):
+        if not self.manifest_path:
+            return
+        data = {"version": MANIFEST_VERSION, "overrides": self._overrides_digest(), "tools": entries}
+        folder = os.path.dirname(os.path.abspath(self.manifest_path))
+        tmp = self.manifest_path + ".tmp"
+        try:
+            os.makedirs(folder, exist_ok=True)
+            if not os.access(folder, os.W_OK):
+                # A read-only install still works; the catalog is just parsed again next start.
+                return
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=1)
+            os.replace(tmp, self.manifest_path)
+        except OSError:
+            if os.path.exists(tmp):
+                try:
+                    os.remove(tmp)
+                except OSError:
+                    pass
+
+    def _load_entries(self, module_names):
+        cached = self._read_cache()
+        entries = []
+        rebuilt = 0
+        for module_name in module_names:
+            path = os.path.join(self.tool_dir, f"{module_name}.py")
+            sha1 = _sha1_file(path)
+            row = cached.get(module_name)
+            if row and row.get("sha1") == sha1:
+                entries.append(row)
+                continue
+            rebuilt += 1
+            row = static_entry(path, module_name, self._overrides)
+            if row is None:
+                module = self._import(module_name)
+                row = imported_entry(module, module_name, sha1, self._overrides)
+            entries.append(row)
+        if rebuilt or len(cached) != len(module_names):
+            self._write_cache(entries)
+        if not rebuilt:
+            return entries, "cached"
+        return entries, "built" if rebuilt == len(module_names) else "refreshed"
+
+    def _import(self, module_name):
+        with self._lock:
+            module = self._modules.get(module_name)
+            if module is None:
+                module = importlib.import_module(f"{self.package}.{module_name}")
+                self._modules[module_name] = module
+            return module
+
+    def names(self):
+        return [s.get("name") for s in self.specs]
+
+    def spec(self, name):
+        entry = self._entries.get(str(name or ""))
+        return entry["spec"] if entry else None
+
+    def module(self, name):
+        """The tool's module, imported on first use; ``None`` for unknown tools."""
+        entry = self._entries.get(str(name or ""))
+        if entry is None:
+            return None
+        return self._import(entry["module"])
+
+    def formatter(self, name):
+        entry = self._entries.get(str(name or ""))
+        if not entry or not entry.get("format_reply"):
+            return None
+        return getattr(self.module(name), "format_reply", None)
+
+    def loaded(self):
+        with self._lock:
+            return sorted(self._modules)
+
+    def stats(self):
+        return {
+            "tools": len(self.specs),
+            "loaded": len(self._modules),
+            "manifest": self.manifest_status,
+            "build_ms": round(self.build_ms, 2),
+        }
@@ -17,6 +17,7 @@ def spec():
         "args": {"name": "string", "args": "object", "confirm": "boolean", "dry_run": "boolean"},
         "side_effects": True,
         "required": ["name"],
+        "timeout_s": 120,
     }
 
 
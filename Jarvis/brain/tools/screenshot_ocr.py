@@ -9,6 +9,8 @@ def spec():
         "description": "Take a screenshot and extract text via Tesseract OCR if available (side effect).",
         "args": {"filename": "string"},
         "side_effects": True,
+        "timeout_s": 30,
+        "executor": "process",
     }
 
 
@@ -6,7 +6,7 @@ def spec():
     return {
         "name": "system_health",
         "description": "Report disk usage and top CPU processes.",
-        "args": {"top_n": "number"},
+        "args": {"top_n": {"type": "integer", "min": 1, "max": 20, "clamp": True}},
     }
 
 
@@ -42,3 +42,35 @@ def run(*, assistant=None, wolfram_fn=None, top_n=5):
         "disk": {"total_gb": round(disk.total / 1e9, 2), "free_gb": round(disk.free / 1e9, 2)},
         "top_cpu": [{"cpu": c, **info} for c, info in scored[:top_n]],
     }
+
+
+_TEMPLATES = {
+    "en": (
+        "Disk: {free} GB free of {total} GB.",
+        "Busiest processes: {procs}.",
+    ),
+    "ru": (
+        "Диск: свободно {free} ГБ из {total} ГБ.",
+        "Больше всего нагружают процессор: {procs}.",
+    ),
+    "de": (
+        "Festplatte: {free} GB von {total} GB frei.",
+        "Prozesse mit der höchsten CPU-Last: {procs}.",
+    ),
+}
+
+
+def format_reply(*, result, tool_args=None, lang="en"):
+    data = (result or {}).get("data")
+    if not isinstance(data, dict) or not isinstance(data.get("disk"), dict):
+        return ""
+    disk_line, procs_line = _TEMPLATES.get(lang, _TEMPLATES["en"])
+    out = [disk_line.format(free=data["disk"].get("free_gb"), total=data["disk"].get("total_gb"))]
+    procs = [
+        f"{p.get('name')} ({round(float(p.get('cpu') or 0), 1)}%)"
+        for p in (data.get("top_cpu") or [])[:3]
+        if isinstance(p, dict) and p.get("name")
+    ]
+    if procs:
+        out.append(procs_line.format(procs=", ".join(procs)))
+    return " ".join(out)
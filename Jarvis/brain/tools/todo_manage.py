@@ -9,7 +9,11 @@ def spec():
     return {
         "name": "todo_manage",
         "description": "Manage a simple Markdown todo list in todo.md (side effect).",
-        "args": {"action": "string", "text": "string", "index": "number"},
+        "args": {
+            "action": {"type": "string", "enum": ["list", "add", "done"]},
+            "text": "string",
+            "index": {"type": "integer", "min": 0},
+        },
         "side_effects": True,
     }
 
@@ -68,3 +72,50 @@ def run(*, assistant=None, wolfram_fn=None, action="list", text="", index=None):
 
     return {"ok": False, "error": "unknown action"}
 
+
+_TEMPLATES = {
+    "en": {
+        "empty": "Your todo list is empty.",
+        "list": "You have {n} tasks: {items}.",
+        "add": "Added to your todo list: {text}.",
+        "done": "Marked task {index} as done.",
+    },
+    "ru": {
+        "empty": "Список дел пуст.",
+        "list": "Задач в списке: {n}. {items}.",
+        "add": "Добавил в список дел: {text}.",
+        "done": "Задача {index} отмечена как выполненная.",
+    },
+    "de": {
+        "empty": "Ihre Aufgabenliste ist leer.",
+        "list": "Sie haben {n} Aufgaben: {items}.",
+        "add": "Zur Aufgabenliste hinzugefügt: {text}.",
+        "done": "Aufgabe {index} als erledigt markiert.",
+    },
+}
+
+
+def format_reply(*, result, tool_args=None, lang="en"):
+    result = result or {}
+    if result.get("sandbox"):
+        return ""
+    t = _TEMPLATES.get(lang, _TEMPLATES["en"])
+    args = tool_args or {}
+    action = str(args.get("action") or "list").strip().lower()
+    if action == "list":
+        rows = result.get("data")
+        if not isinstance(rows, list):
+            return ""
+        if not rows:
+            return t["empty"]
+        items = "; ".join(
+            f"{r.get('index')}. {str(r.get('task', '')).replace('- [ ]', '').replace('- [x]', '✓').strip()}"
+            for r in rows[:10]
+            if isinstance(r, dict)
+        )
+        return t["list"].format(n=len(rows), items=items)
+    if action == "add":
+        return t["add"].format(text=str(args.get("text") or "").strip())
+    if action == "done":
+        return t["done"].format(index=args.get("index"))
+    return ""
@@ -7,6 +7,7 @@ def spec():
         "name": "translate_text",
         "description": "Translate text to a target language using the configured LLM.",
         "args": {"text": "string", "target_language": "string"},
+        "timeout_s": 45,
     }
 
 
@@ -0,0 +1,259 @@
+import json
+import os
+import stat
+
+# Tool spec "args" map an arg name to a rule. A bare type name ("string",
+# "number", "boolean", "object", "array") keeps the historic lenient
+# behaviour: values that do not coerce are passed through unchanged.
+# A dict rule is strict and reports why a value was rejected:
+#   {"type": "string", "enum": ["list", "add", "done"]}
+#   {"type": "integer", "min": 1, "max": 200, "clamp": True}
+#   {"type": "path", "kind": "dir", "must_exist": True}
+#   {"type": "list", "items": "string", "max_items": 10}
+
+_TRUE = ("1", "true", "yes", "y", "on")
+_FALSE = ("0", "false", "no", "n", "off")
+
+
+class ArgError(ValueError):
+    pass
+
+
+def _json_literal(value, kind):
+    if not isinstance(value, str):
+        return None
+    s = value.strip()
+    opener, closer = ("{", "}") if kind is dict else ("[", "]")
+    if not (s.startswith(opener) and s.endswith(closer)):
+        return None
+    try:
+        parsed = json.loads(s)
+    except ValueError:
+        return None
+    return parsed if isinstance(parsed, kind) else None
+
+
+def _to_string(value):
+    return value if isinstance(value, str) else str(value)
+
+
+def _to_bool(value):
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)):
+        return bool(value)
+    s = str(value).strip().lower()
+    if s in _TRUE:
+        return True
+    if s in _FALSE:
+        return False
+    raise ArgError(f"expected yes or no, got {value!r}")
+
+
+def _to_number(value):
+    if isinstance(value, (int, float)):
+        return value
+    s = str(value).strip()
+    try:
+        return float(s) if "." in s else int(s)
+    except ValueError:
+        raise ArgError(f"expected a number, got {value!r}") from None
+
+
+def _to_integer(value):
+    number = _to_number(value)
+    if isinstance(number, float):
+        if not number.is_integer():
+            raise ArgError(f"expected a whole number, got {value!r}")
+        number = int(number)
+    return number
+
+
+def _to_object(value):
+    if isinstance(value, dict):
+        return value
+    parsed = _json_literal(value, dict)
+    if parsed is None:
+        raise ArgError(f"expected an object, got {value!r}")
+    return parsed
+
+
+def _to_list(value):
+    if isinstance(value, list):
+        return value
+    if isinstance(value, tuple):
+        return list(value)
+    parsed = _json_literal(value, list)
+    if parsed is None:
+        raise ArgError(f"expected a list, got {value!r}")
+    return parsed
+
+
+def _to_path(value):
+    s = _to_string(value).strip().strip("\"'").strip()
+    if not s:
+        return s
+    return os.path.expanduser(s)
+
+
+_BASE = {
+    "string": _to_string,
+    "str": _to_string,
+    "boolean": _to_bool,
+    "bool": _to_bool,
+    "number": _to_number,
+    "float": _to_number,
+    "int": _to_integer,
+    "integer": _to_integer,
+    "object": _to_object,
+    "dict": _to_object,
+    "map": _to_object,
+    "list": _to_list,
+    "array": _to_list,
+    "path": _to_path,
+}
+
+
+def _lenient(base):
+    def coerce(value):
+        try:
+            return base(value)
+        except ArgError:
+            return value
+
+    return coerce
+
+
+def _passthrough(value):
+    return value
+
+
+def _enum_check(choices):
+    by_key = {str(c).strip().lower(): c for c in choices}
+    listed = ", ".join(str(c) for c in choices)
+
+    def check(value):
+        key = str(value).strip().lower()
+        if key not in by_key:
+            raise ArgError(f"expected one of {listed}, got {value!r}")
+        return by_key[key]
+
+    return check
+
+
+def _range_check(low, high, clamp):
+    def check(value):
+        if low is not None and value < low:
+            if clamp:
+                return type(value)(low)
+            raise ArgError(f"must be at least {low}, got {value}")
+        if high is not None and value > high:
+            if clamp:
+                return type(value)(high)
+            raise ArgError(f"must be at most {high}, got {value}")
+        return value
+
+    return check
+
+
+def _path_check(kind, must_exist):
+    def check(value):
+        if not value:
+            return value
+        try:
+            mode = os.stat(value).st_mode
+        except (OSError, ValueError):
+            if must_exist:
+                raise ArgError(f"path does not exist: {value}") from None
+            return value
+        if kind == "dir" and not stat.S_ISDIR(mode):
+            raise ArgError(f"expected a folder, got a file: {value}")
+        if kind == "file" and stat.S_ISDIR(mode):
+            raise ArgError(f"expected a file, got a folder: {value}")
+        return value
+
+    return check
+
+
+def _items_check(item_coerce, max_items):
+    def check(values):
+        if max_items is not None and len(values) > max_items:
+            raise ArgError(f"expected at most {max_items} items, got {len(values)}")
+        out = []
+        for i, item in enumerate(values):
+            try:
+                out.append(item_coerce(item))
+            except ArgError as e:
+                raise ArgError(f"item {i}: {e}") from None
+        return out
+
+    return check
+
+
+def compile_rule(rule):
+    """One arg rule -> ``coerce(value)`` returning the clean value or raising ``ArgError``."""
+    if not isinstance(rule, dict):
+        base = _BASE.get(str(rule or "").strip().lower())
+        if base in (_to_string, _to_path):
+            return base
+        return _lenient(base) if base else _passthrough
+    t = str(rule.get("type") or "string").strip().lower()
+    steps = [_BASE.get(t, _passthrough)]
+    if rule.get("enum"):
+        steps.append(_enum_check(list(rule["enum"])))
+    if rule.get("min") is not None or rule.get("max") is not None:
+        steps.append(_range_check(rule.get("min"), rule.get("max"), bool(rule.get("clamp"))))
+    if t == "path" and (rule.get("kind") or rule.get("must_exist")):
+        steps.append(_path_check(rule.get("kind"), bool(rule.get("must_exist"))))
+    if t in ("list", "array") and (rule.get("items") or rule.get("max_items") is not None):
+        items = rule.get("items")
+        item_coerce = compile_rule(items if isinstance(items, dict) else {"type": items}) if items else _passthrough
+        steps.append(_items_check(item_coerce, rule.get("max_items")))
+    if len(steps) == 1:
+        return steps[0]
+
+    def coerce(value):
+        for step in steps:
+            value = step(value)
+        return value
+
+    return coerce
+
+
+def _empty(value):
+    return value is None or (isinstance(value, str) and not value.strip())
+
+
+def compile_args(args_spec, required=()):
+    """
+    Compile a tool's ``args``/``required`` once into ``validate(tool_args)``.
+
+    ``validate`` returns ``(clean, missing, errors)``: coerced args for the
+    declared names, required names that are absent or unusable, and
+    ``{arg: reason}`` for every rejected value.
+    """
+    fields = {name: compile_rule(rule) for name, rule in (args_spec or {}).items()}
+    required = tuple(required or ())
+
+    def validate(tool_args):
+        clean = {}
+        errors = {}
+        if not isinstance(tool_args, dict):
+            tool_args = {}
+        # Calls carry a few args while specs may declare a dozen: walk the call, not the spec.
+        for name, value in tool_args.items():
+            coerce = fields.get(name)
+            if coerce is None or value is None:
+                continue
+            if value.__class__ is str and not value.strip():
+                # Blank means "not given": tools apply their own defaults, required names are reported below.
+                clean[name] = value
+                continue
+            try:
+                clean[name] = coerce(value)
+            except ArgError as e:
+                errors[name] = str(e)
+        missing = [k for k in required if _empty(clean.get(k))]
+        return clean, missing, errors
+
+    return validate
@@ -9,3 +9,13 @@ def spec():
 def run(*, assistant, wolfram_fn=None, city=""):
     return assistant.weather(city)
 
+
+
+def format_reply(*, result, tool_args=None, lang="en"):
+    # The weather feature already phrases an English sentence; other languages go through the LLM.
+    if lang != "en":
+        return ""
+    value = (result or {}).get("data")
+    if not isinstance(value, str):
+        return ""
+    return " ".join(value.split()).rstrip(".") + "."
@@ -0,0 +1,56 @@
+import threading
+
+_CHAT_ROLES = ("user", "assistant", "system")
+
+
+def normalize_history(rows, limit=12):
+    """
+    Keep valid chat rows (known role, non-empty content), starting with a non-assistant turn.
+
+    Some providers reject history if the first non-system message is assistant.
+    """
+    normalized = []
+    for row in rows or []:
+        if not isinstance(row, dict):
+            continue
+        role = str(row.get("role", "")).strip().lower()
+        content = str(row.get("content", ""))
+        if role not in _CHAT_ROLES:
+            continue
+        if not content.strip():
+            continue
+        normalized.append({"role": role, "content": content})
+    while normalized and normalized[0].get("role") == "assistant":
+        normalized.pop(0)
+    return normalized[-limit:]
+
+
+class TurnContext:
+    """
+    Conversation history for one turn, read from the store at most once.
+
+    ``history()`` loads lazily through ``load`` (e.g. a Redis ``LRANGE``) and
+    returns copies of the snapshot; ``record()`` mirrors this turn's own writes
+    into it so later readers in the same turn see them without another read.
+    """
+
+    def __init__(self, load, limit=12):
+        self._load = load
+        self._limit = int(limit)
+        self._rows = None
+        self._lock = threading.Lock()
+        self.loads = 0
+
+    def history(self):
+        with self._lock:
+            if self._rows is None:
+                self._rows = normalize_history(self._load(), self._limit)
+                self.loads += 1
+            return list(self._rows)
+
+    def record(self, role, content):
+        with self._lock:
+            # Not loaded yet: the store already has the write, so the first read will see it.
+            if self._rows is None:
+                return
+            self._rows = normalize_history(self._rows + [{"role": role, "content": content}], self._limit)
@@ -110,18 +110,112 @@ speech_phrase_time_limit_conversational = int(
     os.getenv("JIVAN_SPEECH_PHRASE_TIME_LIMIT_CONVERSATIONAL", "6")
 )
 speech_phrase_time_limit_dictation = int(os.getenv("JIVAN_SPEECH_PHRASE_TIME_LIMIT_DICTATION", "14"))
-speech_latency_trace = os.getenv("JIVAN_SPEECH_LATENCY_TRACE", "1")
 
 # LLM latency tuning.
 llm_timeout_s = int(os.getenv("JIVAN_LLM_TIMEOUT_S", "10"))
 llm_tool_fill_timeout_s = int(os.getenv("JIVAN_LLM_TOOL_FILL_TIMEOUT_S", "6"))
 llm_fast_model = os.getenv("JIVAN_LLM_FAST_MODEL", llm_model)
 latency_trace = os.getenv("JIVAN_LATENCY_TRACE", "1")
+# Turn tracing: nested spans appended to a Chrome trace file (open in chrome://tracing or ui.perfetto.dev).
+trace_enabled = os.getenv("JIVAN_TRACE_ENABLED", "0")
+trace_path = os.getenv("JIVAN_TRACE_PATH", "Jarvis/data/turn_trace.json")
+trace_max_bytes = int(os.getenv("JIVAN_TRACE_MAX_BYTES", "20000000"))
 llm_fast_timeout_s = int(os.getenv("JIVAN_LLM_FAST_TIMEOUT_S", "7"))
+# Hedged requests: past the primary's p90 latency, duplicate the call to the fast model (or the fallback
+# endpoint) and keep the first valid answer. Hedges are capped at a share of recent requests.
+llm_hedging = os.getenv("JIVAN_LLM_HEDGING", "1")
+llm_hedge_quantile = float(os.getenv("JIVAN_LLM_HEDGE_QUANTILE", "0.9"))
+llm_hedge_min_samples = int(os.getenv("JIVAN_LLM_HEDGE_MIN_SAMPLES", "20"))
+llm_hedge_default_ms = int(os.getenv("JIVAN_LLM_HEDGE_DEFAULT_MS", "2500"))
+llm_hedge_max_ratio = float(os.getenv("JIVAN_LLM_HEDGE_MAX_RATIO", "0.15"))
+# Optional secondary OpenAI-compatible endpoint for hedging and failover.
+llm_fallback_base_url = os.getenv("JIVAN_LLM_FALLBACK_BASE_URL", "")
+llm_fallback_api_key = os.getenv("JIVAN_LLM_FALLBACK_API_KEY", "")
+llm_fallback_model = os.getenv("JIVAN_LLM_FALLBACK_MODEL", "")
+# Stop calling a model after this many consecutive failures; probe it again after the reset window.
+llm_breaker_failures = int(os.getenv("JIVAN_LLM_BREAKER_FAILURES", "5"))
+llm_breaker_reset_s = int(os.getenv("JIVAN_LLM_BREAKER_RESET_S", "30"))
 llm_prompt_char_budget = int(os.getenv("JIVAN_LLM_PROMPT_CHAR_BUDGET", "12000"))
+# Token budget for history rows; the system prompt is measured first and always sent whole,
+# as is the newest turn. 0 disables trimming.
+llm_history_token_budget = int(os.getenv("JIVAN_LLM_HISTORY_TOKEN_BUDGET", "2500"))
+# Model context window in tokens (0 = unknown); when set, history also gets no more than what
+# is left after the system prompt and the reply reserve.
+llm_context_tokens = int(os.getenv("JIVAN_LLM_CONTEXT_TOKENS", "0"))
+llm_reply_reserve_tokens = int(os.getenv("JIVAN_LLM_REPLY_RESERVE_TOKENS", "1024"))
+# Token counter: heuristic, or tiktoken[:<encoding>] when tiktoken is installed.
+llm_tokenizer = os.getenv("JIVAN_LLM_TOKENIZER", "heuristic")
+# Fold turns that fall out of the prompt into a rolling summary (stored next to the Redis buffer).
+brain_summary_enabled = os.getenv("JIVAN_BRAIN_SUMMARY_ENABLED", "1")
+brain_summary_max_chars = int(os.getenv("JIVAN_BRAIN_SUMMARY_MAX_CHARS", "1200"))
+# Send prompt_cache_key=<static prefix hash> (OpenAI-style prompt caching); off for providers that reject it.
+llm_prompt_cache_key = os.getenv("JIVAN_LLM_PROMPT_CACHE_KEY", "0")
+# Ask streamed responses for a final usage chunk (cached prompt token metrics).
+llm_stream_include_usage = os.getenv("JIVAN_LLM_STREAM_INCLUDE_USAGE", "1")
+brain_prompt_catalog_refresh_s = int(os.getenv("JIVAN_BRAIN_PROMPT_CATALOG_REFRESH_S", "30"))
+# Tool spec snapshot, rebuilt from tool sources when they change; empty keeps it in memory only.
+brain_tool_manifest_path = os.getenv("JIVAN_BRAIN_TOOL_MANIFEST_PATH", "Jarvis/data/tool_manifest.json")
+# Tool calls run in a pool with a deadline; a tool's spec may set its own "timeout_s".
+tool_default_timeout_s = float(os.getenv("JIVAN_TOOL_DEFAULT_TIMEOUT_S", "20"))
+tool_executor_threads = int(os.getenv("JIVAN_TOOL_EXECUTOR_THREADS", "8"))
+# Workers for "executor": "process" tools (OCR); 0 runs them on the thread pool.
+tool_executor_processes = int(os.getenv("JIVAN_TOOL_EXECUTOR_PROCESSES", "2"))
+# file_search answers from a SQLite filename index of these comma-separated roots, rescanned in the background.
+file_index_enabled = os.getenv("JIVAN_FILE_INDEX_ENABLED", "1")
+file_index_path = os.getenv("JIVAN_FILE_INDEX_PATH", "Jarvis/data/file_index.sqlite3")
+file_index_roots = os.getenv("JIVAN_FILE_INDEX_ROOTS", "~")
+file_index_refresh_s = int(os.getenv("JIVAN_FILE_INDEX_REFRESH_S", "300"))
+# Folder names never indexed (searches inside them walk the disk instead).
+file_index_exclude = os.getenv("JIVAN_FILE_INDEX_EXCLUDE", ".git,node_modules,__pycache__")
+# Only show the planner the tools/protocols relevant to the query (BM25 over the catalog).
+brain_tool_retrieval = os.getenv("JIVAN_BRAIN_TOOL_RETRIEVAL", "1")
+brain_tool_retrieval_top_k = int(os.getenv("JIVAN_BRAIN_TOOL_RETRIEVAL_TOP_K", "8"))
+brain_protocol_retrieval_top_k = int(os.getenv("JIVAN_BRAIN_PROTOCOL_RETRIEVAL_TOP_K", "4"))
+# Below this best-match score the full catalog is sent instead.
+brain_tool_retrieval_min_score = float(os.getenv("JIVAN_BRAIN_TOOL_RETRIEVAL_MIN_SCORE", "1.5"))
+brain_tool_retrieval_always_on = os.getenv(
+    "JIVAN_BRAIN_TOOL_RETRIEVAL_ALWAYS_ON",
+    "web_search,google_search,wikipedia,wolframalpha,launch_app,open_website,run_protocol,list_protocols,mcp_execute",
+)
+# Stream replies (SSE) and hand finished sentences to TTS while the rest is generating.
+llm_streaming = os.getenv("JIVAN_LLM_STREAMING", "1")
+speech_tts_chunk_min_chars = int(os.getenv("JIVAN_SPEECH_TTS_CHUNK_MIN_CHARS", "16"))
+speech_tts_chunk_max_chars = int(os.getenv("JIVAN_SPEECH_TTS_CHUNK_MAX_CHARS", "220"))
+# Start side-effect-free tools as soon as the streamed plan names them with all required args.
+brain_early_tool_dispatch = os.getenv("JIVAN_BRAIN_EARLY_TOOL_DISPATCH", "1")
+brain_worker_threads = int(os.getenv("JIVAN_BRAIN_WORKER_THREADS", "6"))
+# Join identical LLM requests and side-effect-free tool calls that are already in flight.
+brain_singleflight = os.getenv("JIVAN_BRAIN_SINGLEFLIGHT", "1")
+# Guess a side-effect-free tool from the text and run it while the planner is thinking.
+brain_speculative_tools = os.getenv("JIVAN_BRAIN_SPECULATIVE_TOOLS", "1")
+brain_speculative_tool_names = os.getenv("JIVAN_BRAIN_SPECULATIVE_TOOL_NAMES", "weather,news,wikipedia,get_time,ip_address")
+# Phrase simple tool results with per-tool templates instead of a second LLM call.
+brain_template_replies = os.getenv("JIVAN_BRAIN_TEMPLATE_REPLIES", "1")
+brain_template_reply_max_chars = int(os.getenv("JIVAN_BRAIN_TEMPLATE_REPLY_MAX_CHARS", "480"))
+# Per-source deadlines for concurrent context assembly; late sources fall back to a default.
+brain_context_soul_deadline_ms = int(os.getenv("JIVAN_BRAIN_CONTEXT_SOUL_DEADLINE_MS", "200"))
+brain_context_history_deadline_ms = int(os.getenv("JIVAN_BRAIN_CONTEXT_HISTORY_DEADLINE_MS", "300"))
+brain_context_memory_deadline_ms = int(os.getenv("JIVAN_BRAIN_CONTEXT_MEMORY_DEADLINE_MS", "400"))
+brain_context_persona_deadline_ms = int(os.getenv("JIVAN_BRAIN_CONTEXT_PERSONA_DEADLINE_MS", "150"))
+brain_context_plan_deadline_ms = int(os.getenv("JIVAN_BRAIN_CONTEXT_PLAN_DEADLINE_MS", "400"))
 brain_no_llm_mode = os.getenv("JIVAN_BRAIN_NO_LLM_MODE", "0")
 brain_semantic_cache_ttl_s = int(os.getenv("JIVAN_BRAIN_SEMANTIC_CACHE_TTL_S", "45"))
+# "reply" = plain LLM answers; tool names = replies built from those (side-effect-free) tools.
+brain_semantic_cache_intents = os.getenv(
+    "JIVAN_BRAIN_SEMANTIC_CACHE_INTENTS", "reply,weather,news,wikipedia,ip_address,get_date"
+)
 brain_tool_cache_ttl_s = int(os.getenv("JIVAN_BRAIN_TOOL_CACHE_TTL_S", "60"))
+# Per-tool cache freshness in seconds (0 disables caching for that tool).
+brain_tool_cache_ttls = os.getenv(
+    "JIVAN_BRAIN_TOOL_CACHE_TTLS",
+    "weather=600,news=900,wikipedia=86400,ip_address=300,get_date=300,get_time=0",
+)
+brain_cache_max_items = int(os.getenv("JIVAN_BRAIN_CACHE_MAX_ITEMS", "256"))
+brain_cache_max_bytes = int(os.getenv("JIVAN_BRAIN_CACHE_MAX_BYTES", "2000000"))
+# memory | sqlite | redis; sqlite/redis keep warm caches across restarts.
+brain_cache_backend = os.getenv("JIVAN_BRAIN_CACHE_BACKEND", "memory")
+brain_cache_path = os.getenv("JIVAN_BRAIN_CACHE_PATH", "Jarvis/data/brain_cache.sqlite3")
+brain_cache_redis_prefix = os.getenv("JIVAN_BRAIN_CACHE_REDIS_PREFIX", "jivan:cache")
 
 # Protocol reaction tuning.
 protocol_ai_reactions = os.getenv("JIVAN_PROTOCOL_AI_REACTIONS", "1")
@@ -153,6 +247,17 @@ security_allowed_tailscale_cidrs = os.getenv("JIVAN_SECURITY_ALLOWED_TAILSCALE_C
 security_allowed_telegram_user_ids = os.getenv("JIVAN_SECURITY_ALLOWED_TELEGRAM_USER_IDS", "")
 security_allowed_telegram_usernames = os.getenv("JIVAN_SECURITY_ALLOWED_TELEGRAM_USERNAMES", "")
 
+# Headless brain server (scripts/brain_server.py): HTTP + WebSocket, loopback only by default.
+server_host = os.getenv("JIVAN_SERVER_HOST", "127.0.0.1")
+server_port = int(os.getenv("JIVAN_SERVER_PORT", "8765"))
+# When set, every request needs "Authorization: Bearer <token>" (required for non-loopback hosts).
+server_auth_token = os.getenv("JIVAN_SERVER_AUTH_TOKEN", "")
+server_max_concurrency = int(os.getenv("JIVAN_SERVER_MAX_CONCURRENCY", "8"))
+server_max_body_bytes = int(os.getenv("JIVAN_SERVER_MAX_BODY_BYTES", "65536"))
+# Conversations kept in memory at once; idle ones are dropped (Redis history survives).
+brain_max_sessions = int(os.getenv("JIVAN_BRAIN_MAX_SESSIONS", "256"))
+brain_session_idle_ttl_s = int(os.getenv("JIVAN_BRAIN_SESSION_IDLE_TTL_S", "3600"))
+
 # Composio MCP bridge.
 composio_mcp_enabled = os.getenv("JIVAN_COMPOSIO_MCP_ENABLED", "0")
 composio_api_key = os.getenv("JIVAN_COMPOSIO_API_KEY", "")
@@ -192,6 +297,12 @@ runtime_outbound_retry_max = int(os.getenv("JIVAN_RUNTIME_OUTBOUND_RETRY_MAX", "
 runtime_sandbox_mode = os.getenv("JIVAN_RUNTIME_SANDBOX_MODE", "0")
 runtime_offline_mode = os.getenv("JIVAN_RUNTIME_OFFLINE_MODE", "0")
 runtime_owner_only_critical = os.getenv("JIVAN_RUNTIME_OWNER_ONLY_CRITICAL", "1")
+# Shared outbound HTTP transport: per-host keep-alive pools, (connect, read) timeouts, idempotent retries.
+http_connect_timeout_s = float(os.getenv("JIVAN_HTTP_CONNECT_TIMEOUT_S", "3.05"))
+http_read_timeout_s = float(os.getenv("JIVAN_HTTP_READ_TIMEOUT_S", "20"))
+http_retries = int(os.getenv("JIVAN_HTTP_RETRIES", "2"))
+http_backoff_s = float(os.getenv("JIVAN_HTTP_BACKOFF_S", "0.2"))
+http_pool_size = int(os.getenv("JIVAN_HTTP_POOL_SIZE", "8"))
 
 # Audio device / profile tuning
 speech_input_device_index = os.getenv("JIVAN_SPEECH_INPUT_DEVICE_INDEX", "")
@@ -1,8 +1,10 @@
-import webbrowser, requests
+import webbrowser
 from geopy.geocoders import Nominatim
 from geopy.distance import great_circle
 import geocoder
 
+from Jarvis.runtime import transport
+
 def loc(place):
     webbrowser.open("http://www.google.com/maps/place/" + place + "")
     geolocator = Nominatim(user_agent="myGeocoder")
@@ -25,9 +27,9 @@ def loc(place):
     return current_loc, target_loc, distance
 
 def my_location():
-    ip_add = requests.get('https://api.ipify.org').text
+    ip_add = transport.get('https://api.ipify.org').text
     url = 'https://get.geojs.io/v1/ip/geo/' + ip_add + '.json'
-    geo_requests = requests.get(url)
+    geo_requests = transport.get(url)
     geo_data = geo_requests.json()
     city = geo_data['city']
     state = geo_data['region']
@@ -1,11 +1,12 @@
-import requests
 import json
 
+from Jarvis.runtime import transport
+
 
 
 def get_news():
     url = 'http://newsapi.org/v2/top-headlines?sources=the-times-of-india&apiKey=ae5ccbe2006a4debbe6424d7e4b569ec'
-    news = requests.get(url).text
+    news = transport.get(url).text
     news_dict = json.loads(news)
     articles = news_dict['articles']
     try:
@@ -1,5 +1,5 @@
-import requests
 from Jarvis.config import config
+from Jarvis.runtime import transport
 
 
 
@@ -17,7 +17,7 @@ def fetch_weather(city):
     base_url = "http://api.openweathermap.org/data/2.5/weather?q="
     complete_url = base_url + city + "&appid=" + api_key + units_format
 
-    response = requests.get(complete_url)
+    response = transport.get(complete_url)
 
     city_weather_data = response.json()
 
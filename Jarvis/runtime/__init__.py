@@ -1,7 +1,11 @@
+from .flags import config_flag
 from .structured_log import set_turn_id, get_turn_id, log_event
 from .replay import replay_event
 from .receipts import record_receipt, recent_receipts
-from .metrics import metrics_inc, metrics_observe_ms, metrics_snapshot
+from .metrics import metrics_add_observer, metrics_inc, metrics_observe_ms, metrics_remove_observer, metrics_snapshot
 from .precheck import startup_precheck
 from .secrets import scan_env_secrets
+from .singleflight import SingleFlight
+from . import transport
 
+from . import tracing
@@ -5,6 +5,9 @@ _MAP = {
     "missing_required_args": "I need more details to run this action.",
     "execution_failed": "The requested action failed while executing.",
     "source_access_denied": "Request blocked by access policy.",
+    "tool_unavailable": "This tool is not available on this machine.",
+    "invalid_args": "Some details for this action are not valid.",
+    "timeout": "The action took too long and was stopped.",
 }
 
 
@@ -0,0 +1,8 @@
+from Jarvis.config import config
+
+_TRUE = ("1", "true", "yes", "on")
+
+
+def config_flag(name, default="0"):
+    """An on/off setting from config: "1", "true", "yes" or "on" (any case) means on."""
+    return str(getattr(config, name, default)).strip().lower() in _TRUE
@@ -6,6 +6,7 @@ from Jarvis.config import config
 
 _COUNTERS = {}
 _LAT_MS = {}
+_OBSERVERS = []
 
 
 def metrics_inc(name, value=1):
@@ -24,6 +25,21 @@ def metrics_observe_ms(name, value_ms):
     if len(arr) > 200:
         arr = arr[-200:]
     _LAT_MS[key] = arr
+    for observer in list(_OBSERVERS):
+        try:
+            observer(key, float(value_ms))
+        except Exception:
+            pass
+
+
+def metrics_add_observer(fn):
+    """Call ``fn(name, value_ms)`` for every latency sample (e.g. a benchmark collecting per-turn stages)."""
+    _OBSERVERS.append(fn)
+
+
+def metrics_remove_observer(fn):
+    if fn in _OBSERVERS:
+        _OBSERVERS.remove(fn)
 
 
 def metrics_snapshot():
@@ -1,5 +1,4 @@
-import requests
-
+from Jarvis.runtime import transport
 from Jarvis.runtime.secrets import scan_env_secrets
 
 
@@ -10,7 +9,7 @@ def startup_precheck(*, assistant=None, brain=None):
     except Exception:
         out["mic"] = False
     try:
-        r = requests.get("https://api.ipify.org", timeout=3)
+        r = transport.get("https://api.ipify.org", timeout=3)
         out["internet"] = bool(r.ok and r.text)
     except Exception:
         out["internet"] = False
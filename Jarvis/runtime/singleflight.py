@@ -0,0 +1,63 @@
+import threading
+from concurrent.futures import Future
+
+
+class SingleFlight:
+    """
+    Collapse concurrent calls with the same key into one execution.
+
+    The first caller for a key (the leader) runs ``fn``; callers that arrive
+    while it is in flight wait for the leader and share its result or its
+    exception. Nothing is kept once the call finishes, so caching stays with
+    the caller (e.g. the tool TTL cache is filled by the leader).
+    """
+
+    def __init__(self, name, *, on_metric=None):
+        self.name = str(name or "default")
+        self._on_metric = on_metric
+        self._calls = {}
+        self._lock = threading.Lock()
+        self._stats = {"leaders": 0, "coalesced": 0, "errors": 0, "max_waiters": 0}
+
+    def _metric(self, name):
+        self._stats[name] += 1
+        if self._on_metric:
+            self._on_metric(f"singleflight_{self.name}_{name}", 1)
+
+    def do(self, key, fn, *args, **kwargs):
+        """Run ``fn(*args, **kwargs)`` once per in-flight ``key``; returns ``(result, shared)``."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = {"future": Future(), "waiters": 0}
+            else:
+                call["waiters"] += 1
+                self._stats["max_waiters"] = max(self._stats["max_waiters"], call["waiters"])
+        if not leader:
+            self._metric("coalesced")
+            return call["future"].result(), True
+
+        self._metric("leaders")
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            self._metric("errors")
+            call["future"].set_exception(e)
+            raise
+        else:
+            call["future"].set_result(result)
+            return result, False
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+    def in_flight(self):
+        return len(self._calls)
+
+    def stats(self):
+        out = dict(self._stats)
+        out["in_flight"] = len(self._calls)
+        calls = out["leaders"] + out["coalesced"]
+        out["coalesce_rate"] = (out["coalesced"] / float(calls)) if calls else 0.0
+        return out
@@ -0,0 +1,206 @@
+import inspect
+import multiprocessing
+import threading
+import time
+from concurrent.futures import CancelledError, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+
+from Jarvis.config import config
+from . import tracing
+from .metrics import metrics_inc, metrics_observe_ms
+from .structured_log import get_turn_id, set_turn_id
+
+
+class ToolTimeout(Exception):
+    def __init__(self, name, timeout_s):
+        super().__init__(f"{name} did not finish within {timeout_s:g}s")
+        self.name = name
+        self.timeout_s = timeout_s
+
+
+class ToolStillRunning(ToolTimeout):
+    """A detached call passed its deadline; it was left to finish in the background."""
+
+    def __str__(self):
+        return f"{self.name} is still running after {self.timeout_s:g}s"
+
+
+def _process_context():
+    """
+    forkserver where the platform has it; None otherwise.
+
+    spawn would re-execute main.py's top level (GUI, assistant, brain) in every
+    worker, and plain fork is unsafe once Qt and the brain threads are running.
+    """
+    if "forkserver" not in multiprocessing.get_all_start_methods():
+        return None
+    ctx = multiprocessing.get_context("forkserver")
+    # Without '__main__' in the preload list the server never imports main.py.
+    ctx.set_forkserver_preload([__name__])
+    return ctx
+
+
+class _Lane:
+    """One pool plus the counters behind queue-depth and saturation metrics."""
+
+    def __init__(self, kind, workers):
+        self.kind = kind
+        self.workers = max(1, int(workers))
+        self.pool = None
+        self.inflight = 0
+        self.running = 0
+        self.peak_inflight = 0
+        self.saturated = 0
+        self.submitted = 0
+
+
+class ToolExecutor:
+    """
+    Runs tool calls off the caller's thread with a deadline.
+
+    I/O tools share a thread pool. Tools whose spec says ``"executor": "process"``
+    (CPU-heavy work such as OCR) run in a process pool when the platform
+    supports forkserver, and on the thread pool otherwise. When a deadline
+    passes the caller gets ``ToolTimeout`` right away. A thread tool that
+    accepts ``cancel_event`` sees it set and should stop. A process tool is
+    killed together with its pool, so later calls do not queue behind it.
+    A ``detach`` call (a tool with side effects) is never stopped half-way:
+    past its deadline the caller gets ``ToolStillRunning`` and the call runs on.
+    """
+
+    def __init__(self, threads=None, processes=None):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._threads = _Lane("thread", threads or getattr(config, "tool_executor_threads", 8))
+        procs = int(getattr(config, "tool_executor_processes", 2) if processes is None else processes)
+        self._ctx = _process_context() if procs > 0 else None
+        self._processes = _Lane("process", procs) if self._ctx is not None else None
+        self._accepts_cancel = {}
+        self._timeouts = 0
+
+    def _lane(self, mode):
+        if mode == "process" and self._processes is not None:
+            return self._processes
+        return self._threads
+
+    def _pool(self, lane):
+        if lane.pool is None:
+            if lane.kind == "process":
+                lane.pool = ProcessPoolExecutor(max_workers=lane.workers, mp_context=self._ctx)
+            else:
+                lane.pool = ThreadPoolExecutor(max_workers=lane.workers, thread_name_prefix="jivan-tool")
+        return lane.pool
+
+    def _takes_cancel_event(self, fn):
+        if fn not in self._accepts_cancel:
+            try:
+                self._accepts_cancel[fn] = "cancel_event" in inspect.signature(fn).parameters
+            except (TypeError, ValueError):
+                self._accepts_cancel[fn] = False
+        return self._accepts_cancel[fn]
+
+    def run(self, name, fn, kwargs=None, *, timeout_s=None, mode="thread", detach=False):
+        """``fn(**kwargs)`` within ``timeout_s`` seconds; raises ``ToolTimeout`` past the deadline."""
+        kwargs = dict(kwargs or {})
+        if timeout_s is None:
+            timeout_s = float(getattr(config, "tool_default_timeout_s", 20))
+        lane = self._lane(mode)
+        cancel_event = threading.Event()
+        if lane.kind == "thread" and self._takes_cancel_event(fn):
+            kwargs["cancel_event"] = cancel_event
+        if getattr(self._local, "in_tool", False):
+            # A tool calling another tool (run_protocol) already holds a worker; queueing
+            # behind itself could deadlock a saturated pool. The outer deadline still applies.
+            return fn(**kwargs)
+
+        queued_at = time.perf_counter()
+        if lane.kind == "process":
+            task = (fn,)
+        else:
+            task = (self._thread_call, lane, fn, kwargs, queued_at, get_turn_id(), tracing.current_span())
+        with self._lock:
+            pool = self._pool(lane)
+            if lane.inflight >= lane.workers:
+                lane.saturated += 1
+                metrics_inc("tool_pool_saturated", 1)
+            lane.inflight += 1
+            lane.submitted += 1
+            lane.peak_inflight = max(lane.peak_inflight, lane.inflight)
+            fut = pool.submit(*task, **kwargs) if lane.kind == "process" else pool.submit(*task)
+        fut.add_done_callback(lambda _f: self._done(lane))
+        try:
+            return fut.result(timeout=max(0.0, float(timeout_s)))
+        except FutureTimeout:
+            if detach:
+                metrics_inc("tool_detached", 1)
+                raise ToolStillRunning(name, float(timeout_s)) from None
+            cancel_event.set()
+            if not fut.cancel() and lane.kind == "process":
+                self._recycle(lane, pool)
+            with self._lock:
+                self._timeouts += 1
+            metrics_inc("tool_timeouts", 1)
+            raise ToolTimeout(name, float(timeout_s)) from None
+        except CancelledError:
+            raise ToolTimeout(name, float(timeout_s)) from None
+        finally:
+            if lane.kind == "process":
+                metrics_observe_ms("tool_process_call_ms", (time.perf_counter() - queued_at) * 1000.0)
+
+    def _thread_call(self, lane, fn, kwargs, queued_at, turn_id, parent):
+        metrics_observe_ms("tool_queue_wait_ms", (time.perf_counter() - queued_at) * 1000.0)
+        if turn_id:
+            set_turn_id(turn_id)
+        with self._lock:
+            lane.running += 1
+        self._local.in_tool = True
+        try:
+            with tracing.attach(parent):
+                return fn(**kwargs)
+        finally:
+            self._local.in_tool = False
+            with self._lock:
+                lane.running -= 1
+
+    def _done(self, lane):
+        with self._lock:
+            lane.inflight -= 1
+
+    def _recycle(self, lane, pool):
+        """Kill a pool holding a hung worker; the next call starts a fresh one."""
+        with self._lock:
+            if lane.pool is pool:
+                lane.pool = None
+        kill_workers = getattr(pool, "kill_workers", None)  # Python 3.14+
+        if callable(kill_workers):
+            kill_workers()
+            return
+        for proc in list((getattr(pool, "_processes", None) or {}).values()):
+            proc.terminate()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self):
+        with self._lock:
+            out = {"timeouts": self._timeouts}
+            for lane in (self._threads, self._processes):
+                if lane is None:
+                    continue
+                busy = lane.running if lane.kind == "thread" else min(lane.inflight, lane.workers)
+                out[lane.kind] = {
+                    "workers": lane.workers,
+                    "inflight": lane.inflight,
+                    "queued": max(0, lane.inflight - busy),
+                    "peak_inflight": lane.peak_inflight,
+                    "saturated": lane.saturated,
+                    "submitted": lane.submitted,
+                }
+            return out
+
+    def shutdown(self):
+        with self._lock:
+            pools = [lane.pool for lane in (self._threads, self._processes) if lane is not None and lane.pool]
+            for lane in (self._threads, self._processes):
+                if lane is not None:
+                    lane.pool = None
+        for pool in pools:
+            pool.shutdown(wait=False, cancel_futures=True)
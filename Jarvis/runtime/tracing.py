@@ -0,0 +1,286 @@
+import contextlib
+import itertools
+import json
+import os
+import threading
+import time
+
+from Jarvis.config import config
+from .flags import config_flag
+from .metrics import metrics_observe_ms
+from .structured_log import get_turn_id, log_event
+
+_local = threading.local()
+_lock = threading.Lock()
+_ids = itertools.count(1)
+_PID = os.getpid()
+# perf_counter is monotonic but has no epoch; pin it to wall time once so trace timestamps are absolute.
+_EPOCH_US = time.time() * 1e6 - time.perf_counter() * 1e6
+
+
+def enabled():
+    return config_flag("trace_enabled", "0")
+
+
+def _path():
+    return os.path.abspath(str(getattr(config, "trace_path", "Jarvis/data/turn_trace.json")))
+
+
+def _us(perf_s):
+    return int(_EPOCH_US + perf_s * 1e6)
+
+
+class Span:
+    """
+    One timed step of a turn. Spans nest through a per-thread stack.
+
+    Finished spans are buffered on their root span and written together
+    when the root ends, so a dropped root (e.g. a listen that heard
+    nothing) leaves no trace at all.
+    """
+
+    def __init__(self, name, parent=None, attrs=None):
+        self.name = str(name)
+        self.span_id = format(next(_ids), "x")
+        self.parent = parent
+        self.root = parent.root if parent is not None else self
+        self.turn_id = get_turn_id()
+        self.tid = threading.get_ident()
+        self.attrs = dict(attrs or {})
+        self.start = time.perf_counter()
+        self.end_at = None
+        self.dropped = False
+        self.finished = []
+        self.events = []
+
+    @property
+    def duration_ms(self):
+        end = self.end_at if self.end_at is not None else time.perf_counter()
+        return (end - self.start) * 1000.0
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+        return self
+
+    def drop(self):
+        """Discard the whole trace this span belongs to."""
+        self.root.dropped = True
+
+    def end(self):
+        if self.end_at is not None:
+            return
+        self.end_at = time.perf_counter()
+        _finish(self)
+
+    def to_event(self):
+        args = dict(self.attrs)
+        args.update({"span_id": self.span_id, "parent_id": self.parent.span_id if self.parent else None})
+        if self.turn_id:
+            args["turn_id"] = self.turn_id
+        return {
+            "name": self.name,
+            "cat": "jivan",
+            "ph": "X",
+            "ts": _us(self.start),
+            "dur": max(0, int((self.end_at - self.start) * 1e6)),
+            "pid": _PID,
+            "tid": self.tid,
+            "args": args,
+        }
+
+
+class _UntracedSpan:
+    """Stand-in while tracing is off: still times the block so callers can feed metrics."""
+
+    span_id = None
+
+    def __init__(self, name):
+        self.name = str(name)
+        self.start = time.perf_counter()
+        self.end_at = None
+
+    @property
+    def duration_ms(self):
+        end = self.end_at if self.end_at is not None else time.perf_counter()
+        return (end - self.start) * 1000.0
+
+    def set(self, **attrs):
+        return self
+
+    def drop(self):
+        return None
+
+    def end(self):
+        if self.end_at is None:
+            self.end_at = time.perf_counter()
+
+
+def _stack():
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+def current_span():
+    stack = _stack()
+    return stack[-1] if stack else None
+
+
+def start_span(name, parent=None, **attrs):
+    """Open a span without making it current; call ``.end()`` yourself."""
+    if not enabled():
+        return _UntracedSpan(name)
+    if parent is None:
+        parent = current_span()
+    return Span(name, parent if isinstance(parent, Span) else None, attrs)
+
+
+@contextlib.contextmanager
+def span(name, **attrs):
+    """Time the block as a child of the current span (or as a new root)."""
+    current = start_span(name, **attrs)
+    if not isinstance(current, Span):
+        try:
+            yield current
+        finally:
+            current.end()
+        return
+    stack = _stack()
+    stack.append(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.set(error=type(e).__name__)
+        raise
+    finally:
+        if stack and stack[-1] is current:
+            stack.pop()
+        current.end()
+
+
+@contextlib.contextmanager
+def attach(parent):
+    """Make ``parent`` (captured on another thread) the current span for the block."""
+    if not isinstance(parent, Span):
+        yield
+        return
+    stack = _stack()
+    stack.append(parent)
+    try:
+        yield
+    finally:
+        if stack and stack[-1] is parent:
+            stack.pop()
+
+
+def wrap(name, fn, **attrs):
+    """``fn`` run inside ``span(name)``; for work handed to pools and assemblies."""
+
+    def _traced(*args, **kwargs):
+        with span(name, **attrs):
+            return fn(*args, **kwargs)
+
+    return _traced
+
+
+def annotate(**attrs):
+    """Set attributes on the current span, if any."""
+    current = current_span()
+    if current is not None:
+        current.set(**attrs)
+
+
+def event(name, **attrs):
+    """Record an instant event (e.g. first streamed sentence) in the current trace."""
+    current = current_span()
+    if current is None:
+        return
+    row = {
+        "name": str(name),
+        "cat": "jivan",
+        "ph": "i",
+        "s": "t",
+        "ts": _us(time.perf_counter()),
+        "pid": _PID,
+        "tid": threading.get_ident(),
+        "args": dict(attrs, parent_id=current.span_id),
+    }
+    with _lock:
+        if current.root.end_at is None:
+            current.root.events.append(row)
+            return
+    if not current.root.dropped:
+        _write([row])
+
+
+def _finish(done):
+    root = done.root
+    if root is not done:
+        with _lock:
+            if root.end_at is None:
+                root.finished.append(done)
+                return
+        # A straggler (e.g. an abandoned context source) that outlived its root.
+        if not root.dropped:
+            _write([done.to_event()])
+        return
+    if root.dropped:
+        return
+    with _lock:
+        spans = root.finished + [root]
+        events = list(root.events)
+    _write([s.to_event() for s in spans] + events)
+    if config_flag("latency_trace", "1"):
+        totals = stage_totals(root, spans)
+        metrics_observe_ms(f"trace_{root.name}_ms", root.duration_ms)
+        for name, ms in totals.items():
+            metrics_observe_ms(f"trace_{root.name}_{name}_ms", ms)
+        log_event("trace", root=root.name, ms=int(root.duration_ms), stages={k: int(v) for k, v in totals.items()})
+
+
+def stage_totals(root, spans):
+    """Milliseconds per span name under ``root``, in first-seen order."""
+    totals = {}
+    for row in spans:
+        if row is not root:
+            totals[row.name] = totals.get(row.name, 0.0) + row.duration_ms
+    return totals
+
+
+def summary_line(root, spans):
+    parts = " ".join(f"{name}={int(ms)}ms" for name, ms in stage_totals(root, spans).items())
+    return f"[trace] {root.name}={int(root.duration_ms)}ms {parts}".rstrip()
+
+
+def _write(rows):
+    """Append Chrome trace events (JSON array format; the closing bracket is optional for viewers)."""
+    if not rows:
+        return False
+    path = _path()
+    folder = os.path.dirname(path)
+    data = "".join(json.dumps(r, ensure_ascii=False, separators=(",", ":"), default=str) + ",\n" for r in rows)
+    with _lock:
+        try:
+            if folder and not os.path.isdir(folder):
+                os.makedirs(folder, exist_ok=True)
+            max_bytes = int(getattr(config, "trace_max_bytes", 20_000_000))
+            if max_bytes > 0 and os.path.exists(path) and os.path.getsize(path) > max_bytes:
+                os.replace(path, path + ".1")
+            fresh = not os.path.exists(path) or os.path.getsize(path) == 0
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(("[\n" if fresh else "") + data)
+        except Exception:
+            return False
+    return True
+
+
+def load_trace(path=None):
+    """Read a trace file written by this module back into a list of events."""
+    with open(path or _path(), "r", encoding="utf-8") as f:
+        text = f.read().strip()
+    if not text:
+        return []
+    if not text.endswith("]"):
+        text = text.rstrip(",") + "]"
+    return json.loads(text)
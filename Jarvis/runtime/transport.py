@@ -0,0 +1,127 @@
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from Jarvis.config import config
+from Jarvis.runtime.metrics import metrics_inc, metrics_observe_ms
+
+# Callers catch these exactly as they did with bare ``requests``.
+RequestException = requests.RequestException
+Timeout = requests.Timeout
+Response = requests.Response
+
+_IDEMPOTENT = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+_SESSIONS = {}
+_HOSTS = {}
+_lock = threading.Lock()
+
+
+def _default_timeout():
+    return (
+        float(getattr(config, "http_connect_timeout_s", 3.05)),
+        float(getattr(config, "http_read_timeout_s", 20)),
+    )
+
+
+def _retry_policy():
+    retries = max(0, int(getattr(config, "http_retries", 2)))
+    # Connect errors are retried for every method (nothing reached the server);
+    # read errors and 429/5xx answers only for idempotent methods.
+    return Retry(
+        total=retries,
+        connect=retries,
+        read=retries,
+        status=retries,
+        backoff_factor=float(getattr(config, "http_backoff_s", 0.2)),
+        status_forcelist=(429, 502, 503, 504),
+        allowed_methods=_IDEMPOTENT,
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+
+
+def _host(url):
+    parts = urlsplit(str(url or ""))
+    return (parts.hostname or "").lower(), parts.scheme or "https"
+
+
+def session_for(url):
+    """The keep-alive ``requests.Session`` shared by every call to ``url``'s host."""
+    host, scheme = _host(url)
+    key = f"{scheme}://{host}"
+    with _lock:
+        session = _SESSIONS.get(key)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=1,
+                pool_maxsize=max(1, int(getattr(config, "http_pool_size", 8))),
+                max_retries=_retry_policy(),
+            )
+            session.mount(f"{scheme}://", adapter)
+            _SESSIONS[key] = session
+        return session
+
+
+def _record(host, started, error=None, status=0):
+    ms = (time.perf_counter() - started) * 1000.0
+    with _lock:
+        row = _HOSTS.setdefault(host, {"requests": 0, "errors": 0, "total_ms": 0.0, "last_status": 0})
+        row["requests"] += 1
+        row["total_ms"] += ms
+        row["last_status"] = int(status or 0)
+        if error is not None or status >= 500:
+            row["errors"] += 1
+    metrics_observe_ms(f"http_{host}_ms", ms)
+    if error is not None or status >= 500:
+        metrics_inc(f"http_{host}_errors", 1)
+
+
+def request(method, url, **kwargs):
+    """
+    ``requests.request`` over a pooled per-host session.
+
+    Adds the default ``(connect, read)`` timeout when the caller gives none,
+    retries with backoff per ``http_retries``, and records per-host latency
+    and errors. Returns a ``requests.Response``.
+    """
+    if kwargs.get("timeout") is None:
+        kwargs["timeout"] = _default_timeout()
+    host, _scheme = _host(url)
+    started = time.perf_counter()
+    try:
+        res = session_for(url).request(str(method).upper(), url, **kwargs)
+    except requests.RequestException as e:
+        _record(host, started, error=e)
+        raise
+    _record(host, started, status=res.status_code)
+    return res
+
+
+def get(url, params=None, **kwargs):
+    return request("GET", url, params=params, **kwargs)
+
+
+def post(url, data=None, json=None, **kwargs):
+    return request("POST", url, data=data, json=json, **kwargs)
+
+
+def host_stats():
+    with _lock:
+        out = {}
+        for host, row in _HOSTS.items():
+            out[host] = dict(row)
+            out[host]["avg_ms"] = row["total_ms"] / float(row["requests"]) if row["requests"] else 0.0
+        return out
+
+
+def close_all():
+    with _lock:
+        sessions = list(_SESSIONS.values())
+        _SESSIONS.clear()
+    for session in sessions:
+        session.close()
@@ -0,0 +1,447 @@
+import asyncio
+import base64
+import hashlib
+import hmac
+import ipaddress
+import json
+import re
+import struct
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+from Jarvis.config import config
+from Jarvis.runtime.metrics import metrics_inc, metrics_observe_ms, metrics_snapshot
+from Jarvis.runtime.structured_log import set_turn_id
+from Jarvis.security import validate_source_access
+
+_WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+# No ":": the Redis buffer derives "<key>:summary" from a session's key.
+_SESSION_ID = re.compile(r"^[A-Za-z0-9_.-]{1,64}$")
+# The desktop/voice loop's pinned session; headless clients never share it.
+_DESKTOP_SESSION = "default"
+_STATUS = {
+    200: "OK",
+    400: "Bad Request",
+    401: "Unauthorized",
+    403: "Forbidden",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    503: "Service Unavailable",
+}
+_TELEGRAM_FIELDS = ("telegram_user_id", "telegram_username")
+_WS_TEXT, _WS_CLOSE, _WS_PING, _WS_PONG = 0x1, 0x8, 0x9, 0xA
+
+
+class RequestError(Exception):
+    def __init__(self, status, code):
+        super().__init__(code)
+        self.status = int(status)
+        self.code = str(code)
+
+
+def valid_session_id(session_id):
+    sid = str(session_id or "")
+    return bool(_SESSION_ID.match(sid)) and sid != _DESKTOP_SESSION
+
+
+def new_session_id(prefix):
+    """A fresh id for a client that did not name its session."""
+    return f"{prefix}-{uuid.uuid4().hex[:16]}"
+
+
+def _is_loopback(ip):
+    try:
+        return ipaddress.ip_address(str(ip or "").split("%", 1)[0]).is_loopback
+    except ValueError:
+        return False
+
+
+def request_source_context(peer_ip, payload=None):
+    """
+    Source context for one request, or ``(None, reason)`` when access is denied.
+
+    The IP always comes from the socket: loopback peers are "local", anything
+    else is "http". A front-end may declare itself a Telegram bridge with the
+    ``telegram_*`` identity fields; that identity is checked on top of the
+    transport check, never instead of it.
+    """
+    body = payload if isinstance(payload, dict) else {}
+    ip = str(peer_ip or "")
+    ctx = {"source": "local" if _is_loopback(ip) else "http", "ip": ip}
+    allowed, reason = validate_source_access(ctx)
+    if not allowed:
+        return None, reason
+    if str(body.get("source", "") or "").strip().lower() == "telegram":
+        ctx["source"] = "telegram"
+        for field in _TELEGRAM_FIELDS:
+            if body.get(field) not in (None, ""):
+                ctx[field] = body[field]
+        allowed, reason = validate_source_access(ctx)
+        if not allowed:
+            return None, reason
+    language = str(body.get("language", "") or "").strip().lower()
+    if language:
+        ctx["language"] = language[:8]
+    return ctx, ""
+
+
+def _ws_accept(key):
+    return base64.b64encode(hashlib.sha1((key + _WS_GUID).encode("ascii")).digest()).decode("ascii")
+
+
+def _ws_frame(opcode, payload):
+    data = payload if isinstance(payload, bytes) else str(payload).encode("utf-8")
+    n = len(data)
+    if n < 126:
+        head = struct.pack("!BB", 0x80 | opcode, n)
+    elif n < 65536:
+        head = struct.pack("!BBH", 0x80 | opcode, 126, n)
+    else:
+        head = struct.pack("!BBQ", 0x80 | opcode, 127, n)
+    return head + data
+
+
+async def _ws_read_frame(reader, max_bytes):
+    b0, b1 = await reader.readexactly(2)
+    length = b1 & 0x7F
+    if length == 126:
+        (length,) = struct.unpack("!H", await reader.readexactly(2))
+    elif length == 127:
+        (length,) = struct.unpack("!Q", await reader.readexactly(8))
+    if not b1 & 0x80:
+        raise RequestError(400, "unmasked_client_frame")
+    if length > max_bytes:
+        raise RequestError(413, "frame_too_large")
+    mask = await reader.readexactly(4)
+    data = bytearray(await reader.readexactly(length))
+    for i in range(length):
+        data[i] ^= mask[i & 3]
+    return bool(b0 & 0x80), b0 & 0x0F, bytes(data)
+
+
+class _Request:
+    def __init__(self, method, target, headers, body, peer_ip):
+        parts = urlsplit(target)
+        self.method = method
+        self.path = parts.path or "/"
+        self.query = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+        self.headers = headers
+        self.body = body
+        self.peer_ip = peer_ip
+
+    def json(self):
+        if not self.body:
+            return {}
+        try:
+            payload = json.loads(self.body.decode("utf-8"))
+        except (UnicodeDecodeError, ValueError):
+            raise RequestError(400, "invalid_json")
+        if not isinstance(payload, dict):
+            raise RequestError(400, "invalid_json")
+        return payload
+
+
+class BrainServer:
+    """
+    Headless front door to one ``JarvisBrain`` over HTTP and WebSocket.
+
+    Endpoints:
+      POST /respond  {"text", "session_id"?, "language"?, "source"?, "telegram_*"?} -> {"reply", ...}
+      GET  /ws       WebSocket; each text message is a /respond payload, answered with
+                     {"type": "sentence"} chunks as they are ready and a final {"type": "reply"}
+
+    A request without a ``session_id`` gets a new session (one per WebSocket
+    connection); the reply carries its id so the client can continue it.
+      GET  /health   brain and backing-service status
+      GET  /metrics  runtime metrics, brain stats, caches and live sessions
+
+    Every request passes ``validate_source_access`` for its peer; turns run on
+    a bounded thread pool so many sessions share one brain and its clients.
+    """
+
+    def __init__(self, brain, *, host=None, port=None, auth_token=None, max_concurrency=None, max_body_bytes=None):
+        self._brain = brain
+        self.host = str(host if host is not None else getattr(config, "server_host", "127.0.0.1"))
+        self.port = int(port if port is not None else getattr(config, "server_port", 8765))
+        self._token = str(auth_token if auth_token is not None else getattr(config, "server_auth_token", "") or "")
+        workers = int(max_concurrency or getattr(config, "server_max_concurrency", 8))
+        self.max_body_bytes = int(max_body_bytes or getattr(config, "server_max_body_bytes", 65536))
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="jivan-server")
+        self._server = None
+        self._started_ts = time.time()
+        self._stats = {"requests": 0, "rejected": 0, "errors": 0, "ws_connections": 0, "ws_messages": 0}
+
+    async def start(self):
+        if not self._token and not _is_loopback(self.host) and self.host != "localhost":
+            raise ValueError("Refusing to listen on a non-loopback host without JIVAN_SERVER_AUTH_TOKEN.")
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._started_ts = time.time()
+        return self.port
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        self._executor.shutdown(wait=False)
+
+    def stats(self):
+        out = dict(self._stats)
+        out["uptime_s"] = int(time.time() - self._started_ts)
+        return out
+
+    def _count(self, name):
+        self._stats[name] += 1
+        metrics_inc(f"server_{name}", 1)
+
+    async def _handle(self, reader, writer):
+        peer = writer.get_extra_info("peername")
+        peer_ip = str(peer[0]) if peer else ""
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader, peer_ip)
+                except RequestError as e:
+                    await self._send_json(writer, e.status, {"error": e.code}, keep_alive=False)
+                    return
+                if request is None:
+                    return
+                if request.path == "/ws" and request.headers.get("upgrade", "").lower() == "websocket":
+                    await self._websocket(request, reader, writer)
+                    return
+                status, body = await self._dispatch(request)
+                keep_alive = request.headers.get("connection", "").lower() != "close"
+                await self._send_json(writer, status, body, keep_alive=keep_alive)
+                if not keep_alive:
+                    return
+        except (ConnectionError, asyncio.IncompleteReadError):
+            return
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader, peer_ip):
+        line = await reader.readline()
+        if not line:
+            return None
+        try:
+            method, target, _version = line.decode("latin-1").strip().split(" ", 2)
+        except ValueError:
+            raise RequestError(400, "bad_request_line")
+        headers = {}
+        while True:
+            raw = await reader.readline()
+            if raw in (b"\r\n", b"\n", b""):
+                break
+            if len(headers) >= 100:
+                raise RequestError(400, "too_many_headers")
+            name, _, value = raw.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        try:
+            length = int(headers.get("content-length", "0") or 0)
+        except ValueError:
+            raise RequestError(400, "bad_content_length")
+        if length > self.max_body_bytes:
+            raise RequestError(413, "body_too_large")
+        body = await reader.readexactly(length) if length > 0 else b""
+        return _Request(method.upper(), target, headers, body, peer_ip)
+
+    def _authorize(self, request, payload=None):
+        if self._token:
+            supplied = request.headers.get("authorization", "")
+            if not supplied.startswith("Bearer ") or not hmac.compare_digest(supplied[7:].strip(), self._token):
+                raise RequestError(401, "unauthorized")
+        ctx, reason = request_source_context(request.peer_ip, payload)
+        if ctx is None:
+            raise RequestError(403, reason or "access_denied")
+        return ctx
+
+    async def _dispatch(self, request):
+        self._count("requests")
+        routes = {"/respond": "POST", "/health": "GET", "/metrics": "GET"}
+        try:
+            if request.path not in routes:
+                raise RequestError(404, "not_found")
+            if request.method != routes[request.path]:
+                raise RequestError(405, "method_not_allowed")
+            if request.path == "/respond":
+                payload = request.json()
+                ctx = self._authorize(request, payload)
+                return await self._respond(payload, ctx)
+            self._authorize(request)
+            loop = asyncio.get_running_loop()
+            fn = self._health if request.path == "/health" else self._metrics
+            return 200, await loop.run_in_executor(self._executor, fn)
+        except RequestError as e:
+            self._count("rejected" if e.status in (401, 403) else "errors")
+            return e.status, {"error": e.code}
+
+    def _turn_args(self, payload, default_session=None):
+        text = payload.get("text")
+        if not isinstance(text, str) or not text.strip():
+            raise RequestError(400, "missing_text")
+        session_id = payload.get("session_id") or default_session or new_session_id("http")
+        if not valid_session_id(session_id):
+            raise RequestError(400, "invalid_session_id")
+        return text.strip(), str(session_id)
+
+    async def _respond(self, payload, ctx, *, default_session=None, on_sentence=None):
+        text, session_id = self._turn_args(payload, default_session)
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        reply = await loop.run_in_executor(self._executor, self._run_turn, text, ctx, session_id, on_sentence)
+        ms = int((time.perf_counter() - started) * 1000)
+        if reply is None:
+            return 503, {"error": "brain_unavailable", "session_id": session_id}
+        return 200, {"reply": str(reply), "session_id": session_id, "ms": ms}
+
+    def _run_turn(self, text, ctx, session_id, on_sentence):
+        set_turn_id()
+        started = time.perf_counter()
+        if ctx.get("language"):
+            self._brain.session(session_id).lang = ctx["language"]
+        try:
+            return self._brain.respond(text, dict(ctx), on_sentence=on_sentence, session_id=session_id)
+        finally:
+            metrics_observe_ms("server_turn_ms", (time.perf_counter() - started) * 1000.0)
+
+    def _health(self):
+        brain = self._brain
+        return {
+            "ok": True,
+            "llm_configured": bool(brain.enabled()),
+            "mem0": brain.mem0_health(),
+            "mcp": brain.mcp_health(),
+            "redis": brain.redis_health(),
+            "sessions": brain.session_stats().get("active", 0),
+            "uptime_s": int(time.time() - self._started_ts),
+        }
+
+    def _metrics(self):
+        brain = self._brain
+        return {
+            "metrics": metrics_snapshot(),
+            "brain": brain.runtime_stats(),
+            "cache": brain.cache_stats(),
+            "sessions": brain.session_stats(),
+            "server": self.stats(),
+        }
+
+    async def _send_json(self, writer, status, body, *, keep_alive=True):
+        data = json.dumps(body, ensure_ascii=False, default=str).encode("utf-8")
+        head = (
+            f"HTTP/1.1 {status} {_STATUS.get(status, 'OK')}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(data)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + data)
+        await writer.drain()
+
+    async def _websocket(self, request, reader, writer):
+        self._count("requests")
+        try:
+            ctx = self._authorize(request, request.query)
+        except RequestError as e:
+            self._count("rejected")
+            await self._send_json(writer, e.status, {"error": e.code}, keep_alive=False)
+            return
+        key = request.headers.get("sec-websocket-key", "")
+        if not key:
+            await self._send_json(writer, 400, {"error": "missing_websocket_key"}, keep_alive=False)
+            return
+        writer.write(
+            (
+                "HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                f"Sec-WebSocket-Accept: {_ws_accept(key)}\r\n\r\n"
+            ).encode("latin-1")
+        )
+        await writer.drain()
+        self._count("ws_connections")
+        # Messages without their own session_id share one session per connection.
+        default_session = request.query.get("session_id") or new_session_id("ws")
+        parts = []
+        while True:
+            try:
+                fin, opcode, data = await _ws_read_frame(reader, self.max_body_bytes)
+            except RequestError:
+                writer.write(_ws_frame(_WS_CLOSE, struct.pack("!H", 1009)))
+                await writer.drain()
+                return
+            if opcode == _WS_CLOSE:
+                writer.write(_ws_frame(_WS_CLOSE, data[:2]))
+                await writer.drain()
+                return
+            if opcode == _WS_PING:
+                writer.write(_ws_frame(_WS_PONG, data))
+                await writer.drain()
+                continue
+            if opcode == _WS_PONG:
+                continue
+            parts.append(data)
+            if not fin:
+                if sum(len(p) for p in parts) > self.max_body_bytes:
+                    writer.write(_ws_frame(_WS_CLOSE, struct.pack("!H", 1009)))
+                    await writer.drain()
+                    return
+                continue
+            message, parts = b"".join(parts), []
+            await self._ws_message(writer, message, ctx, default_session)
+
+    async def _ws_message(self, writer, message, ctx, default_session):
+        self._count("ws_messages")
+        msg_id = None
+        try:
+            payload = _Request("POST", "/ws", {}, message, "").json()
+            msg_id = payload.get("id")
+            if payload.get("language"):
+                ctx = dict(ctx, language=str(payload["language"]).strip().lower()[:8])
+            loop = asyncio.get_running_loop()
+            sentences = asyncio.Queue()
+
+            def _on_sentence(sentence):
+                loop.call_soon_threadsafe(sentences.put_nowait, str(sentence))
+
+            turn = asyncio.ensure_future(
+                self._respond(payload, ctx, default_session=default_session, on_sentence=_on_sentence)
+            )
+            while True:
+                getter = asyncio.ensure_future(sentences.get())
+                done, _pending = await asyncio.wait({turn, getter}, return_when=asyncio.FIRST_COMPLETED)
+                if getter in done:
+                    await self._ws_send(writer, {"type": "sentence", "text": getter.result(), "id": msg_id})
+                    continue
+                getter.cancel()
+                break
+            while not sentences.empty():
+                await self._ws_send(writer, {"type": "sentence", "text": sentences.get_nowait(), "id": msg_id})
+            status, body = turn.result()
+        except RequestError as e:
+            status, body = e.status, {"error": e.code}
+        if status != 200:
+            self._count("errors")
+            await self._ws_send(writer, dict(body, type="error", status=status, id=msg_id))
+            return
+        await self._ws_send(writer, dict(body, type="reply", id=msg_id))
+
+    async def _ws_send(self, writer, obj):
+        writer.write(_ws_frame(_WS_TEXT, json.dumps(obj, ensure_ascii=False, default=str)))
+        await writer.drain()
+
+
+async def run_server(brain, **kwargs):
+    server = BrainServer(brain, **kwargs)
+    port = await server.start()
+    print(f"JIVAN brain server listening on http://{server.host}:{port} (ws: /ws)")
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
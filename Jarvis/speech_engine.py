@@ -11,10 +11,10 @@ import queue
 import threading
 import wave
 
-import requests
 import speech_recognition as sr
 
 from Jarvis.config import config
+from Jarvis.runtime import tracing, transport
 
 
 def _log_error(context, error):
@@ -144,7 +144,8 @@ class SpeechEngine:
     def wait_until_silent(self, timeout_s=10.0):
         end = time.time() + max(0.1, float(timeout_s))
         while time.time() < end:
-            if not self.is_speaking() and self._tts_queue.empty():
+            # unfinished_tasks also covers a job the worker has dequeued but not started.
+            if not self.is_speaking() and self._tts_queue.unfinished_tasks == 0:
                 return True
             time.sleep(0.03)
         return False
@@ -192,26 +193,29 @@ class SpeechEngine:
         else:
             self.wait_until_silent(timeout_s=float(getattr(config, "speech_mic_wait_timeout", 12)))
 
-        capture_started = time.perf_counter()
-        with sr.Microphone(device_index=self._preferred_input_index()) as source:
-            print("Listening....")
-            if str(getattr(config, "speech_adjust_noise", "0")).lower() in ("1", "true", "yes", "on"):
-                self._recognizer.adjust_for_ambient_noise(source, duration=0.25)
-            mode = self.get_mode()
-            if mode == "dictation":
-                phrase_limit = int(getattr(config, "speech_phrase_time_limit_dictation", 14))
-            else:
-                phrase_limit = int(getattr(config, "speech_phrase_time_limit_conversational", 6))
-            hard_limit = getattr(config, "speech_phrase_time_limit", 0)
-            if hard_limit not in (None, "") and int(hard_limit) > 0:
-                phrase_limit = int(hard_limit)
-            audio = self._recognizer.listen(
-                source,
-                timeout=getattr(config, "speech_listen_timeout", None),
-                phrase_time_limit=phrase_limit,
-            )
-        self._metrics["capture_ms"] = int((time.perf_counter() - capture_started) * 1000)
-        if not self._vad_has_speech(audio):
+        with tracing.span("capture", mode=self.get_mode()) as capture_span:
+            with sr.Microphone(device_index=self._preferred_input_index()) as source:
+                print("Listening....")
+                if str(getattr(config, "speech_adjust_noise", "0")).lower() in ("1", "true", "yes", "on"):
+                    self._recognizer.adjust_for_ambient_noise(source, duration=0.25)
+                mode = self.get_mode()
+                if mode == "dictation":
+                    phrase_limit = int(getattr(config, "speech_phrase_time_limit_dictation", 14))
+                else:
+                    phrase_limit = int(getattr(config, "speech_phrase_time_limit_conversational", 6))
+                hard_limit = getattr(config, "speech_phrase_time_limit", 0)
+                if hard_limit not in (None, "") and int(hard_limit) > 0:
+                    phrase_limit = int(hard_limit)
+                audio = self._recognizer.listen(
+                    source,
+                    timeout=getattr(config, "speech_listen_timeout", None),
+                    phrase_time_limit=phrase_limit,
+                )
+        self._metrics["capture_ms"] = int(capture_span.duration_ms)
+        with tracing.span("vad") as vad_span:
+            has_speech = self._vad_has_speech(audio)
+            vad_span.set(speech=has_speech)
+        if not has_speech:
             return "", self._conversation_lang
 
         # Primary STT provider chain.
@@ -243,19 +247,16 @@ class SpeechEngine:
             provider_chain = [self._stt_openai, self._stt_faster_whisper, self._stt_google_fallback]
 
         for fn in provider_chain:
-            stt_started = time.perf_counter()
-            text, lang = fn(audio)
+            provider = str(getattr(fn, "__name__", "stt"))
+            with tracing.span("stt", provider=provider) as stt_span:
+                text, lang = fn(audio)
+                stt_span.set(ok=bool(text))
             if text:
-                self._metrics["stt_ms"] = int((time.perf_counter() - stt_started) * 1000)
-                self._metrics["stt_provider"] = str(getattr(fn, "__name__", "stt"))
+                self._metrics["stt_ms"] = int(stt_span.duration_ms)
+                self._metrics["stt_provider"] = provider
                 self._conversation_lang = _normalize_lang(lang) or self._conversation_lang
                 self._last_input_text = _postprocess_transcript(text)
                 self._last_input_lang = self._conversation_lang
-                if str(getattr(config, "speech_latency_trace", "1")).lower() in ("1", "true", "yes", "on"):
-                    print(
-                        f"[latency] capture={self._metrics['capture_ms']}ms stt={self._metrics['stt_ms']}ms"
-                        f" provider={self._metrics['stt_provider']}"
-                    )
                 return self._last_input_text, self._conversation_lang
 
         return "", self._conversation_lang
@@ -351,7 +352,8 @@ class SpeechEngine:
             wait = not self._nonblocking_tts
 
         if not wait:
-            self._tts_queue.put((message, lang))
+            # The worker thread speaks it later; keep it in the trace of the turn that queued it.
+            self._tts_queue.put((message, lang, tracing.current_span()))
             return True
         return self._speak_sync(message, lang)
 
@@ -359,18 +361,20 @@ class SpeechEngine:
         # Hard-enforce ElevenLabs TTS path (requested behavior).
         self._mark_speaking(True)
         try:
-            return self._tts_elevenlabs(message, lang)
+            with tracing.span("tts", chars=len(message), lang=lang):
+                return self._tts_elevenlabs(message, lang)
         finally:
             self._mark_speaking(False)
 
     def _tts_worker_loop(self):
         while not self._stop_event.is_set():
             try:
-                message, lang = self._tts_queue.get(timeout=0.1)
+                message, lang, parent = self._tts_queue.get(timeout=0.1)
             except queue.Empty:
                 continue
             try:
-                self._speak_sync(message, lang)
+                with tracing.attach(parent):
+                    self._speak_sync(message, lang)
             finally:
                 self._tts_queue.task_done()
 
@@ -453,7 +457,7 @@ class SpeechEngine:
             data["language"] = hint
 
         try:
-            res = requests.post(url, headers=headers, files=files, data=data, timeout=45)
+            res = transport.post(url, headers=headers, files=files, data=data, timeout=45)
             if not res.ok:
                 _log_error("OpenAI STT error", f"{res.status_code} {res.text}")
                 return "", ""
@@ -461,7 +465,7 @@ class SpeechEngine:
             text = (obj.get("text") or "").strip()
             lang = _normalize_lang(obj.get("language", ""))
             return text, lang
-        except requests.RequestException as e:
+        except transport.RequestException as e:
             _log_error("OpenAI STT request failed", e)
             return "", ""
         except (ValueError, json.JSONDecodeError) as e:
@@ -595,12 +599,12 @@ class SpeechEngine:
         }
 
         try:
-            res = requests.post(url, headers=headers, json=payload, timeout=60)
+            res = transport.post(url, headers=headers, json=payload, timeout=60)
             if not res.ok:
                 _log_error("OpenAI TTS error", f"{res.status_code} {res.text}")
                 return False
             return self._play_wav_bytes(res.content)
-        except requests.RequestException as e:
+        except transport.RequestException as e:
             _log_error("OpenAI TTS request failed", e)
             return False
 
@@ -639,12 +643,12 @@ class SpeechEngine:
         )
 
         try:
-            res = requests.post(endpoint, headers=headers, data=ssml.encode("utf-8"), timeout=60)
+            res = transport.post(endpoint, headers=headers, data=ssml.encode("utf-8"), timeout=60)
             if not res.ok:
                 _log_error("Azure TTS error", f"{res.status_code} {res.text}")
                 return False
             return self._play_wav_bytes(res.content)
-        except requests.RequestException as e:
+        except transport.RequestException as e:
             _log_error("Azure TTS request failed", e)
             return False
 
@@ -673,12 +677,12 @@ class SpeechEngine:
             "voice_settings": {"stability": 0.45, "similarity_boost": 0.7},
         }
         try:
-            res = requests.post(url, headers=headers, json=payload, timeout=60)
+            res = transport.post(url, headers=headers, json=payload, timeout=60)
             if not res.ok:
                 _log_error("ElevenLabs TTS error", f"{res.status_code} {res.text}")
                 return False
             return self._play_wav_bytes(res.content)
-        except requests.RequestException as e:
+        except transport.RequestException as e:
             _log_error("ElevenLabs TTS request failed", e)
             return False
 
@@ -706,12 +710,12 @@ class SpeechEngine:
             "output_format": {"container": "wav", "encoding": "pcm_s16le", "sample_rate": 24000},
         }
         try:
-            res = requests.post(url, headers=headers, json=payload, timeout=30)
+            res = transport.post(url, headers=headers, json=payload, timeout=30)
             if not res.ok:
                 _log_error("Cartesia TTS error", f"{res.status_code} {res.text}")
                 return False
             return self._play_wav_bytes(res.content)
-        except requests.RequestException as e:
+        except transport.RequestException as e:
             _log_error("Cartesia TTS request failed", e)
             return False
 
@@ -11,7 +11,6 @@ from typing import Any, cast
 import pyautogui
 import pyjokes
 import pywhatkit
-import requests
 import wolframalpha
 from PIL import Image
 from PyQt5 import QtCore
@@ -47,6 +46,8 @@ from Jarvis.runtime import (
     metrics_observe_ms,
     metrics_snapshot,
     recent_receipts,
+    tracing,
+    transport,
 )
 
 obj = JarvisAssistant()
@@ -243,9 +244,9 @@ class MainThread(QThread):
 
         return False
 
-    def _handle_command(self, command):
+    def _handle_command(self, command, turn_id=None):
         turn_started = time.perf_counter()
-        turn_id = set_turn_id()
+        turn_id = set_turn_id(turn_id)
         log_event("turn_start", text=command)
         lowered = normalize_command(command)
         if not lowered:
@@ -502,8 +503,8 @@ class MainThread(QThread):
 
         if "ip address" in lowered:
             try:
-                ip = requests.get("https://api.ipify.org", timeout=10).text
-            except requests.RequestException as e:
+                ip = transport.get("https://api.ipify.org", timeout=10).text
+            except transport.RequestException as e:
                 print(f"IP lookup failed: {e}")
                 ip = ""
             if not ip:
@@ -589,7 +590,12 @@ class MainThread(QThread):
 
         if brain.enabled():
             self._ack_if_slow("brain")
-            ai_started = time.perf_counter()
+            streamed = []
+
+            def _speak_sentence(sentence):
+                streamed.append(sentence)
+                obj.tts_async(sentence)
+
             ai_reply = brain.respond(
                 command,
                 command_context={
@@ -598,17 +604,24 @@ class MainThread(QThread):
                     "language": obj.last_input_language(),
                     "role": "owner",
                 },
+                on_sentence=_speak_sentence,
             )
             if ai_reply:
                 print(ai_reply)
-                speak(ai_reply)
+                if streamed:
+                    # Sentences were queued while generating; let them finish before listening again.
+                    obj.wait_until_silent(timeout_s=120)
+                    # A stream cut short leaves the rest (or the error reply) unspoken.
+                    rest = getattr(ai_reply, "unspoken", "")
+                    if rest:
+                        speak(rest)
+                else:
+                    speak(ai_reply)
                 replay_event("assistant_reply", {"text": ai_reply})
             else:
                 speak("AI brain is not configured.")
             if str(getattr(config, "latency_trace", "1")).lower() in ("1", "true", "yes", "on"):
-                llm_ms = int((time.perf_counter() - ai_started) * 1000)
                 total_ms = int((time.perf_counter() - turn_started) * 1000)
-                print(f"[latency] brain={llm_ms}ms total={total_ms}ms mode={obj.get_listen_mode()}")
                 metrics_inc("turns_total", 1)
                 metrics_observe_ms("turn_total_ms", total_ms)
                 metrics_snapshot()
@@ -616,28 +629,24 @@ class MainThread(QThread):
             return True
 
         speak("AI brain is not configured.")
-        if str(getattr(config, "latency_trace", "1")).lower() in ("1", "true", "yes", "on"):
-            total_ms = int((time.perf_counter() - turn_started) * 1000)
-            print(f"[latency] total={total_ms}ms mode={obj.get_listen_mode()}")
         return True
 
     def TaskExecution(self):
         while not self.isInterruptionRequested():
-            command = obj.mic_input()
-            if self.isInterruptionRequested():
-                break
-            if not command:
-                continue
-            print(f"You said [{obj.last_input_language()}]: {command}")
-            replay_event("user_input", {"lang": obj.last_input_language(), "text": command})
-            if str(getattr(config, "latency_trace", "1")).lower() in ("1", "true", "yes", "on"):
-                m = obj.last_metrics()
-                if isinstance(m, dict) and m:
-                    print(
-                        f"[latency] capture={m.get('capture_ms', 0)}ms stt={m.get('stt_ms', 0)}ms"
-                        f" provider={m.get('stt_provider', '')}"
-                    )
-            should_continue = self._handle_command(command)
+            turn_id = set_turn_id()
+            # One trace per spoken turn: capture, VAD and STT, then routing, LLM, tools and TTS.
+            with tracing.span("turn", mode=obj.get_listen_mode()) as turn_span:
+                command = obj.mic_input()
+                if self.isInterruptionRequested():
+                    turn_span.drop()
+                    break
+                if not command:
+                    turn_span.drop()
+                    continue
+                print(f"You said [{obj.last_input_language()}]: {command}")
+                replay_event("user_input", {"lang": obj.last_input_language(), "text": command})
+                turn_span.set(lang=obj.last_input_language())
+                should_continue = self._handle_command(command, turn_id=turn_id)
             if not should_continue:
                 break
 
@@ -0,0 +1,85 @@
+import argparse
+import json
+import platform
+import subprocess
+import time
+
+from Jarvis.bench.llm_stub import StubLLM, StubLLMServer, load_script
+from Jarvis.bench.turns import compare, corpus_digest, format_report, load_corpus, run_benchmark
+from Jarvis.config import config
+
+
+def _commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5)
+        return out.stdout.strip() or None
+    except Exception:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark JarvisBrain.respond per stage against the local LLM stub.")
+    parser.add_argument("--corpus", default="Jarvis/bench/corpus.txt")
+    parser.add_argument("--script", default="Jarvis/bench/stub_script.json", help="stub script or JSONL replay file")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--warm-runs", type=int, default=1)
+    parser.add_argument("--base-url", default="", help="use this endpoint instead of starting the stub in-process")
+    parser.add_argument("--out", default="", help="write the JSON report here")
+    parser.add_argument("--baseline", default="", help="earlier JSON report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="relative slowdown counted as a regression")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus)
+    script = load_script(args.script)
+    server = None
+    if args.base_url:
+        base_url = args.base_url
+    else:
+        server = StubLLMServer(StubLLM(script, seed=args.seed)).start()
+        base_url = server.base_url
+    model = (script.get("models") or ["stub-model"])[0]
+    # Point every route at the stub; the brain reads these when it is built and on each turn.
+    config.llm_base_url = base_url
+    config.llm_api_key = config.llm_api_key if args.base_url else "stub"
+    config.llm_model = config.llm_fast_model = model
+    config.llm_fallback_base_url = ""
+
+    from Jarvis import JarvisAssistant
+    from Jarvis.brain import JarvisBrain
+
+    try:
+        brain = JarvisBrain(assistant=JarvisAssistant(speech=False), wolfram_fn=lambda q: None)
+        report = run_benchmark(brain, corpus, warm_runs=args.warm_runs)
+    finally:
+        if server:
+            server.close()
+    report["meta"] = {
+        "commit": _commit(),
+        "corpus": args.corpus,
+        "corpus_sha1": corpus_digest(corpus),
+        "script": args.script,
+        "seed": args.seed,
+        "python": platform.python_version(),
+        "ts_epoch": int(time.time()),
+    }
+    print(format_report(report))
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if (baseline.get("meta") or {}).get("corpus_sha1") != report["meta"]["corpus_sha1"]:
+            print("Warning: baseline was recorded on a different corpus.")
+        regressions = compare(baseline, report, tolerance=args.tolerance)
+        for row in regressions:
+            print(
+                f"REGRESSION {row['phase']}/{row['stage']} {row['quantile']}: "
+                f"{row['baseline_ms']:.1f}ms -> {row['current_ms']:.1f}ms"
+            )
+        if regressions:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
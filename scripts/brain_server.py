@@ -0,0 +1,35 @@
+import argparse
+import asyncio
+
+from Jarvis import JarvisAssistant
+from Jarvis.brain import JarvisBrain
+from Jarvis.config import config
+from Jarvis.server import run_server
+
+
+def _wolfram(question):
+    try:
+        import wolframalpha
+
+        client = wolframalpha.Client(config.wolframalpha_id)
+        return next(client.query(question).results).text
+    except Exception as e:
+        print(f"WolframAlpha failed: {e}")
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the JIVAN brain headless over HTTP/WebSocket.")
+    parser.add_argument("--host", default=None, help="bind address (default JIVAN_SERVER_HOST, loopback)")
+    parser.add_argument("--port", type=int, default=None, help="port (default JIVAN_SERVER_PORT)")
+    args = parser.parse_args()
+
+    brain = JarvisBrain(assistant=JarvisAssistant(speech=False), wolfram_fn=_wolfram)
+    try:
+        asyncio.run(run_server(brain, host=args.host, port=args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
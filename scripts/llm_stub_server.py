@@ -0,0 +1,25 @@
+import argparse
+
+from Jarvis.bench.llm_stub import StubLLM, StubLLMServer, load_script
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a scripted OpenAI-compatible LLM stand-in for local benchmarks.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--script", default="Jarvis/bench/stub_script.json", help="JSON script or JSONL replay file")
+    parser.add_argument("--seed", type=int, default=0, help="latency sampler seed")
+    args = parser.parse_args()
+
+    server = StubLLMServer(StubLLM(load_script(args.script), seed=args.seed), host=args.host, port=args.port)
+    print(f"LLM stub serving on {server.base_url} (set JIVAN_LLM_BASE_URL to it)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,7 @@ from Jarvis.brain import JarvisBrain
 
 
 def main():
-    assistant = JarvisAssistant()
+    assistant = JarvisAssistant(speech=False)
     brain = JarvisBrain(assistant=assistant, wolfram_fn=lambda q: None)
     report = {
         "mem0": brain.mem0_health(force=True),
@@ -0,0 +1,69 @@
+import json
+import os
+
+from Jarvis.brain.tool_retrieval import CatalogRetriever
+from Jarvis.brain.tools import TOOL_SPECS, tools_for_prompt_compact
+from Jarvis.config import config
+from Jarvis.protocols import list_protocols
+
+
+def _labelled_turns(rows):
+    """Pair each turn's user text with the tool the planner picked for it."""
+    texts = {}
+    tools = {}
+    for row in rows:
+        turn_id = row.get("turn_id")
+        payload = row.get("payload") or {}
+        stage = row.get("stage")
+        if stage == "user_input" and payload.get("text"):
+            texts[turn_id] = payload["text"]
+        elif stage == "planner_plan" and payload.get("tool"):
+            tools[turn_id] = payload["tool"]
+        elif stage in ("tool_fast_reply", "tool_template_reply", "tool_error") and payload.get("tool"):
+            tools.setdefault(turn_id, payload["tool"])
+    return [(texts[t], tools[t]) for t in tools if t in texts]
+
+
+def main():
+    path = os.path.abspath(str(getattr(config, "runtime_replay_path", "Jarvis/data/conversation_replay.jsonl")))
+    if not os.path.exists(path):
+        print("No replay file found.")
+        return
+    with open(path, "r", encoding="utf-8") as f:
+        rows = [json.loads(x) for x in f if x.strip()]
+    turns = _labelled_turns(rows)
+    if not turns:
+        print("No tool turns with user text in the replay file.")
+        return
+
+    always_on = [x.strip() for x in str(getattr(config, "brain_tool_retrieval_always_on", "")).split(",") if x.strip()]
+    retriever = CatalogRetriever(
+        TOOL_SPECS,
+        list_protocols(),
+        always_on=always_on,
+        top_k=int(getattr(config, "brain_tool_retrieval_top_k", 8)),
+        min_score=float(getattr(config, "brain_tool_retrieval_min_score", 1.5)),
+    )
+    full_chars = len(tools_for_prompt_compact())
+    hits = fallbacks = chars = 0
+    misses = []
+    for text, tool in turns:
+        picked = retriever.select(text)
+        fallbacks += 1 if picked["fallback"] else 0
+        chars += full_chars if picked["fallback"] else len(tools_for_prompt_compact(picked["tools"]))
+        if tool in picked["tools"]:
+            hits += 1
+        else:
+            misses.append((text, tool, picked["tools"]))
+
+    n = len(turns)
+    print(f"Tool turns: {n}")
+    print(f"recall@{retriever.top_k}: {hits / float(n):.3f}")
+    print(f"fallback rate: {fallbacks / float(n):.3f}")
+    print(f"avg tools JSON chars: {chars / float(n):.0f} (full catalog: {full_chars})")
+    for text, tool, picked in misses[:20]:
+        print(f"MISS {tool}: {text[:80]!r} -> {', '.join(picked)}")
+
+
+if __name__ == "__main__":
+    main()
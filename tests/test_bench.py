@@ -0,0 +1,130 @@
+import importlib.util
+import time
+import unittest
+from pathlib import Path
+
+
+def _load_module(relative_path, module_name):
+    repo_root = Path(__file__).resolve().parents[1]
+    mod_path = repo_root / relative_path
+    spec = importlib.util.spec_from_file_location(module_name, str(mod_path))
+    module = importlib.util.module_from_spec(spec)
+    assert spec and spec.loader
+    spec.loader.exec_module(module)
+    return module
+
+
+llm_mod = _load_module(Path("Jarvis") / "brain" / "llm.py", "llm_bench_mod")
+stub_mod = _load_module(Path("Jarvis") / "bench" / "llm_stub.py", "jivan_llm_stub_mod")
+turns_mod = _load_module(Path("Jarvis") / "bench" / "turns.py", "jivan_bench_turns_mod")
+
+SCRIPT = {
+    "models": ["big", "fast"],
+    "default": '{"action":"reply","reply":"default"}',
+    "latency": {"dist": "fixed", "ms": 0, "models": {"big": {"ms": 120}}},
+    "rules": [
+        {"user": "what time is it", "content": '{"action":"tool","tool_name":"get_time","tool_args":{}}'},
+        {"match": "weather", "model": "fast", "content": '{"action":"reply","reply":"sunny"}'},
+    ],
+}
+
+
+class StubLLMServerTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.stub = stub_mod.StubLLM(SCRIPT, seed=1)
+        cls.server = stub_mod.StubLLMServer(cls.stub).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.close()
+
+    def _chat(self, model, text):
+        return llm_mod.chat_completions(
+            api_key="k",
+            base_url=self.server.base_url,
+            model=model,
+            messages=[{"role": "system", "content": "s"}, {"role": "user", "content": text}],
+            timeout_s=5,
+        )
+
+    def test_models_and_scripted_replies(self):
+        self.assertEqual(llm_mod.list_models(api_key="k", base_url=self.server.base_url), ["big", "fast"])
+        self.assertIn('"get_time"', self._chat("fast", "what time is it"))
+        self.assertEqual(self._chat("fast", "weather in Paris?"), '{"action":"reply","reply":"sunny"}')
+        self.assertEqual(self._chat("big", "weather in Paris?"), SCRIPT["default"])
+
+    def test_per_model_latency(self):
+        started = time.perf_counter()
+        self._chat("big", "hi")
+        self.assertGreaterEqual(time.perf_counter() - started, 0.11)
+
+    def test_streaming_chunks_and_usage(self):
+        usage = []
+        pieces = list(
+            llm_mod.chat_completions_stream(
+                api_key="k",
+                base_url=self.server.base_url,
+                model="fast",
+                messages=[{"role": "user", "content": "what time is it"}],
+                timeout_s=5,
+                on_usage=usage.append,
+            )
+        )
+        self.assertGreater(len(pieces), 1)
+        self.assertEqual("".join(pieces), SCRIPT["rules"][0]["content"])
+        self.assertEqual(len(usage), 1)
+        self.assertGreaterEqual(self.stub.stats()["streamed"], 1)
+
+    def test_seeded_latency_is_reproducible(self):
+        spec = {"dist": "lognormal", "ms": 100, "sigma": 0.5}
+        a = stub_mod.LatencyModel(spec, seed=7)
+        b = stub_mod.LatencyModel(spec, seed=7)
+        self.assertEqual([a.sample_ms() for _ in range(5)], [b.sample_ms() for _ in range(5)])
+
+
+class _FakeBrain:
+    def __init__(self, recorder):
+        self.recorder = recorder
+        self.seen = set()
+
+    def respond(self, user_text, session_id=None):
+        warm = (session_id, user_text) in self.seen
+        self.seen.add((session_id, user_text))
+        self.recorder("context_plan_ms", 1.0)
+        if not warm:
+            self.recorder("llm_plan_ms", 100.0)
+            self.recorder("tool_exec_ms", 10.0)
+            self.recorder("tool_exec_ms", 5.0)
+        return "ok"
+
+
+class TurnBenchmarkTests(unittest.TestCase):
+    def test_percentiles_use_nearest_rank(self):
+        values = list(range(1, 101))
+        self.assertEqual(turns_mod.percentile(values, 0.5), 50)
+        self.assertEqual(turns_mod.percentile(values, 0.99), 99)
+        self.assertEqual(turns_mod.summarize([5])["p99"], 5)
+        self.assertIsNone(turns_mod.percentile([], 0.5))
+
+    def test_passes_collect_stages_per_turn(self):
+        recorder = turns_mod.StageRecorder()
+        brain = _FakeBrain(recorder)
+        cold = turns_mod.summarize_pass(turns_mod.run_pass(brain, ["a", "b"], recorder))
+        warm = turns_mod.summarize_pass(turns_mod.run_pass(brain, ["a", "b"], recorder))
+        self.assertEqual(cold["stages"]["tool"]["p50"], 15.0)
+        self.assertEqual(cold["stages"]["llm_plan"]["n"], 2)
+        self.assertNotIn("llm_plan", warm["stages"])
+        self.assertEqual(warm["stages"]["routing"]["n"], 2)
+        recorder("llm_plan_ms", 5.0)
+        self.assertEqual(recorder.end(), {})
+
+    def test_compare_flags_only_real_regressions(self):
+        base = {"cold": {"stages": {"llm_plan": {"p50": 100.0, "p95": 200.0, "p99": 2.0}}}}
+        cur = {"cold": {"stages": {"llm_plan": {"p50": 105.0, "p95": 260.0, "p99": 4.0}}}}
+        rows = turns_mod.compare(base, cur, tolerance=0.15, min_delta_ms=5)
+        self.assertEqual([(r["stage"], r["quantile"]) for r in rows], [("llm_plan", "p95")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,322 @@
+import asyncio
+import base64
+import importlib.util
+import json
+import os
+import struct
+import sys
+import threading
+import time
+import types
+import unittest
+from pathlib import Path
+
+
+def _load_module(relative_path, module_name):
+    repo_root = Path(__file__).resolve().parents[1]
+    mod_path = repo_root / relative_path
+    spec = importlib.util.spec_from_file_location(module_name, str(mod_path))
+    module = importlib.util.module_from_spec(spec)
+    assert spec and spec.loader
+    spec.loader.exec_module(module)
+    return module
+
+
+def _load_server():
+    config_mod = types.ModuleType("Jarvis.config.config")
+    config_pkg = types.ModuleType("Jarvis.config")
+    config_pkg.config = config_mod
+    metrics_mod = types.ModuleType("Jarvis.runtime.metrics")
+    metrics_mod.metrics_inc = lambda name, value=1: None
+    metrics_mod.metrics_observe_ms = lambda name, value: None
+    metrics_mod.metrics_snapshot = lambda: {"counters": {}, "latency_ms": {}}
+    log_mod = types.ModuleType("Jarvis.runtime.structured_log")
+    log_mod.set_turn_id = lambda turn_id=None: "t"
+    security_mod = types.ModuleType("Jarvis.security")
+    # Stand-in policy: only the Telegram user 42 and loopback peers get through.
+    security_mod.validate_source_access = lambda ctx: (
+        (True, "") if ctx.get("source") != "telegram" or ctx.get("telegram_user_id") == 42
+        else (False, "telegram_identity_not_allowlisted")
+    )
+    stubs = {
+        "Jarvis": sys.modules.get("Jarvis") or types.ModuleType("Jarvis"),
+        "Jarvis.config": config_pkg,
+        "Jarvis.config.config": config_mod,
+        "Jarvis.runtime.metrics": metrics_mod,
+        "Jarvis.runtime.structured_log": log_mod,
+        "Jarvis.security": security_mod,
+    }
+    saved = {name: sys.modules.get(name) for name in stubs}
+    sys.modules.update(stubs)
+    try:
+        return _load_module(Path("Jarvis") / "server.py", "jivan_server_mod")
+    finally:
+        for name, module in saved.items():
+            if module is None:
+                sys.modules.pop(name, None)
+            else:
+                sys.modules[name] = module
+
+
+session_mod = _load_module(Path("Jarvis") / "brain" / "session.py", "jivan_session_mod")
+server_mod = _load_server()
+
+
+class _FakeBrain:
+    def __init__(self):
+        self.calls = []
+        self.sessions = {}
+        self.lock = threading.Lock()
+
+    def session(self, session_id):
+        return self.sessions.setdefault(session_id, types.SimpleNamespace(lang=""))
+
+    def respond(self, user_text, command_context=None, on_sentence=None, session_id=None):
+        with self.lock:
+            self.calls.append((user_text, dict(command_context or {}), session_id))
+        if on_sentence:
+            on_sentence("First part.")
+            on_sentence("Second part.")
+        return f"{session_id}: {user_text}"
+
+    def enabled(self):
+        return True
+
+    def mem0_health(self):
+        return {"ok": False, "status": "disabled"}
+
+    mcp_health = redis_health = mem0_health
+
+    def runtime_stats(self):
+        return {"llm_calls": 0}
+
+    def cache_stats(self):
+        return {}
+
+    def session_stats(self):
+        return {"active": len(self.sessions)}
+
+
+async def _http(port, method, path, body=None, headers=None):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    data = json.dumps(body).encode("utf-8") if body is not None else b""
+    head = f"{method} {path} HTTP/1.1\r\nHost: x\r\nConnection: close\r\nContent-Length: {len(data)}\r\n"
+    for name, value in (headers or {}).items():
+        head += f"{name}: {value}\r\n"
+    writer.write(head.encode("latin-1") + b"\r\n" + data)
+    await writer.drain()
+    raw = await reader.read()
+    writer.close()
+    status_line, _, rest = raw.partition(b"\r\n")
+    return int(status_line.split()[1]), json.loads(rest.partition(b"\r\n\r\n")[2] or b"{}")
+
+
+def _client_frame(text):
+    data = text.encode("utf-8")
+    mask = os.urandom(4)
+    masked = bytes(b ^ mask[i % 4] for i, b in enumerate(data))
+    return struct.pack("!BB", 0x81, 0x80 | len(data)) + mask + masked
+
+
+async def _read_server_frame(reader):
+    b0, b1 = await reader.readexactly(2)
+    length = b1 & 0x7F
+    if length == 126:
+        (length,) = struct.unpack("!H", await reader.readexactly(2))
+    return b0 & 0x0F, await reader.readexactly(length)
+
+
+class BrainServerTests(unittest.TestCase):
+    def _serve(self, scenario, **kwargs):
+        brain = _FakeBrain()
+
+        async def _main():
+            server = server_mod.BrainServer(brain, host="127.0.0.1", port=0, **kwargs)
+            port = await server.start()
+            try:
+                return await scenario(port)
+            finally:
+                await server.close()
+
+        return brain, asyncio.run(_main())
+
+    def test_respond_keeps_sessions_apart(self):
+        async def scenario(port):
+            return await asyncio.gather(
+                _http(port, "POST", "/respond", {"text": "hi", "session_id": "tg-1", "language": "de"}),
+                _http(port, "POST", "/respond", {"text": "yo", "session_id": "web-2"}),
+                _http(port, "POST", "/respond", {"text": "hi", "session_id": "bad id!"}),
+                _http(port, "POST", "/respond", {"session_id": "tg-1"}),
+            )
+
+        brain, results = self._serve(scenario)
+        self.assertEqual(results[0], (200, {"reply": "tg-1: hi", "session_id": "tg-1", "ms": results[0][1]["ms"]}))
+        self.assertEqual(results[1][1]["reply"], "web-2: yo")
+        self.assertEqual(results[2], (400, {"error": "invalid_session_id"}))
+        self.assertEqual(results[3], (400, {"error": "missing_text"}))
+        self.assertEqual(brain.sessions["tg-1"].lang, "de")
+        contexts = {sid: ctx for _text, ctx, sid in brain.calls}
+        self.assertEqual(contexts["web-2"], {"source": "local", "ip": "127.0.0.1"})
+
+    def test_requests_without_a_session_get_their_own(self):
+        async def scenario(port):
+            return await asyncio.gather(
+                _http(port, "POST", "/respond", {"text": "hi"}),
+                _http(port, "POST", "/respond", {"text": "hi"}),
+                _http(port, "POST", "/respond", {"text": "hi", "session_id": "default"}),
+                _http(port, "POST", "/respond", {"text": "hi", "session_id": "tg-1:summary"}),
+            )
+
+        brain, results = self._serve(scenario)
+        first, second = results[0][1]["session_id"], results[1][1]["session_id"]
+        self.assertTrue(first.startswith("http-") and second.startswith("http-"))
+        self.assertNotEqual(first, second)
+        self.assertEqual(results[2], (400, {"error": "invalid_session_id"}))
+        self.assertEqual(results[3], (400, {"error": "invalid_session_id"}))
+        self.assertNotIn("default", [sid for _text, _ctx, sid in brain.calls])
+
+    def test_source_access_is_checked_per_request(self):
+        async def scenario(port):
+            denied = await _http(port, "POST", "/respond", {"text": "hi", "source": "telegram", "telegram_user_id": 7})
+            allowed = await _http(port, "POST", "/respond", {"text": "hi", "source": "telegram", "telegram_user_id": 42})
+            return denied, allowed
+
+        brain, (denied, allowed) = self._serve(scenario)
+        self.assertEqual(denied, (403, {"error": "telegram_identity_not_allowlisted"}))
+        self.assertEqual(allowed[0], 200)
+        self.assertEqual(brain.calls[-1][1]["source"], "telegram")
+
+    def test_token_health_and_metrics(self):
+        async def scenario(port):
+            return (
+                await _http(port, "GET", "/health"),
+                await _http(port, "GET", "/health", headers={"Authorization": "Bearer s3cret"}),
+                await _http(port, "GET", "/metrics", headers={"Authorization": "Bearer s3cret"}),
+                await _http(port, "GET", "/respond", headers={"Authorization": "Bearer s3cret"}),
+            )
+
+        _brain, (anon, health, metrics, wrong_method) = self._serve(scenario, auth_token="s3cret")
+        self.assertEqual(anon, (401, {"error": "unauthorized"}))
+        self.assertEqual(health[0], 200)
+        self.assertTrue(health[1]["ok"])
+        self.assertEqual(metrics[1]["brain"], {"llm_calls": 0})
+        self.assertIn("requests", metrics[1]["server"])
+        self.assertEqual(wrong_method[0], 405)
+
+    def test_websocket_streams_sentences_then_reply(self):
+        async def scenario(port):
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            key = base64.b64encode(os.urandom(16)).decode("ascii")
+            writer.write(
+                (
+                    "GET /ws?session_id=desk HTTP/1.1\r\nHost: x\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                    f"Sec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n"
+                ).encode("latin-1")
+            )
+            head = await reader.readuntil(b"\r\n\r\n")
+            writer.write(_client_frame(json.dumps({"text": "hello", "id": 1})))
+            frames = [await _read_server_frame(reader) for _ in range(3)]
+            writer.close()
+            return head, key, frames
+
+        _brain, (head, key, frames) = self._serve(scenario)
+        self.assertIn(b"101 Switching Protocols", head)
+        self.assertIn(server_mod._ws_accept(key).encode("ascii"), head)
+        messages = [json.loads(data) for _op, data in frames]
+        self.assertEqual([m["type"] for m in messages], ["sentence", "sentence", "reply"])
+        self.assertEqual(messages[0]["text"], "First part.")
+        self.assertEqual(messages[2]["reply"], "desk: hello")
+        self.assertEqual(messages[2]["id"], 1)
+
+    def test_websocket_without_session_keeps_one_per_connection(self):
+        async def scenario(port):
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            key = base64.b64encode(os.urandom(16)).decode("ascii")
+            writer.write(
+                (
+                    "GET /ws HTTP/1.1\r\nHost: x\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                    f"Sec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n"
+                ).encode("latin-1")
+            )
+            await reader.readuntil(b"\r\n\r\n")
+            replies = []
+            for msg_id in (1, 2):
+                writer.write(_client_frame(json.dumps({"text": "hello", "id": msg_id})))
+                frames = [await _read_server_frame(reader) for _ in range(3)]
+                replies.append(json.loads(frames[-1][1]))
+            writer.close()
+            return replies
+
+        _brain, replies = self._serve(scenario)
+        self.assertTrue(replies[0]["session_id"].startswith("ws-"))
+        self.assertEqual(replies[0]["session_id"], replies[1]["session_id"])
+
+    def test_refuses_public_bind_without_token(self):
+        server = server_mod.BrainServer(_FakeBrain(), host="0.0.0.0", port=0, auth_token="")
+        with self.assertRaises(ValueError):
+            asyncio.run(server.start())
+        server._executor.shutdown(wait=False)
+
+
+class SessionStoreTests(unittest.TestCase):
+    def _store(self, **kwargs):
+        factory = lambda sid: session_mod.BrainSession(sid, buffer=None, summary=None)
+        return session_mod.SessionStore(factory, **kwargs)
+
+    def test_sessions_are_created_once_and_lru_evicted(self):
+        store = self._store(max_sessions=2, idle_ttl_s=0, pinned=("default",))
+        default = store.get("default")
+        a = store.get("a")
+        self.assertIs(store.get("a"), a)
+        store.get("b")
+        self.assertIs(store.peek("default"), default)
+        self.assertIsNone(store.peek("a"))
+        self.assertEqual(store.stats()["evicted"], 1)
+
+    def test_eviction_skips_a_session_mid_turn(self):
+        store = self._store(max_sessions=2, idle_ttl_s=0)
+        busy = store.get("busy")
+        store.get("idle")
+        held = threading.Event()
+        release = threading.Event()
+
+        def _turn():
+            with busy.lock:
+                held.set()
+                release.wait(5)
+
+        worker = threading.Thread(target=_turn)
+        worker.start()
+        held.wait(5)
+        store.get("new")
+        release.set()
+        worker.join()
+        self.assertIs(store.peek("busy"), busy)
+        self.assertIsNone(store.peek("idle"))
+        self.assertEqual(store.stats()["evicted"], 1)
+
+    def test_idle_sessions_expire_unless_mid_turn(self):
+        store = self._store(idle_ttl_s=60)
+        idle, busy = store.get("idle"), store.get("busy")
+        idle.last_used_ts = busy.last_used_ts = time.time() - 120
+        held = threading.Event()
+        release = threading.Event()
+
+        def _turn():
+            with busy.lock:
+                held.set()
+                release.wait(5)
+
+        worker = threading.Thread(target=_turn)
+        worker.start()
+        held.wait(5)
+        store.get("other")
+        release.set()
+        worker.join()
+        self.assertIsNone(store.peek("idle"))
+        self.assertIs(store.peek("busy"), busy)
+        self.assertEqual(store.stats()["expired"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
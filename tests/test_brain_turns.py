@@ -0,0 +1,108 @@
+import os
+import tempfile
+import types
+import unittest
+
+from Jarvis.brain import brain as brain_mod
+from Jarvis.brain.tokens import message_tokens
+from Jarvis.config import config
+
+_LLM_SETTINGS = {
+    "llm_api_key": "test-key",
+    "llm_base_url": "http://127.0.0.1:9",
+    "llm_model": "test-model",
+    "llm_streaming": "0",
+}
+
+
+class BrainTurnTests(unittest.TestCase):
+    """Whole turns through ``JarvisBrain.respond`` with tools, the LLM and memory writes faked."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        settings = dict(_LLM_SETTINGS, runtime_replay_path=os.path.join(self.tmp.name, "replay.jsonl"))
+        self._saved = {name: getattr(config, name, None) for name in settings}
+        for name, value in settings.items():
+            setattr(config, name, value)
+        self.brain = brain_mod.JarvisBrain(assistant=types.SimpleNamespace(), wolfram_fn=None)
+        self.tool_calls = []
+        self.llm_calls = []
+        self.learned = []
+        self.brain._execute_tool = self._execute_tool
+        self.brain._chat = self._chat
+        self.brain._memory.learn_turn = lambda **kwargs: self.learned.append(kwargs)
+
+    def tearDown(self):
+        self.brain._executor.shutdown(wait=False)
+        for name, value in self._saved.items():
+            setattr(config, name, value)
+        self.tmp.cleanup()
+
+    def _execute_tool(self, *, tool_name, tool_args, user_text, source_context=None, **_kwargs):
+        self.tool_calls.append((tool_name, dict(tool_args or {}), user_text))
+        return {"ok": True, "tool_name": tool_name, "data": {}}
+
+    def _chat(self, **kwargs):
+        self.llm_calls.append(kwargs)
+        return '{"action":"reply","reply":"Done."}'
+
+    def test_turns_run_in_their_own_session(self):
+        self.brain.respond("what time is it", session_id="kitchen")
+        session = self.brain.session("kitchen")
+        self.assertEqual(session.turns, 1)
+        self.assertEqual(session.history[0], {"role": "user", "content": "what time is it"})
+        self.assertEqual(self.brain.session().turns, 0)
+
+    def test_chain_reaches_the_chain_planner(self):
+        text = "weather in Berlin and then news and then what time is it"
+        reply = self.brain.respond(text)
+        self.assertEqual(sorted(name for name, _args, _text in self.tool_calls), ["get_time", "news", "weather"])
+        weather_args = next(args for name, args, _text in self.tool_calls if name == "weather")
+        self.assertEqual(weather_args.get("city", "").lower(), "berlin")
+        self.assertTrue(reply)
+        self.assertEqual(len(self.learned), 1)
+        self.assertEqual(self.learned[0]["user_text"], text)
+
+    def test_history_fits_next_to_the_real_system_prompt(self):
+        # The retrieved catalog and the full one (~1.7k and ~12k prompt tokens) leave history alone.
+        self.addCleanup(setattr, config, "brain_tool_retrieval", config.brain_tool_retrieval)
+        for retrieval, topic in (("1", "octopuses"), ("0", "volcanoes")):
+            with self.subTest(tool_retrieval=retrieval):
+                config.brain_tool_retrieval = retrieval
+                self.brain._session.history.clear()
+                self.llm_calls.clear()
+                compacted = []
+                self.brain._session.summary.compact = compacted.append
+                for i in range(4):
+                    self.brain._record_turn("user", f"question {i}: how often should I water the roses in summer?")
+                    self.brain._record_turn("assistant", f"answer {i}: deeply twice a week, in the morning, more when hot")
+                self.brain.respond(f"tell me something interesting about {topic}")
+                messages = self.llm_calls[0]["messages"]
+                system_tokens = sum(
+                    message_tokens(m, self.brain._count_tokens) for m in messages if m["role"] == "system"
+                )
+                self.assertGreater(system_tokens, 1000)
+                self.assertEqual(len(messages), 1 + 8)
+                self.assertEqual(compacted, [])
+
+    def test_stream_usage_chunk_follows_its_flag(self):
+        streamed = []
+
+        def fake_stream(**kwargs):
+            streamed.append(kwargs)
+            yield '{"action":"reply","reply":"Octopuses have three hearts."}'
+
+        self.addCleanup(setattr, brain_mod, "chat_completions_stream", brain_mod.chat_completions_stream)
+        brain_mod.chat_completions_stream = fake_stream
+        self.addCleanup(setattr, config, "llm_streaming", config.llm_streaming)
+        self.addCleanup(setattr, config, "llm_stream_include_usage", config.llm_stream_include_usage)
+        config.llm_streaming = "1"
+        for flag, topic in (("0", "octopuses"), ("1", "volcanoes")):
+            config.llm_stream_include_usage = flag
+            self.brain.respond(f"tell me something interesting about {topic}", on_sentence=lambda _s: None)
+        self.assertIsNone(streamed[0]["on_usage"])
+        self.assertIsNotNone(streamed[1]["on_usage"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import importlib.util
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+
+def _load_module(relative_path, module_name):
+    repo_root = Path(__file__).resolve().parents[1]
+    mod_path = repo_root / relative_path
+    spec = importlib.util.spec_from_file_location(module_name, str(mod_path))
+    module = importlib.util.module_from_spec(spec)
+    assert spec and spec.loader
+    spec.loader.exec_module(module)
+    return module
+
+
+chain = _load_module(Path("Jarvis") / "brain" / "chain.py", "chain_mod")
+
+_PURE = {"weather", "news", "get_time"}
+
+
+class ChainPlannerTests(unittest.TestCase):
+    def test_split_chain(self):
+        self.assertEqual(
+            chain.split_chain("weather in Berlin and then news and then what time is it"),
+            ["weather in Berlin", "news", "what time is it"],
+        )
+        self.assertIsNone(chain.split_chain("weather in Berlin"))
+        self.assertIsNone(chain.split_chain("a and then b and then c and then d and then e"))
+
+    def test_side_effect_steps_are_barriers(self):
+        steps = [("weather", {}), ("news", {}), ("todo_manage", {"action": "add"}), ("get_time", {}), ("news", {})]
+        self.assertEqual(chain.plan_chain_waves(steps, lambda name: name in _PURE), [[0, 1], [2], [3, 4]])
+
+    def test_pure_steps_run_concurrently_and_keep_order(self):
+        steps = [("weather", {"city": "Berlin"}), ("news", {}), ("get_time", {})]
+        waves = chain.plan_chain_waves(steps, lambda name: name in _PURE)
+        seen_threads = set()
+
+        def _execute(i, tool_name, tool_args):
+            seen_threads.add(threading.get_ident())
+            time.sleep(0.15)
+            return {"ok": True, "tool_name": tool_name, "index": i}
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            started = time.perf_counter()
+            results = chain.run_chain_waves(steps, waves, _execute, pool.submit)
+            elapsed = time.perf_counter() - started
+        self.assertEqual([r["tool_name"] for r in results], ["weather", "news", "get_time"])
+        self.assertLess(elapsed, 0.35)
+        self.assertEqual(len(seen_threads), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
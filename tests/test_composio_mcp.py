@@ -53,6 +53,14 @@ def _install_stub_config(
     config_pkg.config = config_mod
     sys.modules["Jarvis.config"] = config_pkg
     sys.modules["Jarvis.config.config"] = config_mod
+    # Other test modules may have imported the real runtime package; never write receipts/queue files from tests.
+    receipts_mod = types.ModuleType("Jarvis.runtime.receipts")
+    receipts_mod.record_receipt = lambda channel, action, ok, details=None: False
+    queue_mod = types.ModuleType("Jarvis.runtime.outbound_queue")
+    queue_mod.enqueue = lambda channel, action, payload: ("", False)
+    queue_mod.remove = lambda item_id: False
+    sys.modules["Jarvis.runtime.receipts"] = receipts_mod
+    sys.modules["Jarvis.runtime.outbound_queue"] = queue_mod
 
 
 def _install_stub_composio():
@@ -224,7 +232,7 @@ class ComposioMCPTests(unittest.TestCase):
                 )
             return DummyResp({"jsonrpc": "2.0", "id": (json or {}).get("id"), "error": {"message": "bad method"}})
 
-        mod.requests.post = fake_post
+        mod.transport = types.SimpleNamespace(post=fake_post)
         client = mod.ComposioMCPClient()
         listed = client.list_tools()
         self.assertTrue(listed.get("ok"))
@@ -287,7 +295,7 @@ class ComposioMCPTests(unittest.TestCase):
                 return DummyResp({"jsonrpc": "2.0", "id": 2, "result": {"tools": [{"name": "GMAIL_SEND_EMAIL"}]}})
             return DummyResp({"jsonrpc": "2.0", "id": 3, "error": {"message": "bad method"}})
 
-        mod.requests.post = fake_post
+        mod.transport = types.SimpleNamespace(post=fake_post)
         client = mod.ComposioMCPClient()
         listed = client.list_tools()
         self.assertTrue(listed.get("ok"))
@@ -334,7 +342,7 @@ class ComposioMCPTests(unittest.TestCase):
                 return DummyResp({"jsonrpc": "2.0", "id": 3, "result": {"ok": True}})
             return DummyResp({"jsonrpc": "2.0", "id": 4, "error": {"message": "bad method"}})
 
-        mod.requests.post = fake_post
+        mod.transport = types.SimpleNamespace(post=fake_post)
         client = mod.ComposioMCPClient()
         res = client.execute(
             tool_name="AUTO_TOOLKIT:codeinterpreter",
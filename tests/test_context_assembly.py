@@ -0,0 +1,68 @@
+import importlib.util
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+
+def _load_module(relative_path, module_name):
+    repo_root = Path(__file__).resolve().parents[1]
+    mod_path = repo_root / relative_path
+    spec = importlib.util.spec_from_file_location(module_name, str(mod_path))
+    module = importlib.util.module_from_spec(spec)
+    assert spec and spec.loader
+    spec.loader.exec_module(module)
+    return module
+
+
+assembly_mod = _load_module(Path("Jarvis") / "brain" / "context_assembly.py", "context_assembly_mod")
+
+
+def _sleepy(value, seconds):
+    def _fn():
+        time.sleep(seconds)
+        return value
+
+    return _fn
+
+
+class ContextAssemblyTests(unittest.TestCase):
+    def setUp(self):
+        self.pool = ThreadPoolExecutor(max_workers=6)
+
+    def tearDown(self):
+        self.pool.shutdown(wait=True)
+
+    def test_sources_run_concurrently(self):
+        assembly = assembly_mod.ContextAssembly(self.pool.submit)
+        for name in ("a", "b", "c"):
+            assembly.add(name, _sleepy(name, 0.15), deadline_ms=2000)
+        started = time.perf_counter()
+        self.assertEqual(assembly.collect(), {"a": "a", "b": "b", "c": "c"})
+        self.assertLess(time.perf_counter() - started, 0.4)
+
+    def test_late_source_falls_back_to_default(self):
+        assembly = assembly_mod.ContextAssembly(self.pool.submit)
+        assembly.add("fast", _sleepy("ok", 0.0), deadline_ms=500)
+        assembly.add("slow", _sleepy("late", 0.5), deadline_ms=50, default="")
+        self.assertEqual(assembly.collect(), {"fast": "ok", "slow": ""})
+        timings = assembly.timings()
+        self.assertEqual(timings["slow"]["status"], "timeout")
+        self.assertEqual(timings["fast"]["status"], "ok")
+        self.assertIn("total", timings)
+
+    def test_failing_source_uses_default_and_dependents_can_wait(self):
+        assembly = assembly_mod.ContextAssembly(self.pool.submit)
+
+        def _boom():
+            raise RuntimeError("redis down")
+
+        assembly.add("history", _boom, deadline_ms=500, default=["local"])
+        assembly.add("plan", lambda: ("plan", assembly.get("history")), deadline_ms=500)
+        out = assembly.collect()
+        self.assertEqual(out["plan"], ("plan", ["local"]))
+        self.assertEqual(assembly.timings()["history"]["status"], "error")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+import importlib.util
+import os
+import sys
+import tempfile
+import time
+import types
+import unittest
+from pathlib import Path
+
+
+def _load_module(relative_path, module_name):
+    repo_root = Path(__file__).resolve().parents[1]
+    mod_path = repo_root / relative_path
+    spec = importlib.util.spec_from_file_location(module_name, str(mod_path))
+    module = importlib.util.module_from_spec(spec)
+    assert spec and spec.loader
+    spec.loader.exec_module(module)
+    return module
+
+
+def _load_file_index():
+    config_mod = types.ModuleType("Jarvis.config.config")
+    config_pkg = types.ModuleType("Jarvis.config")
+    config_pkg.config = config_mod
+    stubs = {
+        "Jarvis": sys.modules.get("Jarvis") or types.ModuleType("Jarvis"),
+        "Jarvis.config": config_pkg,
+        "Jarvis.config.config": config_mod,
+        "Jarvis.runtime": types.ModuleType("Jarvis.runtime"),
+    }
+    saved = {name: sys.modules.get(name) for name in stubs}
+    saved["Jarvis.runtime.flags"] = sys.modules.get("Jarvis.runtime.flags")
+    sys.modules.update(stubs)
+    try:
+        sys.modules["Jarvis.runtime.flags"] = _load_module(Path("Jarvis") / "runtime" / "flags.py", "jivan_index_flags")
+        return _load_module(Path("Jarvis") / "brain" / "tools" / "file_index.py", "jivan_file_index")
+    finally:
+        for name, module in saved.items():
+            if module is None:
+                sys.modules.pop(name, None)
+            else:
+                sys.modules[name] = module
+
+
+file_index = _load_file_index()
+
+
+def _touch(path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    Path(path).write_text("x", encoding="utf-8")
+
+
+class FileIndexTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self.tmp.name, "home")
+        for rel in ("notes/Budget_2024.xlsx", "notes/todo.txt", "photos/trip/IMG_001.jpg", ".git/config"):
+            _touch(os.path.join(self.root, rel))
+        self.index = file_index.FileIndex(
+            os.path.join(self.tmp.name, "index.sqlite3"), [self.root], exclude=[".git"], refresh_s=300
+        )
+        self.index.refresh(self.root)
+
+    def tearDown(self):
+        self.index._conn.close()
+        self.tmp.cleanup()
+
+    def _names(self, **kwargs):
+        hit = self.index.search(kwargs.pop("root", self.root), **kwargs)
+        return sorted(os.path.basename(p) for p in hit["paths"])
+
+    def test_substring_and_glob_queries(self):
+        self.assertEqual(self._names(name_contains="budget"), ["Budget_2024.xlsx"])
+        self.assertEqual(self._names(glob="*.jpg"), ["IMG_001.jpg"])
+        self.assertEqual(self._names(name_contains="o", glob="*.txt"), ["todo.txt"])
+        self.assertEqual(self._names(root=os.path.join(self.root, "photos")), ["IMG_001.jpg"])
+        self.assertEqual(len(self._names(max_results=2)), 2)
+        self.assertNotIn("config", self._names())
+        hit = self.index.search(self.root, name_contains="todo")
+        self.assertEqual(hit["paths"], [os.path.join(self.root, "notes", "todo.txt")])
+        self.assertFalse(hit["stale"])
+
+    def test_character_classes_are_not_looked_up_as_literals(self):
+        for name in ("xa", "xb", "note_a.txt", "note_c.txt"):
+            _touch(os.path.join(self.root, "misc", name))
+        self.index.refresh(self.root)
+        self.assertIsNone(file_index._fts_term("", "x[abcd]"))
+        self.assertEqual(file_index._fts_term("", "note_[!b].txt"), "note_")
+        self.assertEqual(self._names(glob="x[abcd]"), ["xa", "xb"])
+        self.assertEqual(self._names(glob="note_[!b].txt"), ["note_a.txt", "note_c.txt"])
+
+    def test_uncovered_or_excluded_roots_fall_back_to_walking(self):
+        self.assertIsNone(self.index.search(self.tmp.name, name_contains="todo"))
+        self.assertIsNone(self.index.search(os.path.join(self.root, ".git")))
+
+    def test_rescan_only_relists_changed_directories(self):
+        notes = os.path.join(self.root, "notes")
+        _touch(os.path.join(notes, "todo_old.txt"))
+        os.remove(os.path.join(notes, "todo.txt"))
+        os.utime(notes, (time.time() + 5, time.time() + 5))
+        for rel in ("photos/trip/IMG_001.jpg", "photos/trip"):
+            path = os.path.join(self.root, rel)
+            os.remove(path) if os.path.isfile(path) else os.rmdir(path)
+
+        listed = []
+        original = self.index._list_dir
+        self.index._list_dir = lambda path: listed.append(path) or original(path)
+        self.index.refresh(self.root)
+
+        self.assertEqual(self._names(name_contains="todo"), ["todo_old.txt"])
+        self.assertEqual(self._names(glob="*.jpg"), [])
+        self.assertEqual(sorted(listed), sorted([notes, os.path.join(self.root, "photos")]))
+        self.assertEqual(self.index.stats()["roots"][0]["files"], 2)
+
+    def test_background_refresh_marks_old_results_stale(self):
+        self.assertIsNone(self.index.refresh_in_background())
+        self.index.refresh_s = 0
+        time.sleep(0.01)
+        self.assertTrue(self.index.search(self.root, name_contains="todo")["stale"])
+        _touch(os.path.join(self.root, "notes", "todo2.txt"))
+        worker = self.index.refresh_in_background()
+        self.assertIsNotNone(worker)
+        worker.join(5)
+        self.assertEqual(self._names(name_contains="todo"), ["todo.txt", "todo2.txt"])
+
+
+if __name__ == "__main__":
+    unittest.main()
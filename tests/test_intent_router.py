@@ -0,0 +1,48 @@
+import importlib.util
+import json
+import unittest
+from pathlib import Path
+
+
+def _load_module(relative_path, module_name):
+    repo_root = Path(__file__).resolve().parents[1]
+    mod_path = repo_root / relative_path
+    spec = importlib.util.spec_from_file_location(module_name, str(mod_path))
+    module = importlib.util.module_from_spec(spec)
+    assert spec and spec.loader
+    spec.loader.exec_module(module)
+    return module
+
+
+intent = _load_module(Path("Jarvis") / "brain" / "intent_routing.py", "intent_router_mod")
+GOLDEN = Path(__file__).resolve().parent / "data" / "intent_routing_golden.json"
+
+
+class IntentRouterTests(unittest.TestCase):
+    def test_golden_corpus(self):
+        rows = json.loads(GOLDEN.read_text(encoding="utf-8"))
+        for row in rows:
+            plan = intent.required_tool_plan(row["text"], recent_messages=row["recent"])
+            self.assertEqual(list(plan) if plan else None, row["plan"], row["text"])
+
+    def test_keyword_automaton_finds_overlapping_keywords(self):
+        automaton = intent._KeywordAutomaton(["he", "she", "his", "hers"])
+        self.assertEqual(automaton.find("ushers"), {0, 1, 3})
+        self.assertEqual(automaton.find("xyz"), set())
+
+    def test_priority_and_hit_counts(self):
+        rules = [
+            intent.RouteRule("late", 20, lambda t, l, r: ("b", {}), keywords=("weather",)),
+            intent.RouteRule("early", 10, lambda t, l, r: ("a", {}) if "paris" in l else None, keywords=("weather",)),
+            intent.RouteRule("digits", 30, lambda t, l, r: ("c", {}), pattern=r"\d+"),
+        ]
+        router = intent.IntentRouter(rules)
+        self.assertEqual(router.match("Weather in Paris"), ("early", ("a", {})))
+        self.assertEqual(router.route("weather in Rome"), ("b", {}))
+        self.assertEqual(router.route("room 12"), ("c", {}))
+        self.assertIsNone(router.route("hello"))
+        self.assertEqual(router.hit_counts(), {"late": 1, "early": 1, "digits": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import importlib.util
+import unittest
+from pathlib import Path
+
+
+def _load_module(relative_path, module_name):
+    repo_root = Path(__file__).resolve().parents[1]
+    mod_path = repo_root / relative_path
+    spec = importlib.util.spec_from_file_location(module_name, str(mod_path))
+    module = importlib.util.module_from_spec(spec)
+    assert spec and spec.loader
+    spec.loader.exec_module(module)
+    return module
+
+
+json_stream = _load_module(Path("Jarvis") / "brain" / "json_stream.py", "json_stream_mod")
+
+
+class IncrementalJSONObjectTests(unittest.TestCase):
+    def _feed_chars(self, parser, text):
+        events = []
+        for ch in text:
+            events.extend(parser.feed(ch))
+        return events
+
+    def test_reports_values_as_soon_as_they_complete(self):
+        parser = json_stream.IncrementalJSONObject()
+        self.assertEqual(parser.feed('{"action":"tool","tool_na'), [(("action",), "tool")])
+        self.assertEqual(parser.feed('me":"weather","tool_args":{"city":"Par'), [(("tool_name",), "weather")])
+        self.assertEqual(parser.partial_string(), (("tool_args", "city"), "Par"))
+        events = parser.feed('is","days":3}}')
+        self.assertIn((("tool_args", "city"), "Paris"), events)
+        self.assertIn((("tool_args", "days"), 3), events)
+        self.assertTrue(parser.done)
+        self.assertEqual(parser.get(), {"action": "tool", "tool_name": "weather", "tool_args": {"city": "Paris", "days": 3}})
+
+    def test_char_by_char_matches_json_loads(self):
+        text = '```json\n{"a": [1, 2.5, true, null], "b": {"c": "x\\"y\\n"}, "d": false}\n```'
+        parser = json_stream.IncrementalJSONObject()
+        self._feed_chars(parser, text)
+        self.assertTrue(parser.done)
+        self.assertFalse(parser.error)
+        self.assertEqual(parser.get(), {"a": [1, 2.5, True, None], "b": {"c": 'x"y\n'}, "d": False})
+        self.assertEqual(parser.get("a", 1), 2.5)
+
+    def test_unicode_escapes_and_surrogate_pairs(self):
+        parser = json_stream.IncrementalJSONObject()
+        self._feed_chars(parser, '{"reply":"\\u041f\\u0440\\u0438 \\ud83d\\ude00"}')
+        self.assertEqual(parser.get("reply"), "При \U0001F600")
+
+    def test_malformed_input_sets_error(self):
+        parser = json_stream.IncrementalJSONObject()
+        parser.feed('{"a" 1}')
+        self.assertTrue(parser.error)
+        self.assertFalse(parser.done)
+
+
+if __name__ == "__main__":
+    unittest.main()
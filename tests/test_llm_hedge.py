@@ -0,0 +1,145 @@
+import importlib.util
+import sys
+import threading
+import time
+import types
+import unittest
+from pathlib import Path
+
+
+def _load_module(relative_path, module_name):
+    repo_root = Path(__file__).resolve().parents[1]
+    mod_path = repo_root / relative_path
+    spec = importlib.util.spec_from_file_location(module_name, str(mod_path))
+    module = importlib.util.module_from_spec(spec)
+    assert spec and spec.loader
+    spec.loader.exec_module(module)
+    return module
+
+
+def _load_brain_module(name):
+    pkg_name = "jivan_brain_hedge_pkg"
+    if pkg_name not in sys.modules:
+        pkg = types.ModuleType(pkg_name)
+        pkg.__path__ = [str(Path(__file__).resolve().parents[1] / "Jarvis" / "brain")]
+        sys.modules[pkg_name] = pkg
+    full_name = f"{pkg_name}.{name}"
+    module = _load_module(Path("Jarvis") / "brain" / f"{name}.py", full_name)
+    sys.modules[full_name] = module
+    return module
+
+
+hedge_mod = _load_brain_module("llm_hedge")
+LLMError = sys.modules["jivan_brain_hedge_pkg.llm"].LLMError
+
+PRIMARY = ("k", "https://llm.example/v1", "big")
+FAST = ("k", "https://llm.example/v1", "fast")
+
+
+class _FakeProvider:
+    """Per-model behaviour: (delay_s, content or exception)."""
+
+    def __init__(self, plan):
+        self.plan = plan
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def __call__(self, *, api_key, base_url, model, messages, timeout_s, extra=None, on_usage=None):
+        with self.lock:
+            self.calls.append(model)
+        delay, outcome = self.plan[model]
+        time.sleep(delay)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+def _client(provider, **kwargs):
+    defaults = {"min_samples": 3, "default_hedge_ms": 50, "min_hedge_ms": 10, "max_hedge_ratio": 1.0}
+    defaults.update(kwargs)
+    return hedge_mod.HedgedLLM(provider, **defaults)
+
+
+def _is_json(content):
+    return str(content).startswith("{")
+
+
+class HedgedLLMTests(unittest.TestCase):
+    def test_fast_primary_never_hedges(self):
+        provider = _FakeProvider({"big": (0.0, '{"action":"reply"}'), "fast": (0.0, "{}")})
+        llm = _client(provider)
+        self.assertEqual(llm.complete([PRIMARY, FAST], [], timeout_s=5), '{"action":"reply"}')
+        self.assertEqual(provider.calls, ["big"])
+        self.assertEqual(llm.stats()["hedges"], 0)
+
+    def test_slow_primary_is_hedged_to_fast_model(self):
+        provider = _FakeProvider({"big": (1.0, '{"from":"big"}'), "fast": (0.02, '{"from":"fast"}')})
+        llm = _client(provider)
+        started = time.perf_counter()
+        self.assertEqual(llm.complete([PRIMARY, FAST], [], timeout_s=5, validate=_is_json), '{"from":"fast"}')
+        self.assertLess(time.perf_counter() - started, 0.5)
+        stats = llm.stats()
+        self.assertEqual((stats["hedges"], stats["hedge_wins"], stats["abandoned"]), (1, 1, 1))
+
+    def test_refused_hedges_do_not_count_against_the_ratio(self):
+        provider = _FakeProvider({"big": (0.15, '{"from":"big"}'), "fast": (0.0, '{"from":"fast"}')})
+        llm = _client(provider, max_hedge_ratio=0.5, min_samples=100)
+        answers = [llm.complete([PRIMARY, FAST], [], timeout_s=5) for _ in range(4)]
+        # Hedged, refused (1/1), refused (1/2), hedged again (1/3 < 0.5).
+        self.assertEqual(answers, ['{"from":"fast"}', '{"from":"big"}', '{"from":"big"}', '{"from":"fast"}'])
+        self.assertEqual(llm.stats()["hedges"], 2)
+
+    def test_invalid_answer_waits_for_the_other_call(self):
+        provider = _FakeProvider({"big": (0.2, '{"from":"big"}'), "fast": (0.0, "sorry, plain text")})
+        llm = _client(provider)
+        self.assertEqual(llm.complete([PRIMARY, FAST], [], timeout_s=5, validate=_is_json), '{"from":"big"}')
+
+    def test_error_fails_over_and_breaker_opens(self):
+        provider = _FakeProvider({"big": (0.0, LLMError("503 overloaded")), "fast": (0.0, '{"ok":1}')})
+        llm = _client(provider, breaker_failures=2, breaker_reset_s=60)
+        for _ in range(3):
+            self.assertEqual(llm.complete([PRIMARY, FAST], [], timeout_s=5), '{"ok":1}')
+        self.assertEqual(provider.calls, ["big", "fast", "big", "fast", "fast"])
+        self.assertEqual(llm.stats()["routes"]["https://llm.example/v1|big"]["breaker"], "open")
+        self.assertFalse(llm.available(PRIMARY))
+
+    def test_all_routes_failing_raises(self):
+        provider = _FakeProvider({"big": (0.0, LLMError("down"))})
+        llm = _client(provider, breaker_failures=1, breaker_reset_s=60)
+        with self.assertRaises(LLMError):
+            llm.complete([PRIMARY], [], timeout_s=5)
+        with self.assertRaises(LLMError):
+            llm.complete([PRIMARY], [], timeout_s=5)
+        self.assertEqual(provider.calls, ["big"])
+
+    def test_hedge_delay_follows_observed_p90(self):
+        provider = _FakeProvider({"big": (0.0, "{}")})
+        llm = _client(provider, min_samples=3, default_hedge_ms=999)
+        self.assertEqual(llm.hedge_delay_ms(PRIMARY), 999)
+        window = llm._window(PRIMARY)
+        for ms in (100, 120, 140, 160, 1000):
+            window.add(ms)
+        self.assertEqual(llm.hedge_delay_ms(PRIMARY), 1000)
+        for ms in (100,) * 20:
+            window.add(ms)
+        self.assertLess(llm.hedge_delay_ms(PRIMARY), 200)
+
+
+class CircuitBreakerTests(unittest.TestCase):
+    def test_half_open_probe_closes_or_reopens(self):
+        breaker = hedge_mod.CircuitBreaker(failures=1, reset_s=0.05)
+        breaker.record_failure()
+        self.assertFalse(breaker.allow())
+        time.sleep(0.06)
+        self.assertTrue(breaker.allow())
+        self.assertFalse(breaker.allow())
+        breaker.record_failure()
+        self.assertEqual(breaker.state(), "open")
+        time.sleep(0.06)
+        self.assertTrue(breaker.allow())
+        breaker.record_success()
+        self.assertEqual(breaker.state(), "closed")
+
+
+if __name__ == "__main__":
+    unittest.main()
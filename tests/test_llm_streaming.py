@@ -0,0 +1,198 @@
+import importlib.util
+import json
+import sys
+import threading
+import types
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+
+def _load_module(relative_path, module_name):
+    repo_root = Path(__file__).resolve().parents[1]
+    mod_path = repo_root / relative_path
+    spec = importlib.util.spec_from_file_location(module_name, str(mod_path))
+    module = importlib.util.module_from_spec(spec)
+    assert spec and spec.loader
+    spec.loader.exec_module(module)
+    return module
+
+
+def _load_brain_module(name):
+    # streaming.py uses relative imports; load it inside a stub package so the
+    # Jarvis package (and its Windows-only speech imports) is never executed.
+    pkg_name = "jivan_brain_stream_pkg"
+    if pkg_name not in sys.modules:
+        pkg = types.ModuleType(pkg_name)
+        pkg.__path__ = [str(Path(__file__).resolve().parents[1] / "Jarvis" / "brain")]
+        sys.modules[pkg_name] = pkg
+    full_name = f"{pkg_name}.{name}"
+    module = _load_module(Path("Jarvis") / "brain" / f"{name}.py", full_name)
+    sys.modules[full_name] = module
+    return module
+
+
+llm_mod = _load_module(Path("Jarvis") / "brain" / "llm.py", "llm_streaming_mod")
+streaming_mod = _load_brain_module("streaming")
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    pieces = []
+    plain = False
+
+    def log_message(self, *args):
+        return
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", "0"))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        if self.plain or not body.get("stream"):
+            payload = json.dumps({"choices": [{"message": {"content": "".join(self.pieces)}}]}).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+        for piece in self.pieces:
+            chunk = {"choices": [{"delta": {"content": piece}}]}
+            self.wfile.write(b"data: " + json.dumps(chunk, ensure_ascii=False).encode("utf-8") + b"\n\n")
+            self.wfile.flush()
+        if (body.get("stream_options") or {}).get("include_usage"):
+            usage = {"choices": [], "usage": {"prompt_tokens": 120, "prompt_tokens_details": {"cached_tokens": 96}}}
+            self.wfile.write(b"data: " + json.dumps(usage).encode("utf-8") + b"\n\n")
+        self.wfile.write(b"data: [DONE]\n\n")
+
+
+class LLMStreamingTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_address[1]}/v1"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def _stream(self):
+        return list(
+            llm_mod.chat_completions_stream(
+                api_key="k",
+                base_url=self.base_url,
+                model="m",
+                messages=[{"role": "user", "content": "hi"}],
+                timeout_s=5,
+            )
+        )
+
+    def test_stream_yields_deltas_in_order(self):
+        _StubHandler.plain = False
+        _StubHandler.pieces = ['{"action":"reply",', '"reply":"Привет. ', 'Как дела?"}']
+        self.assertEqual(self._stream(), _StubHandler.pieces)
+
+    def test_plain_json_response_is_yielded_once(self):
+        _StubHandler.plain = True
+        _StubHandler.pieces = ["hello ", "world"]
+        try:
+            self.assertEqual(self._stream(), ["hello world"])
+        finally:
+            _StubHandler.plain = False
+
+    def test_usage_chunk_reports_cached_prompt_tokens(self):
+        _StubHandler.pieces = ["ok"]
+        seen = []
+        out = list(
+            llm_mod.chat_completions_stream(
+                api_key="k", base_url=self.base_url, model="m", messages=[], timeout_s=5, on_usage=seen.append
+            )
+        )
+        self.assertEqual(out, ["ok"])
+        self.assertEqual([llm_mod.cached_prompt_tokens(u) for u in seen], [96])
+        self.assertEqual(llm_mod.cached_prompt_tokens({"prompt_cache_hit_tokens": 7}), 7)
+        self.assertEqual(llm_mod.cached_prompt_tokens(None), 0)
+
+    def test_reply_sentences_reach_sink_before_stream_ends(self):
+        _StubHandler.pieces = [
+            '{"action":"reply","reply":"The weather in Paris is sunny',
+            ' today. Expect light wind',
+            ' in the evening.\\nStay warm!"}',
+        ]
+        spoken = []
+        chunker = streaming_mod.SentenceChunker(spoken.append, min_chars=4)
+        stream = streaming_mod.ReplyTextStream(chunker)
+        seen_after_first_sentence = None
+        for delta in llm_mod.chat_completions_stream(
+            api_key="k", base_url=self.base_url, model="m", messages=[], timeout_s=5
+        ):
+            stream.feed(delta)
+            if spoken and seen_after_first_sentence is None:
+                seen_after_first_sentence = delta
+        stream.finish()
+        self.assertEqual(
+            spoken,
+            ["The weather in Paris is sunny today.", "Expect light wind in the evening.", "Stay warm!"],
+        )
+        self.assertEqual(seen_after_first_sentence, _StubHandler.pieces[1])
+
+
+class SentenceChunkerTests(unittest.TestCase):
+    def test_skips_abbreviations_and_short_fragments(self):
+        out = []
+        chunker = streaming_mod.SentenceChunker(out.append, min_chars=8)
+        chunker.feed("Ok. Dr. Smith called about 3.5 tasks. ")
+        chunker.feed("Done")
+        chunker.flush()
+        self.assertEqual(out, ["Ok. Dr. Smith called about 3.5 tasks.", "Done"])
+
+    def test_long_clause_is_split_at_comma(self):
+        out = []
+        chunker = streaming_mod.SentenceChunker(out.append, min_chars=5, max_chars=40)
+        chunker.feed("first part of a long answer, second part keeps going without a stop")
+        self.assertEqual(out[0], "first part of a long answer,")
+
+    def test_tool_action_is_not_streamed(self):
+        out = []
+        stream = streaming_mod.ReplyTextStream(streaming_mod.SentenceChunker(out.append, min_chars=1))
+        stream.feed('{"action":"tool","tool_name":"weather","tool_args":{"city":"Paris. Now"}}')
+        stream.finish()
+        self.assertEqual(out, [])
+
+    def test_plain_text_answer_is_streamed(self):
+        out = []
+        stream = streaming_mod.ReplyTextStream(streaming_mod.SentenceChunker(out.append, min_chars=1))
+        stream.feed("Sure thing. ")
+        stream.feed("Anything else?")
+        stream.finish()
+        self.assertEqual(out, ["Sure thing.", "Anything else?"])
+
+    def test_prose_followed_by_a_plan_stops_speaking_at_the_json(self):
+        out = []
+        stream = streaming_mod.ReplyTextStream(streaming_mod.SentenceChunker(out.append, min_chars=1))
+        text = 'Sure! Let me check. {"action":"tool","tool_name":"weather","tool_args":{"city":"Paris"}}'
+        events = []
+        for i in range(0, len(text), 3):
+            events.extend(stream.feed(text[i : i + 3]))
+        self.assertEqual(stream.finish(), text)
+        self.assertEqual(out, ["Sure!"])
+        self.assertEqual(stream.action, "tool")
+        self.assertEqual(stream.parser.get("tool_args", "city"), "Paris")
+        self.assertIn((("tool_name",), "weather"), events)
+
+    def test_prose_before_a_code_fence_is_not_read_with_it(self):
+        out = []
+        stream = streaming_mod.ReplyTextStream(streaming_mod.SentenceChunker(out.append, min_chars=1))
+        stream.feed("Here you go")
+        stream.feed(': ```json\n{"action":"reply","reply":"Hi there."}\n```')
+        stream.finish()
+        self.assertEqual(out, [])
+        self.assertEqual(stream.parser.get("reply"), "Hi there.")
+
+
+if __name__ == "__main__":
+    unittest.main()
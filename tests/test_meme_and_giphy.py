@@ -47,14 +47,14 @@ class MemeAndGiphyTests(unittest.TestCase):
                     "data": {"memes": [{"id": "1", "name": "X", "url": "https://i.imgflip.com/x.jpg"}]},
                 }
 
-        old_get = self.imgflip_mod.requests.get
-        self.imgflip_mod.requests.get = lambda *a, **k: _Resp()
+        old_get = self.imgflip_mod.transport.get
+        self.imgflip_mod.transport.get = lambda *a, **k: _Resp()
         try:
             res = self.imgflip_mod.run(action="get_memes")
             self.assertTrue(res.get("ok"))
             self.assertTrue(isinstance((res.get("data") or {}).get("memes"), list))
         finally:
-            self.imgflip_mod.requests.get = old_get
+            self.imgflip_mod.transport.get = old_get
 
     def test_imgflip_search_requires_credentials(self):
         old_user = os.environ.get("JIVAN_IMGFLIP_USERNAME")
@@ -17,6 +17,17 @@ def _load_module(relative_path, module_name):
     return module
 
 
+def _load_manager(module_name):
+    # manager.py uses relative imports; load it inside a stub package so the
+    # Jarvis package (and its Windows-only speech imports) is never executed.
+    pkg_name = "jivan_memory_pkg"
+    if pkg_name not in sys.modules:
+        pkg = types.ModuleType(pkg_name)
+        pkg.__path__ = [str(Path(__file__).resolve().parents[1] / "Jarvis" / "brain" / "memory")]
+        sys.modules[pkg_name] = pkg
+    return _load_module(Path("Jarvis") / "brain" / "memory" / "manager.py", f"{pkg_name}.{module_name}")
+
+
 def _install_stub_config(tmp_path):
     if "Jarvis" not in sys.modules:
         sys.modules["Jarvis"] = types.ModuleType("Jarvis")
@@ -68,7 +79,7 @@ class MemoryManagerTests(unittest.TestCase):
         with tempfile.TemporaryDirectory() as td:
             store_path = Path(td) / "mem.jsonl"
             _install_stub_config(store_path)
-            mod = _load_module(Path("Jarvis") / "brain" / "memory" / "manager.py", "mem_manager_mod_a")
+            mod = _load_manager("mem_manager_mod_a")
             mgr = mod.MemoryManager()
             mgr.learn_turn(user_text="my name is Tony", assistant_reply="Nice to meet you", tool_result=None)
             ctx = mgr.retrieve_context("what is my name")
@@ -79,7 +90,7 @@ class MemoryManagerTests(unittest.TestCase):
         with tempfile.TemporaryDirectory() as td:
             store_path = Path(td) / "mem.jsonl"
             _install_stub_config(store_path)
-            mod = _load_module(Path("Jarvis") / "brain" / "memory" / "manager.py", "mem_manager_mod_b")
+            mod = _load_manager("mem_manager_mod_b")
             mgr = mod.MemoryManager()
             mgr.learn_turn(user_text="remember that my password is 123456", assistant_reply="", tool_result=None)
             rows = mgr.retrieve_context("password")
@@ -89,7 +100,7 @@ class MemoryManagerTests(unittest.TestCase):
         with tempfile.TemporaryDirectory() as td:
             store_path = Path(td) / "mem.jsonl"
             _install_stub_config(store_path)
-            mod = _load_module(Path("Jarvis") / "brain" / "memory" / "manager.py", "mem_manager_mod_c")
+            mod = _load_manager("mem_manager_mod_c")
             mgr = mod.MemoryManager()
             mgr.learn_turn(
                 user_text="run protocol house party",
@@ -105,7 +116,7 @@ class MemoryManagerTests(unittest.TestCase):
             cfg = _install_stub_config(store_path)
             cfg.mem0_api_key = "m0-test"
             MemoryClient = _install_stub_mem0()
-            mod = _load_module(Path("Jarvis") / "brain" / "memory" / "manager.py", "mem_manager_mod_d")
+            mod = _load_manager("mem_manager_mod_d")
             mgr = mod.MemoryManager()
             mgr.learn_turn(user_text="I prefer dark roast coffee", assistant_reply="Noted", tool_result=None)
             ctx = mgr.retrieve_context("what coffee do I like")
@@ -115,13 +126,27 @@ class MemoryManagerTests(unittest.TestCase):
             self.assertTrue(len(client.search_calls) >= 1)
             self.assertTrue(any("vegetarian" in x.get("text", "").lower() for x in ctx))
 
+    def test_local_store_is_indexed_incrementally(self):
+        with tempfile.TemporaryDirectory() as td:
+            store_path = Path(td) / "mem.jsonl"
+            _install_stub_config(store_path)
+            mod = _load_manager("mem_manager_mod_f")
+            mgr = mod.MemoryManager()
+            mgr.learn_turn(user_text="my name is Tony", assistant_reply="", tool_result=None)
+            self.assertEqual(mgr._retrieve_local("name")[0]["text"], "User name is Tony.")
+            mgr.learn_turn(user_text="I like long walks in Berlin", assistant_reply="", tool_result=None)
+            rows = mgr._retrieve_local("walks around berlin")
+            self.assertIn("berlin", rows[0]["text"])
+            self.assertEqual(len(mgr._local_index), 2)
+            self.assertEqual(mgr._local_offset, store_path.stat().st_size)
+
     def test_health_check_connected_with_sdk(self):
         with tempfile.TemporaryDirectory() as td:
             store_path = Path(td) / "mem.jsonl"
             cfg = _install_stub_config(store_path)
             cfg.mem0_api_key = "m0-test"
             _install_stub_mem0()
-            mod = _load_module(Path("Jarvis") / "brain" / "memory" / "manager.py", "mem_manager_mod_e")
+            mod = _load_manager("mem_manager_mod_e")
             mgr = mod.MemoryManager()
             h = mgr.health_check(force=True)
             self.assertTrue(h.get("enabled"))
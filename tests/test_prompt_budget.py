@@ -0,0 +1,90 @@
+import importlib.util
+import unittest
+from pathlib import Path
+
+
+def _load_module(relative_path, module_name):
+    repo_root = Path(__file__).resolve().parents[1]
+    mod_path = repo_root / relative_path
+    spec = importlib.util.spec_from_file_location(module_name, str(mod_path))
+    module = importlib.util.module_from_spec(spec)
+    assert spec and spec.loader
+    spec.loader.exec_module(module)
+    return module
+
+
+tokens = _load_module(Path("Jarvis") / "brain" / "tokens.py", "tokens_mod")
+summary = _load_module(Path("Jarvis") / "brain" / "summary.py", "summary_mod")
+
+
+def _row(role, words):
+    return {"role": role, "content": " ".join(["word"] * words)}
+
+
+class TokenBudgetTests(unittest.TestCase):
+    def test_heuristic_estimate(self):
+        self.assertEqual(tokens.heuristic_tokens(""), 0)
+        self.assertEqual(tokens.heuristic_tokens("hello world!"), 5)
+        self.assertGreater(tokens.heuristic_tokens("привет мир"), tokens.heuristic_tokens("hello mir"))
+
+    def test_unknown_tokenizer_falls_back_to_heuristic(self):
+        count = tokens.make_token_counter("tiktoken:no_such_encoding")
+        self.assertEqual(count("hello world!"), 5)
+
+    def test_fit_keeps_system_and_newest_turns(self):
+        count = tokens.make_token_counter()
+        messages = [_row("system", 50)] + [_row("user" if i % 2 == 0 else "assistant", 10) for i in range(8)]
+        kept, dropped = tokens.fit_messages(messages, 100, count)
+        self.assertEqual(kept[0]["role"], "system")
+        self.assertEqual(kept[-1], messages[-1])
+        self.assertNotEqual(kept[1]["role"], "assistant")
+        self.assertEqual(len(kept) - 1 + len(dropped), 8)
+        self.assertLessEqual(sum(tokens.message_tokens(m, count) for m in kept), 100)
+
+    def test_newest_turn_survives_a_tiny_budget(self):
+        count = tokens.make_token_counter()
+        messages = [_row("system", 50), _row("user", 40)]
+        kept, dropped = tokens.fit_messages(messages, 10, count)
+        self.assertEqual(kept, messages)
+        self.assertEqual(dropped, [])
+
+    def test_history_budget_is_counted_after_the_system_prompt(self):
+        self.assertEqual(tokens.history_budget(12000, 2500), 2500)
+        self.assertEqual(tokens.history_budget(12000, 2500, context_tokens=16000, reply_tokens=1024), 2500)
+        self.assertEqual(tokens.history_budget(12000, 2500, context_tokens=14000, reply_tokens=1024), 976)
+        self.assertEqual(tokens.history_budget(12000, 2500, context_tokens=8000, reply_tokens=1024), 0)
+
+
+class RollingSummaryTests(unittest.TestCase):
+    def test_compacts_new_rows_once_and_saves(self):
+        calls = []
+        saved = []
+
+        def summarize(previous, rows):
+            calls.append((previous, [r["content"] for r in rows]))
+            return (previous + " " if previous else "") + "/".join(r["content"] for r in rows)
+
+        rs = summary.RollingSummary(
+            summarize, submit=lambda fn: fn(), load=lambda: "start", save=saved.append, max_chars=40
+        )
+        rows = [{"role": "user", "content": "a"}, {"role": "assistant", "content": "b"}]
+        self.assertEqual(rs.compact(rows), 2)
+        self.assertEqual(rs.compact(rows), 0)
+        rs.compact(rows + [{"role": "user", "content": "c"}])
+        self.assertEqual(calls, [("start", ["a", "b"]), ("start a/b", ["c"])])
+        self.assertEqual(rs.text(), "start a/b c")
+        self.assertEqual(saved[-1], "start a/b c")
+        self.assertIn("start a/b c", rs.block())
+
+    def test_failed_summary_keeps_previous(self):
+        def summarize(previous, rows):
+            raise RuntimeError("llm down")
+
+        rs = summary.RollingSummary(summarize, submit=lambda fn: fn(), load=lambda: "kept")
+        rs.compact([{"role": "user", "content": "x"}])
+        self.assertEqual(rs.text(), "kept")
+        self.assertEqual(rs.compactions, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import importlib.util
+import unittest
+from pathlib import Path
+
+
+def _load_module(relative_path, module_name):
+    repo_root = Path(__file__).resolve().parents[1]
+    mod_path = repo_root / relative_path
+    spec = importlib.util.spec_from_file_location(module_name, str(mod_path))
+    module = importlib.util.module_from_spec(spec)
+    assert spec and spec.loader
+    spec.loader.exec_module(module)
+    return module
+
+
+prompt = _load_module(Path("Jarvis") / "brain" / "prompt.py", "prompt_mod")
+
+
+class StaticPromptPrefixTests(unittest.TestCase):
+    def test_rebuilds_only_when_inputs_change(self):
+        calls = []
+
+        def _build(soul, tools):
+            calls.append((soul, tools))
+            return f"SOUL:{soul}\nTOOLS:{tools}"
+
+        prefix = prompt.StaticPromptPrefix(_build)
+        soul, tools = "be brief", '[{"name":"weather"}]'
+        text1, digest1 = prefix.get(soul, tools)
+        text2, digest2 = prefix.get(soul, tools)
+        self.assertEqual((text1, digest1), (text2, digest2))
+        self.assertEqual(len(calls), 1)
+        _text3, digest3 = prefix.get("be warm", tools)
+        self.assertNotEqual(digest1, digest3)
+        self.assertEqual(prefix.rebuilds, 2)
+
+    def test_dynamic_blocks_follow_the_static_prefix(self):
+        system = prompt.join_system_prompt("STATIC", "lang", "", "memory")
+        self.assertTrue(system.startswith("STATIC\n\n"))
+        self.assertEqual(system, "STATIC\n\nlang\n\nmemory")
+        self.assertEqual(prompt.join_system_prompt("STATIC", "", None), "STATIC")
+
+
+if __name__ == "__main__":
+    unittest.main()
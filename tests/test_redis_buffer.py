@@ -78,6 +78,13 @@ def _install_stub_redis():
             rows = self.data.get(key, [])
             return rows[a if a != 0 else None : b + 1 if b != -1 else None]
 
+        def get(self, key):
+            return self.data.get(key)
+
+        def set(self, key, val, ex=None):
+            self.data[key] = val
+            return True
+
     class Redis:
         _last_client = None
 
@@ -116,6 +123,28 @@ class RedisBufferTests(unittest.TestCase):
         rows = buf.read()
         self.assertTrue(any(r.get("content") == "retry hello" for r in rows))
 
+    def test_summary_is_stored_next_to_history(self):
+        _install_stub_config(enabled="1")
+        Redis = _install_stub_redis()
+        mod = _load_module(Path("Jarvis") / "brain" / "cache" / "redis_buffer.py", "redis_buffer_mod_summary")
+        buf = mod.RedisConversationBuffer()
+        self.assertEqual(buf.read_summary(), "")
+        self.assertTrue(buf.write_summary("User planned a trip to Rome."))
+        self.assertEqual(buf.read_summary(), "User planned a trip to Rome.")
+        self.assertIn("jivan:session:test:summary", Redis._last_client.data)
+
+    def test_sessions_share_the_client_but_not_the_history(self):
+        _install_stub_config(enabled="1")
+        Redis = _install_stub_redis()
+        mod = _load_module(Path("Jarvis") / "brain" / "cache" / "redis_buffer.py", "redis_buffer_mod_sessions")
+        buf = mod.RedisConversationBuffer()
+        other = buf.for_session("tg-42")
+        self.assertEqual(other.key, "jivan:session:tg-42")
+        self.assertIs(other._client, Redis._last_client)
+        self.assertTrue(other.append("user", "hello from telegram"))
+        self.assertEqual(buf.read(), [])
+        self.assertEqual(other.read()[0]["content"], "hello from telegram")
+
 
 if __name__ == "__main__":
     unittest.main()
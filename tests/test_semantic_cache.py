@@ -0,0 +1,127 @@
+import importlib.util
+import os
+import sys
+import tempfile
+import time
+import types
+import unittest
+from pathlib import Path
+
+
+def _load_module(relative_path, module_name):
+    repo_root = Path(__file__).resolve().parents[1]
+    mod_path = repo_root / relative_path
+    spec = importlib.util.spec_from_file_location(module_name, str(mod_path))
+    module = importlib.util.module_from_spec(spec)
+    assert spec and spec.loader
+    spec.loader.exec_module(module)
+    return module
+
+
+def _load_semantic():
+    """semantic.py and ttl_lru.py under a private package, with config stubbed."""
+    config_mod = types.ModuleType("Jarvis.config.config")
+    config_mod.brain_cache_backend = "memory"
+    config_pkg = types.ModuleType("Jarvis.config")
+    config_pkg.config = config_mod
+    stubs = {
+        "Jarvis": sys.modules.get("Jarvis") or types.ModuleType("Jarvis"),
+        "Jarvis.config": config_pkg,
+        "Jarvis.config.config": config_mod,
+    }
+    saved = {name: sys.modules.get(name) for name in stubs}
+    sys.modules.update(stubs)
+    pkg_name = "semantic_cache_pkg"
+    pkg = types.ModuleType(pkg_name)
+    pkg.__path__ = [str(Path(__file__).resolve().parents[1] / "Jarvis" / "brain" / "cache")]
+    sys.modules[pkg_name] = pkg
+    try:
+        for name in ("ttl_lru", "semantic"):
+            module = _load_module(Path("Jarvis") / "brain" / "cache" / f"{name}.py", f"{pkg_name}.{name}")
+            sys.modules[f"{pkg_name}.{name}"] = module
+        return sys.modules[f"{pkg_name}.ttl_lru"], sys.modules[f"{pkg_name}.semantic"]
+    finally:
+        for name, module in saved.items():
+            if module is None:
+                sys.modules.pop(name, None)
+            else:
+                sys.modules[name] = module
+
+
+ttl_lru, semantic = _load_semantic()
+
+
+class SemanticReplyCacheTests(unittest.TestCase):
+    def test_paraphrases_hit(self):
+        cache = semantic.SemanticReplyCache()
+        cache.set("what's the weather in Paris", "en", "Sunny in Paris.")
+        self.assertEqual(cache.get("weather in paris please", "en"), "Sunny in Paris.")
+        self.assertEqual(cache.get("tell me the weather in Paris right now?", "en"), "Sunny in Paris.")
+
+    def test_different_entity_or_language_misses(self):
+        cache = semantic.SemanticReplyCache()
+        cache.set("weather in Paris", "en", "Sunny in Paris.")
+        self.assertIsNone(cache.get("weather in Berlin", "en"))
+        self.assertIsNone(cache.get("weather in Paris tomorrow", "en"))
+        self.assertIsNone(cache.get("weather in Paris", "de"))
+        self.assertEqual(cache.stats()["misses"], 3)
+
+    def test_word_order_and_numbers_must_match(self):
+        cache = semantic.SemanticReplyCache()
+        cache.set("convert 5 eur to usd", "en", "5 EUR is 5.4 USD")
+        self.assertIsNone(cache.get("convert 5 usd to eur", "en"))
+        self.assertIsNone(cache.get("convert 50 eur to usd", "en"))
+        self.assertEqual(cache.get("please convert 5 EUR to USD", "en"), "5 EUR is 5.4 USD")
+        cache.set("what is 10 minus 3", "en", "7")
+        self.assertIsNone(cache.get("what is 3 minus 10", "en"))
+        self.assertIsNone(cache.get("what is 10 minus 3 minus 3", "en"))
+        self.assertEqual(cache.get("10 minus 3", "en"), "7")
+
+    def test_typed_and_transcribed_queries_share_a_key(self):
+        typed = semantic.content_key("What's the weather in Amsterdam?")
+        self.assertEqual(semantic.content_key("whats the weather in amsterdam"), typed)
+        self.assertEqual(semantic.content_key("WEATHER IN AMSTERDAM"), typed)
+        self.assertNotEqual(
+            semantic.content_key("weather in Johannesburg"), semantic.content_key("weather in Johannes")
+        )
+
+    def test_russian_inflection_and_ttl(self):
+        cache = semantic.SemanticReplyCache()
+        cache.set("какая погода в Москве", "ru", "Облачно.", ttl_s=0.05)
+        self.assertEqual(cache.get("погода в москве пожалуйста", "ru"), "Облачно.")
+        self.assertEqual(cache.get("погоду в Москву", "ru"), "Облачно.")
+        time.sleep(0.08)
+        self.assertIsNone(cache.get("погода в москве", "ru"))
+        self.assertFalse(cache.set("погода в москве", "ru", "x", ttl_s=0))
+
+    def test_lru_bound_and_replacement(self):
+        cache = semantic.SemanticReplyCache(max_items=2)
+        cache.set("news headlines", "en", "old")
+        cache.set("the news headlines please", "en", "new")
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache.get("news headlines", "en"), "new")
+        cache.set("joke about cats", "en", "a")
+        cache.set("joke about dogs", "en", "b")
+        self.assertIsNone(cache.get("news headlines", "en"))
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_rows_persist_through_the_cache_backend(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "cache.sqlite3")
+            cache = semantic.SemanticReplyCache(backend=ttl_lru.SQLiteCacheBackend(path))
+            cache.set("weather in Paris", "en", "Sunny in Paris.", ttl_s=60)
+            warm = semantic.SemanticReplyCache(backend=ttl_lru.SQLiteCacheBackend(path))
+            self.assertEqual(warm.get("what's the weather in Paris", "en"), "Sunny in Paris.")
+
+    def test_max_bytes_bounds_the_store(self):
+        cache = semantic.SemanticReplyCache(max_bytes=400)
+        self.assertFalse(cache.set("long answer", "en", "x" * 500))
+        for city in ("Paris", "Berlin", "Madrid", "Vienna"):
+            cache.set(f"weather in {city}", "en", f"Sunny in {city}, 21 degrees and a light breeze.")
+        self.assertLessEqual(cache.stats()["bytes"], 400)
+        self.assertLess(len(cache), 4)
+        self.assertEqual(cache.get("weather in Vienna", "en"), "Sunny in Vienna, 21 degrees and a light breeze.")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import importlib.util
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+
+def _load_module(relative_path, module_name):
+    repo_root = Path(__file__).resolve().parents[1]
+    mod_path = repo_root / relative_path
+    spec = importlib.util.spec_from_file_location(module_name, str(mod_path))
+    module = importlib.util.module_from_spec(spec)
+    assert spec and spec.loader
+    spec.loader.exec_module(module)
+    return module
+
+
+singleflight = _load_module(Path("Jarvis") / "runtime" / "singleflight.py", "singleflight_mod")
+
+
+class SingleFlightTests(unittest.TestCase):
+    def test_concurrent_identical_calls_run_once(self):
+        metrics = []
+        flight = singleflight.SingleFlight("tool", on_metric=lambda name, value: metrics.append(name))
+        calls = []
+        release = threading.Event()
+
+        def fetch(city):
+            calls.append(city)
+            release.wait(5)
+            return {"ok": True, "city": city}
+
+        with ThreadPoolExecutor(max_workers=6) as pool:
+            futures = [pool.submit(flight.do, "weather:paris", fetch, "paris") for _ in range(5)]
+            other = pool.submit(flight.do, "weather:rome", fetch, "rome")
+            deadline = time.time() + 5
+            while flight.stats()["coalesced"] < 4 and time.time() < deadline:
+                time.sleep(0.01)
+            release.set()
+            results = [f.result() for f in futures]
+
+        self.assertEqual(sorted(calls), ["paris", "rome"])
+        self.assertEqual(other.result(), ({"ok": True, "city": "rome"}, False))
+        self.assertTrue(all(r[0] == {"ok": True, "city": "paris"} for r in results))
+        self.assertEqual(sum(1 for _r, shared in results if shared), 4)
+        stats = flight.stats()
+        self.assertEqual((stats["leaders"], stats["coalesced"], stats["in_flight"]), (2, 4, 0))
+        self.assertEqual(stats["max_waiters"], 4)
+        self.assertEqual(metrics.count("singleflight_tool_coalesced"), 4)
+
+    def test_errors_reach_every_waiter_and_are_not_remembered(self):
+        flight = singleflight.SingleFlight("llm")
+        started = threading.Event()
+        release = threading.Event()
+
+        def boom():
+            started.set()
+            release.wait(5)
+            raise RuntimeError("upstream down")
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            leader = pool.submit(flight.do, "k", boom)
+            started.wait(5)
+            follower = pool.submit(flight.do, "k", boom)
+            deadline = time.time() + 5
+            while flight.stats()["coalesced"] < 1 and time.time() < deadline:
+                time.sleep(0.01)
+            release.set()
+            for future in (leader, follower):
+                with self.assertRaises(RuntimeError):
+                    future.result()
+
+        self.assertEqual(flight.stats()["errors"], 1)
+        self.assertEqual(flight.do("k", lambda: "recovered"), ("recovered", False))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import importlib.util
+import os
+import unittest
+from pathlib import Path
+
+
+def _load_module(relative_path, module_name):
+    repo_root = Path(__file__).resolve().parents[1]
+    mod_path = repo_root / relative_path
+    spec = importlib.util.spec_from_file_location(module_name, str(mod_path))
+    module = importlib.util.module_from_spec(spec)
+    assert spec and spec.loader
+    spec.loader.exec_module(module)
+    return module
+
+
+slots = _load_module(Path("Jarvis") / "brain" / "slots.py", "slots_mod")
+
+
+class SlotFillingTests(unittest.TestCase):
+    def _fill(self, tool, text, args=None, required=()):
+        return slots.fill_slots(tool, args or {}, text, required=required)
+
+    def test_required_slots_resolve_locally(self):
+        cases = [
+            ("weather", "what's the weather like in Paris today?", {"city": "paris"}),
+            ("weather", "погода в Москве", {"city": "москве"}),
+            ("wikipedia", "Tell me about Ada Lovelace", {"topic": "Ada Lovelace"}),
+            ("web_search", "search the web for cheap flights please", {"query": "cheap flights"}),
+            ("launch_app", "открой Telegram", {"app": "Telegram"}),
+            ("open_website", "open github.com/anthropics", {"domain": "github.com/anthropics"}),
+            ("open_website", "go to youtube", {"domain": "youtube.com"}),
+            ("take_note", "note that the meeting moved to 3pm", {"text": "the meeting moved to 3pm"}),
+            ("translate_text", "translate good morning to German", {"text": "good morning", "target_language": "German"}),
+            ("translate_text", "переведи доброе утро на английский", {"text": "доброе утро", "target_language": "English"}),
+            ("location", "wie weit ist Berlin", {"place": "Berlin"}),
+        ]
+        for tool, text, expected in cases:
+            args, filled, missing = self._fill(tool, text, required=list(expected))
+            self.assertEqual(missing, [], text)
+            self.assertEqual({k: args[k] for k in expected}, expected, text)
+            self.assertEqual(sorted(filled), sorted(expected), text)
+
+    def test_planner_args_are_kept_and_unresolved_slots_reported(self):
+        args, filled, missing = self._fill("weather", "weather in Rome", {"city": "Paris"}, required=["city"])
+        self.assertEqual(args["city"], "Paris")
+        self.assertEqual(filled, [])
+        _args, _filled, missing = self._fill("launch_app", "I need that thing", required=["app"])
+        self.assertEqual(missing, ["app"])
+
+    def test_numbers_paths_and_todo(self):
+        args, _f, _m = self._fill("todo_manage", "mark task three as done")
+        self.assertEqual((args["action"], args["index"]), ("done", 3))
+        args, _f, _m = self._fill("todo_manage", "add buy milk to my todo list")
+        self.assertEqual((args["action"], args["text"]), ("add", "buy milk"))
+        args, _f, _m = self._fill("file_search", "find pdf files in my downloads")
+        self.assertEqual(args["root"], os.path.expanduser("~/Downloads"))
+        self.assertEqual(args["glob"], "*.pdf")
+        self.assertEqual(slots.parse_path('convert "/tmp/in put.mov" to mp4'), "/tmp/in put.mov")
+        self.assertEqual(slots.parse_path(r"rename files in C:\Users\me\Pics"), r"C:\Users\me\Pics")
+        self.assertEqual(slots.parse_number("top fünf processes"), 5)
+
+    def test_confirm_is_never_inferred(self):
+        args, filled, _m = self._fill("batch_rename", "yes, confirm renaming files in ~/Desktop")
+        self.assertNotIn("confirm", args)
+        self.assertEqual(filled, ["directory"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+import importlib.util
+import unittest
+from pathlib import Path
+
+
+def _load_module(relative_path, module_name):
+    repo_root = Path(__file__).resolve().parents[1]
+    mod_path = repo_root / relative_path
+    spec = importlib.util.spec_from_file_location(module_name, str(mod_path))
+    module = importlib.util.module_from_spec(spec)
+    assert spec and spec.loader
+    spec.loader.exec_module(module)
+    return module
+
+
+speculation = _load_module(Path("Jarvis") / "brain" / "speculation.py", "speculation_mod")
+
+
+class PredictToolTests(unittest.TestCase):
+    def test_near_miss_phrasings(self):
+        self.assertEqual(speculation.predict_tool("Is it going to rain in Berlin tomorrow?"), ("weather", {"city": "Berlin"}))
+        self.assertEqual(speculation.predict_tool("Какой прогноз в Москве сегодня"), ("weather", {"city": "Москве"}))
+        self.assertEqual(speculation.predict_tool("what's happening in the world"), ("news", {}))
+        self.assertEqual(speculation.predict_tool("Wie spät ist es?"), ("get_time", {}))
+        self.assertEqual(speculation.predict_tool("show my public IP"), ("ip_address", {}))
+        self.assertEqual(speculation.predict_tool("Who was Ada Lovelace?"), ("wikipedia", {"topic": "Ada Lovelace"}))
+
+    def test_no_guess_without_required_args(self):
+        self.assertIsNone(speculation.predict_tool("will it rain?"))
+        self.assertIsNone(speculation.predict_tool("open notepad"))
+        self.assertIsNone(speculation.predict_tool(""))
+
+    def test_args_match_ignores_case_and_empty_values(self):
+        self.assertTrue(speculation.args_match({"city": "Berlin"}, {"city": "berlin ", "units": ""}))
+        self.assertFalse(speculation.args_match({"city": "Berlin"}, {"city": "Paris"}))
+        self.assertTrue(speculation.args_match({}, {}))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import importlib.util
+import unittest
+from pathlib import Path
+
+
+def _load_module(relative_path, module_name):
+    repo_root = Path(__file__).resolve().parents[1]
+    mod_path = repo_root / relative_path
+    spec = importlib.util.spec_from_file_location(module_name, str(mod_path))
+    module = importlib.util.module_from_spec(spec)
+    assert spec and spec.loader
+    spec.loader.exec_module(module)
+    return module
+
+
+token_index = _load_module(Path("Jarvis") / "brain" / "memory" / "token_index.py", "token_index_mod")
+
+
+class TokenIndexTests(unittest.TestCase):
+    def test_overlaps_only_visit_matching_rows(self):
+        index = token_index.TokenIndex()
+        a = index.add("a", "weather in Paris")
+        b = index.add("b", "Paris is sunny, weather is nice")
+        index.add("c", "set a timer")
+        self.assertEqual(index.overlaps("paris weather"), {a: 2, b: 2})
+        self.assertEqual(index.overlaps("a"), {})
+
+    def test_top_keeps_conversation_order_and_fills(self):
+        index = token_index.TokenIndex()
+        for i, text in enumerate(["hello", "weather paris", "thanks", "paris trip", "bye"]):
+            index.add(i, text)
+        self.assertEqual(index.top("paris weather", 2), [1, 3])
+        self.assertEqual(index.top("paris weather", 3), [0, 1, 3])
+
+    def test_max_rows_drops_oldest(self):
+        index = token_index.TokenIndex(max_rows=2)
+        index.add("old", "paris")
+        index.add("mid", "berlin")
+        index.add("new", "paris")
+        self.assertEqual(index.rows(), ["mid", "new"])
+        self.assertEqual(len(index.overlaps("paris")), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,150 @@
+import functools
+import importlib.util
+import sys
+import threading
+import time
+import types
+import unittest
+from pathlib import Path
+
+
+def _load_module(relative_path, module_name):
+    repo_root = Path(__file__).resolve().parents[1]
+    mod_path = repo_root / relative_path
+    spec = importlib.util.spec_from_file_location(module_name, str(mod_path))
+    module = importlib.util.module_from_spec(spec)
+    assert spec and spec.loader
+    spec.loader.exec_module(module)
+    return module
+
+
+def _load_executor():
+    config_mod = types.ModuleType("Jarvis.config.config")
+    config_mod.trace_enabled = "0"
+    config_mod.tool_default_timeout_s = 5
+    config_pkg = types.ModuleType("Jarvis.config")
+    config_pkg.config = config_mod
+    stubs = {
+        "Jarvis": sys.modules.get("Jarvis") or types.ModuleType("Jarvis"),
+        "Jarvis.config": config_pkg,
+        "Jarvis.config.config": config_mod,
+    }
+    saved = {name: sys.modules.get(name) for name in stubs}
+    sys.modules.update(stubs)
+    pkg_name = "jivan_runtime_exec_pkg"
+    pkg = types.ModuleType(pkg_name)
+    pkg.__path__ = [str(Path(__file__).resolve().parents[1] / "Jarvis" / "runtime")]
+    sys.modules[pkg_name] = pkg
+    try:
+        for name in ("metrics", "structured_log", "tracing"):
+            sys.modules[f"{pkg_name}.{name}"] = _load_module(
+                Path("Jarvis") / "runtime" / f"{name}.py", f"{pkg_name}.{name}"
+            )
+        return _load_module(Path("Jarvis") / "runtime" / "tool_executor.py", f"{pkg_name}.tool_executor")
+    finally:
+        for name, module in saved.items():
+            if module is None:
+                sys.modules.pop(name, None)
+            else:
+                sys.modules[name] = module
+
+
+tool_executor = _load_executor()
+
+
+class ToolExecutorTests(unittest.TestCase):
+    def setUp(self):
+        self.executor = tool_executor.ToolExecutor(threads=2, processes=0)
+
+    def tearDown(self):
+        self.executor.shutdown()
+
+    def test_result_and_exceptions_pass_through(self):
+        self.assertEqual(self.executor.run("add", lambda a, b: a + b, {"a": 2, "b": 3}), 5)
+
+        def _boom():
+            raise RuntimeError("broken")
+
+        with self.assertRaises(RuntimeError):
+            self.executor.run("boom", _boom)
+
+    def test_deadline_returns_promptly_and_sets_cancel_event(self):
+        stopped = threading.Event()
+
+        def _slow(*, cancel_event):
+            while not cancel_event.wait(0.01):
+                pass
+            stopped.set()
+
+        started = time.perf_counter()
+        with self.assertRaises(tool_executor.ToolTimeout) as ctx:
+            self.executor.run("file_search", _slow, timeout_s=0.1)
+        self.assertLess(time.perf_counter() - started, 1.0)
+        self.assertIn("file_search", str(ctx.exception))
+        self.assertTrue(stopped.wait(1.0))
+        self.assertEqual(self.executor.stats()["timeouts"], 1)
+
+    def test_detached_call_keeps_running_past_its_deadline(self):
+        finished = threading.Event()
+
+        def _launch(*, cancel_event):
+            time.sleep(0.3)
+            if not cancel_event.is_set():
+                finished.set()
+
+        with self.assertRaises(tool_executor.ToolStillRunning) as ctx:
+            self.executor.run("launch_app", _launch, timeout_s=0.05, detach=True)
+        self.assertIn("still running", str(ctx.exception))
+        self.assertTrue(finished.wait(2))
+        self.assertEqual(self.executor.stats()["timeouts"], 0)
+
+    def test_saturation_and_queue_depth_are_counted(self):
+        release = threading.Event()
+        results = []
+
+        def _call():
+            results.append(self.executor.run("wait", lambda: release.wait(2), timeout_s=3))
+
+        callers = [threading.Thread(target=_call) for _ in range(3)]
+        for t in callers:
+            t.start()
+        deadline = time.time() + 2
+        # Calls count as in flight on submit, as running once a worker picks them up.
+        while time.time() < deadline:
+            stats = self.executor.stats()["thread"]
+            if stats["inflight"] == 3 and stats["queued"] == 1:
+                break
+            time.sleep(0.01)
+        stats = self.executor.stats()["thread"]
+        self.assertEqual(stats["queued"], 1)
+        self.assertEqual(stats["saturated"], 1)
+        release.set()
+        for t in callers:
+            t.join()
+        self.assertEqual(results, [True, True, True])
+        self.assertEqual(self.executor.stats()["thread"]["inflight"], 0)
+
+    def test_nested_call_from_a_tool_runs_inline(self):
+        executor = tool_executor.ToolExecutor(threads=1, processes=0)
+        try:
+            inner = lambda: threading.current_thread().name  # noqa: E731
+            outer = lambda: (threading.current_thread().name, executor.run("inner", inner))  # noqa: E731
+            outer_thread, inner_thread = executor.run("outer", outer, timeout_s=2)
+            self.assertEqual(outer_thread, inner_thread)
+        finally:
+            executor.shutdown()
+
+    @unittest.skipUnless(tool_executor._process_context() is not None, "forkserver is not available")
+    def test_process_tools_run_in_a_pool_that_is_replaced_after_a_timeout(self):
+        executor = tool_executor.ToolExecutor(threads=1, processes=1)
+        try:
+            self.assertEqual(executor.run("pow", functools.partial(pow, 2, 10), mode="process", timeout_s=20), 1024)
+            with self.assertRaises(tool_executor.ToolTimeout):
+                executor.run("ocr", functools.partial(time.sleep, 30), mode="process", timeout_s=0.3)
+            self.assertEqual(executor.run("pow", functools.partial(pow, 3, 2), mode="process", timeout_s=20), 9)
+        finally:
+            executor.shutdown()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,223 @@
+import importlib.util
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import types
+import unittest
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+TOOLS_DIR = REPO_ROOT / "Jarvis" / "brain" / "tools"
+
+
+def _load_module(relative_path, module_name):
+    mod_path = REPO_ROOT / relative_path
+    spec = importlib.util.spec_from_file_location(module_name, str(mod_path))
+    module = importlib.util.module_from_spec(spec)
+    assert spec and spec.loader
+    spec.loader.exec_module(module)
+    return module
+
+
+registry = _load_module(Path("Jarvis") / "brain" / "tools" / "registry.py", "jivan_tool_registry")
+
+
+def _load_runtime_executor():
+    pkg_name = "jivan_runtime_tools_pkg"
+    pkg = types.ModuleType(pkg_name)
+    pkg.__path__ = [str(REPO_ROOT / "Jarvis" / "runtime")]
+    sys.modules[pkg_name] = pkg
+    for name in ("metrics", "structured_log", "tracing", "tool_executor"):
+        module = _load_module(Path("Jarvis") / "runtime" / f"{name}.py", f"{pkg_name}.{name}")
+        sys.modules[f"{pkg_name}.{name}"] = module
+    return sys.modules[f"{pkg_name}.tool_executor"]
+
+
+def _load_tools_package(manifest_path):
+    """The real tools package under a private name, with config/security stubbed."""
+    config_mod = types.ModuleType("Jarvis.config.config")
+    config_mod.brain_tool_manifest_path = manifest_path
+    config_mod.trace_enabled = "0"
+    config_mod.tool_executor_processes = 0
+    config_pkg = types.ModuleType("Jarvis.config")
+    config_pkg.config = config_mod
+    security_mod = types.ModuleType("Jarvis.security")
+    security_mod.validate_source_access = lambda ctx: (True, "")
+    stubs = {
+        "Jarvis": sys.modules.get("Jarvis") or types.ModuleType("Jarvis"),
+        "Jarvis.config": config_pkg,
+        "Jarvis.config.config": config_mod,
+        "Jarvis.security": security_mod,
+        "Jarvis.runtime": sys.modules.get("Jarvis.runtime") or types.ModuleType("Jarvis.runtime"),
+    }
+    saved = {name: sys.modules.get(name) for name in stubs}
+    saved["Jarvis.runtime.tool_executor"] = sys.modules.get("Jarvis.runtime.tool_executor")
+    sys.modules.update(stubs)
+    sys.modules["Jarvis.runtime.tool_executor"] = _load_runtime_executor()
+    pkg_name = "jivan_tools_pkg"
+    for name in [n for n in sys.modules if n == pkg_name or n.startswith(pkg_name + ".")]:
+        sys.modules.pop(name)
+    try:
+        spec = importlib.util.spec_from_file_location(
+            pkg_name, str(TOOLS_DIR / "__init__.py"), submodule_search_locations=[str(TOOLS_DIR)]
+        )
+        pkg = importlib.util.module_from_spec(spec)
+        sys.modules[pkg_name] = pkg
+        spec.loader.exec_module(pkg)
+        return pkg
+    finally:
+        for name, module in saved.items():
+            if module is None:
+                sys.modules.pop(name, None)
+            else:
+                sys.modules[name] = module
+
+
+class StaticEntryTests(unittest.TestCase):
+    def test_spec_and_required_args_come_from_source(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "demo.py")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(
+                    "import not_installed_anywhere\n\n"
+                    "def spec():\n"
+                    "    return {'name': 'demo', 'args': {'city': 'string', 'units': 'string'}}\n\n"
+                    "def run(*, city, units='metric', assistant=None, user_text):\n"
+                    "    return city\n\n"
+                    "def format_reply(*, result, tool_args=None, lang='en'):\n"
+                    "    return ''\n"
+                )
+            entry = registry.static_entry(path, "demo", {})
+            self.assertEqual(entry["spec"]["required"], ["city"])
+            self.assertEqual(entry["spec"]["description"], "")
+            self.assertTrue(entry["format_reply"])
+            self.assertFalse(entry["can_run"])
+            self.assertEqual(registry.static_entry(path, "demo", {"demo": []})["spec"]["required"], [])
+
+    def test_non_literal_spec_is_left_to_import(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "dyn.py")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("NAME = 'dyn'\n\ndef spec():\n    return {'name': NAME}\n")
+            self.assertIsNone(registry.static_entry(path, "dyn", {}))
+
+
+class ToolPackageTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.manifest = os.path.join(self.tmp.name, "tool_manifest.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_catalog_is_built_without_importing_tools(self):
+        saved = sys.modules.get("pyperclip")
+        sys.modules["pyperclip"] = None
+        try:
+            tools = _load_tools_package(self.manifest)
+            self.assertEqual(len(tools.TOOL_SPECS), len(tools._TOOL_MODULE_NAMES))
+            self.assertEqual(tools.REGISTRY.loaded(), [])
+            self.assertEqual(tools.REGISTRY.stats()["manifest"], "built")
+            self.assertEqual(tools.get_tool_spec("weather")["required"], ["city"])
+            self.assertIsNone(tools.get_tool_spec("nope"))
+
+            class _Assistant:
+                def tell_time(self):
+                    return "10:15:30"
+
+            result = tools.run_tool(
+                tool_name="get_time", tool_args={}, user_text="", assistant=_Assistant(), wolfram_fn=None
+            )
+            self.assertEqual(result["data"], "10:15:30")
+            self.assertEqual(tools.REGISTRY.loaded(), ["get_time"])
+            self.assertEqual(tools.format_tool_reply(tool_name="get_time", tool_result=result), "It's 10:15.")
+
+            tools.config.tool_default_timeout_s = 0.2
+            slow = types.SimpleNamespace(tell_time=lambda: time.sleep(1) or "late")
+            timed_out = tools.run_tool(tool_name="get_time", tool_args={}, user_text="", assistant=slow, wolfram_fn=None)
+            self.assertEqual(timed_out["error_code"], "timeout")
+
+            launched = []
+            slow_launch = types.SimpleNamespace(
+                launch_app_name=lambda app, new_window=True: time.sleep(0.5) or launched.append(app) or True
+            )
+            still_running = tools.run_tool(
+                tool_name="launch_app",
+                tool_args={"app": "notepad"},
+                user_text="launch notepad",
+                assistant=slow_launch,
+                wolfram_fn=None,
+            )
+            self.assertTrue(still_running["ok"])
+            self.assertTrue(still_running["pending"])
+            self.assertNotIn("error_code", still_running)
+            deadline = time.time() + 3
+            while not launched and time.time() < deadline:
+                time.sleep(0.02)
+            self.assertEqual(launched, ["notepad"])
+
+            rejected = tools.run_tool(
+                tool_name="file_search",
+                tool_args={"root": os.path.join(self.tmp.name, "missing")},
+                user_text="",
+                assistant=None,
+                wolfram_fn=None,
+            )
+            self.assertEqual(rejected["error_code"], "invalid_args")
+            self.assertEqual(rejected["invalid_args"], ["root"])
+            self.assertNotIn("file_search", tools.REGISTRY.loaded())
+            self.assertEqual(tools.check_tool_args("weather", {"city": " "}), (["city"], {}))
+
+            blocked = tools.run_tool(
+                tool_name="clipboard_get", tool_args={}, user_text="", assistant=None, wolfram_fn=None
+            )
+            self.assertEqual(blocked["error_code"], "tool_unavailable")
+            with self.assertRaises(ValueError):
+                tools.run_tool(tool_name="nope", tool_args={}, user_text="", assistant=None, wolfram_fn=None)
+        finally:
+            if saved is None:
+                sys.modules.pop("pyperclip", None)
+            else:
+                sys.modules["pyperclip"] = saved
+
+    def test_manifest_is_reused_until_a_tool_source_changes(self):
+        tool_dir = os.path.join(self.tmp.name, "tools")
+        shutil.copytree(TOOLS_DIR, tool_dir, ignore=shutil.ignore_patterns("__pycache__"))
+        names = ["get_time", "weather"]
+
+        def _build():
+            return registry.ToolRegistry("unused_pkg", names, tool_dir=tool_dir, manifest_path=self.manifest)
+
+        first = _build()
+        self.assertEqual(first.manifest_status, "built")
+        self.assertEqual(_build().manifest_status, "cached")
+
+        with open(os.path.join(tool_dir, "weather.py"), "a", encoding="utf-8") as f:
+            f.write("\n# edited\n")
+        rebuilt = _build()
+        self.assertEqual(rebuilt.manifest_status, "refreshed")
+        self.assertEqual(rebuilt.specs, first.specs)
+        with open(self.manifest, "r", encoding="utf-8") as f:
+            self.assertEqual([row["module"] for row in json.load(f)["tools"]], names)
+
+        blocked = os.path.join(self.tmp.name, "not_a_folder")
+        with open(blocked, "w", encoding="utf-8") as f:
+            f.write("x")
+        unwritable = registry.ToolRegistry(
+            "unused_pkg", names, tool_dir=tool_dir, manifest_path=os.path.join(blocked, "tool_manifest.json")
+        )
+        self.assertEqual(unwritable.manifest_status, "built")
+        self.assertEqual(unwritable.specs, first.specs)
+
+        changed = registry.ToolRegistry(
+            "unused_pkg", names, tool_dir=tool_dir, manifest_path=self.manifest, required_overrides={"weather": []}
+        )
+        self.assertEqual(changed.manifest_status, "built")
+        self.assertEqual(changed.spec("weather")["required"], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+import importlib.util
+from pathlib import Path
+
+
+def _load_module(relative_path, module_name):
+    repo_root = Path(__file__).resolve().parents[1]
+    mod_path = repo_root / relative_path
+    spec = importlib.util.spec_from_file_location(module_name, str(mod_path))
+    module = importlib.util.module_from_spec(spec)
+    assert spec and spec.loader
+    spec.loader.exec_module(module)
+    return module
+
+
+def _tool(name):
+    return _load_module(Path("Jarvis") / "brain" / "tools" / f"{name}.py", f"{name}_formatter_tool")
+
+
+get_time = _tool("get_time")
+get_date = _tool("get_date")
+weather = _tool("weather")
+todo_manage = _tool("todo_manage")
+contacts_manage = _tool("contacts_manage")
+git_summary = _tool("git_summary")
+file_search = _tool("file_search")
+news = _tool("news")
+
+
+class ToolReplyFormatterTests(unittest.TestCase):
+    def test_time_and_date_are_localized(self):
+        result = {"ok": True, "data": "14:05:33"}
+        self.assertEqual(get_time.format_reply(result=result, lang="en"), "It's 14:05.")
+        self.assertEqual(get_time.format_reply(result=result, lang="de"), "Es ist 14:05 Uhr.")
+        date = {"ok": True, "data": "Oct 18 2026"}
+        self.assertEqual(get_date.format_reply(result=date, lang="en"), "Today is October 18, 2026.")
+        self.assertEqual(get_date.format_reply(result=date, lang="ru"), "Сегодня 18 октября 2026 года.")
+        self.assertEqual(get_date.format_reply(result={"ok": True, "data": False}, lang="en"), "")
+
+    def test_english_only_sources_defer_to_llm_for_other_languages(self):
+        result = {"ok": True, "data": "\n  The weather in Paris is currently clear sky \n  with 20 degrees"}
+        self.assertEqual(weather.format_reply(result=result, lang="en"), "The weather in Paris is currently clear sky with 20 degrees.")
+        self.assertEqual(weather.format_reply(result=result, lang="ru"), "")
+        self.assertEqual(news.format_reply(result={"ok": True, "headlines": ["A", "B"]}, lang="de"), "")
+        self.assertEqual(news.format_reply(result={"ok": True, "headlines": ["A", "B."]}, lang="en"), "Top headlines: 1. A. 2. B.")
+
+    def test_action_aware_formatters(self):
+        todos = {"ok": True, "data": [{"index": 0, "task": "- [ ] buy milk (2026-10-18)"}]}
+        self.assertEqual(
+            todo_manage.format_reply(result=todos, tool_args={"action": "list"}, lang="en"),
+            "You have 1 tasks: 0. buy milk (2026-10-18).",
+        )
+        self.assertEqual(
+            todo_manage.format_reply(result={"ok": True}, tool_args={"action": "add", "text": "call mom"}, lang="de"),
+            "Zur Aufgabenliste hinzugefügt: call mom.",
+        )
+        self.assertEqual(
+            contacts_manage.format_reply(result={"ok": True, "data": None}, tool_args={"action": "get", "name": "Ann"}, lang="en"),
+            "No contact named Ann.",
+        )
+        self.assertEqual(
+            git_summary.format_reply(result={"ok": True, "data": {"changed_files": 2, "lines": [" M a.py", "?? b.py"]}}, lang="en"),
+            "2 changed files: a.py, b.py.",
+        )
+        self.assertEqual(file_search.format_reply(result={"ok": True, "data": []}, lang="ru"), "Подходящих файлов не найдено.")
+
+    def test_sandbox_results_are_not_templated(self):
+        result = {"ok": True, "sandbox": True, "data": {"dry_run": True}}
+        self.assertEqual(todo_manage.format_reply(result=result, tool_args={"action": "add", "text": "x"}, lang="en"), "")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import importlib.util
+import unittest
+from pathlib import Path
+
+
+def _load_module(relative_path, module_name):
+    repo_root = Path(__file__).resolve().parents[1]
+    mod_path = repo_root / relative_path
+    spec = importlib.util.spec_from_file_location(module_name, str(mod_path))
+    module = importlib.util.module_from_spec(spec)
+    assert spec and spec.loader
+    spec.loader.exec_module(module)
+    return module
+
+
+retrieval = _load_module(Path("Jarvis") / "brain" / "tool_retrieval.py", "tool_retrieval_mod")
+
+TOOLS = [
+    {"name": "weather", "description": "Get current weather for a city.", "args": {"city": "string"}},
+    {"name": "get_time", "description": "Current local time.", "args": {}},
+    {"name": "launch_app", "description": "Launch a desktop application by name.", "args": {"app_name": "string"}},
+    {"name": "mcp_execute", "description": "Run a Composio MCP action.", "args": {"tool": "string"}},
+    {"name": "todo_manage", "description": "Add, list or complete todo items.", "args": {"action": "string"}},
+    {"name": "web_search", "description": "Search the web.", "args": {"query": "string"}},
+]
+PROTOCOLS = [
+    {"name": "morning_routine", "description": "Start the day", "triggers": ["good morning"]},
+    {"name": "focus_session", "description": "Deep work timer", "triggers": ["focus time"]},
+]
+
+
+class CatalogRetrieverTests(unittest.TestCase):
+    def setUp(self):
+        self.retriever = retrieval.CatalogRetriever(
+            TOOLS, PROTOCOLS, always_on=["web_search"], top_k=2, protocol_top_k=1, min_score=0.5
+        )
+
+    def test_relevant_tools_are_retrieved(self):
+        cases = {
+            "what's the weather in Paris": "weather",
+            "какая погода в Москве": "weather",
+            "what time is it": "get_time",
+            "open chrome": "launch_app",
+            "send a telegram message to Anna": "mcp_execute",
+            "add milk to my todo list": "todo_manage",
+        }
+        for text, tool in cases.items():
+            picked = self.retriever.select(text)
+            self.assertFalse(picked["fallback"], text)
+            self.assertIn(tool, picked["tools"], text)
+            self.assertEqual(picked["tools"][0], "web_search")
+            self.assertLessEqual(len(picked["tools"]), 3)
+
+    def test_protocols_are_ranked(self):
+        picked = self.retriever.select("good morning, what's the weather")
+        self.assertEqual(picked["protocols"], ["morning_routine"])
+
+    def test_unmatched_query_falls_back_to_full_catalog(self):
+        picked = self.retriever.select("zxqv blorp")
+        self.assertTrue(picked["fallback"])
+        self.assertEqual(picked["tools"], [t["name"] for t in TOOLS])
+        self.assertEqual(picked["protocols"], ["morning_routine", "focus_session"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import importlib.util
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+
+def _load_module(relative_path, module_name):
+    repo_root = Path(__file__).resolve().parents[1]
+    mod_path = repo_root / relative_path
+    spec = importlib.util.spec_from_file_location(module_name, str(mod_path))
+    module = importlib.util.module_from_spec(spec)
+    assert spec and spec.loader
+    spec.loader.exec_module(module)
+    return module
+
+
+validators = _load_module(Path("Jarvis") / "brain" / "tools" / "validators.py", "jivan_tool_validators")
+
+
+class ValidatorTests(unittest.TestCase):
+    def test_bare_type_names_coerce_leniently(self):
+        validate = validators.compile_args(
+            {"n": "number", "flag": "boolean", "data": "object", "items": "array", "name": "string"}, ["name"]
+        )
+        clean, missing, errors = validate(
+            {"n": "2.5", "flag": "yes", "data": '{"a": 1}', "items": "[1, 2]", "name": 7, "extra": "dropped"}
+        )
+        self.assertEqual(clean, {"n": 2.5, "flag": True, "data": {"a": 1}, "items": [1, 2], "name": "7"})
+        self.assertEqual((missing, errors), ([], {}))
+        clean, missing, errors = validate({"n": "lots", "flag": "maybe", "name": "  "})
+        self.assertEqual(clean["n"], "lots")
+        self.assertEqual(clean["flag"], "maybe")
+        self.assertEqual(missing, ["name"])
+        self.assertEqual(errors, {})
+
+    def test_enum_and_range_rules(self):
+        validate = validators.compile_args(
+            {
+                "action": {"type": "string", "enum": ["list", "add", "done"]},
+                "limit": {"type": "integer", "min": 1, "max": 25, "clamp": True},
+                "index": {"type": "integer", "min": 0},
+            },
+            ["action"],
+        )
+        clean, missing, errors = validate({"action": " ADD ", "limit": "100", "index": "2"})
+        self.assertEqual(clean, {"action": "add", "limit": 25, "index": 2})
+        self.assertEqual((missing, errors), ([], {}))
+
+        clean, missing, errors = validate({"action": "remove", "index": -1, "limit": "1.5"})
+        self.assertEqual(missing, ["action"])
+        self.assertEqual(errors["action"], "expected one of list, add, done, got 'remove'")
+        self.assertEqual(errors["index"], "must be at least 0, got -1")
+        self.assertEqual(errors["limit"], "expected a whole number, got '1.5'")
+        self.assertNotIn("action", clean)
+
+    def test_path_and_typed_list_rules(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            file_path = os.path.join(tmp, "clip.mp4")
+            Path(file_path).write_text("x", encoding="utf-8")
+            validate = validators.compile_args(
+                {
+                    "folder": {"type": "path", "kind": "dir", "must_exist": True},
+                    "input": {"type": "path", "kind": "file"},
+                    "boxes": {"type": "list", "items": "object", "max_items": 2},
+                }
+            )
+            clean, _missing, errors = validate({"folder": f' "{tmp}" ', "input": file_path, "boxes": '[{"text": "a"}]'})
+            self.assertEqual(errors, {})
+            self.assertEqual(clean["folder"], tmp)
+            self.assertEqual(clean["boxes"], [{"text": "a"}])
+
+            _clean, _missing, errors = validate(
+                {"folder": os.path.join(tmp, "missing"), "input": tmp, "boxes": [{"text": "a"}, "b"]}
+            )
+            self.assertTrue(errors["folder"].startswith("path does not exist: "))
+            self.assertTrue(errors["input"].startswith("expected a file, got a folder: "))
+            self.assertEqual(errors["boxes"], "item 1: expected an object, got 'b'")
+
+    def test_blank_values_are_left_to_tool_defaults(self):
+        validate = validators.compile_args({"action": {"type": "string", "enum": ["list", "add"]}})
+        self.assertEqual(validate({"action": ""}), ({"action": ""}, [], {}))
+        self.assertEqual(validate(None), ({}, [], {}))
+
+
+if __name__ == "__main__":
+    unittest.main()
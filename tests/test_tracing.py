@@ -0,0 +1,168 @@
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+import types
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+
+def _load_module(relative_path, module_name):
+    repo_root = Path(__file__).resolve().parents[1]
+    mod_path = repo_root / relative_path
+    spec = importlib.util.spec_from_file_location(module_name, str(mod_path))
+    module = importlib.util.module_from_spec(spec)
+    assert spec and spec.loader
+    spec.loader.exec_module(module)
+    return module
+
+
+def _load_tracing():
+    config_mod = types.ModuleType("Jarvis.config.config")
+    config_mod.trace_enabled = "1"
+    config_mod.latency_trace = "0"
+    config_pkg = types.ModuleType("Jarvis.config")
+    config_pkg.config = config_mod
+    stubs = {
+        "Jarvis": sys.modules.get("Jarvis") or types.ModuleType("Jarvis"),
+        "Jarvis.config": config_pkg,
+        "Jarvis.config.config": config_mod,
+    }
+    saved = {name: sys.modules.get(name) for name in stubs}
+    sys.modules.update(stubs)
+    pkg_name = "jivan_runtime_trace_pkg"
+    pkg = types.ModuleType(pkg_name)
+    pkg.__path__ = [str(Path(__file__).resolve().parents[1] / "Jarvis" / "runtime")]
+    sys.modules[pkg_name] = pkg
+    try:
+        log_mod = _load_module(Path("Jarvis") / "runtime" / "structured_log.py", f"{pkg_name}.structured_log")
+        sys.modules[f"{pkg_name}.structured_log"] = log_mod
+        metrics_mod = _load_module(Path("Jarvis") / "runtime" / "metrics.py", f"{pkg_name}.metrics")
+        sys.modules[f"{pkg_name}.metrics"] = metrics_mod
+        return _load_module(Path("Jarvis") / "runtime" / "tracing.py", f"{pkg_name}.tracing"), log_mod
+    finally:
+        for name, module in saved.items():
+            if module is None:
+                sys.modules.pop(name, None)
+            else:
+                sys.modules[name] = module
+
+
+tracing, structured_log = _load_tracing()
+
+
+class TracingTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        tracing.config.trace_path = os.path.join(self.tmp.name, "trace.json")
+        tracing.config.trace_enabled = "1"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _events(self):
+        return {e["name"]: e for e in tracing.load_trace(tracing.config.trace_path)}
+
+    def test_nested_spans_share_a_trace_and_link_parents(self):
+        structured_log.set_turn_id("turn-1")
+        pool = ThreadPoolExecutor(max_workers=1)
+        with tracing.span("turn", mode="conversational") as root:
+            with tracing.span("llm_plan", model="m"):
+                tracing.annotate(prompt_tokens=120)
+                tracing.event("llm_first_sentence", ms=5)
+            parent = tracing.current_span()
+
+            def _work():
+                with tracing.attach(parent):
+                    with tracing.span("memory"):
+                        pass
+
+            pool.submit(_work).result()
+            self.assertFalse(os.path.exists(tracing.config.trace_path))
+        pool.shutdown()
+
+        events = self._events()
+        self.assertEqual(set(events), {"turn", "llm_plan", "memory", "llm_first_sentence"})
+        self.assertEqual(events["llm_plan"]["ph"], "X")
+        self.assertEqual(events["llm_plan"]["args"]["parent_id"], root.span_id)
+        self.assertEqual(events["memory"]["args"]["parent_id"], root.span_id)
+        self.assertNotEqual(events["memory"]["tid"], events["turn"]["tid"])
+        self.assertEqual(events["llm_plan"]["args"]["prompt_tokens"], 120)
+        self.assertEqual(events["turn"]["args"]["turn_id"], "turn-1")
+        self.assertIsNone(events["turn"]["args"]["parent_id"])
+        self.assertGreaterEqual(events["turn"]["dur"], events["llm_plan"]["dur"])
+
+    def test_dropped_trace_is_not_written_and_errors_are_tagged(self):
+        with tracing.span("turn") as root:
+            with tracing.span("capture"):
+                pass
+            root.drop()
+        self.assertFalse(os.path.exists(tracing.config.trace_path))
+
+        with self.assertRaises(ValueError):
+            with tracing.span("tool", tool="weather"):
+                raise ValueError("boom")
+        self.assertEqual(self._events()["tool"]["args"]["error"], "ValueError")
+        self.assertIsNone(tracing.current_span())
+
+    def test_straggler_after_root_end_is_still_written(self):
+        release = threading.Event()
+        history = tracing.wrap("history", lambda: release.wait(5))
+        with tracing.span("respond"):
+            parent = tracing.current_span()
+
+            def _late():
+                with tracing.attach(parent):
+                    history()
+
+            worker = threading.Thread(target=_late)
+            worker.start()
+        release.set()
+        worker.join()
+        self.assertEqual(set(self._events()), {"respond", "history"})
+
+    def test_disabled_tracing_still_times_blocks(self):
+        tracing.config.trace_enabled = "0"
+        with tracing.span("tool") as timed:
+            pass
+        self.assertGreaterEqual(timed.duration_ms, 0.0)
+        self.assertEqual(timed.duration_ms, timed.duration_ms)
+        self.assertIsNone(tracing.current_span())
+        self.assertFalse(os.path.exists(tracing.config.trace_path))
+
+    def test_summary_line_sums_stages(self):
+        with tracing.span("turn") as root:
+            with tracing.span("stt"):
+                pass
+            with tracing.span("tts"):
+                pass
+            with tracing.span("tts"):
+                pass
+        line = tracing.summary_line(root, root.finished + [root])
+        self.assertTrue(line.startswith("[trace] turn="))
+        self.assertEqual([part.split("=")[0] for part in line.split()[2:]], ["stt", "tts"])
+
+    def test_turn_summary_goes_to_the_event_log_not_stdout(self):
+        tracing.config.latency_trace = "1"
+        tracing.config.runtime_log_path = os.path.join(self.tmp.name, "events.jsonl")
+        out = io.StringIO()
+        try:
+            with contextlib.redirect_stdout(out):
+                with tracing.span("turn"):
+                    with tracing.span("stt"):
+                        pass
+        finally:
+            tracing.config.latency_trace = "0"
+        self.assertEqual(out.getvalue(), "")
+        with open(tracing.config.runtime_log_path, "r", encoding="utf-8") as f:
+            row = json.loads(f.readline())
+        self.assertEqual((row["event"], row["root"], list(row["stages"])), ("trace", "turn", ["stt"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
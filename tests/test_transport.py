@@ -0,0 +1,142 @@
+import importlib.util
+import json
+import sys
+import threading
+import types
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+
+def _load_module(relative_path, module_name):
+    repo_root = Path(__file__).resolve().parents[1]
+    mod_path = repo_root / relative_path
+    spec = importlib.util.spec_from_file_location(module_name, str(mod_path))
+    module = importlib.util.module_from_spec(spec)
+    assert spec and spec.loader
+    spec.loader.exec_module(module)
+    return module
+
+
+METRICS = []
+
+
+def _load_transport():
+    config_mod = types.ModuleType("Jarvis.config.config")
+    config_mod.http_connect_timeout_s = 1.5
+    config_mod.http_read_timeout_s = 4
+    config_mod.http_retries = 2
+    config_mod.http_backoff_s = 0
+    config_mod.http_pool_size = 4
+    config_pkg = types.ModuleType("Jarvis.config")
+    config_pkg.config = config_mod
+    metrics_mod = types.ModuleType("Jarvis.runtime.metrics")
+    metrics_mod.metrics_inc = lambda name, value=1: METRICS.append(name)
+    metrics_mod.metrics_observe_ms = lambda name, value: METRICS.append(name)
+    stubs = {
+        "Jarvis": sys.modules.get("Jarvis") or types.ModuleType("Jarvis"),
+        "Jarvis.config": config_pkg,
+        "Jarvis.config.config": config_mod,
+        "Jarvis.runtime.metrics": metrics_mod,
+    }
+    saved = {name: sys.modules.get(name) for name in stubs}
+    sys.modules.update(stubs)
+    try:
+        return _load_module(Path("Jarvis") / "runtime" / "transport.py", "jivan_transport_mod")
+    finally:
+        for name, module in saved.items():
+            if module is None:
+                sys.modules.pop(name, None)
+            else:
+                sys.modules[name] = module
+
+
+transport = _load_transport()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, status, body):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.ports.append(self.client_address[1])
+            server.hits[self.path] = server.hits.get(self.path, 0) + 1
+            hits = server.hits[self.path]
+        if self.path == "/flaky" and hits < 3:
+            return self._reply(503, {"error": "busy"})
+        self._reply(200, {"path": self.path, "hits": hits})
+
+    def do_POST(self):
+        with self.server.lock:
+            self.server.hits[self.path] = self.server.hits.get(self.path, 0) + 1
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        self._reply(503, {"error": "busy"})
+
+
+class TransportTests(unittest.TestCase):
+    def setUp(self):
+        transport.close_all()
+        transport._HOSTS.clear()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.server.daemon_threads = True
+        self.server.lock = threading.Lock()
+        self.server.ports = []
+        self.server.hits = {}
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def tearDown(self):
+        transport.close_all()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_requests_to_one_host_reuse_a_connection(self):
+        for i in range(5):
+            self.assertEqual(transport.get(f"{self.base}/ping/{i}").json()["path"], f"/ping/{i}")
+        self.assertEqual(len(set(self.server.ports)), 1)
+        self.assertIs(transport.session_for(self.base + "/a"), transport.session_for(self.base + "/b"))
+        row = transport.host_stats()["127.0.0.1"]
+        self.assertEqual((row["requests"], row["errors"], row["last_status"]), (5, 0, 200))
+        self.assertIn("http_127.0.0.1_ms", METRICS)
+
+    def test_default_timeout_is_applied_unless_given(self):
+        seen = []
+        session = transport.session_for(self.base)
+        original = session.request
+        session.request = lambda method, url, **kw: seen.append(kw["timeout"]) or original(method, url, **kw)
+        try:
+            transport.get(f"{self.base}/t")
+            transport.get(f"{self.base}/t", timeout=9)
+        finally:
+            session.request = original
+        self.assertEqual(seen, [(1.5, 4.0), 9])
+
+    def test_idempotent_get_is_retried_but_post_is_not(self):
+        res = transport.get(f"{self.base}/flaky")
+        self.assertEqual((res.status_code, res.json()["hits"]), (200, 3))
+        res = transport.post(f"{self.base}/submit", json={"x": 1})
+        self.assertEqual(res.status_code, 503)
+        self.assertEqual(self.server.hits["/submit"], 1)
+        self.assertEqual(transport.host_stats()["127.0.0.1"]["errors"], 1)
+
+    def test_connection_errors_are_counted(self):
+        with self.assertRaises(transport.RequestException):
+            transport.get("http://127.0.0.1:9/unreachable", timeout=0.5)
+        self.assertEqual(transport.host_stats()["127.0.0.1"]["errors"], 1)
+        self.assertIn("http_127.0.0.1_errors", METRICS)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import importlib.util
+import os
+import sys
+import tempfile
+import time
+import types
+import unittest
+from pathlib import Path
+
+
+def _load_module(relative_path, module_name):
+    repo_root = Path(__file__).resolve().parents[1]
+    mod_path = repo_root / relative_path
+    spec = importlib.util.spec_from_file_location(module_name, str(mod_path))
+    module = importlib.util.module_from_spec(spec)
+    assert spec and spec.loader
+    spec.loader.exec_module(module)
+    return module
+
+
+def _install_stub_config():
+    if "Jarvis" not in sys.modules:
+        sys.modules["Jarvis"] = types.ModuleType("Jarvis")
+    config_pkg = types.ModuleType("Jarvis.config")
+    config_mod = types.ModuleType("Jarvis.config.config")
+    config_mod.brain_cache_backend = "memory"
+    config_pkg.config = config_mod
+    sys.modules["Jarvis.config"] = config_pkg
+    sys.modules["Jarvis.config.config"] = config_mod
+    return config_mod
+
+
+class TTLCacheTests(unittest.TestCase):
+    def setUp(self):
+        _install_stub_config()
+        self.mod = _load_module(Path("Jarvis") / "brain" / "cache" / "ttl_lru.py", "ttl_lru_mod")
+
+    def test_lru_eviction_keeps_recently_used(self):
+        cache = self.mod.TTLCache("t", ttl_s=60, max_items=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        self.assertEqual(cache.get("a"), 1)
+        cache.set("c", 3)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.get("c"), 3)
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_per_entry_ttl_and_zero_ttl(self):
+        cache = self.mod.TTLCache("t", ttl_s=60)
+        cache.set("short", "x", ttl_s=0.05)
+        self.assertFalse(cache.set("never", "y", ttl_s=0))
+        time.sleep(0.08)
+        self.assertIsNone(cache.get("short"))
+        self.assertIsNone(cache.get("never"))
+        stats = cache.stats()
+        self.assertEqual(stats["expired"], 1)
+        self.assertEqual(stats["misses"], 2)
+
+    def test_byte_budget_and_metrics_hook(self):
+        seen = []
+        cache = self.mod.TTLCache("t", ttl_s=60, max_items=100, max_bytes=30, on_metric=lambda n, v: seen.append(n))
+        cache.set("a", "x" * 15)
+        cache.set("b", "y" * 15)
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.get("b"), "y" * 15)
+        self.assertFalse(cache.set("huge", "z" * 100))
+        self.assertLessEqual(cache.stats()["bytes"], 30)
+        self.assertIn("cache_t_evictions", seen)
+        self.assertIn("cache_t_hits", seen)
+
+    def test_sqlite_backend_survives_restart(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "cache.sqlite3")
+            first = self.mod.TTLCache("tool", ttl_s=60, backend=self.mod.SQLiteCacheBackend(path))
+            first.set("k", {"ok": True, "data": "sunny"})
+            first.set("gone", "x", ttl_s=0.01)
+            time.sleep(0.03)
+            second = self.mod.TTLCache("tool", ttl_s=60, backend=self.mod.SQLiteCacheBackend(path))
+            self.assertEqual(second.get("k"), {"ok": True, "data": "sunny"})
+            self.assertIsNone(second.get("gone"))
+            other = self.mod.TTLCache("semantic", ttl_s=60, backend=self.mod.SQLiteCacheBackend(path))
+            self.assertEqual(len(other), 0)
+
+    def test_parse_ttl_overrides(self):
+        self.assertEqual(self.mod.parse_ttl_overrides("weather=600, news=900,bad,x=y"), {"weather": 600, "news": 900})
+
+
+if __name__ == "__main__":
+    unittest.main()
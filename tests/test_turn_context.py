@@ -0,0 +1,55 @@
+import importlib.util
+import unittest
+from pathlib import Path
+
+
+def _load_module(relative_path, module_name):
+    repo_root = Path(__file__).resolve().parents[1]
+    mod_path = repo_root / relative_path
+    spec = importlib.util.spec_from_file_location(module_name, str(mod_path))
+    module = importlib.util.module_from_spec(spec)
+    assert spec and spec.loader
+    spec.loader.exec_module(module)
+    return module
+
+
+turn_context = _load_module(Path("Jarvis") / "brain" / "turn_context.py", "turn_context_mod")
+
+
+class TurnContextTests(unittest.TestCase):
+    def test_history_is_loaded_once_and_mirrors_writes(self):
+        calls = []
+
+        def load():
+            calls.append(1)
+            return [{"role": "user", "content": "hi"}, {"role": "assistant", "content": "hello"}]
+
+        turn = turn_context.TurnContext(load)
+        self.assertEqual(len(turn.history()), 2)
+        turn.record("user", "weather in Paris")
+        rows = turn.history()
+        turn.history()
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(rows[-1], {"role": "user", "content": "weather in Paris"})
+
+    def test_record_before_load_is_left_to_the_store(self):
+        turn = turn_context.TurnContext(lambda: [{"role": "user", "content": "stored"}])
+        turn.record("user", "stored")
+        self.assertEqual(turn.history(), [{"role": "user", "content": "stored"}])
+
+    def test_normalize_history(self):
+        rows = [
+            {"role": "assistant", "content": "stray"},
+            {"role": "tool", "content": "x"},
+            {"role": "user", "content": "  "},
+            "bad",
+            {"role": "User", "content": "q"},
+        ] + [{"role": "assistant", "content": str(i)} for i in range(20)]
+        out = turn_context.normalize_history(rows, limit=5)
+        self.assertEqual(len(out), 5)
+        self.assertEqual(out[-1]["content"], "19")
+        self.assertEqual(turn_context.normalize_history(rows[:5]), [{"role": "user", "content": "q"}])
+
+
+if __name__ == "__main__":
+    unittest.main()